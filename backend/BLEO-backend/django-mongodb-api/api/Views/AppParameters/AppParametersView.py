@@ -5,6 +5,8 @@ from models.response.BLEOResponse import BLEOResponse
 from models.AppParameters import AppParameters
 from api.serializers import AppParametersSerializer
 from utils.logger import Logger
+from utils.parameter_manager import ParameterManager
+from utils.log_retention import LogRetention
 from models.enums.LogType import LogType
 
 class AppParametersView(APIView):
@@ -73,6 +75,15 @@ class AppParametersView(APIView):
                     errors={"param_value": "This field is required"}
                 ).to_response(status.HTTP_400_BAD_REQUEST)
             
+            if param_name == AppParameters.PARAM_LOG_RETENTION_DAYS:
+                try:
+                    LogRetention.parse_days(param_value)
+                except ValueError as e:
+                    return BLEOResponse.validation_error(
+                        message=str(e),
+                        errors={"param_value": str(e)}
+                    ).to_response(status.HTTP_400_BAD_REQUEST)
+            
             db = MongoDB.get_instance().get_collection('AppParameters')
             
             # Check if parameter exists
@@ -105,6 +116,8 @@ class AppParametersView(APIView):
                 
                 db.insert_one(new_param.to_dict())
             
+            ParameterManager.invalidate_cache(param_name)
+            
             # Get and return updated parameter
             updated_param = db.find_one({"param_name": param_name})
             
@@ -120,6 +133,9 @@ class AppParametersView(APIView):
                 # Update config file
                 from utils.config_manager import ConfigManager
                 ConfigManager.update_app_version(param_value)
+            elif param_name == AppParameters.PARAM_LOG_RETENTION_DAYS:
+                # Retune the DebugLogs TTL index
+                LogRetention.apply(param_value)
             
             # Log the update
             Logger.system_action(
@@ -159,6 +175,15 @@ class AppParametersView(APIView):
                     errors={"param_value": "This field is required"}
                 ).to_response(status.HTTP_400_BAD_REQUEST)
             
+            if param_name == AppParameters.PARAM_LOG_RETENTION_DAYS:
+                try:
+                    LogRetention.parse_days(param_value)
+                except ValueError as e:
+                    return BLEOResponse.validation_error(
+                        message=str(e),
+                        errors={"param_value": str(e)}
+                    ).to_response(status.HTTP_400_BAD_REQUEST)
+            
             db = MongoDB.get_instance().get_collection('AppParameters')
             
             # Check if parameter already exists
@@ -185,6 +210,7 @@ class AppParametersView(APIView):
             
             # Insert into database
             db.insert_one(new_param.to_dict())
+            ParameterManager.invalidate_cache(param_name)
             
             # Get the created parameter
             created_param = db.find_one({"param_name": param_name})
@@ -210,6 +236,9 @@ class AppParametersView(APIView):
                 # Update config file
                 from utils.config_manager import ConfigManager
                 ConfigManager.update_app_version(param_value)
+            elif param_name == AppParameters.PARAM_LOG_RETENTION_DAYS:
+                # Retune the DebugLogs TTL index
+                LogRetention.apply(param_value)
             
             # Log the creation
             Logger.system_action(
@@ -279,6 +308,15 @@ class AppParameterDetailView(APIView):
                     errors={"param_value": "This field is required"}
                 ).to_response(status.HTTP_400_BAD_REQUEST)
             
+            if param_name == AppParameters.PARAM_LOG_RETENTION_DAYS:
+                try:
+                    LogRetention.parse_days(param_value)
+                except ValueError as e:
+                    return BLEOResponse.validation_error(
+                        message=str(e),
+                        errors={"param_value": str(e)}
+                    ).to_response(status.HTTP_400_BAD_REQUEST)
+            
             db = MongoDB.get_instance().get_collection('AppParameters')
             
             # Check if parameter exists
@@ -305,6 +343,7 @@ class AppParameterDetailView(APIView):
                 {"param_name": param_name}, 
                 {"$set": {"param_value": param_value}}
             )
+            ParameterManager.invalidate_cache(param_name)
             
             Logger.system_action(
                 f"Update result: matched={result.matched_count}, modified={result.modified_count}",
@@ -343,6 +382,9 @@ class AppParameterDetailView(APIView):
                 # Update config file
                 from utils.config_manager import ConfigManager
                 ConfigManager.update_app_version(param_value)
+            elif param_name == AppParameters.PARAM_LOG_RETENTION_DAYS:
+                # Retune the DebugLogs TTL index
+                LogRetention.apply(param_value)
             
             # Log the update
             Logger.system_action(
@@ -377,6 +419,11 @@ class AppParameterDetailView(APIView):
             
             # Delete parameter
             db.delete_one({"param_name": param_name})
+            ParameterManager.invalidate_cache(param_name)
+            
+            if param_name == AppParameters.PARAM_LOG_RETENTION_DAYS:
+                # Without the parameter logs are kept forever
+                LogRetention.apply(None)
             
             # Log the deletion
             Logger.system_action(
@@ -0,0 +1,35 @@
+import json
+from asgiref.sync import sync_to_async
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+class AsyncAPIView(View):
+    """Base for the async (ASGI) variants of the hot API views.
+
+    DRF's APIView is sync-only, so these are plain Django views with async
+    handlers. Like APIView they are CSRF exempt and read JSON bodies.
+    Methods without an async handler are served by sync_view in a worker
+    thread, so a route can switch to the async view one method at a time.
+    """
+
+    sync_view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        if self.sync_view is not None and method in self.http_method_names and not hasattr(self, method):
+            return await sync_to_async(self.sync_view.as_view(), thread_sensitive=False)(request, *args, **kwargs)
+        return await super().dispatch(request, *args, **kwargs)
+
+    @staticmethod
+    def parse_body(request):
+        """Decode a JSON request body (empty body -> {}), raising ValueError when malformed"""
+        if not request.body:
+            return {}
+        try:
+            return json.loads(request.body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Malformed JSON body: {str(e)}") from e
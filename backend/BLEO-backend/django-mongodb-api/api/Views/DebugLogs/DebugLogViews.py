@@ -1,20 +1,50 @@
+import threading
+import time
+from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from utils.logger import Logger
+from utils.log_sampler import LogSampler, TokenBuckets
 from utils.mongodb_utils import MongoDB
 from api.serializers import DebugLogSerializer
+from models.DebugLogs import DebugLogs
 from models.enums.LogType import LogType
 from datetime import datetime, timedelta
-from utils.validation_patterns import ValidationPatterns
+from utils.log_query import LogQuery
+from utils.log_export import LogExporter
+from django.http import StreamingHttpResponse
 from rest_framework.exceptions import ValidationError
 from models.enums.ErrorSourceType import ErrorSourceType
 
 class LoggingView(APIView):
-    """API endpoint for client-side logging"""
+    """API endpoint for client-side logging (one entry or an array of entries)"""
+    
+    _client_buckets = TokenBuckets(max_keys=10000)
+    _client_lock = threading.Lock()
     
     def post(self, request, format=None):
-        """Create a new log entry with enhanced BLEOID validation"""
+        """Create log entries with enhanced BLEOID validation"""
+        max_bytes = settings.LOG_BATCH_MAX_BYTES
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > max_bytes:
+            return Response(
+                {"error": f"Log payload too large (max {max_bytes} bytes)"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        
+        if isinstance(request.data, list):
+            return self._post_batch(request)
+        
+        if not self._client_allowance(request, 1):
+            return Response(
+                {"error": "Log rate limit exceeded"},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
+        
         serializer = DebugLogSerializer(data=request.data)
         
         if not serializer.is_valid():
@@ -53,108 +83,175 @@ class LoggingView(APIView):
         
         if log_id:
             return Response({"success": True, "log_id": str(log_id)}, status=status.HTTP_201_CREATED)
+        elif LogSampler.last_decision() in (LogSampler.SAMPLED, LogSampler.RATE_LIMITED, LogSampler.AGGREGATED):
+            # Accepted but not stored individually by log sampling
+            return Response(
+                {"success": True, "log_id": None, "sampling": LogSampler.last_decision()},
+                status=status.HTTP_202_ACCEPTED
+            )
         else:
             return Response(
                 {"error": "Failed to create log entry"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def _post_batch(self, request):
+        """Validate an array of entries in bulk and store them with one insert_many"""
+        entries = request.data
+        max_entries = settings.LOG_BATCH_MAX_ENTRIES
+        
+        if not entries:
+            return Response({"error": "Empty log batch"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(entries) > max_entries:
+            return Response(
+                {"error": f"Too many log entries in batch (max {max_entries})"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        
+        # Entries beyond the client's quota are rejected, the rest are processed
+        allowed = self._client_allowance(request, len(entries))
+        results = [{"index": index, "status": "rate_limited"} for index in range(len(entries))]
+        
+        serializer = DebugLogSerializer(data=entries[:allowed], many=True)
+        if serializer.is_valid():
+            validated = list(serializer.validated_data)
+        else:
+            # Errors come back as a list, or keyed by index for the failing entries only
+            errors_by_index = serializer.errors
+            if not isinstance(errors_by_index, dict):
+                errors_by_index = dict(enumerate(errors_by_index))
+            validated = []
+            for index, entry in enumerate(entries[:allowed]):
+                errors = errors_by_index.get(index)
+                if errors:
+                    results[index] = {"index": index, "status": "invalid", "errors": errors}
+                    validated.append(None)
+                else:
+                    validated.append(serializer.child.run_validation(entry))
+        
+        positions = [index for index, data in enumerate(validated) if data is not None]
+        log_entries = [self._build_entry(validated[index]) for index in positions]
+        
+        for index, (log_id, decision) in zip(positions, Logger.save_many(log_entries)):
+            if log_id:
+                results[index] = {"index": index, "status": "created", "log_id": str(log_id)}
+            elif decision in (LogSampler.SAMPLED, LogSampler.RATE_LIMITED, LogSampler.AGGREGATED):
+                # Accepted but not stored individually by log sampling
+                results[index] = {"index": index, "status": "accepted", "sampling": decision}
+            else:
+                results[index] = {"index": index, "status": "failed"}
+        
+        accepted = sum(1 for result in results if result["status"] in ("created", "accepted"))
+        statuses = {result["status"] for result in results}
+        if accepted == len(results):
+            response_status = status.HTTP_201_CREATED
+        elif accepted:
+            response_status = status.HTTP_207_MULTI_STATUS
+        elif "invalid" in statuses:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif "rate_limited" in statuses:
+            response_status = status.HTTP_429_TOO_MANY_REQUESTS
+        else:
+            response_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+        
+        return Response(
+            {
+                "success": accepted > 0,
+                "accepted": accepted,
+                "rejected": len(results) - accepted,
+                "results": results
+            },
+            status=response_status
+        )
+    
+    @staticmethod
+    def _build_entry(data):
+        """Build the DebugLogs entry Logger.error/Logger.user_action would write"""
+        if data['type'] == LogType.ERROR.value:
+            return DebugLogs.log_error(
+                message=data['message'],
+                code=data['code'],
+                bleoid=data.get('bleoid'),
+                error_source=data.get('error_source')
+            )
+        return DebugLogs.log_user_action(
+            bleoid=data.get('bleoid'),
+            message=data['message'],
+            type=data['type'],
+            code=data['code']
+        )
+    
+    @classmethod
+    def _client_allowance(cls, request, count):
+        """Number of entries (up to count) the client may still send this minute"""
+        per_minute = settings.LOG_CLIENT_ENTRIES_PER_MINUTE
+        if per_minute <= 0:
+            return count
+        client = request.META.get('REMOTE_ADDR', 'unknown')
+        now = time.monotonic()
+        with cls._client_lock:
+            return cls._client_buckets.get(client, per_minute, per_minute, now).take(now, count)
+
 class AdminLogsView(APIView):
     """API endpoint for retrieving logs (admin use only)"""
     
+    MAX_LIMIT = 1000
+    # Filtered totals stop counting here and are reported as an estimate
+    COUNT_LIMIT = 10000
+    
     def get(self, request, format=None):
-        """Get logs with optional filtering and BLEOID validation"""
+        """Get logs with optional filtering, keyset pagination and BLEOID validation"""
         try:
             db = MongoDB.get_instance().get_collection('DebugLogs')
             
-            # Parse query parameters for filtering
-            limit = int(request.query_params.get('limit', 100))
+            # Parse query parameters for pagination
+            limit = min(max(int(request.query_params.get('limit', 100)), 1), self.MAX_LIMIT)
             skip = int(request.query_params.get('skip', 0))
-            log_type = request.query_params.get('type')
-            bleoid = request.query_params.get('bleoid')
-            error_source = request.query_params.get('error_source')
-            user_type = request.query_params.get('user_type')
-            
-            # Date range filtering
-            days = request.query_params.get('days')
-            start_date = request.query_params.get('start_date')
-            end_date = request.query_params.get('end_date')
-            
-            # Build query filters
-            query = {}
-            
-            # Type filter
-            if log_type:
-                query['type'] = log_type
-            
-            # bleoid filter
-            if bleoid:
-                query['bleoid'] = bleoid
-                
-            # Error source filter
-            if error_source:
-                query['error_source'] = error_source
-                
-            # User type filter - Add this block
-            if user_type:
-                query['user_type'] = user_type
+            cursor = request.query_params.get('cursor')
+            exact_count = request.query_params.get('exact_count', '').lower() in ('1', 'true')
             
-            # Date filters
-            if days:
-                try:
-                    days_ago = datetime.now() - timedelta(days=int(days))
-                    query['date'] = {'$gte': days_ago}
-                except ValueError:
-                    pass
+            # Build query filters, validating the BLEOID filter when provided
+            try:
+                query = LogQuery.build(request.query_params)
+            except ValidationError as e:
+                bleoid = request.query_params.get('bleoid')
+                Logger.debug_error(
+                    f"Invalid BLEOID format in filter: {bleoid} - {str(e)}",
+                    400,
+                    None,
+                    ErrorSourceType.SERVER.value
+                )
+                return Response(
+                    {"error": f"Invalid BLEOID format in filter: {bleoid}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             
-            if start_date:
+            # Cursor pages seek through the (date, id) indexes; skip is kept for older clients
+            page_query = query
+            if cursor:
                 try:
-                    start = datetime.fromisoformat(start_date)
-                    if 'date' not in query:
-                        query['date'] = {}
-                    query['date']['$gte'] = start
-                except ValueError:
-                    pass
-                    
-            if end_date:
-                try:
-                    end = datetime.fromisoformat(end_date)
-                    if 'date' not in query:
-                        query['date'] = {}
-                    query['date']['$lte'] = end
-                except ValueError:
-                    pass
-            
-            # Validate BLEOID filter parameter if provided
-            bleoid = request.query_params.get('bleoid')
-            validated_bleoid = None
-            
-            if bleoid:
-                try:
-                    validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
-                    query['bleoid'] = validated_bleoid
-                except ValidationError as e:
-                    Logger.debug_error(
-                        f"Invalid BLEOID format in filter: {bleoid} - {str(e)}",
-                        400,
-                        None,
-                        ErrorSourceType.SERVER.value
-                    )
-                    return Response(
-                        {"error": f"Invalid BLEOID format in filter: {bleoid}"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            
-            # Execute query with pagination
-            logs = list(db.find(query).sort('date', -1).skip(skip).limit(limit))
+                    page_query = LogQuery.after_cursor(query, cursor)
+                except ValueError as e:
+                    return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+                skip = 0
+            
+            # Fetch one extra log to know whether another page exists
+            logs = list(db.find(page_query).sort(LogQuery.SORT).skip(skip).limit(limit + 1))
+            has_more = len(logs) > limit
+            logs = logs[:limit]
             
             # Convert ObjectId to string for JSON serialization
             for log in logs:
                 log['_id'] = str(log['_id'])
+            
+            total, total_is_estimate = self._count(db, query, exact_count)
                 
             return Response({
-                'total': db.count_documents(query),
-                'logs': logs
+                'total': total,
+                'total_is_estimate': total_is_estimate,
+                'logs': logs,
+                'has_more': has_more,
+                'next_cursor': LogQuery.encode_cursor(logs[-1]) if has_more else None
             })
             
         except Exception as e:
@@ -163,6 +260,16 @@ class AdminLogsView(APIView):
                 {"error": "Failed to retrieve logs"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    def _count(self, db, query, exact_count):
+        """Return (total, is_estimate) without rescanning large match sets unless asked to"""
+        if exact_count:
+            return db.count_documents(query), False
+        if not query:
+            # Collection metadata, no scan
+            return db.estimated_document_count(), True
+        total = db.count_documents(query, limit=self.COUNT_LIMIT)
+        return total, total >= self.COUNT_LIMIT
 
 class AdminLogDetailView(APIView):
     """API endpoint for retrieving a specific log by ID"""
@@ -198,4 +305,153 @@ class AdminLogDetailView(APIView):
             return Response(
                 {"error": "Failed to retrieve log"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+class AdminLogAnalyticsView(APIView):
+    """API endpoint aggregating logs server-side for incident triage (admin use only)"""
+    
+    # $dateToString formats per bucket, with the widest window each may cover
+    BUCKETS = {
+        'minute': ('%Y-%m-%dT%H:%M:00', timedelta(days=1)),
+        'hour': ('%Y-%m-%dT%H:00:00', timedelta(days=31)),
+        'day': ('%Y-%m-%d', timedelta(days=366)),
+    }
+    DEFAULT_WINDOW = timedelta(days=1)
+    MAX_TOP = 100
+    
+    def get(self, request, format=None):
+        """Get log counts by type, code, error source, user and time bucket over a window"""
+        try:
+            db = MongoDB.get_instance().get_collection('DebugLogs')
+            
+            bucket = request.query_params.get('bucket', 'hour')
+            if bucket not in self.BUCKETS:
+                return Response(
+                    {"error": f"Invalid bucket. Must be one of: {', '.join(self.BUCKETS)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                top = min(max(int(request.query_params.get('top', 10)), 1), self.MAX_TOP)
+            except ValueError:
+                return Response({"error": "top must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+            
+            try:
+                query = LogQuery.build(request.query_params)
+            except ValidationError:
+                return Response(
+                    {"error": f"Invalid BLEOID format in filter: {request.query_params.get('bleoid')}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Always aggregate over a bounded window (last 24 hours by default)
+            date_filter = query.setdefault('date', {})
+            end = date_filter.get('$lte', datetime.now())
+            start = date_filter.setdefault('$gte', end - self.DEFAULT_WINDOW)
+            date_format, max_window = self.BUCKETS[bucket]
+            if end - start > max_window:
+                return Response(
+                    {"error": f"Window too large for {bucket} buckets (max {max_window.days} days)"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            result = next(db.aggregate(self._pipeline(query, date_format, top), allowDiskUse=True), {})
+            
+            return Response({
+                'window': {'start': start, 'end': end},
+                'bucket': bucket,
+                'total': sum(row['count'] for row in result.get('by_type', [])),
+                'by_type': self._rows(result.get('by_type'), 'type'),
+                'errors_by_code': self._rows(result.get('errors_by_code'), 'code'),
+                'errors_by_source': self._rows(result.get('errors_by_source'), 'error_source'),
+                'top_users': self._rows(result.get('top_users'), 'bleoid'),
+                'timeline': self._rows(result.get('timeline'), 'bucket')
+            })
+            
+        except Exception as e:
+            Logger.server_error(f"Error aggregating logs: {str(e)}")
+            return Response(
+                {"error": "Failed to aggregate logs"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @staticmethod
+    def _pipeline(query, date_format, top):
+        """One pass over the window; each facet groups the same matched logs"""
+        # Aggregated entries stand for repeat_count occurrences
+        occurrences = {'$ifNull': ['$repeat_count', 1]}
+        errors = {'$cond': [{'$eq': ['$type', LogType.ERROR.value]}, occurrences, 0]}
+        by_count = {'$sort': {'count': -1, '_id': 1}}
+        only_errors = {'$match': {'type': LogType.ERROR.value}}
+        
+        return [
+            {'$match': query},
+            {'$project': {'type': 1, 'code': 1, 'error_source': 1, 'bleoid': 1, 'date': 1, 'repeat_count': 1}},
+            {'$facet': {
+                'by_type': [
+                    {'$group': {'_id': '$type', 'count': {'$sum': occurrences}}},
+                    by_count
+                ],
+                'errors_by_code': [
+                    only_errors,
+                    {'$group': {'_id': '$code', 'count': {'$sum': occurrences}}},
+                    by_count
+                ],
+                'errors_by_source': [
+                    only_errors,
+                    {'$group': {'_id': '$error_source', 'count': {'$sum': occurrences}}},
+                    by_count
+                ],
+                'top_users': [
+                    {'$match': {'bleoid': {'$ne': None}}},
+                    {'$group': {'_id': '$bleoid', 'count': {'$sum': occurrences}, 'errors': {'$sum': errors}}},
+                    by_count,
+                    {'$limit': top}
+                ],
+                'timeline': [
+                    {'$group': {
+                        '_id': {'$dateToString': {'format': date_format, 'date': '$date'}},
+                        'count': {'$sum': occurrences},
+                        'errors': {'$sum': errors}
+                    }},
+                    {'$sort': {'_id': 1}}
+                ]
+            }}
+        ]
+    
+    @staticmethod
+    def _rows(rows, key):
+        """Rename each group's _id to key"""
+        return [{key: row.pop('_id'), **row} for row in rows or []]
+
+class AdminLogExportView(APIView):
+    """API endpoint streaming filtered logs as NDJSON or CSV (admin use only)"""
+    
+    MAX_BATCH_SIZE = 10000
+    
+    def get(self, request, format=None):
+        """Stream every log matching the AdminLogsView filters"""
+        # 'format' is reserved by DRF for renderer selection, hence 'output'
+        export_format = request.query_params.get('output', 'ndjson')
+        compress = request.query_params.get('gzip', '').lower() in ('1', 'true')
+        
+        try:
+            batch_size = min(max(int(request.query_params.get('batch_size', LogExporter.DEFAULT_BATCH_SIZE)), 1), self.MAX_BATCH_SIZE)
+            query = LogQuery.build(request.query_params)
+            exporter = LogExporter(query, export_format, batch_size, compress)
+        except ValidationError:
+            return Response(
+                {"error": f"Invalid BLEOID format in filter: {request.query_params.get('bleoid')}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        Logger.debug_system_action(
+            f"DebugLogs export started: output={export_format}, gzip={compress}, filters={query}",
+            LogType.INFO.value,
+            200
+        )
+        
+        response = StreamingHttpResponse(exporter.chunks(), content_type=exporter.content_type)
+        filename = exporter.filename(f"debuglogs-{datetime.now():%Y%m%d-%H%M%S}")
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
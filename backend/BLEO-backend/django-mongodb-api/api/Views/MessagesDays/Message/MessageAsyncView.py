@@ -0,0 +1,593 @@
+from datetime import datetime
+from pymongo import ReturnDocument
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from models.MessagesDays import MessagesDays
+from models.response.BLEOResponse import BLEOResponse
+from api.serializers import MessageInfosSerializer
+from api.Views.AsyncAPIView import AsyncAPIView
+from utils.mongodb_async import AsyncMongoDB
+from utils.logger import Logger
+from models.enums.LogType import LogType
+from models.enums.ErrorSourceType import ErrorSourceType
+from utils.validation_patterns import ValidationPatterns, ValidationRules
+from utils.realtime_events import RealtimeEvents
+from utils.conditional_get import ConditionalGet
+from utils.message_sync import MessageSync
+from api.Views.MessagesDays.Message.MessageView import (
+    _grouped_days,
+    _flat_messages,
+    _day_listing,
+    _day_response,
+    _incoming_messages,
+    _validate_messages,
+    _number_new_messages,
+    _number_replacements,
+    _format_created_at
+)
+
+class AsyncMessageOperationsView(AsyncAPIView):
+    """Async variant of MessageOperationsView.
+
+    Writes use find_one_and_update so the updated day comes back in the same
+    round trip instead of a second find_one.
+    """
+
+    async def get_message_day(self, bleoid, date, projection=None):
+        """Get message day by bleoid and date with validation (optionally only the projected fields)"""
+        try:
+            validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+            date_obj = datetime.strptime(date, ValidationRules.STANDARD_DATE_FORMAT)
+            message_date = datetime(date_obj.year, date_obj.month, date_obj.day)
+
+            db = AsyncMongoDB.get_instance().get_collection('MessagesDays')
+            return await db.find_one({
+                "from_bleoid": validated_bleoid,
+                "date": message_date
+            }, projection)
+        except Exception:
+            return None
+
+    async def set_messages(self, message_day, messages):
+        """Replace the messages of message_day, returning the updated document"""
+        db = AsyncMongoDB.get_instance().get_collection('MessagesDays')
+        return await db.find_one_and_update(
+            {"_id": message_day['_id']},
+            MessagesDays.touch({"$set": {"messages": messages}}),
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _invalid_bleoid(self, bleoid, error):
+        await Logger.run_async(
+            Logger.debug_error,
+            f"Invalid BLEOID format in URL: {bleoid} - {str(error)}",
+            400,
+            None,  # DebugLogs rejects malformed BLEOIDs
+            ErrorSourceType.SERVER.value
+        )
+        return BLEOResponse.validation_error(
+            message=f"Invalid BLEOID format: {bleoid}"
+        ).to_json_response(status.HTTP_400_BAD_REQUEST)
+
+    async def _day_not_found(self, bleoid, date, context):
+        await Logger.run_async(
+            Logger.debug_error,
+            f"No message day found for bleoid={bleoid} on date {date} {context}",
+            404,
+            bleoid,
+            ErrorSourceType.SERVER.value
+        )
+        return BLEOResponse.not_found(
+            message=f"No message day found for bleoid={bleoid} on date {date}"
+        ).to_json_response(status.HTTP_404_NOT_FOUND)
+
+    async def get(self, request, bleoid, date=None, message_id=None):
+        """Get messages with URL BLEOID validation (?shape=grouped groups the all-dates listing by day)"""
+        validated_bleoid = bleoid  # Fallback value
+
+        try:
+            validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+            if date and message_id is not None:
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    f"Getting message with ID={message_id} for date {date}",
+                    LogType.INFO.value,
+                    200
+                )
+            elif date:
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    f"Getting all messages for date {date}",
+                    LogType.INFO.value,
+                    200
+                )
+            else:
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    "Getting all messages across all dates",
+                    LogType.INFO.value,
+                    200
+                )
+
+            # Revalidation: compare the client's validators against a projection-only read
+            if ConditionalGet.is_conditional(request):
+                if date:
+                    validators = await self.get_message_day(validated_bleoid, date, ConditionalGet.PROJECTION)
+                else:
+                    validators = await AsyncMongoDB.get_instance().get_collection('MessagesDays').find(
+                        {"from_bleoid": validated_bleoid}, ConditionalGet.PROJECTION
+                    ).to_list(None)
+                not_modified = ConditionalGet.revalidate(request, validators)
+                if not_modified is not None:
+                    return not_modified
+
+            # Case 3: Specific message by ID
+            if date and message_id is not None:
+                message_day = await self.get_message_day(validated_bleoid, date)
+                if not message_day:
+                    return await self._day_not_found(validated_bleoid, date, f"when getting message {message_id}")
+
+                message_id = int(message_id)
+                for msg in message_day.get('messages', []):
+                    if msg.get('id') == message_id:
+                        await Logger.run_async(
+                            Logger.debug_user_action,
+                            validated_bleoid,
+                            f"Message with ID={message_id} retrieved successfully for date {date}",
+                            LogType.SUCCESS.value,
+                            200
+                        )
+                        return ConditionalGet.apply(BLEOResponse.success(
+                            data=MessageInfosSerializer(msg).data,
+                            message="Message retrieved successfully"
+                        ).to_json_response(), *ConditionalGet.validators(message_day))
+
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"Message with ID={message_id} not found for bleoid={validated_bleoid} on date {date}",
+                    404,
+                    validated_bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.not_found(
+                    message=f"Message with ID {message_id} not found for date {date}"
+                ).to_json_response(status.HTTP_404_NOT_FOUND)
+
+            # Case 2: All messages for a specific date
+            elif date:
+                message_day = await self.get_message_day(validated_bleoid, date)
+                if not message_day:
+                    return await self._day_not_found(validated_bleoid, date, "when listing messages")
+
+                messages = message_day.get('messages', [])
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    f"Retrieved {len(messages)} messages for date {date}",
+                    LogType.SUCCESS.value,
+                    200
+                )
+
+                return ConditionalGet.apply(BLEOResponse.success(
+                    data=_day_listing(validated_bleoid, date, message_day),
+                    message=f"Retrieved {len(messages)} messages for date {date}"
+                ).to_json_response(), *ConditionalGet.validators(message_day))
+
+            # Case 1: All messages for this user across all dates
+            else:
+                db = AsyncMongoDB.get_instance().get_collection('MessagesDays')
+                message_days = await db.find({"from_bleoid": validated_bleoid}).to_list(None)
+
+                if not message_days:
+                    await Logger.run_async(
+                        Logger.debug_error,
+                        f"No message days found for bleoid={validated_bleoid}",
+                        404,
+                        validated_bleoid,
+                        ErrorSourceType.SERVER.value
+                    )
+                    return BLEOResponse.not_found(
+                        message=f"No message days found for bleoid={validated_bleoid}"
+                    ).to_json_response(status.HTTP_404_NOT_FOUND)
+
+                if request.GET.get('shape') == 'grouped':
+                    days = _grouped_days(message_days)
+                    message_count = sum(len(day['messages']) for day in days)
+                    await Logger.run_async(
+                        Logger.debug_user_action,
+                        validated_bleoid,
+                        f"Retrieved {message_count} messages from {len(days)} dates (grouped)",
+                        LogType.SUCCESS.value,
+                        200
+                    )
+                    return ConditionalGet.apply(BLEOResponse.success(
+                        data={
+                            'from_bleoid': validated_bleoid,
+                            'days': days,
+                            'count': message_count,
+                            'date_count': len(days)
+                        },
+                        message=f"Retrieved {message_count} messages from {len(days)} dates"
+                    ).to_json_response(), *ConditionalGet.validators(message_days))
+
+                result = _flat_messages(message_days)
+
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    f"Retrieved {len(result)} messages from {len(message_days)} dates",
+                    LogType.SUCCESS.value,
+                    200
+                )
+
+                return ConditionalGet.apply(BLEOResponse.success(
+                    data={
+                        'from_bleoid': validated_bleoid,
+                        'messages': MessageInfosSerializer(result, many=True).data,
+                        'count': len(result),
+                        'date_count': len(message_days)
+                    },
+                    message=f"Retrieved {len(result)} messages from {len(message_days)} dates"
+                ).to_json_response(), *ConditionalGet.validators(message_days))
+
+        except ValidationError as e:
+            return await self._invalid_bleoid(bleoid, e)
+        except Exception as e:
+            await Logger.run_async(
+                Logger.debug_error,
+                f"Failed to retrieve message(s) for bleoid={validated_bleoid}" +
+                (f" on date {date}" if date else "") +
+                (f" with ID={message_id}" if message_id is not None else "") +
+                f": {str(e)}",
+                500,
+                validated_bleoid,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.server_error(
+                message=f"Failed to retrieve messages: {str(e)}"
+            ).to_json_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def post(self, request, bleoid, date):
+        """Add new messages with URL BLEOID validation"""
+        validated_bleoid = bleoid  # Fallback value
+
+        try:
+            validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+            await Logger.run_async(
+                Logger.debug_user_action,
+                validated_bleoid,
+                f"Adding new message(s) for date {date}",
+                LogType.INFO.value,
+                200
+            )
+
+            try:
+                data = self.parse_body(request)
+            except ValueError as e:
+                return BLEOResponse.validation_error(
+                    message=str(e)
+                ).to_json_response(status.HTTP_400_BAD_REQUEST)
+
+            message_day = await self.get_message_day(validated_bleoid, date)
+            if not message_day:
+                return await self._day_not_found(validated_bleoid, date, "when adding messages")
+
+            current_messages = message_day.get('messages', [])
+
+            validated_messages, invalid = _validate_messages(_incoming_messages(data))
+            if invalid:
+                i, errors = invalid
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"Invalid message at index {i} when adding messages: {errors}",
+                    400,
+                    validated_bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.validation_error(
+                    message=f"Invalid message at index {i}",
+                    errors=errors
+                ).to_json_response(status.HTTP_400_BAD_REQUEST)
+
+            _number_new_messages(current_messages, validated_messages)
+
+            updated_message_day = await self.set_messages(message_day, current_messages + validated_messages)
+
+            await Logger.run_async(
+                Logger.debug_user_action,
+                validated_bleoid,
+                f"Added {len(validated_messages)} new message(s) for date {date}",
+                LogType.SUCCESS.value,
+                201
+            )
+
+            messages = updated_message_day.get('messages', [])
+            _format_created_at(messages)
+
+            response_data = _day_response(updated_message_day, MessageInfosSerializer(messages, many=True).data)
+            await RealtimeEvents.apublish(RealtimeEvents.MESSAGE_CREATED, validated_bleoid, message_day.get('to_bleoid'), date, response_data)
+
+            return BLEOResponse.success(
+                data=response_data,
+                message=f"{len(validated_messages)} message(s) added successfully"
+            ).to_json_response(status.HTTP_201_CREATED)
+
+        except ValidationError as e:
+            return await self._invalid_bleoid(bleoid, e)
+        except Exception as e:
+            await Logger.run_async(
+                Logger.debug_error,
+                f"Failed to add message(s) for bleoid={validated_bleoid} on date {date}: {str(e)}",
+                500,
+                validated_bleoid,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.server_error(
+                message=f"Failed to add messages: {str(e)}"
+            ).to_json_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def put(self, request, bleoid, date, message_id=None):
+        """Update messages with URL BLEOID validation"""
+        validated_bleoid = bleoid  # Fallback value
+
+        try:
+            validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+            if message_id is not None:
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    f"Updating message with ID={message_id} for date {date}",
+                    LogType.INFO.value,
+                    200
+                )
+            else:
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    f"Replacing all messages for date {date}",
+                    LogType.INFO.value,
+                    200
+                )
+
+            try:
+                data = self.parse_body(request)
+            except ValueError as e:
+                return BLEOResponse.validation_error(
+                    message=str(e)
+                ).to_json_response(status.HTTP_400_BAD_REQUEST)
+
+            message_day = await self.get_message_day(validated_bleoid, date)
+            if not message_day:
+                return await self._day_not_found(validated_bleoid, date, "during message update")
+
+            if message_id is not None:
+                # Update specific message by ID
+                message_id = int(message_id)
+                messages = message_day.get('messages', [])
+                message_index = next((i for i, msg in enumerate(messages) if msg.get('id') == message_id), None)
+
+                if message_index is None:
+                    await Logger.run_async(
+                        Logger.debug_error,
+                        f"Message with ID={message_id} not found for bleoid={validated_bleoid} on date {date}",
+                        404,
+                        validated_bleoid,
+                        ErrorSourceType.SERVER.value
+                    )
+                    return BLEOResponse.not_found(
+                        message=f"Message with ID {message_id} not found"
+                    ).to_json_response(status.HTTP_404_NOT_FOUND)
+
+                serializer = MessageInfosSerializer(data=data, partial=True)
+                if not serializer.is_valid():
+                    error_details = []
+                    if 'type' in serializer.errors:
+                        error_details.append(f"Message type: {serializer.errors['type']}")
+                    await Logger.run_async(
+                        Logger.debug_error,
+                        f"Invalid data when updating message ID={message_id}: {', '.join(error_details)}",
+                        400,
+                        validated_bleoid,
+                        ErrorSourceType.SERVER.value
+                    )
+                    return BLEOResponse.validation_error(
+                        message="Invalid message data",
+                        errors=serializer.errors
+                    ).to_json_response(status.HTTP_400_BAD_REQUEST)
+
+                # Update the message (preserve id and any non-provided fields)
+                messages[message_index].update(serializer.validated_data)
+
+                db = AsyncMongoDB.get_instance().get_collection('MessagesDays')
+                await db.update_one(
+                    {"_id": message_day['_id']},
+                    MessagesDays.touch({"$set": {"messages": messages}})
+                )
+
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    f"Message ID={message_id} updated successfully for date {date}",
+                    LogType.SUCCESS.value,
+                    200
+                )
+
+                response_data = MessageInfosSerializer(messages[message_index]).data
+                await RealtimeEvents.apublish(RealtimeEvents.MESSAGE_UPDATED, validated_bleoid, message_day.get('to_bleoid'), date, response_data)
+
+                return BLEOResponse.success(
+                    data=response_data,
+                    message="Message updated successfully"
+                ).to_json_response()
+
+            # Replace all messages
+            if not isinstance(data, dict) or not isinstance(data.get('messages'), list):
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"Missing 'messages' array when replacing messages for bleoid={validated_bleoid} on date {date}",
+                    400,
+                    validated_bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.validation_error(
+                    message="Request must include a 'messages' array"
+                ).to_json_response(status.HTTP_400_BAD_REQUEST)
+
+            processed_messages, invalid = _validate_messages(data['messages'])
+            if invalid:
+                i, errors = invalid
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"Invalid message at index {i} when replacing messages: {errors}",
+                    400,
+                    validated_bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.validation_error(
+                    message=f"Invalid message at index {i}",
+                    errors=errors
+                ).to_json_response(status.HTTP_400_BAD_REQUEST)
+
+            _number_replacements(data['messages'], processed_messages)
+
+            updated_message_day = await self.set_messages(message_day, processed_messages)
+
+            await Logger.run_async(
+                Logger.debug_user_action,
+                validated_bleoid,
+                f"Replaced all messages for date {date} - now {len(processed_messages)} messages",
+                LogType.SUCCESS.value,
+                200
+            )
+
+            messages = updated_message_day.get('messages', [])
+            response_data = _day_response(updated_message_day, MessageInfosSerializer(messages, many=True).data)
+            await RealtimeEvents.apublish(RealtimeEvents.MESSAGE_UPDATED, validated_bleoid, message_day.get('to_bleoid'), date, response_data)
+
+            return BLEOResponse.success(
+                data=response_data,
+                message="All messages replaced successfully"
+            ).to_json_response()
+
+        except ValidationError as e:
+            return await self._invalid_bleoid(bleoid, e)
+        except Exception as e:
+            await Logger.run_async(
+                Logger.debug_error,
+                f"Failed to update message(s) for bleoid={validated_bleoid} on date {date}: {str(e)}",
+                500,
+                validated_bleoid,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.server_error(
+                message=f"Failed to update messages: {str(e)}"
+            ).to_json_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def delete(self, request, bleoid, date, message_id=None):
+        """Delete messages with URL BLEOID validation"""
+        validated_bleoid = bleoid  # Fallback value
+
+        try:
+            validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+            if message_id is not None:
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    f"Deleting message with ID={message_id} for date {date}",
+                    LogType.INFO.value,
+                    200
+                )
+            else:
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    f"Deleting all messages for date {date}",
+                    LogType.INFO.value,
+                    200
+                )
+
+            message_day = await self.get_message_day(validated_bleoid, date)
+            if not message_day:
+                return await self._day_not_found(validated_bleoid, date, "during message deletion")
+
+            if message_id is not None:
+                # Delete specific message by ID
+                message_id = int(message_id)
+                messages = message_day.get('messages', [])
+                updated_messages = [msg for msg in messages if msg.get('id') != message_id]
+
+                if len(messages) == len(updated_messages):
+                    await Logger.run_async(
+                        Logger.debug_error,
+                        f"Message with ID={message_id} not found for bleoid={validated_bleoid} on date {date} during deletion",
+                        404,
+                        validated_bleoid,
+                        ErrorSourceType.SERVER.value
+                    )
+                    return BLEOResponse.not_found(
+                        message=f"For User with bleoid {validated_bleoid} and at date {date}, message with ID {message_id} not found"
+                    ).to_json_response(status.HTTP_404_NOT_FOUND)
+
+                updated_message_day = await self.set_messages(message_day, updated_messages)
+                await MessageSync.arecord(MessageSync.tombstones(message_day, [message_id]))
+
+                await Logger.run_async(
+                    Logger.debug_user_action,
+                    validated_bleoid,
+                    f"Message with ID={message_id} deleted successfully from date {date}",
+                    LogType.SUCCESS.value,
+                    200
+                )
+
+                messages = updated_message_day.get('messages', [])
+                response_data = _day_response(updated_message_day, MessageInfosSerializer(messages, many=True).data)
+                await RealtimeEvents.apublish(RealtimeEvents.MESSAGE_DELETED, validated_bleoid, message_day.get('to_bleoid'), date, response_data)
+
+                return BLEOResponse.success(
+                    data=response_data,
+                    message=f"Message with ID {message_id} deleted successfully"
+                ).to_json_response()
+
+            # Delete all messages
+            updated_message_day = await self.set_messages(message_day, [])
+            await MessageSync.arecord(MessageSync.tombstones(
+                message_day, [msg.get('id') for msg in message_day.get('messages', []) if msg.get('id') is not None]
+            ))
+
+            await Logger.run_async(
+                Logger.debug_user_action,
+                validated_bleoid,
+                f"All messages deleted successfully for date {date}",
+                LogType.SUCCESS.value,
+                200
+            )
+
+            response_data = _day_response(updated_message_day, [])
+            await RealtimeEvents.apublish(RealtimeEvents.MESSAGE_DELETED, validated_bleoid, message_day.get('to_bleoid'), date, response_data)
+
+            return BLEOResponse.success(
+                data=response_data,
+                message="All messages deleted successfully"
+            ).to_json_response()
+
+        except ValidationError as e:
+            return await self._invalid_bleoid(bleoid, e)
+        except Exception as e:
+            await Logger.run_async(
+                Logger.debug_error,
+                f"Failed to delete message(s) for bleoid={validated_bleoid} on date {date}: {str(e)}",
+                500,
+                validated_bleoid,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.server_error(
+                message=f"Failed to delete messages: {str(e)}"
+            ).to_json_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
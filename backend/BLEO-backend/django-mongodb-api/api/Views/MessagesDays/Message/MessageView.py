@@ -1,6 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework import status
 from utils.mongodb_utils import MongoDB
+from models.MessagesDays import MessagesDays
 from datetime import datetime
 from models.response.BLEOResponse import BLEOResponse
 from models.enums.MessageType import MessageType
@@ -12,14 +13,136 @@ from models.enums.EnergyLevelType import EnergyLevelType
 from models.enums.PleasantnessType import PleasantnessType
 from models.enums.MoodQuadrantType import MoodQuadrantType
 from utils.validation_patterns import ValidationPatterns, ValidationRules
+from utils.realtime_events import RealtimeEvents
+from utils.conditional_get import ConditionalGet
+from utils.message_sync import MessageSync
 from rest_framework.exceptions import ValidationError
 from utils.validation_patterns import ValidationPatterns
 
+def _quadrant(message_day):
+    """Mood quadrant of a message day, or None when energy or pleasantness is missing"""
+    if message_day.get('energy_level') and message_day.get('pleasantness'):
+        try:
+            energy = EnergyLevelType(message_day['energy_level'])
+            pleasant = PleasantnessType(message_day['pleasantness'])
+            return MoodQuadrantType.from_dimensions(energy, pleasant).value
+        except (ValueError, KeyError):
+            pass
+    return None
+
+def _grouped_days(message_days):
+    """Grouped response shape: day-level fields once per day with that day's messages"""
+    return [
+        {
+            'date': day['date'].strftime(ValidationRules.STANDARD_DATE_FORMAT) if isinstance(day['date'], datetime) else str(day['date']),
+            'to_bleoid': day.get('to_bleoid'),
+            'mood': day.get('mood'),
+            'energy_level': day.get('energy_level'),
+            'pleasantness': day.get('pleasantness'),
+            'quadrant': _quadrant(day),
+            'messages': MessageInfosSerializer(day.get('messages', []), many=True).data
+        }
+        for day in message_days
+    ]
+
+def _flat_messages(message_days):
+    """Flat response shape: every message with its day-level fields"""
+    result = []
+    for day in message_days:
+        date_str = day['date'].strftime(ValidationRules.STANDARD_DATE_FORMAT) if isinstance(day['date'], datetime) else str(day['date'])
+        quadrant = _quadrant(day)
+        for msg in day.get('messages', []):
+            result.append({
+                **msg,
+                'date': date_str,
+                'from_bleoid': day.get('from_bleoid'),
+                'to_bleoid': day.get('to_bleoid'),
+                'mood': day.get('mood'),
+                'energy_level': day.get('energy_level'),
+                'pleasantness': day.get('pleasantness'),
+                'quadrant': quadrant
+            })
+    return result
+
+def _day_listing(bleoid, date, message_day):
+    """Response payload for the messages of one date"""
+    messages = message_day.get('messages', [])
+    return {
+        'from_bleoid': bleoid,
+        'to_bleoid': message_day.get('to_bleoid'),
+        'date': date,
+        'messages': MessageInfosSerializer(messages, many=True).data,
+        'count': len(messages),
+        'mood': message_day.get('mood'),
+        'energy_level': message_day.get('energy_level'),
+        'pleasantness': message_day.get('pleasantness'),
+        'quadrant': _quadrant(message_day)
+    }
+
+def _day_response(message_day, messages):
+    """Response payload for a message day after a write"""
+    date = message_day['date']
+    if isinstance(date, datetime):
+        date = date.strftime(ValidationRules.STANDARD_DATE_FORMAT)
+    return {
+        'from_bleoid': message_day['from_bleoid'],
+        'to_bleoid': message_day.get('to_bleoid'),
+        'date': date,
+        'messages': messages,
+        'mood': message_day.get('mood'),
+        'energy_level': message_day.get('energy_level'),
+        'pleasantness': message_day.get('pleasantness')
+    }
+
+def _incoming_messages(data):
+    """Messages of a POST body: {"messages": [...]}, a list, or a single message object"""
+    if isinstance(data, dict) and isinstance(data.get('messages'), list):
+        return data['messages']
+    if isinstance(data, list):
+        return data
+    return [data]
+
+def _validate_messages(messages):
+    """Validated messages and None, or None and (index, errors) of the first invalid one"""
+    validated_messages = []
+    for i, msg in enumerate(messages):
+        serializer = MessageInfosSerializer(data=msg)
+        if not serializer.is_valid():
+            return None, (i, serializer.errors)
+        validated_messages.append(serializer.validated_data)
+    return validated_messages, None
+
+def _number_new_messages(current_messages, validated_messages):
+    """Give added messages without an id the next ids after the day's, and a created_at"""
+    max_id = max((msg['id'] for msg in current_messages if isinstance(msg.get('id'), int)), default=0)
+    for msg in validated_messages:
+        if not isinstance(msg.get('id'), int):
+            max_id += 1
+            msg['id'] = max_id
+        if 'created_at' not in msg:
+            msg['created_at'] = datetime.now()
+
+def _number_replacements(messages, validated_messages):
+    """Keep the integer ids sent with replacement messages, number the others from 1"""
+    max_id = 0
+    for msg, validated_msg in zip(messages, validated_messages):
+        if isinstance(msg.get('id'), int):
+            validated_msg['id'] = msg['id']
+        else:
+            max_id += 1
+            validated_msg['id'] = max_id
+
+def _format_created_at(messages):
+    """created_at of each message as an ISO string, in place"""
+    for msg in messages:
+        if isinstance(msg.get('created_at'), datetime):
+            msg['created_at'] = msg['created_at'].strftime('%Y-%m-%dT%H:%M:%S')
+
 class MessageOperationsView(APIView):
     """API view for operations on messages within a message day"""
     
-    def get_message_day(self, bleoid, date):
-        """Get message day by bleoid and date with validation"""
+    def get_message_day(self, bleoid, date, projection=None):
+        """Get message day by bleoid and date with validation (optionally only the projected fields)"""
         try:
             validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
             
@@ -30,7 +153,7 @@ class MessageOperationsView(APIView):
             return db.find_one({
                 "from_bleoid": validated_bleoid,
                 "date": message_date
-            })
+            }, projection)
         except Exception:
             return None
     
@@ -126,7 +249,7 @@ class MessageOperationsView(APIView):
                 # Update in database
                 result = db.update_one(
                     {"_id": message_day['_id']},
-                    {"$set": {"messages": messages}}
+                    MessagesDays.touch({"$set": {"messages": messages}})
                 )
                 
                 Logger.debug_user_action(
@@ -139,6 +262,9 @@ class MessageOperationsView(APIView):
                 updated_message = messages[message_index]
                 response_serializer = MessageInfosSerializer(updated_message)
                 
+                # Push to the couple's WebSocket
+                RealtimeEvents.publish(RealtimeEvents.MESSAGE_UPDATED, validated_bleoid, message_day.get('to_bleoid'), date, response_serializer.data)
+                
                 return BLEOResponse.success(
                     data=response_serializer.data,
                     message="Message updated successfully"
@@ -146,7 +272,7 @@ class MessageOperationsView(APIView):
             
             else:
                 # Replace all messages
-                if 'messages' not in data or not isinstance(data['messages'], list):
+                if not isinstance(data, dict) or not isinstance(data.get('messages'), list):
                     Logger.debug_error(
                         f"Missing 'messages' array when replacing messages for bleoid={validated_bleoid} on date {date}",
                         400,
@@ -158,39 +284,26 @@ class MessageOperationsView(APIView):
                         message="Request must include a 'messages' array"
                     ).to_response(status.HTTP_400_BAD_REQUEST)
                 
-                new_messages = data['messages']
-                processed_messages = []
-                max_id = 0
-                
-                for i, msg in enumerate(new_messages):
-                    serializer = MessageInfosSerializer(data=msg)
-                    if not serializer.is_valid():
-                        Logger.debug_error(
-                            f"Invalid message at index {i} when replacing messages: {serializer.errors}",
-                            400,
-                            validated_bleoid,
-                            ErrorSourceType.SERVER.value
-                        )
-                        
-                        return BLEOResponse.validation_error(
-                            message=f"Invalid message at index {i}",
-                            errors=serializer.errors
-                        ).to_response(status.HTTP_400_BAD_REQUEST)
-                    
-                    validated_msg = serializer.validated_data
-                    
-                    if 'id' in msg and isinstance(msg['id'], int):
-                        msg_id = msg['id']
-                    else:
-                        max_id += 1
-                        msg_id = max_id
-                    
-                    validated_msg['id'] = msg_id
-                    processed_messages.append(validated_msg)
-                
+                processed_messages, invalid = _validate_messages(data['messages'])
+                if invalid:
+                    i, errors = invalid
+                    Logger.debug_error(
+                        f"Invalid message at index {i} when replacing messages: {errors}",
+                        400,
+                        validated_bleoid,
+                        ErrorSourceType.SERVER.value
+                    )
+
+                    return BLEOResponse.validation_error(
+                        message=f"Invalid message at index {i}",
+                        errors=errors
+                    ).to_response(status.HTTP_400_BAD_REQUEST)
+
+                _number_replacements(data['messages'], processed_messages)
+
                 result = db.update_one(
                     {"_id": message_day['_id']},
-                    {"$set": {"messages": processed_messages}}
+                    MessagesDays.touch({"$set": {"messages": processed_messages}})
                 )
                 
                 Logger.debug_user_action(
@@ -201,22 +314,11 @@ class MessageOperationsView(APIView):
                 )
                 
                 updated_message_day = db.find_one({"_id": message_day['_id']})
-                
-                if 'date' in updated_message_day and isinstance(updated_message_day['date'], datetime):
-                    updated_message_day['date'] = updated_message_day['date'].strftime(ValidationRules.STANDARD_DATE_FORMAT)
-                
                 messages = updated_message_day.get('messages', [])
-                message_serializer = MessageInfosSerializer(messages, many=True)
-                
-                response_data = {
-                    'from_bleoid': updated_message_day['from_bleoid'],
-                    'to_bleoid': updated_message_day.get('to_bleoid'),
-                    'date': updated_message_day['date'],
-                    'messages': message_serializer.data,
-                    'mood': updated_message_day.get('mood'),
-                    'energy_level': updated_message_day.get('energy_level'),
-                    'pleasantness': updated_message_day.get('pleasantness')
-                }
+                response_data = _day_response(updated_message_day, MessageInfosSerializer(messages, many=True).data)
+
+                # Push to the couple's WebSocket
+                RealtimeEvents.publish(RealtimeEvents.MESSAGE_UPDATED, validated_bleoid, message_day.get('to_bleoid'), date, response_data)
                 
                 return BLEOResponse.success(
                     data=response_data,
@@ -305,8 +407,9 @@ class MessageOperationsView(APIView):
                 
                 result = db.update_one(
                     {"_id": message_day['_id']},
-                    {"$set": {"messages": updated_messages}}
+                    MessagesDays.touch({"$set": {"messages": updated_messages}})
                 )
+                MessageSync.record(MessageSync.tombstones(message_day, [message_id]))
                 
                 Logger.debug_user_action(
                     validated_bleoid,
@@ -316,22 +419,11 @@ class MessageOperationsView(APIView):
                 )
                 
                 updated_message_day = db.find_one({"_id": message_day['_id']})
-                
-                if 'date' in updated_message_day and isinstance(updated_message_day['date'], datetime):
-                    updated_message_day['date'] = updated_message_day['date'].strftime(ValidationRules.STANDARD_DATE_FORMAT)
-                
                 messages = updated_message_day.get('messages', [])
-                message_serializer = MessageInfosSerializer(messages, many=True)
-                
-                response_data = {
-                    'from_bleoid': updated_message_day['from_bleoid'],
-                    'to_bleoid': updated_message_day.get('to_bleoid'),
-                    'date': updated_message_day['date'],
-                    'messages': message_serializer.data,
-                    'mood': updated_message_day.get('mood'),
-                    'energy_level': updated_message_day.get('energy_level'),
-                    'pleasantness': updated_message_day.get('pleasantness')
-                }
+                response_data = _day_response(updated_message_day, MessageInfosSerializer(messages, many=True).data)
+
+                # Push to the couple's WebSocket
+                RealtimeEvents.publish(RealtimeEvents.MESSAGE_DELETED, validated_bleoid, message_day.get('to_bleoid'), date, response_data)
                 
                 return BLEOResponse.success(
                     data=response_data,
@@ -341,8 +433,11 @@ class MessageOperationsView(APIView):
                 # Delete all messages
                 result = db.update_one(
                     {"_id": message_day['_id']},
-                    {"$set": {"messages": []}}
+                    MessagesDays.touch({"$set": {"messages": []}})
                 )
+                MessageSync.record(MessageSync.tombstones(
+                    message_day, [msg.get('id') for msg in message_day.get('messages', []) if msg.get('id') is not None]
+                ))
                 
                 Logger.debug_user_action(
                     validated_bleoid,
@@ -352,19 +447,10 @@ class MessageOperationsView(APIView):
                 )
                 
                 updated_message_day = db.find_one({"_id": message_day['_id']})
-                
-                if 'date' in updated_message_day and isinstance(updated_message_day['date'], datetime):
-                    updated_message_day['date'] = updated_message_day['date'].strftime(ValidationRules.STANDARD_DATE_FORMAT)
-                
-                response_data = {
-                    'from_bleoid': updated_message_day['from_bleoid'],
-                    'to_bleoid': updated_message_day.get('to_bleoid'),
-                    'date': updated_message_day['date'],
-                    'messages': [],
-                    'mood': updated_message_day.get('mood'),
-                    'energy_level': updated_message_day.get('energy_level'),
-                    'pleasantness': updated_message_day.get('pleasantness')
-                }
+                response_data = _day_response(updated_message_day, [])
+
+                # Push to the couple's WebSocket
+                RealtimeEvents.publish(RealtimeEvents.MESSAGE_DELETED, validated_bleoid, message_day.get('to_bleoid'), date, response_data)
                 
                 return BLEOResponse.success(
                     data=response_data,
@@ -426,52 +512,29 @@ class MessageOperationsView(APIView):
             db = MongoDB.get_instance().get_collection('MessagesDays')
             
             current_messages = message_day.get('messages', [])
-            
-            new_messages = []
-            if 'messages' in data and isinstance(data['messages'], list):
-                new_messages = data['messages']
-            elif not isinstance(data, list):
-                new_messages = [data]
-            else:
-                new_messages = data
-                
-            validated_messages = []
-            
-            for i, msg in enumerate(new_messages):
-                serializer = MessageInfosSerializer(data=msg)
-                if not serializer.is_valid():
-                    Logger.debug_error(
-                        f"Invalid message at index {i} when adding messages: {serializer.errors}",
-                        400,
-                        validated_bleoid,
-                        ErrorSourceType.SERVER.value
-                    )
-                    
-                    return BLEOResponse.validation_error(
-                        message=f"Invalid message at index {i}",
-                        errors=serializer.errors
-                    ).to_response(status.HTTP_400_BAD_REQUEST)
-                    
-                validated_messages.append(serializer.validated_data)
-            
-            max_id = 0
-            for msg in current_messages:
-                if 'id' in msg and isinstance(msg['id'], int) and msg['id'] > max_id:
-                    max_id = msg['id']
-            
-            for msg in validated_messages:
-                if 'id' not in msg or not isinstance(msg['id'], int):
-                    max_id += 1
-                    msg['id'] = max_id
-                
-                if 'created_at' not in msg:
-                    msg['created_at'] = datetime.now()
-            
+
+            validated_messages, invalid = _validate_messages(_incoming_messages(data))
+            if invalid:
+                i, errors = invalid
+                Logger.debug_error(
+                    f"Invalid message at index {i} when adding messages: {errors}",
+                    400,
+                    validated_bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+
+                return BLEOResponse.validation_error(
+                    message=f"Invalid message at index {i}",
+                    errors=errors
+                ).to_response(status.HTTP_400_BAD_REQUEST)
+
+            _number_new_messages(current_messages, validated_messages)
+
             updated_messages = current_messages + validated_messages
             
             db.update_one(
                 {"_id": message_day['_id']},
-                {"$set": {"messages": updated_messages}}
+                MessagesDays.touch({"$set": {"messages": updated_messages}})
             )
             
             Logger.debug_user_action(
@@ -482,27 +545,12 @@ class MessageOperationsView(APIView):
             )
             
             updated_message_day = db.find_one({"_id": message_day['_id']})
-            
-            if 'date' in updated_message_day and isinstance(updated_message_day['date'], datetime):
-                updated_message_day['date'] = updated_message_day['date'].strftime(ValidationRules.STANDARD_DATE_FORMAT)
-            
             messages = updated_message_day.get('messages', [])
+            _format_created_at(messages)
+            response_data = _day_response(updated_message_day, MessageInfosSerializer(messages, many=True).data)
 
-            for msg in messages:
-                if 'created_at' in msg and isinstance(msg['created_at'], datetime):
-                    msg['created_at'] = msg['created_at'].strftime('%Y-%m-%dT%H:%M:%S')
-
-            message_serializer = MessageInfosSerializer(messages, many=True)
-            
-            response_data = {
-                'from_bleoid': updated_message_day['from_bleoid'],
-                'to_bleoid': updated_message_day.get('to_bleoid'),
-                'date': updated_message_day['date'],
-                'messages': message_serializer.data,
-                'mood': updated_message_day.get('mood'),
-                'energy_level': updated_message_day.get('energy_level'),
-                'pleasantness': updated_message_day.get('pleasantness')
-            }
+            # Push to the couple's WebSocket
+            RealtimeEvents.publish(RealtimeEvents.MESSAGE_CREATED, validated_bleoid, message_day.get('to_bleoid'), date, response_data)
             
             return BLEOResponse.success(
                 data=response_data,
@@ -532,7 +580,7 @@ class MessageOperationsView(APIView):
             ).to_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     def get(self, request, bleoid, date=None, message_id=None):
-        """Get messages with URL BLEOID validation"""
+        """Get messages with URL BLEOID validation (?shape=grouped groups the all-dates listing by day)"""
         validated_bleoid = bleoid  # Fallback value
         
         try:
@@ -562,6 +610,18 @@ class MessageOperationsView(APIView):
                     200
                 )
             
+            # Revalidation: compare the client's validators against a projection-only read
+            if ConditionalGet.is_conditional(request):
+                if date:
+                    validators = self.get_message_day(validated_bleoid, date, ConditionalGet.PROJECTION)
+                else:
+                    validators = list(MongoDB.get_instance().get_collection('MessagesDays').find(
+                        {"from_bleoid": validated_bleoid}, ConditionalGet.PROJECTION
+                    ))
+                not_modified = ConditionalGet.revalidate(request, validators)
+                if not_modified is not None:
+                    return not_modified
+            
             # Case 3: Specific message by ID
             if date and message_id is not None:
                 message_day = self.get_message_day(validated_bleoid, date)
@@ -588,10 +648,10 @@ class MessageOperationsView(APIView):
                         )
                         
                         serializer = MessageInfosSerializer(msg)
-                        return BLEOResponse.success(
+                        return ConditionalGet.apply(BLEOResponse.success(
                             data=serializer.data,
-                            message=f"Message retrieved successfully"
-                        ).to_response()
+                            message="Message retrieved successfully"
+                        ).to_response(), *ConditionalGet.validators(message_day))
                 
                 Logger.debug_error(
                     f"Message with ID={message_id} not found for bleoid={validated_bleoid} on date {date}",
@@ -628,31 +688,10 @@ class MessageOperationsView(APIView):
                     200
                 )
                 
-                message_serializer = MessageInfosSerializer(messages, many=True)
-                
-                quadrant = None
-                if 'energy_level' in message_day and message_day['energy_level'] and 'pleasantness' in message_day and message_day['pleasantness']:
-                    try:
-                        energy = EnergyLevelType(message_day['energy_level'])
-                        pleasant = PleasantnessType(message_day['pleasantness'])
-                        quadrant = MoodQuadrantType.from_dimensions(energy, pleasant).value
-                    except (ValueError, KeyError):
-                        pass
-                
-                return BLEOResponse.success(
-                    data={
-                        'from_bleoid': validated_bleoid,
-                        'to_bleoid': message_day.get('to_bleoid'),
-                        'date': date,
-                        'messages': message_serializer.data,
-                        'count': len(messages),
-                        'mood': message_day.get('mood'),
-                        'energy_level': message_day.get('energy_level'),
-                        'pleasantness': message_day.get('pleasantness'),
-                        'quadrant': quadrant
-                    },
+                return ConditionalGet.apply(BLEOResponse.success(
+                    data=_day_listing(validated_bleoid, date, message_day),
                     message=f"Retrieved {len(messages)} messages for date {date}"
-                ).to_response()
+                ).to_response(), *ConditionalGet.validators(message_day))
                 
             # Case 1: All messages for this user across all dates
             else:
@@ -671,31 +710,30 @@ class MessageOperationsView(APIView):
                     return BLEOResponse.not_found(
                         message=f"No message days found for bleoid={validated_bleoid}"
                     ).to_response(status.HTTP_404_NOT_FOUND)
+                
+                if request.query_params.get('shape') == 'grouped':
+                    days = _grouped_days(message_days)
+                    message_count = sum(len(day['messages']) for day in days)
                     
-                result = []
-                for day in message_days:
-                    date_str = day['date'].strftime(ValidationRules.STANDARD_DATE_FORMAT) if isinstance(day['date'], datetime) else str(day['date'])
+                    Logger.debug_user_action(
+                        validated_bleoid,
+                        f"Retrieved {message_count} messages from {len(days)} dates (grouped)",
+                        LogType.SUCCESS.value,
+                        200
+                    )
                     
-                    quadrant = None
-                    if 'energy_level' in day and day['energy_level'] and 'pleasantness' in day and day['pleasantness']:
-                        try:
-                            energy = EnergyLevelType(day['energy_level'])
-                            pleasant = PleasantnessType(day['pleasantness'])
-                            quadrant = MoodQuadrantType.from_dimensions(energy, pleasant).value
-                        except (ValueError, KeyError):
-                            pass
+                    return ConditionalGet.apply(BLEOResponse.success(
+                        data={
+                            'from_bleoid': validated_bleoid,
+                            'days': days,
+                            'count': message_count,
+                            'date_count': len(days)
+                        },
+                        message=f"Retrieved {message_count} messages from {len(days)} dates"
+                    ).to_response(), *ConditionalGet.validators(message_days))
                     
-                    for msg in day.get('messages', []):
-                        msg_with_date = msg.copy()
-                        msg_with_date['date'] = date_str
-                        msg_with_date['from_bleoid'] = day.get('from_bleoid')
-                        msg_with_date['to_bleoid'] = day.get('to_bleoid')
-                        msg_with_date['mood'] = day.get('mood')
-                        msg_with_date['energy_level'] = day.get('energy_level')
-                        msg_with_date['pleasantness'] = day.get('pleasantness')
-                        msg_with_date['quadrant'] = quadrant
-                        result.append(msg_with_date)
-                
+                result = _flat_messages(message_days)
+
                 Logger.debug_user_action(
                     validated_bleoid,
                     f"Retrieved {len(result)} messages from {len(message_days)} dates",
@@ -705,7 +743,7 @@ class MessageOperationsView(APIView):
                 
                 message_serializer = MessageInfosSerializer(result, many=True)
                 
-                return BLEOResponse.success(
+                return ConditionalGet.apply(BLEOResponse.success(
                     data={
                         'from_bleoid': validated_bleoid,
                         'messages': message_serializer.data,
@@ -713,7 +751,7 @@ class MessageOperationsView(APIView):
                         'date_count': len(message_days)
                     },
                     message=f"Retrieved {len(result)} messages from {len(message_days)} dates"
-                ).to_response()
+                ).to_response(), *ConditionalGet.validators(message_days))
         
         except ValidationError as e:
             Logger.debug_error(
@@ -0,0 +1,318 @@
+import asyncio
+from datetime import datetime
+from rest_framework import status
+from models.MessagesDays import MessagesDays
+from models.response.BLEOResponse import BLEOResponse
+from api.serializers import MessagesDaysSerializer
+from api.Views.AsyncAPIView import AsyncAPIView
+from api.Views.MessagesDays.MessagesDaysView import (
+    MessageDayCreateView,
+    MessageDayDetailView,
+    _generate_message_ids,
+    _add_quadrant_info
+)
+from utils.mongodb_async import AsyncMongoDB
+from utils.logger import Logger
+from models.enums.LogType import LogType
+from models.enums.ErrorSourceType import ErrorSourceType
+from utils.validation_patterns import ValidationPatterns, ValidationRules
+from utils.realtime_events import RealtimeEvents
+from utils.conditional_get import ConditionalGet
+
+def _accepted_link_query(from_bleoid, to_bleoid=None):
+    """Links filter for an accepted link of from_bleoid (with to_bleoid when given)"""
+    if to_bleoid is None:
+        return {
+            "$or": [
+                {"bleoidPartner1": from_bleoid},
+                {"bleoidPartner2": from_bleoid}
+            ],
+            "status": "accepted"
+        }
+    return {
+        "$or": [
+            {"bleoidPartner1": from_bleoid, "bleoidPartner2": to_bleoid},
+            {"bleoidPartner1": to_bleoid, "bleoidPartner2": from_bleoid}
+        ],
+        "status": "accepted"
+    }
+
+class AsyncMessageDayCreateView(AsyncAPIView):
+    """Async variant of MessageDayCreateView (POST is async, DELETE runs the sync view)"""
+
+    sync_view = MessageDayCreateView
+
+    async def post(self, request, bleoid):
+        """Create a new message day with from_bleoid from URL path"""
+        try:
+            # Validate BLEOID from URL parameter
+            validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+            try:
+                data = self.parse_body(request)
+            except ValueError as e:
+                return BLEOResponse.validation_error(
+                    message=str(e)
+                ).to_json_response(status.HTTP_400_BAD_REQUEST)
+            data['from_bleoid'] = validated_bleoid
+
+            # Check if date is provided, if not initialize to today
+            if 'date' not in data:
+                data['date'] = datetime.now().strftime(ValidationRules.STANDARD_DATE_FORMAT)
+
+            mongo = AsyncMongoDB.get_instance()
+            db_users = mongo.get_collection('Users')
+            db_links = mongo.get_collection('Links')
+
+            # The user, partner and link lookups are independent: run them concurrently
+            to_bleoid = data.get('to_bleoid')
+            if to_bleoid is not None:
+                from_user, to_user, link = await asyncio.gather(
+                    db_users.find_one({"bleoid": validated_bleoid}),
+                    db_users.find_one({"bleoid": to_bleoid}),
+                    db_links.find_one(_accepted_link_query(validated_bleoid, to_bleoid))
+                )
+            else:
+                from_user, link = await asyncio.gather(
+                    db_users.find_one({"bleoid": validated_bleoid}),
+                    db_links.find_one(_accepted_link_query(validated_bleoid))
+                )
+                to_user = None
+
+            # Checks are reported in the same order as the sync view
+            if not from_user:
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"User with bleoid {validated_bleoid} not found",
+                    404,
+                    validated_bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.not_found(
+                    message=f"User with bleoid {validated_bleoid} not found"
+                ).to_json_response(status.HTTP_404_NOT_FOUND)
+
+            if to_bleoid is not None:
+                if not to_user:
+                    await Logger.run_async(
+                        Logger.debug_error,
+                        f"Partner with bleoid {to_bleoid} not found",
+                        404,
+                        validated_bleoid,
+                        ErrorSourceType.SERVER.value
+                    )
+                    return BLEOResponse.not_found(
+                        message=f"Partner with bleoid {to_bleoid} not found"
+                    ).to_json_response(status.HTTP_404_NOT_FOUND)
+
+                if not link:
+                    await Logger.run_async(
+                        Logger.debug_error,
+                        f"No accepted link found between {validated_bleoid} and {to_bleoid}",
+                        403,
+                        validated_bleoid,
+                        ErrorSourceType.SERVER.value
+                    )
+                    return BLEOResponse.error(
+                        error_type="ValidationError",
+                        error_message=f"No accepted link found between {validated_bleoid} and {to_bleoid}"
+                    ).to_json_response(status.HTTP_403_FORBIDDEN)
+            else:
+                # Without to_bleoid, the partner comes from the accepted link
+                if not link:
+                    await Logger.run_async(
+                        Logger.debug_error,
+                        f"User {validated_bleoid} is not linked with any partner",
+                        403,
+                        validated_bleoid,
+                        ErrorSourceType.SERVER.value
+                    )
+                    return BLEOResponse.error(
+                        error_type="ValidationError",
+                        error_message=f"User {validated_bleoid} is not linked with any partner"
+                    ).to_json_response(status.HTTP_403_FORBIDDEN)
+
+                to_bleoid = link["bleoidPartner2"] if link["bleoidPartner1"] == validated_bleoid else link["bleoidPartner1"]
+                to_user = await db_users.find_one({"bleoid": to_bleoid})
+                if not to_user:
+                    await Logger.run_async(
+                        Logger.debug_error,
+                        f"Linked partner with bleoid {to_bleoid} not found in database",
+                        404,
+                        validated_bleoid,
+                        ErrorSourceType.SERVER.value
+                    )
+                    return BLEOResponse.not_found(
+                        message=f"Linked partner with bleoid {to_bleoid} not found"
+                    ).to_json_response(status.HTTP_404_NOT_FOUND)
+
+            # Validate with serializer
+            serializer = MessagesDaysSerializer(data=data)
+            if not serializer.is_valid():
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"Invalid message day data: {serializer.errors}",
+                    400,
+                    validated_bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.validation_error(
+                    message="Invalid data",
+                    errors=serializer.errors
+                ).to_json_response(status.HTTP_400_BAD_REQUEST)
+
+            validated_data = serializer.validated_data
+
+            # Get current date and set time to midnight
+            now = datetime.now()
+            message_date = datetime(now.year, now.month, now.day)
+            date_str = message_date.strftime(ValidationRules.STANDARD_DATE_FORMAT)
+
+            db_message_days = mongo.get_collection('MessagesDays')
+            existing_entry = await db_message_days.find_one({
+                "from_bleoid": validated_bleoid,
+                "to_bleoid": to_bleoid,
+                "date": message_date
+            }, {"_id": 1})
+
+            if existing_entry:
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"Message day already exists for {validated_bleoid} to {to_bleoid} on {date_str}",
+                    409,
+                    validated_bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.error(
+                    error_type="DuplicateError",
+                    error_message=f"Message day already exists for from_bleoid {validated_bleoid} to to_bleoid {to_bleoid} on {date_str}"
+                ).to_json_response(status.HTTP_409_CONFLICT)
+
+            processed_messages = _generate_message_ids(validated_data.get('messages', []))
+
+            message_day = MessagesDays(
+                from_bleoid=validated_bleoid,
+                to_bleoid=to_bleoid,
+                date=message_date,
+                messages=processed_messages,
+                mood=validated_data.get('mood'),
+                energy_level=validated_data.get('energy_level'),
+                pleasantness=validated_data.get('pleasantness')
+            )
+
+            result = await db_message_days.insert_one(message_day.to_dict())
+
+            created_message_day = message_day.to_dict()
+            created_message_day['_id'] = str(result.inserted_id)
+            created_message_day['date'] = date_str
+            _add_quadrant_info(self, created_message_day)
+
+            response_serializer = MessagesDaysSerializer(created_message_day)
+
+            await Logger.run_async(
+                Logger.debug_user_action,
+                validated_bleoid,
+                f"Message day created successfully to {to_bleoid} with {len(processed_messages)} messages",
+                LogType.SUCCESS.value,
+                201
+            )
+
+            await RealtimeEvents.apublish(RealtimeEvents.MESSAGE_DAY_CREATED, validated_bleoid, to_bleoid, message_date, response_serializer.data)
+
+            return BLEOResponse.success(
+                data=response_serializer.data,
+                message="Message day created successfully"
+            ).to_json_response(status.HTTP_201_CREATED)
+
+        except Exception as e:
+            await Logger.run_async(
+                Logger.debug_error,
+                f"Failed to create message day for {bleoid}: {str(e)}",
+                500,
+                bleoid,
+                ErrorSourceType.SERVER.value
+            )
+
+            return BLEOResponse.server_error(
+                message=f"Failed to create message day: {str(e)}"
+            ).to_json_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class AsyncMessageDayDetailView(AsyncAPIView):
+    """Async variant of MessageDayDetailView (GET is async, PUT and DELETE run the sync view)"""
+
+    sync_view = MessageDayDetailView
+
+    async def get(self, request, bleoid, date):
+        """Get the message day of bleoid on date"""
+        try:
+            await Logger.run_async(
+                Logger.debug_system_action,
+                f"Getting message day(s) - bleoid: {bleoid}, Date: {date}",
+                LogType.INFO.value,
+                200
+            )
+
+            try:
+                date_obj = datetime.strptime(date, ValidationRules.STANDARD_DATE_FORMAT)
+                day_filter = {
+                    "from_bleoid": bleoid,
+                    "date": datetime(date_obj.year, date_obj.month, date_obj.day)
+                }
+            except ValueError:
+                day_filter = None
+
+            db = AsyncMongoDB.get_instance().get_collection('MessagesDays')
+
+            # Revalidation: compare the client's validators against a projection-only read
+            if day_filter and ConditionalGet.is_conditional(request):
+                not_modified = ConditionalGet.revalidate(request, await db.find_one(day_filter, ConditionalGet.PROJECTION))
+                if not_modified is not None:
+                    return not_modified
+
+            message_day = await db.find_one(day_filter) if day_filter else None
+
+            if not message_day:
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"No message day found for bleoid={bleoid} on date {date}",
+                    404,
+                    bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.not_found(
+                    message=f"No message day found for bleoid={bleoid} on date {date}"
+                ).to_json_response(status.HTTP_404_NOT_FOUND)
+
+            etag, last_modified = ConditionalGet.validators(message_day)
+            message_day['_id'] = str(message_day['_id'])
+            if isinstance(message_day.get('date'), datetime):
+                message_day['date'] = message_day['date'].strftime(ValidationRules.STANDARD_DATE_FORMAT)
+            _add_quadrant_info(self, message_day)
+
+            serializer = MessagesDaysSerializer(message_day)
+
+            await Logger.run_async(
+                Logger.debug_user_action,
+                bleoid,
+                f"Retrieved message day for date {date}",
+                LogType.SUCCESS.value,
+                200
+            )
+
+            return ConditionalGet.apply(BLEOResponse.success(
+                data=serializer.data,
+                message="Messages days retrieved successfully"
+            ).to_json_response(), etag, last_modified)
+
+        except Exception as e:
+            await Logger.run_async(
+                Logger.debug_error,
+                f"Failed to retrieve message day(s): {str(e)}",
+                500,
+                bleoid,
+                ErrorSourceType.SERVER.value
+            )
+
+            return BLEOResponse.server_error(
+                message=f"Failed to retrieve message day(s): {str(e)}"
+            ).to_json_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,126 @@
+from datetime import datetime
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from models.response.BLEOResponse import BLEOResponse
+from api.serializers import MessagesDaysSerializer, MessageDayTombstoneSerializer
+from api.Views.MessagesDays.MessagesDaysView import _add_quadrant_info
+from utils.mongodb_utils import MongoDB
+from utils.logger import Logger
+from utils.message_sync import MessageSync
+from models.enums.LogType import LogType
+from models.enums.ErrorSourceType import ErrorSourceType
+from utils.validation_patterns import ValidationPatterns, ValidationRules
+
+class MessageDaySyncView(APIView):
+    """Delta sync of the message days written by or to a user.
+
+    GET without `since` pages through the whole history. Every response carries
+    a `watermark`: pass it back as `since` to receive only the days written and
+    the days/messages deleted after it. Keep paging while `has_more` is true.
+    """
+
+    DEFAULT_LIMIT = 200
+    MAX_LIMIT = 1000
+
+    def get(self, request, bleoid):
+        """Changes since the `since` watermark"""
+        validated_bleoid = bleoid  # Fallback value
+
+        try:
+            validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+            try:
+                limit = min(max(int(request.query_params.get('limit', self.DEFAULT_LIMIT)), 1), self.MAX_LIMIT)
+            except ValueError:
+                return BLEOResponse.validation_error(
+                    message="limit must be an integer"
+                ).to_response(status.HTTP_400_BAD_REQUEST)
+
+            watermark = request.query_params.get('since') or None
+            watermark_key = None
+            if watermark:
+                try:
+                    watermark_key = MessageSync.decode_watermark(watermark)
+                except ValueError as e:
+                    return BLEOResponse.validation_error(message=str(e)).to_response(status.HTTP_400_BAD_REQUEST)
+
+                if MessageSync.is_expired(watermark_key[0]):
+                    Logger.debug_user_action(
+                        validated_bleoid,
+                        "Delta sync watermark older than tombstone retention, full resync required",
+                        LogType.INFO.value,
+                        410
+                    )
+                    return BLEOResponse.error(
+                        error_type="WatermarkExpired",
+                        error_message="Watermark is older than the tombstone retention, sync again without since"
+                    ).to_response(status.HTTP_410_GONE)
+
+            mongo = MongoDB.get_instance()
+            scope = MessageSync.scope(validated_bleoid)
+
+            # Fetch one extra change per stream to know whether another page exists
+            days = list(
+                mongo.get_collection('MessagesDays')
+                .find(MessageSync.after(scope, 'updated_at', watermark_key))
+                .sort(MessageSync.DAY_SORT)
+                .limit(limit + 1)
+            )
+            # A first sync holds no local days, so there is nothing to delete yet
+            tombstones = [] if watermark_key is None else list(
+                mongo.get_collection('MessagesDaysTombstones')
+                .find(MessageSync.after(scope, 'deleted_at', watermark_key))
+                .sort(MessageSync.TOMBSTONE_SORT)
+                .limit(limit + 1)
+            )
+
+            days, tombstones, next_watermark, has_more = MessageSync.merge(days, tombstones, limit, watermark)
+
+            for day in days:
+                day['_id'] = str(day['_id'])
+                if isinstance(day.get('date'), datetime):
+                    day['date'] = day['date'].strftime(ValidationRules.STANDARD_DATE_FORMAT)
+                _add_quadrant_info(self, day)
+
+            deleted_days = [tombstone for tombstone in tombstones if tombstone.get('message_id') is None]
+            deleted_messages = [tombstone for tombstone in tombstones if tombstone.get('message_id') is not None]
+
+            Logger.debug_user_action(
+                validated_bleoid,
+                f"Delta sync returned {len(days)} day(s), {len(deleted_days)} deleted day(s) and {len(deleted_messages)} deleted message(s)",
+                LogType.SUCCESS.value,
+                200
+            )
+
+            return BLEOResponse.success(
+                data={
+                    'days': MessagesDaysSerializer(days, many=True).data,
+                    'deleted_days': MessageDayTombstoneSerializer(deleted_days, many=True).data,
+                    'deleted_messages': MessageDayTombstoneSerializer(deleted_messages, many=True).data,
+                    'watermark': next_watermark,
+                    'has_more': has_more
+                },
+                message=f"Synced {len(days) + len(tombstones)} change(s)"
+            ).to_response()
+
+        except ValidationError as e:
+            Logger.debug_error(
+                f"Invalid BLEOID format in URL: {bleoid} - {str(e)}",
+                400,
+                None,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.validation_error(
+                message=f"Invalid BLEOID format: {bleoid}"
+            ).to_response(status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            Logger.debug_error(
+                f"Failed to sync message days for bleoid={validated_bleoid}: {str(e)}",
+                500,
+                validated_bleoid,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.server_error(
+                message=f"Failed to sync message days: {str(e)}"
+            ).to_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
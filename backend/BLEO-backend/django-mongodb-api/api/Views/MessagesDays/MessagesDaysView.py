@@ -14,6 +14,9 @@ from utils.logger import Logger
 from models.enums.LogType import LogType
 from models.enums.ErrorSourceType import ErrorSourceType
 from utils.validation_patterns import ValidationPatterns, ValidationRules
+from utils.realtime_events import RealtimeEvents
+from utils.conditional_get import ConditionalGet
+from utils.message_sync import MessageSync
 from rest_framework.exceptions import ValidationError
 
 def _generate_message_ids(messages):
@@ -418,6 +421,9 @@ class MessageDayListCreateView(APIView):
                 201
             )
             
+            # Push to the couple's WebSocket
+            RealtimeEvents.publish(RealtimeEvents.MESSAGE_DAY_CREATED, from_bleoid, to_bleoid, message_date, response_serializer.data)
+            
             return BLEOResponse.success(
                 data=response_serializer.data,
                 message="Message day created successfully"
@@ -466,6 +472,7 @@ class MessageDayListCreateView(APIView):
             
             # Delete all message days for this user
             db = MongoDB.get_instance().get_collection('MessagesDays')
+            deleted_days = list(db.find({"from_bleoid": validated_bleoid}, MessageSync.DAY_KEY_PROJECTION))
             result = db.delete_many({"from_bleoid": validated_bleoid})
             
             # Log no message days found
@@ -488,6 +495,13 @@ class MessageDayListCreateView(APIView):
                 200
             )
             
+            # Tombstones for delta sync clients
+            MessageSync.record([tombstone for day in deleted_days for tombstone in MessageSync.tombstones(day)])
+            
+            # Push to each couple's WebSocket (date None: every day was deleted)
+            for partner in sorted({day.get('to_bleoid') for day in deleted_days if day.get('to_bleoid')}):
+                RealtimeEvents.publish(RealtimeEvents.MESSAGE_DAY_DELETED, validated_bleoid, partner)
+            
             return BLEOResponse.success(
                 data={"deleted_count": result.deleted_count},
                 message=f"Successfully deleted {result.deleted_count} message day(s) for from_bleoid={validated_bleoid}"
@@ -778,6 +792,9 @@ class MessageDayCreateView(APIView):
                 201
             )
             
+            # Push to the couple's WebSocket
+            RealtimeEvents.publish(RealtimeEvents.MESSAGE_DAY_CREATED, validated_bleoid, to_bleoid, message_date, response_serializer.data)
+            
             return BLEOResponse.success(
                 data=response_serializer.data,
                 message="Message day created successfully"
@@ -826,6 +843,7 @@ class MessageDayCreateView(APIView):
             
             # Delete all message days for this user
             db = MongoDB.get_instance().get_collection('MessagesDays')
+            deleted_days = list(db.find({"from_bleoid": validated_bleoid}, MessageSync.DAY_KEY_PROJECTION))
             result = db.delete_many({"from_bleoid": validated_bleoid})
             
             # Log no message days found
@@ -848,6 +866,13 @@ class MessageDayCreateView(APIView):
                 200
             )
             
+            # Tombstones for delta sync clients
+            MessageSync.record([tombstone for day in deleted_days for tombstone in MessageSync.tombstones(day)])
+            
+            # Push to each couple's WebSocket (date None: every day was deleted)
+            for partner in sorted({day.get('to_bleoid') for day in deleted_days if day.get('to_bleoid')}):
+                RealtimeEvents.publish(RealtimeEvents.MESSAGE_DAY_DELETED, validated_bleoid, partner)
+            
             return BLEOResponse.success(
                 data={"deleted_count": result.deleted_count},
                 message=f"Successfully deleted {result.deleted_count} message day(s) for from_bleoid={validated_bleoid}"
@@ -869,8 +894,8 @@ class MessageDayCreateView(APIView):
 class MessageDayDetailView(APIView):
     """API view for getting, updating and deleting a message day by bleoid and date"""
     
-    def get_by_bleoid_and_date(self, bleoid, date):
-        """Get message day by bleoid and date"""
+    def get_by_bleoid_and_date(self, bleoid, date, projection=None):
+        """Get message day by bleoid and date (optionally only the projected fields)"""
         try:
             # No type conversion needed for bleoid anymore since it's a string
             date_obj = datetime.strptime(date, ValidationRules.STANDARD_DATE_FORMAT)
@@ -882,7 +907,7 @@ class MessageDayDetailView(APIView):
             return db.find_one({
                 "from_bleoid": bleoid,
                 "date": message_date
-            })
+            }, projection)
         except ValueError:
             return None
     
@@ -897,6 +922,14 @@ class MessageDayDetailView(APIView):
             )
             
             if bleoid and date:
+                # Revalidation: compare the client's validators against a projection-only read
+                if ConditionalGet.is_conditional(request):
+                    not_modified = ConditionalGet.revalidate(
+                        request, self.get_by_bleoid_and_date(bleoid, date, ConditionalGet.PROJECTION)
+                    )
+                    if not_modified is not None:
+                        return not_modified
+                
                 # Single message day retrieval
                 message_day = self.get_by_bleoid_and_date(bleoid, date)
                 if not message_day:
@@ -910,6 +943,8 @@ class MessageDayDetailView(APIView):
                         message=f"No message day found for bleoid={bleoid} on date {date}"
                     ).to_response(status.HTTP_404_NOT_FOUND)
                 
+                etag, last_modified = ConditionalGet.validators(message_day)
+                
                 # Convert ObjectId to string
                 message_day['_id'] = str(message_day['_id'])
                 
@@ -931,10 +966,10 @@ class MessageDayDetailView(APIView):
                     200
                 )
                 
-                return BLEOResponse.success(
+                return ConditionalGet.apply(BLEOResponse.success(
                     data=serializer.data,
                     message="Messages days retrieved successfully"
-                ).to_response()
+                ).to_response(), etag, last_modified)
             
             elif bleoid:
                 # All message days for a specific bleoid
@@ -1093,11 +1128,22 @@ class MessageDayDetailView(APIView):
             if 'messages' in validated_data:
                 validated_data['messages'] = _generate_message_ids(validated_data['messages'])
             
+            # Skip the write (and the version bump) when nothing changes
+            if all(message_day.get(key) == value for key, value in validated_data.items()):
+                Logger.debug_system_action(
+                    f"No changes made to message day for bleoid={bleoid} on date {date}",
+                    LogType.INFO.value,
+                    200
+                )
+                return BLEOResponse.success(
+                    message="No changes made"
+                ).to_response(status.HTTP_200_OK)
+            
             # Update in database
             db = MongoDB.get_instance().get_collection('MessagesDays')
             result = db.update_one(
                 {"_id": message_day['_id']},
-                {"$set": validated_data}
+                MessagesDays.touch({"$set": validated_data})
             )
             
             if result.modified_count == 0:
@@ -1124,6 +1170,9 @@ class MessageDayDetailView(APIView):
             # Use serializer for response
             response_serializer = MessagesDaysSerializer(updated_message_day)
             
+            # Push to the couple's WebSocket
+            RealtimeEvents.publish(RealtimeEvents.MESSAGE_DAY_UPDATED, bleoid, message_day.get('to_bleoid'), date, response_serializer.data)
+            
             # Log success (without logging message content)
             message_count = len(updated_message_day.get('messages', []))
             Logger.debug_user_action(
@@ -1176,6 +1225,8 @@ class MessageDayDetailView(APIView):
             # Delete from database
             db = MongoDB.get_instance().get_collection('MessagesDays')
             result = db.delete_one({"_id": message_day['_id']})
+            if result.deleted_count:
+                MessageSync.record(MessageSync.tombstones(message_day))
             
             # Log success
             Logger.debug_user_action(
@@ -1185,6 +1236,9 @@ class MessageDayDetailView(APIView):
                 200
             )
             
+            # Push to the couple's WebSocket
+            RealtimeEvents.publish(RealtimeEvents.MESSAGE_DAY_DELETED, bleoid, message_day.get('to_bleoid'), date)
+            
             return BLEOResponse.success(
                 message="Message day deleted successfully"
             ).to_response(status.HTTP_200_OK)
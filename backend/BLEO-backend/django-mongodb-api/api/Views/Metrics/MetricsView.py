@@ -0,0 +1,20 @@
+import hmac
+from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+from utils.metrics import Metrics
+
+class MetricsView(View):
+    """Prometheus scrape endpoint (plain Django view: no DRF auth, no DebugLogs writes)"""
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def get(self, request):
+        """Render every registered metric in Prometheus text format"""
+        token = getattr(settings, 'METRICS_AUTH_TOKEN', '')
+        if token:
+            provided = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+            if not hmac.compare_digest(provided, token):
+                return HttpResponse("Unauthorized\n", status=401, content_type=self.CONTENT_TYPE)
+
+        return HttpResponse(Metrics.render(), content_type=self.CONTENT_TYPE)
@@ -0,0 +1,215 @@
+import base64
+import binascii
+from datetime import datetime
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from models.response.BLEOResponse import BLEOResponse
+from utils.mongodb_utils import MongoDB
+from utils.profile_pictures import ProfilePictures
+from utils.logger import Logger
+from models.enums.LogType import LogType
+from models.enums.ErrorSourceType import ErrorSourceType
+from utils.validation_patterns import ValidationPatterns
+
+class UserPictureView(APIView):
+    """API view for a user's profile picture (GET image bytes, PUT upload, DELETE)"""
+
+    # Versioned URLs (?v=<reference>) never change content, so caches may keep them
+    IMMUTABLE_CACHE_CONTROL = 'private, max-age=31536000, immutable'
+
+    def get_reference(self, bleoid):
+        """(user_found, reference) using only the Users profilePic field"""
+        user = MongoDB.get_instance().get_collection('Users').find_one({"bleoid": bleoid}, {"profilePic": 1})
+        if user is None:
+            return False, None
+        reference = user.get('profilePic')
+        return True, reference if isinstance(reference, str) else None
+
+    def get(self, request, bleoid):
+        """Image bytes of the requested variant (?size=original|small|thumb)"""
+        try:
+            validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+            variant = request.query_params.get('size', ProfilePictures.DEFAULT_VARIANT)
+            if variant not in ProfilePictures.VARIANTS:
+                return BLEOResponse.validation_error(
+                    message=f"Invalid size: {variant}. Valid sizes are: {', '.join(ProfilePictures.VARIANTS)}"
+                ).to_response(status.HTTP_400_BAD_REQUEST)
+
+            found, reference = self.get_reference(validated_bleoid)
+            if not found:
+                return BLEOResponse.not_found(message="User not found").to_response(status.HTTP_404_NOT_FOUND)
+            if reference is None:
+                return BLEOResponse.not_found(message="User has no profile picture").to_response(status.HTTP_404_NOT_FOUND)
+
+            cache_control = self.IMMUTABLE_CACHE_CONTROL if request.query_params.get('v') == reference else 'private, no-cache'
+
+            # Answer revalidations from the Users reference without loading the image
+            etag = ProfilePictures.etag(reference, variant)
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified['ETag'] = etag
+                not_modified['Cache-Control'] = cache_control
+                return not_modified
+
+            picture = MongoDB.get_instance().get_collection('ProfilePictures').find_one(
+                {"bleoid": validated_bleoid, "variant": variant}
+            )
+            if picture is None:
+                Logger.debug_error(
+                    f"Profile picture {variant} missing for bleoid={validated_bleoid}",
+                    404,
+                    validated_bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.not_found(message="User has no profile picture").to_response(status.HTTP_404_NOT_FOUND)
+
+            response = HttpResponse(bytes(picture['data']), content_type=picture['content_type'])
+            response['ETag'] = etag
+            response['Cache-Control'] = cache_control
+            return response
+
+        except ValidationError as e:
+            Logger.debug_error(
+                f"Invalid BLEOID format in URL: {bleoid} - {str(e)}",
+                400,
+                None,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.validation_error(
+                message=f"Invalid BLEOID format: {bleoid}"
+            ).to_response(status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            Logger.debug_error(
+                f"Failed to retrieve profile picture for bleoid={bleoid}: {str(e)}",
+                500,
+                bleoid,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.server_error(
+                message=f"Failed to retrieve profile picture: {str(e)}"
+            ).to_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def put(self, request, bleoid):
+        """Upload a picture as multipart `file` or base64 `image`"""
+        try:
+            validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+            found, _ = self.get_reference(validated_bleoid)
+            if not found:
+                return BLEOResponse.not_found(message="User not found").to_response(status.HTTP_404_NOT_FOUND)
+
+            upload = request.FILES.get('file')
+            if upload is not None:
+                raw = upload.read()
+            elif request.data.get('image'):
+                try:
+                    raw = base64.b64decode(request.data['image'], validate=True)
+                except (binascii.Error, ValueError):
+                    return BLEOResponse.validation_error(
+                        message="image must be base64 encoded"
+                    ).to_response(status.HTTP_400_BAD_REQUEST)
+            else:
+                return BLEOResponse.validation_error(
+                    message="No picture provided. Send a multipart 'file' or a base64 'image'."
+                ).to_response(status.HTTP_400_BAD_REQUEST)
+
+            try:
+                reference = ProfilePictures.store(validated_bleoid, raw)
+            except ValueError as e:
+                Logger.debug_error(
+                    f"Profile picture rejected for bleoid={validated_bleoid}: {str(e)}",
+                    400,
+                    validated_bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.validation_error(message=str(e)).to_response(status.HTTP_400_BAD_REQUEST)
+
+            MongoDB.get_instance().get_collection('Users').update_one(
+                {"bleoid": validated_bleoid},
+                {"$set": {"profilePic": reference, "updated_at": datetime.now()}}
+            )
+
+            Logger.debug_user_action(
+                validated_bleoid,
+                "Profile picture updated successfully",
+                LogType.SUCCESS.value,
+                200
+            )
+
+            return BLEOResponse.success(
+                data={
+                    'profilePic': ProfilePictures.url(validated_bleoid, reference),
+                    'profilePicThumb': ProfilePictures.url(validated_bleoid, reference, 'thumb')
+                },
+                message="Profile picture updated successfully"
+            ).to_response()
+
+        except ValidationError as e:
+            Logger.debug_error(
+                f"Invalid BLEOID format in URL: {bleoid} - {str(e)}",
+                400,
+                None,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.validation_error(
+                message=f"Invalid BLEOID format: {bleoid}"
+            ).to_response(status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            Logger.debug_error(
+                f"Failed to update profile picture for bleoid={bleoid}: {str(e)}",
+                500,
+                bleoid,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.server_error(
+                message=f"Failed to update profile picture: {str(e)}"
+            ).to_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def delete(self, request, bleoid):
+        """Remove the user's picture"""
+        try:
+            validated_bleoid = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+            found, _ = self.get_reference(validated_bleoid)
+            if not found:
+                return BLEOResponse.not_found(message="User not found").to_response(status.HTTP_404_NOT_FOUND)
+
+            deleted = ProfilePictures.delete(validated_bleoid)
+            MongoDB.get_instance().get_collection('Users').update_one(
+                {"bleoid": validated_bleoid},
+                {"$set": {"profilePic": None, "updated_at": datetime.now()}}
+            )
+
+            Logger.debug_user_action(
+                validated_bleoid,
+                f"Profile picture deleted ({deleted} variant(s))",
+                LogType.SUCCESS.value,
+                200
+            )
+
+            return BLEOResponse.success(message="Profile picture deleted successfully").to_response()
+
+        except ValidationError as e:
+            Logger.debug_error(
+                f"Invalid BLEOID format in URL: {bleoid} - {str(e)}",
+                400,
+                None,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.validation_error(
+                message=f"Invalid BLEOID format: {bleoid}"
+            ).to_response(status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            Logger.debug_error(
+                f"Failed to delete profile picture for bleoid={bleoid}: {str(e)}",
+                500,
+                bleoid,
+                ErrorSourceType.SERVER.value
+            )
+            return BLEOResponse.server_error(
+                message=f"Failed to delete profile picture: {str(e)}"
+            ).to_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -2,11 +2,17 @@ from rest_framework.views import APIView
 from rest_framework import status
 from models.User import User
 from utils.mongodb_utils import MongoDB
-from django.contrib.auth.hashers import make_password, check_password
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from models.response.BLEOResponse import BLEOResponse
 from api.serializers import UserSerializer
 from utils.logger import Logger
+from utils.profile_pictures import ProfilePictures
+from utils.user_query import UserQuery
+from utils.bleoid_allocator import BleoidAllocator
+from services.AccountDeletion import AccountDeletion
+from services.PasswordHashing import PasswordHashing, HashingBusyError
+from django.conf import settings
 from models.enums.LogType import LogType
 from models.enums.ErrorSourceType import ErrorSourceType
 from utils.validation_patterns import ValidationPatterns
@@ -16,8 +22,11 @@ from datetime import datetime
 class UserListCreateView(APIView):
     """API view for listing and creating users"""
     
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+    
     def get(self, request):
-        """Get all users"""
+        """Get one page of users: ?limit=, ?cursor=, ?sort=userName|email|bleoid, ?search= prefix, ?picture=true"""
         try:
             # Log action
             Logger.debug_system_action(
@@ -26,12 +35,29 @@ class UserListCreateView(APIView):
                 200
             )
             
-            db = MongoDB.get_instance().get_collection('Users')
-            users = list(db.find({}, {'password': 0}))  # Exclude password field
+            try:
+                limit = min(max(int(request.query_params.get('limit', self.DEFAULT_LIMIT)), 1), self.MAX_LIMIT)
+                field = UserQuery.sort_field(request.query_params.get('sort'))
+                query = UserQuery.build(field, request.query_params.get('search'))
+                cursor = request.query_params.get('cursor')
+                if cursor:
+                    query = UserQuery.after_cursor(query, field, cursor)
+            except ValueError as e:
+                return BLEOResponse.validation_error(
+                    message=str(e)
+                ).to_response(status.HTTP_400_BAD_REQUEST)
             
-            # Convert ObjectId to string for JSON serialization
-            for user in users:
-                user['_id'] = str(user['_id'])
+            with_picture = request.query_params.get('picture', '').lower() in ('1', 'true')
+            
+            # Fetch one extra user to know whether another page exists
+            db = MongoDB.get_instance().get_collection('Users')
+            users = list(
+                db.find(query, UserQuery.projection(with_picture))
+                .sort(field, 1)
+                .limit(limit + 1)
+            )
+            has_more = len(users) > limit
+            users = users[:limit]
             
             # Serialize the users
             serializer = UserSerializer(users, many=True)
@@ -44,7 +70,11 @@ class UserListCreateView(APIView):
             )
             
             return BLEOResponse.success(
-                data=serializer.data,
+                data={
+                    'users': serializer.data,
+                    'has_more': has_more,
+                    'next_cursor': UserQuery.encode_cursor(field, users[-1]) if has_more else None
+                },
                 message="Users retrieved successfully"
             ).to_response(status.HTTP_200_OK)
         except Exception as e:
@@ -131,35 +161,62 @@ class UserListCreateView(APIView):
                     error_message="Email already exists"
                 ).to_response(status.HTTP_400_BAD_REQUEST)
             
-            # Generate new bleoid
-            while True:
-                new_bleoid = User.generate_bleoid()
-                # Check if ID already exists
-                if not db_users.find_one({"bleoid": new_bleoid}):
-                    break
-        
             # Hash password
-            validated_data['password'] = make_password(validated_data['password'])
+            validated_data['password'] = PasswordHashing.make(validated_data['password'])
+            
+            # Render the picture before the insert; its variants are stored once the bleoid is known
+            picture = None
+            if validated_data.get('profilePic'):
+                try:
+                    picture = ProfilePictures.render(validated_data['profilePic'])
+                except ValueError as e:
+                    Logger.debug_error(
+                        f"User creation failed - profile picture rejected: {str(e)}",
+                        400,
+                        None,
+                        ErrorSourceType.SERVER.value
+                    )
+                    return BLEOResponse.validation_error(
+                        message=str(e),
+                        errors={"profilePic": str(e)}
+                    ).to_response(status.HTTP_400_BAD_REQUEST)
         
             # Create user
             user = User(
-                bleoid=new_bleoid,
+                bleoid=User.generate_bleoid(),
                 email=validated_data['email'],
                 password=validated_data['password'],
                 userName=validated_data.get('userName', "NewUser"),
-                profilePic=validated_data.get('profilePic'),
+                profilePic=ProfilePictures.reference(picture) if picture else None,
                 email_verified=validated_data.get('email_verified', False),
                 bio=validated_data.get('bio'),
                 preferences=validated_data.get('preferences', {})
             )
             
-            # Save to MongoDB
-            result = db_users.insert_one(user.to_dict())
+            # Save to MongoDB; the unique index settles bleoid collisions
+            try:
+                created_user = BleoidAllocator.insert(db_users, user.to_dict())
+            except DuplicateKeyError:
+                # Lost a race for the same email (or userName) against another request
+                Logger.debug_error(
+                    f"User creation failed - duplicate user: {validated_data['email']}",
+                    400,
+                    None,
+                    ErrorSourceType.SERVER.value
+                )
+                return BLEOResponse.error(
+                    error_type="DuplicateError",
+                    error_message="User already exists"
+                ).to_response(status.HTTP_400_BAD_REQUEST)
+            new_bleoid = created_user['bleoid']
+            
+            # Store the picture apart from the user document, which keeps only its reference
+            if picture:
+                ProfilePictures.save(new_bleoid, picture)
             
             # Return created user with ID
-            created_user = user.to_dict()
             del created_user['password']  # Remove password from response
-            created_user['_id'] = str(result.inserted_id)
+            created_user['_id'] = str(created_user['_id'])
             
             # Serialize the response
             response_serializer = UserSerializer(created_user)
@@ -176,6 +233,14 @@ class UserListCreateView(APIView):
                 message="User created successfully"
             ).to_response(status.HTTP_201_CREATED)
             
+        except HashingBusyError as e:
+            Logger.debug_error(
+                f"User creation rejected: {str(e)}",
+                503,
+                None,
+                ErrorSourceType.SERVER.value
+            )
+            return PasswordHashing.busy_response(e)
         except Exception as e:
             # Log error
             Logger.debug_error(
@@ -316,8 +381,23 @@ class UserDetailView(APIView):
             
             # Hash password if provided
             if 'password' in validated_data:
-                from django.contrib.auth.hashers import make_password
-                validated_data['password'] = make_password(validated_data['password'])
+                validated_data['password'] = PasswordHashing.make(validated_data['password'])
+            
+            # Store a new picture apart from the user document, which keeps only its reference
+            if 'profilePic' in validated_data:
+                try:
+                    validated_data['profilePic'] = ProfilePictures.store(validated_bleoid, validated_data['profilePic'])
+                except ValueError as e:
+                    Logger.debug_error(
+                        f"User update failed - profile picture rejected: {str(e)}",
+                        400,
+                        validated_bleoid,
+                        ErrorSourceType.SERVER.value
+                    )
+                    return BLEOResponse.validation_error(
+                        message=str(e),
+                        errors={"profilePic": str(e)}
+                    ).to_response(status.HTTP_400_BAD_REQUEST)
             
             # Add updated timestamp
             validated_data['updated_at'] = datetime.now()
@@ -382,6 +462,14 @@ class UserDetailView(APIView):
             return BLEOResponse.validation_error(
                 message="Invalid BLEOID format in URL"
             ).to_response(status.HTTP_400_BAD_REQUEST)
+        except HashingBusyError as e:
+            Logger.debug_error(
+                f"User update rejected: {str(e)}",
+                503,
+                bleoid,
+                ErrorSourceType.SERVER.value
+            )
+            return PasswordHashing.busy_response(e)
         except Exception as e:
             Logger.debug_error(
                 f"Failed to update user for bleoid={bleoid}: {str(e)}",
@@ -407,14 +495,13 @@ class UserDetailView(APIView):
                 200
             )
             
-            # Get database connections
-            db_users = MongoDB.get_instance().get_collection('Users')
-            db_links = MongoDB.get_instance().get_collection('Links')
-            db_message_days = MongoDB.get_instance().get_collection('MessagesDays')
-            
-            # First check if user exists
-            user = db_users.find_one({"bleoid": validated_bleoid})
-            if not user:
+            # Cascade through every collection owning user data: one transaction on a
+            # replica set, otherwise a resumable job bounded to a few chunks per request
+            result = AccountDeletion.delete_user(
+                validated_bleoid,
+                max_chunks=settings.ACCOUNT_DELETION_INLINE_CHUNKS
+            )
+            if result is None:
                 # Log user not found
                 Logger.debug_error(
                     f"User not found with bleoid: {validated_bleoid} during deletion",
@@ -427,70 +514,25 @@ class UserDetailView(APIView):
                     message="User not found"
                 ).to_response(status.HTTP_404_NOT_FOUND)
             
-            # Log the start of cascade deletion
-            Logger.debug_system_action(
-                f"Starting cascade deletion for user with bleoid: {validated_bleoid}",
-                LogType.INFO.value,
-                200
-            )
-            
-            # STEP 1: Find any links where this user is bleoidPartner2
-            related_links = list(db_links.find({"bleoidPartner2": validated_bleoid}))
-            
-            # STEP 2: Update those links to set bleoidPartner2 to null
-            if related_links:
-                result = db_links.update_many(
-                    {"bleoidPartner2": validated_bleoid},
-                    {"$set": {"bleoidPartner2": None}}
-                )
-                # Log link updates
+            message_days_count = result['deleted'].get('message_days', 0)
+            if not result['complete']:
+                # The user is gone; the remaining data is finished in the background
                 Logger.debug_system_action(
-                    f"Updated {result.modified_count} links that referenced the deleted user {validated_bleoid}",
+                    f"User with bleoid: {validated_bleoid} deleted, remaining data queued for deletion",
                     LogType.INFO.value,
-                    200
+                    202
                 )
+                return BLEOResponse.success(
+                    message=f"User deleted successfully. Removed {message_days_count} message day records so far, "
+                            "the rest is being removed in the background."
+                ).to_response(status.HTTP_202_ACCEPTED)
             
-            # STEP 3: Delete the user's own link where they are bleoidPartner1
-            link_delete_result = db_links.delete_one({"bleoidPartner1": validated_bleoid})
-            link_deleted = link_delete_result.deleted_count
-            
-            # Log link deletion
-            Logger.debug_system_action(
-                f"Deleted {link_deleted} primary links for user {validated_bleoid}",
-                LogType.INFO.value,
-                200
-            )
-            
-            # STEP 4: Delete all MessagesDays associated with this user
-            message_days_result = db_message_days.delete_many({"from_bleoid": validated_bleoid})
-            message_days_count = message_days_result.deleted_count
-            
-            # Log message days deletion
             Logger.debug_system_action(
-                f"Deleted {message_days_count} message days for user {validated_bleoid}",
-                LogType.INFO.value,
+                f"User with bleoid: {validated_bleoid} deleted successfully",
+                LogType.SUCCESS.value,
                 200
             )
             
-            # STEP 5: Finally delete the user
-            result = db_users.delete_one({"bleoid": validated_bleoid})
-            
-            # Log final user deletion
-            if result.deleted_count > 0:
-                Logger.debug_system_action(
-                    f"User with bleoid: {validated_bleoid} deleted successfully",
-                    LogType.SUCCESS.value,
-                    200
-                )
-            else:
-                # This should not happen as we checked for user existence above
-                Logger.debug_error(
-                    f"Failed to delete user with bleoid: {validated_bleoid}. User record not found during final deletion.",
-                    500,
-                    None,
-                    ErrorSourceType.SERVER.value
-                )
-            
             return BLEOResponse.success(
                 message=f"User deleted successfully. Also removed {message_days_count} message day records."
             ).to_response(status.HTTP_200_OK)
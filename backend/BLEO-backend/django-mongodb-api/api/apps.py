@@ -1,5 +1,7 @@
 import os
+import sys
 from django.apps import AppConfig
+from django.conf import settings
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
@@ -7,17 +9,34 @@ class ApiConfig(AppConfig):
 
     def ready(self):
         """This runs only once when Django starts"""
+        # Banners go to stderr: management commands may write data to stdout (export_logs)
         # Check if this is the main process (not the reloader process)
         if os.environ.get('RUN_MAIN') == 'true':
-            print("🌟 Django API app ready - initializing MongoDB...")
+            print("🌟 Django API app ready - initializing MongoDB...", file=sys.stderr)
             
             # Import and initialize MongoDB system
             from utils.mongodb_utils import MongoDB
             try:
                 MongoDB.initialize()
-                print("🎉 MongoDB initialization completed successfully!")
+                print("🎉 MongoDB initialization completed successfully!", file=sys.stderr)
             except Exception as e:
-                print(f"💥 Failed to initialize MongoDB: {str(e)}")
+                print(f"💥 Failed to initialize MongoDB: {str(e)}", file=sys.stderr)
                 # You might want to raise this exception to prevent the server from starting
         else:
-            print("🔄 Django reloader process detected, skipping MongoDB initialization...")
\ No newline at end of file
+            print("🔄 Django reloader process detected, skipping MongoDB initialization...", file=sys.stderr)
+
+        if settings.EMAIL_OUTBOX_WORKER == 'thread' and self.serves_requests():
+            # Rows left pending by the previous run, expired leases and scheduled
+            # retries are delivered without waiting for a new email
+            from services.EmailOutbox import EmailOutbox
+            EmailOutbox.notify()
+
+    @staticmethod
+    def serves_requests():
+        """False for management commands and runserver's reloader parent"""
+        if os.path.basename(sys.argv[0]) not in ('manage.py', 'django-admin', '__main__.py'):
+            # An ASGI/WSGI server (uvicorn, gunicorn, daphne...)
+            return True
+        if sys.argv[1:2] != ['runserver']:
+            return False
+        return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
@@ -0,0 +1,101 @@
+import jwt
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from utils.jwt_keys import JWTKeyRing
+from utils.jwt_utils import record_blacklist_check
+from utils.mongodb_async import AsyncMongoDB
+from utils.realtime_events import RealtimeEvents
+from utils.metrics import Metrics
+
+WEBSOCKET_CONNECTIONS = Metrics.gauge(
+    'bleo_websocket_connections',
+    'Open couple WebSocket connections'
+)
+
+class CoupleConsumer(AsyncJsonWebsocketConsumer):
+    """WebSocket pushing message-day and message events to both partners of a couple.
+
+    Authenticate with an access token, either as ?token=<jwt> or as the
+    subprotocols ["bearer", "<jwt>"] (browsers cannot set headers on a
+    WebSocket). The couple comes from the user's accepted link.
+    """
+
+    # Application close codes (4000-4999)
+    CLOSE_UNAUTHORIZED = 4401
+    CLOSE_NOT_LINKED = 4403
+
+    async def connect(self):
+        self.group = None
+        token, subprotocol = self._token()
+
+        # Accept first so clients receive the close code instead of a bare handshake failure
+        await self.accept(subprotocol=subprotocol)
+
+        bleoid = await self._authenticate(token)
+        if bleoid is None:
+            await self.close(code=self.CLOSE_UNAUTHORIZED)
+            return
+
+        db_links = AsyncMongoDB.get_instance().get_collection('Links')
+        link = await db_links.find_one({
+            "$or": [
+                {"bleoidPartner1": bleoid},
+                {"bleoidPartner2": bleoid}
+            ],
+            "status": "accepted"
+        }, {"bleoidPartner1": 1, "bleoidPartner2": 1})
+        if not link:
+            await self.close(code=self.CLOSE_NOT_LINKED)
+            return
+
+        self.bleoid = bleoid
+        self.partner_bleoid = link["bleoidPartner2"] if link["bleoidPartner1"] == bleoid else link["bleoidPartner1"]
+        self.group = RealtimeEvents.group_name(self.bleoid, self.partner_bleoid)
+
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        WEBSOCKET_CONNECTIONS.inc()
+
+    async def disconnect(self, code):
+        if self.group is not None:
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+            WEBSOCKET_CONNECTIONS.dec()
+
+    async def receive_json(self, content, **kwargs):
+        # The socket is push-only; answer keepalive pings
+        if isinstance(content, dict) and content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+
+    async def couple_event(self, message):
+        """Forward an event published by RealtimeEvents"""
+        await self.send_json(message['event'])
+
+    def _token(self):
+        """(token, subprotocol to echo back) from the subprotocols or the query string"""
+        subprotocols = self.scope.get('subprotocols') or []
+        if len(subprotocols) >= 2 and subprotocols[0] == 'bearer':
+            return subprotocols[1], 'bearer'
+
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        return (query.get('token') or [None])[0], None
+
+    async def _authenticate(self, token):
+        """BLEOID of a valid, non-blacklisted token, else None"""
+        if not token:
+            return None
+        try:
+            # Signature and expiry are checked before any lookup for the token; off the
+            # event loop, as the key ring may reload from MongoDB
+            payload = await sync_to_async(JWTKeyRing.decode)(token)
+        except jwt.InvalidTokenError:
+            return None
+        if not payload.get('bleoid'):
+            return None
+
+        db_blacklist = AsyncMongoDB.get_instance().get_collection('TokenBlacklist')
+        is_blacklisted = await db_blacklist.find_one({"token": token}, {"_id": 1}) is not None
+        record_blacklist_check('websocket', is_blacklisted)
+        if is_blacklisted:
+            return None
+
+        return payload['bleoid']
@@ -0,0 +1,22 @@
+import time
+from django.core.management.base import BaseCommand
+from services.EmailOutbox import EmailOutbox
+
+
+class Command(BaseCommand):
+    help = 'Delivers queued EmailOutbox emails, once or continuously'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling the outbox')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            totals = EmailOutbox.deliver_pending()
+            if any(totals.values()):
+                self.stdout.write(
+                    f"📧 Sent {totals['sent']}, retrying {totals['retried']}, failed {totals['failed']}"
+                )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,53 @@
+import contextlib
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+from utils.log_export import LogExporter
+from utils.log_query import LogQuery
+
+
+class Command(BaseCommand):
+    help = 'Exports DebugLogs to NDJSON or CSV with constant memory, using the admin log filters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='-', help="Destination file, or '-' for stdout")
+        parser.add_argument('--format', dest='export_format', choices=sorted(LogExporter.FORMATS), default='ndjson')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output')
+        parser.add_argument('--batch-size', type=int, default=LogExporter.DEFAULT_BATCH_SIZE, help='Documents fetched per cursor batch')
+        parser.add_argument('--type', help='Log type filter')
+        parser.add_argument('--bleoid', help='BLEOID filter')
+        parser.add_argument('--error-source', help='Error source filter')
+        parser.add_argument('--user-type', help='User type filter')
+        parser.add_argument('--days', help='Only logs from the last N days')
+        parser.add_argument('--start-date', help='ISO date lower bound')
+        parser.add_argument('--end-date', help='ISO date upper bound')
+
+    def handle(self, *args, **options):
+        # stdout carries only the export: anything printed meanwhile (MongoDB
+        # connection banners...) goes to stderr
+        stdout = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            self._export(options, stdout)
+
+    def _export(self, options, stdout):
+        filters = {
+            name: options[name]
+            for name in ('type', 'bleoid', 'error_source', 'user_type', 'days', 'start_date', 'end_date')
+            if options[name]
+        }
+        try:
+            query = LogQuery.build(filters)
+        except ValidationError as e:
+            raise CommandError(f"Invalid BLEOID filter: {options['bleoid']} ({e})")
+
+        exporter = LogExporter(query, options['export_format'], max(options['batch_size'], 1), options['gzip'])
+
+        if options['output'] == '-':
+            stdout.flush()
+            exporter.write_to(stdout.buffer)
+            stdout.buffer.flush()
+        else:
+            with open(options['output'], 'wb') as stream:
+                written = exporter.write_to(stream)
+            # Progress goes to stderr so stdout exports stay clean
+            self.stderr.write(f"📤 Exported DebugLogs to {options['output']} ({written} bytes)")
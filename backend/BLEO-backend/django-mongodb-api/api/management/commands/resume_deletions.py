@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from services.AccountDeletion import AccountDeletion
+
+
+class Command(BaseCommand):
+    help = 'Finishes account deletions left running by a crash or the inline chunk budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-chunks', type=int, default=None, help='Chunks per job before moving on')
+
+    def handle(self, *args, **options):
+        finished = AccountDeletion.resume(options['max_chunks'])
+        self.stdout.write(f"🧹 Finished {finished} account deletion(s)")
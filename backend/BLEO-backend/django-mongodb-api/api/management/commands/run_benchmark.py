@@ -0,0 +1,194 @@
+import json
+import os
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment, teardown_test_environment
+from utils import mongodb_utils
+from utils.mongodb_utils import MongoDB
+from mongoDbVersionUpdate.v1_0_0.v1_0_0_AppParameters import update_app_parameters
+from benchmarks.seed import BenchmarkSeeder
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.runner import BenchmarkRunner
+from benchmarks.baseline import BaselineStore
+
+
+class Command(BaseCommand):
+    help = 'Seeds a benchmark database and measures API latency and Mongo operations per request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Number of seeded users (paired into couples)')
+        parser.add_argument('--years', type=float, default=1, help='Years of MessagesDays history per user')
+        parser.add_argument('--messages-per-day', type=int, default=2, help='Messages stored in each seeded day')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads')
+        parser.add_argument('--iterations', type=int, default=200, help='Measured iterations per scenario')
+        parser.add_argument('--warmup', type=int, default=20, help='Unmeasured warm-up iterations per scenario')
+        parser.add_argument(
+            '--scenarios',
+            default=','.join(SCENARIOS.keys()),
+            help=f"Comma-separated scenarios to run ({', '.join(SCENARIOS.keys())})"
+        )
+        parser.add_argument('--db-name', default='bleo_benchmark', help='Dedicated database for seeded data')
+        parser.add_argument('--mongomock', action='store_true', help='Run against mongomock instead of MongoDB')
+        parser.add_argument('--skip-seed', action='store_true', help='Reuse data seeded by a previous run')
+        parser.add_argument('--baseline', default='default', help='Baseline profile name')
+        parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed regression before failing (0.2 = 20%%)')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit with an error when a metric regresses')
+        parser.add_argument('--output', help='Also write the raw results to this JSON file')
+
+    def handle(self, *args, **options):
+        scenario_names = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = [name for name in scenario_names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(unknown)}")
+
+        if MongoDB._instance is not None:
+            raise CommandError("MongoDB is already connected; the benchmark needs its own database")
+
+        self._configure_database(options)
+
+        setup_test_environment()
+        try:
+            mongo = MongoDB.get_instance()
+            if options['mongomock']:
+                # mongomock cannot create validated collections, so only set up indexes and parameters
+                for collection_name in MongoDB.COLLECTIONS.values():
+                    mongo._setup_collection_indexes(collection_name)
+                update_app_parameters()
+            else:
+                mongo.initialize_system()
+
+            seeder = BenchmarkSeeder(
+                users=options['users'],
+                years=options['years'],
+                messages_per_day=options['messages_per_day']
+            )
+            if options['skip_seed']:
+                # mongomock keeps nothing between runs, so there is never data to reuse
+                if options['mongomock']:
+                    raise CommandError("--skip-seed cannot be combined with --mongomock")
+                fixture = self._load_fixture(seeder)
+            else:
+                self.stdout.write("🌱 Seeding benchmark data...")
+                seeder.reset()
+                fixture = seeder.seed()
+            self.stdout.write(
+                f"📦 Dataset: {len(fixture['users'])} users, {len(fixture['couples'])} couples, "
+                f"{len(fixture['dates'])} days of history"
+            )
+
+            runner = BenchmarkRunner(
+                fixture,
+                concurrency=options['concurrency'],
+                iterations=options['iterations'],
+                warmup=options['warmup']
+            )
+
+            results = {}
+            for name in scenario_names:
+                self.stdout.write(f"🏃 Running scenario: {name}")
+                results.update(runner.run_scenario(SCENARIOS[name]()))
+        finally:
+            teardown_test_environment()
+
+        self._print_results(results, options['mongomock'])
+
+        settings = {
+            key: options[key]
+            for key in ('users', 'years', 'messages_per_day', 'concurrency', 'iterations', 'warmup', 'mongomock')
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'settings': settings, 'results': results}, f, indent=2, sort_keys=True)
+
+        self._handle_baseline(results, settings, options)
+
+    def _configure_database(self, options):
+        """Point the MongoDB singleton at the benchmark database"""
+        os.environ['MONGO_DB_NAME'] = options['db_name']
+
+        if options['mongomock']:
+            try:
+                import mongomock
+            except ImportError:
+                raise CommandError("mongomock is not installed (pip install mongomock)")
+
+            mongodb_utils.MongoClient = mongomock.MongoClient
+            os.environ.setdefault('MONGO_URI', 'mongodb://localhost:27017')
+            os.environ.setdefault('MONGO_PASSWORD', 'benchmark')
+
+    def _load_fixture(self, seeder):
+        """Rebuild the fixture description from previously seeded data"""
+        users = list(seeder.mongo.get_collection('Users').find(
+            {'email': {'$regex': f"@{seeder.EMAIL_DOMAIN}$"}},
+            {'bleoid': 1, 'email': 1}
+        ).sort('email', 1))
+        if not users:
+            raise CommandError("No seeded benchmark users found; run without --skip-seed first")
+
+        couples = [
+            (link['bleoidPartner1'], link['bleoidPartner2'])
+            for link in seeder.mongo.get_collection('Links').find({'status': 'accepted'})
+        ]
+        dates = sorted(
+            seeder.mongo.get_collection('MessagesDays').distinct('date', {'from_bleoid': users[0]['bleoid']}),
+            reverse=True
+        )
+        return {
+            'password': seeder.PASSWORD,
+            'users': [{'bleoid': user['bleoid'], 'email': user['email']} for user in users],
+            'couples': couples,
+            'dates': dates,
+        }
+
+    def _print_results(self, results, mongomock_used):
+        """Print a latency table"""
+        header = f"{'endpoint':<22}{'reqs':>6}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>9}{'mongo ops':>11}"
+        self.stdout.write("")
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for label, stats in results.items():
+            self.stdout.write(
+                f"{label:<22}{stats['requests']:>6}{stats['errors']:>8}{stats['p50_ms']:>10}"
+                f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['throughput_rps']:>9}"
+                f"{stats['mongo_ops_per_request']:>11}"
+            )
+        if mongomock_used:
+            self.stdout.write(self.style.WARNING(
+                "⚠️ mongomock does not emit command events; Mongo ops per request are only reported against MongoDB"
+            ))
+
+    def _handle_baseline(self, results, settings, options):
+        """Compare against the stored baseline and optionally replace it"""
+        store = BaselineStore()
+        baseline = store.load(options['baseline'])
+
+        if baseline:
+            if baseline.get('settings') != settings:
+                self.stdout.write(self.style.WARNING(
+                    f"⚠️ Baseline '{options['baseline']}' was recorded with different settings: {baseline.get('settings')}"
+                ))
+
+            regressions = store.compare(baseline, results, options['tolerance'])
+            if regressions:
+                self.stdout.write(self.style.ERROR(
+                    f"❌ {len(regressions)} regression(s) against baseline from commit {baseline.get('commit')}:"
+                ))
+                for regression in regressions:
+                    self.stdout.write(
+                        f"   {regression['label']}.{regression['metric']}: "
+                        f"{regression['baseline']} -> {regression['current']} (+{regression['change_pct']}%)"
+                    )
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"✅ No regressions against baseline from commit {baseline.get('commit')}"
+                ))
+        else:
+            regressions = []
+            self.stdout.write(f"ℹ️ No baseline named '{options['baseline']}' yet")
+
+        if options['save_baseline']:
+            store.save(options['baseline'], results, settings)
+            self.stdout.write(self.style.SUCCESS(f"💾 Baseline saved to {store.path_for(options['baseline'])}"))
+
+        if regressions and options['fail_on_regression']:
+            raise CommandError("Benchmark regressions detected")
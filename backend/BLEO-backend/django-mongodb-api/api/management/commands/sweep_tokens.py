@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from utils.token_sweeper import TokenSweeper
+
+
+class Command(BaseCommand):
+    help = 'Deletes unused expired PasswordResets and EmailVerifications records'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None, help='Records deleted per batch (default TOKEN_SWEEP_CHUNK_SIZE)')
+        parser.add_argument('--max-chunks', type=int, default=None, help='Stop after this many batches per collection')
+
+    def handle(self, *args, **options):
+        totals = TokenSweeper.sweep(options['chunk_size'], options['max_chunks'])
+        for key, count in totals.items():
+            self.stdout.write(f"🧹 {key}: deleted {count} expired records")
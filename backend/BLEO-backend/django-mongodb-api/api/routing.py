@@ -0,0 +1,7 @@
+from django.urls import path
+from api.consumers import CoupleConsumer
+
+websocket_urlpatterns = [
+    # Couple events: message-day and message create/update/delete
+    path('ws/couple/', CoupleConsumer.as_asgi(), name='ws-couple'),
+]
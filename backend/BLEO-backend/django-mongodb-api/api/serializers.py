@@ -10,10 +10,12 @@ from models.enums.LogType import LogType
 from models.enums.ErrorSourceType import ErrorSourceType
 from models.enums.DebugType import DebugType
 from models.AppParameters import AppParameters
-import random
-import string
+from utils.log_retention import LogRetention
+from utils.profile_pictures import ProfilePictures
+from utils.bleoid_allocator import BleoidAllocator
 from bson import Binary
 import base64
+import binascii
 
 from utils.validation_patterns import (
     ValidationPatterns, 
@@ -74,7 +76,7 @@ class UserSerializer(serializers.Serializer):
     last_login = serializers.CharField(required=False)
     created_at = serializers.CharField(required=False)
     updated_at = serializers.CharField(required=False)
-    profilePic = serializers.CharField(required=False)  # Base64 encoded
+    profilePic = serializers.CharField(required=False)  # Base64 encoded on input, picture URL on output
     
     def __init__(self, *args, **kwargs):
         """Handle partial updates by making required fields optional"""
@@ -85,10 +87,6 @@ class UserSerializer(serializers.Serializer):
             for field_name, field in self.fields.items():
                 field.required = False
     
-    def _generate_bleoid(self):
-        """Generate a random 6-character BLEOID"""
-        return ''.join(random.choice(ValidationPatterns.UPPERCASE_ALPHANUMERIC) for _ in range(ValidationPatterns.BLEOID_LENGTH))
-    
     def validate_bleoid(self, value):
         """Validate BLEOID format when provided"""
         if value:
@@ -103,6 +101,13 @@ class UserSerializer(serializers.Serializer):
             return value.lower().strip()
         return value
     
+    def validate_profilePic(self, value):
+        """Decode the base64 picture; views store it through ProfilePictures"""
+        try:
+            return base64.b64decode(value, validate=True)
+        except (binascii.Error, ValueError):
+            raise serializers.ValidationError("profilePic must be base64 encoded")
+    
     def validate(self, data):
         """Cross-field validation for full creation"""
         # Check if this is a full creation (not partial update)
@@ -111,7 +116,7 @@ class UserSerializer(serializers.Serializer):
         
         # Handle auto-generation of bleoid
         if auto_generate and not data.get('bleoid'):
-            data['bleoid'] = self._generate_bleoid()
+            data['bleoid'] = BleoidAllocator.generate()
             # Log the generation for debugging
             print(f"Auto-generated BLEOID: {data['bleoid']}")
         
@@ -146,8 +151,13 @@ class UserSerializer(serializers.Serializer):
                 'bio': getattr(instance, 'bio', ''),
             }
         
-        # Handle Binary profilePic conversion to base64
-        if 'profilePic' in data and isinstance(data['profilePic'], Binary):
+        # profilePic holds a ProfilePictures reference: expose versioned image URLs
+        if isinstance(data.get('profilePic'), str):
+            reference = data['profilePic']
+            data['profilePic'] = ProfilePictures.url(data.get('bleoid'), reference)
+            data['profilePicThumb'] = ProfilePictures.url(data.get('bleoid'), reference, 'thumb')
+        # Legacy inline pictures (until the v1.3.0 update moves them) stay base64
+        elif 'profilePic' in data and isinstance(data['profilePic'], Binary):
             data['profilePic'] = base64.b64encode(data['profilePic']).decode('utf-8')
         
         return data
@@ -202,6 +212,8 @@ class MessagesDaysSerializer(serializers.Serializer):
     energy_level = serializers.CharField(required=False, allow_null=True)
     pleasantness = serializers.CharField(required=False, allow_null=True)
     quadrant = serializers.CharField(required=False, allow_null=True, read_only=True)
+    version = serializers.IntegerField(read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
     
     def validate(self, data):
         """Validate mood, energy_level and pleasantness compatibility"""
@@ -233,6 +245,14 @@ class MessagesDaysSerializer(serializers.Serializer):
             return ValidationPatterns.validate_bleoid_format(value, "to_bleoid")
         return value
 
+class MessageDayTombstoneSerializer(serializers.Serializer):
+    """Serializer for deleted days and messages in the delta sync feed (read only)"""
+    from_bleoid = serializers.CharField(read_only=True)
+    to_bleoid = serializers.CharField(read_only=True, allow_null=True)
+    date = serializers.DateTimeField(read_only=True, format=ValidationRules.STANDARD_DATE_FORMAT)
+    message_id = serializers.IntegerField(read_only=True, allow_null=True)
+    deleted_at = serializers.DateTimeField(read_only=True)
+
 class ConnectionRequestSerializer(serializers.Serializer):
     """Serializer for connection requests"""
     from_bleoid = serializers.CharField(
@@ -408,6 +428,24 @@ class AppParametersSerializer(serializers.Serializer):
                     "param_value": f"Invalid debug level. Must be one of: {', '.join([level.value for level in DebugType])}"
                 })
         
+        # Validate log_sampling parameter
+        if param_name == AppParameters.PARAM_LOG_SAMPLING:
+            if not isinstance(param_value, dict):
+                raise serializers.ValidationError({"param_value": "Log sampling must be an object"})
+            rates = param_value.get('rates', {})
+            if not isinstance(rates, dict) or any(
+                isinstance(rate, bool) or not isinstance(rate, (int, float)) or not 0 <= rate <= 1
+                for rate in rates.values()
+            ):
+                raise serializers.ValidationError({"param_value": "Sampling rates must be numbers between 0 and 1"})
+        
+        # Validate log_retention_days parameter
+        if param_name == AppParameters.PARAM_LOG_RETENTION_DAYS:
+            try:
+                LogRetention.parse_days(param_value)
+            except ValueError as e:
+                raise serializers.ValidationError({"param_value": str(e)})
+        
         return data
 
 class EmailVerificationSerializer(serializers.Serializer):
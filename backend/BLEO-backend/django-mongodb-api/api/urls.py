@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.urls import path
 from api.Views.User.UserView import UserListCreateView, UserDetailView
+from api.Views.User.UserPictureView import UserPictureView
 from api.Views.Link.LinkView import LinkListCreateView, LinkDetailView
 from api.Views.MessagesDays.MessagesDaysView import MessageDayListCreateView, MessageDayDetailView, MoodOptionsView
 from api.Views.MessagesDays.MessagesDaysView import MessageDayCreateView
+from api.Views.MessagesDays.MessagesDaysSyncView import MessageDaySyncView
 from api.Views.MessagesDays.Message.MessageView import MessageOperationsView
 from auth.jwt_auth import CustomTokenObtainPairView
 from rest_framework_simplejwt.views import TokenRefreshView
@@ -11,13 +14,22 @@ from auth.password_reset import PasswordResetRequestView, PasswordResetConfirmVi
 from auth.email_verification import EmailVerificationView
 from auth.connection import ConnectionRequestView, ConnectionResponseView, ConnectionListView
 from auth.token_validation import TokenValidationView
-from api.Views.DebugLogs.DebugLogViews import LoggingView, AdminLogsView, AdminLogDetailView
+from api.Views.DebugLogs.DebugLogViews import LoggingView, AdminLogsView, AdminLogDetailView, AdminLogAnalyticsView, AdminLogExportView
 from api.Views.AppParameters.AppParametersView import AppParametersView, AppParameterDetailView
+from api.Views.Metrics.MetricsView import MetricsView
+
+if settings.ASYNC_VIEWS:
+    # ASGI deployment: same routes and names, served by the async views
+    from api.Views.MessagesDays.MessagesDaysAsyncView import AsyncMessageDayCreateView as MessageDayCreateView
+    from api.Views.MessagesDays.MessagesDaysAsyncView import AsyncMessageDayDetailView as MessageDayDetailView
+    from api.Views.MessagesDays.Message.MessageAsyncView import AsyncMessageOperationsView as MessageOperationsView
+    from auth.token_validation import AsyncTokenValidationView as TokenValidationView
 
 urlpatterns = [
     # User CRUD endpoints
     path('users/', UserListCreateView.as_view(), name='user-list-create'),
     path('users/<str:bleoid>/', UserDetailView.as_view(), name='user-detail'),  
+    path('users/<str:bleoid>/picture/', UserPictureView.as_view(), name='user-picture'),
 
     # Link CRUD endpoints
     path('links/', LinkListCreateView.as_view(), name='link-list-create'),
@@ -26,6 +38,8 @@ urlpatterns = [
     # MessagesDays CRUD endpoints - COLLECTION LEVEL
     path('messagesdays/', MessageDayListCreateView.as_view(), name='message-day-list'),
     path('messagesdays/<str:bleoid>/', MessageDayCreateView.as_view(), name='message-day-create-with-id'),  
+    # MessagesDays delta sync (before the detail route, which would take "sync" as a date)
+    path('messagesdays/<str:bleoid>/sync/', MessageDaySyncView.as_view(), name='message-day-sync'),
     # MessagesDays CRUD endpoints - INDIVIDUAL RESOURCE LEVEL
     path('messagesdays/<str:bleoid>/<str:date>/', MessageDayDetailView.as_view(), name='message-day-detail'),  
     
@@ -69,6 +83,8 @@ urlpatterns += [
     
     # Admin endpoints
     path('logs/admin/', AdminLogsView.as_view(), name='admin-logs'),
+    path('logs/admin/analytics/', AdminLogAnalyticsView.as_view(), name='admin-log-analytics'),
+    path('logs/admin/export/', AdminLogExportView.as_view(), name='admin-log-export'),
     path('logs/admin/<str:log_id>/', AdminLogDetailView.as_view(), name='admin-log-detail'),
 ]
 
@@ -76,4 +92,9 @@ urlpatterns += [
     # App Parameters endpoints
     path('app-parameters/', AppParametersView.as_view(), name='app-parameters'),
     path('app-parameters/<str:param_name>/', AppParameterDetailView.as_view(), name='app-parameter-detail'),
-]
\ No newline at end of file
+]
+
+urlpatterns += [
+    # Prometheus metrics scrape endpoint
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+]
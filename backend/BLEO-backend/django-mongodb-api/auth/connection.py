@@ -429,26 +429,37 @@ class ConnectionListView(APIView):
             # Get connections
             db_links = MongoDB.get_instance().get_collection('Links')
             connections = list(db_links.find(query))
-            
+
+            # Fetch every other party in a single query instead of one lookup per connection
+            other_ids = {
+                conn['bleoidPartner2'] if conn['bleoidPartner1'] == bleoid else conn['bleoidPartner1']
+                for conn in connections
+            }
+            other_users = {}
+            if other_ids:
+                db_users = MongoDB.get_instance().get_collection('Users')
+                for other_user in db_users.find(
+                    {"bleoid": {"$in": list(other_ids)}},
+                    {"bleoid": 1, "userName": 1, "profilePic": 1, "email": 1}
+                ):
+                    other_users[other_user['bleoid']] = other_user
+
             # Enrich connections with user info
             for conn in connections:
                 conn['_id'] = str(conn['_id'])
-                
+
                 # Add user info for the other party in each connection
                 other_id = conn['bleoidPartner2'] if conn['bleoidPartner1'] == bleoid else conn['bleoidPartner1']
-                
-                # Get other user's name and profile pic
-                db_users = MongoDB.get_instance().get_collection('Users')
-                other_user = db_users.find_one({"bleoid": other_id}, {"userName": 1, "profilePic": 1, "email": 1})
-                
+                other_user = other_users.get(other_id)
+
                 if other_user:
                     other_user['_id'] = str(other_user.get('_id', ''))
-                    # Get profile picture in proper format
+                    # Lists show avatars: link the thumbnail rather than the full picture
                     user_serializer = UserSerializer(other_user)
                     conn['other_user'] = {
                         "bleoid": other_id,
                         "userName": other_user.get('userName', 'Unknown'),
-                        "profilePic": user_serializer.data.get('profilePic')
+                        "profilePic": user_serializer.data.get('profilePicThumb', user_serializer.data.get('profilePic'))
                     }
             
             # Use serializer for response with context
@@ -6,6 +6,7 @@ from utils.logger import Logger
 from models.enums.LogType import LogType
 from models.enums.ErrorSourceType import ErrorSourceType
 from utils.privacy_utils import PrivacyUtils
+from utils.jwt_keys import JWTKeyRing
 from services.EmailService import EmailService
 from api.serializers import (
     EmailVerificationRequestSerializer,
@@ -16,7 +17,6 @@ from django.conf import settings
 import jwt
 import uuid
 from datetime import datetime, timedelta, timezone
-import os
 from utils.validation_patterns import ValidationRules
 
 class EmailVerificationView(APIView):
@@ -80,27 +80,24 @@ class EmailVerificationView(APIView):
                 ).to_response(status.HTTP_200_OK)
             
             # Generate JWT token
+            jti = str(uuid.uuid4())
             payload = {
                 'bleoid': user['bleoid'],
                 'email': email,
                 'type': 'email_verification',
-                'jti': str(uuid.uuid4()),
+                'jti': jti,
                 'iat': datetime.now(timezone.utc).timestamp(),
                 'exp': (datetime.now(timezone.utc) + timedelta(hours=ValidationRules.JWT_EXPIRATION['email_verification'])).timestamp()
             }
             
-            verification_token = jwt.encode(
-                payload, 
-                os.getenv('JWT_SECRET'), 
-                algorithm='HS256'
-            )
+            verification_token = JWTKeyRing.encode(payload)
             
-            # Store verification token in database
+            # Store the token's jti in database; the signed token itself proves the rest
             db_email_verifications = MongoDB.get_instance().get_collection('EmailVerifications')
             verification_data = {
                 'bleoid': user['bleoid'],
                 'email': email,
-                'token': verification_token,
+                'jti': jti,
                 'created_at': datetime.now(timezone.utc),
                 'expires_at': datetime.now(timezone.utc) + timedelta(hours=ValidationRules.JWT_EXPIRATION['email_verification']),
                 'verified': False,
@@ -113,7 +110,7 @@ class EmailVerificationView(APIView):
             # Insert new verification record
             db_email_verifications.insert_one(verification_data)
             
-            # Send verification email
+            # Queue the verification email; the EmailOutbox worker delivers it
             try:
                 email_sent = EmailService.send_verification_email(
                     email=email,
@@ -126,7 +123,7 @@ class EmailVerificationView(APIView):
                     
             except Exception as e:
                 Logger.debug_error(
-                    f"Failed to send verification email to {masked_email}: {str(e)}",
+                    f"Failed to queue verification email to {masked_email}: {str(e)}",
                     500,
                     user['bleoid'],
                     ErrorSourceType.SERVER.value
@@ -138,7 +135,7 @@ class EmailVerificationView(APIView):
             
             # Log success
             Logger.debug_system_action(
-                f"Verification email sent successfully to {masked_email}",
+                f"Verification email queued for {masked_email}",
                 LogType.INFO.value,
                 200
             )
@@ -199,18 +196,17 @@ class EmailVerificationView(APIView):
             
             # Decode and validate JWT token
             try:
-                payload = jwt.decode(
-                    token, 
-                    os.getenv('JWT_SECRET'), 
-                    algorithms=['HS256']
-                )
+                payload = JWTKeyRing.decode(token)
                 
                 bleoid = payload.get('bleoid')
                 email = payload.get('email')
                 token_type = payload.get('type')
+                jti = payload.get('jti')
                 
                 if token_type != 'email_verification':
                     raise jwt.InvalidTokenError("Invalid token type")
+                if not jti:
+                    raise jwt.InvalidTokenError("Token has no jti")
                     
             except jwt.ExpiredSignatureError:
                 Logger.debug_error(
@@ -240,7 +236,7 @@ class EmailVerificationView(APIView):
             
             # Check if verification record exists
             db_email_verifications = MongoDB.get_instance().get_collection('EmailVerifications')
-            verification_record = db_email_verifications.find_one({'email': email, 'token': token})
+            verification_record = db_email_verifications.find_one({'jti': jti})
             
             if not verification_record:
                 Logger.debug_error(
@@ -312,7 +308,7 @@ class EmailVerificationView(APIView):
             
             # Update verification record
             db_email_verifications.update_one(
-                {"email": email, "token": token},
+                {"jti": jti},
                 {
                     "$set": {
                         "verified": True,
@@ -1,7 +1,8 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.contrib.auth.hashers import check_password
+from services.PasswordHashing import PasswordHashing, HashingBusyError
+from utils.login_throttle import LoginThrottle
 import jwt
 from datetime import datetime, timedelta, timezone
 from utils.mongodb_utils import MongoDB
@@ -11,7 +12,8 @@ from models.enums.LogType import LogType
 from models.enums.ErrorSourceType import ErrorSourceType
 import os
 from dotenv import load_dotenv
-from utils.jwt_utils import setup_jwt_secret
+from utils.jwt_utils import setup_jwt_secret, record_blacklist_check
+from utils.jwt_keys import JWTKeyRing
 import uuid
 from utils.privacy_utils import PrivacyUtils
 
@@ -22,11 +24,6 @@ jwt_setup = setup_jwt_secret()
 if not jwt_setup['success']:
     print(f"⚠️  JWT Secret setup warning: {jwt_setup['message']}")
 
-# Get JWT secret from environment
-JWT_SECRET = os.getenv('JWT_SECRET')
-if not JWT_SECRET:
-    raise ValueError("JWT_SECRET not found in environment variables. Please run setup_jwt_secret().")
-
 ACCESS_TOKEN_EXPIRE = int(os.getenv('ACCESS_TOKEN_EXPIRE', '15'))  # minutes
 REFRESH_TOKEN_EXPIRE = int(os.getenv('REFRESH_TOKEN_EXPIRE', '7'))  # days
 
@@ -36,6 +33,27 @@ class CustomTokenObtainPairView(APIView):
     def post(self, request):
         """Authenticate user and return token pair"""
         try:
+            email = request.data.get('email')
+            password = request.data.get('password')
+            client_ip = request.META.get('REMOTE_ADDR')
+            
+            # JSON bodies may carry any type: only strings reach the throttle keys and
+            # the user query (an object would be read as a query operator)
+            if any(value is not None and not isinstance(value, str) for value in (email, password)):
+                return BLEOResponse.validation_error(
+                    message="Email and password must be strings"
+                ).to_response(status.HTTP_400_BAD_REQUEST)
+            
+            # Throttled attempts stop here, before any log write, lookup or hash
+            retry_after = LoginThrottle.retry_after(client_ip, email)
+            if retry_after:
+                response = BLEOResponse.error(
+                    error_type="ThrottledError",
+                    error_message="Too many failed login attempts. Please try again later."
+                ).to_response(status.HTTP_429_TOO_MANY_REQUESTS)
+                response['Retry-After'] = str(retry_after)
+                return response
+            
             # Log request (don't log password)
             Logger.debug_system_action(
                 "Authentication request received",
@@ -43,9 +61,6 @@ class CustomTokenObtainPairView(APIView):
                 200
             )
             
-            email = request.data.get('email')
-            password = request.data.get('password')
-            
             # Mask email for logging
             masked_email = PrivacyUtils.mask_email(email) if email else "missing-email"
             
@@ -74,6 +89,8 @@ class CustomTokenObtainPairView(APIView):
             user = db.find_one({"email": email})
             
             if not user:
+                LoginThrottle.record_failure(client_ip, email)
+                
                 # Log user not found
                 Logger.debug_error(
                     f"Authentication failed: User not found for {masked_email}",
@@ -86,7 +103,10 @@ class CustomTokenObtainPairView(APIView):
                     message="Invalid credentials"
                 ).to_response(status.HTTP_401_UNAUTHORIZED)
                 
-            if not check_password(password, user['password']):
+            valid, upgraded_password = PasswordHashing.verify(password, user.get('password'))
+            if not valid:
+                LoginThrottle.record_failure(client_ip, email)
+                
                 # Log password mismatch
                 Logger.debug_error(
                     f"Authentication failed: Invalid password for {masked_email}",
@@ -99,6 +119,7 @@ class CustomTokenObtainPairView(APIView):
                     message="Invalid credentials"
                 ).to_response(status.HTTP_401_UNAUTHORIZED)
             
+            LoginThrottle.record_success(email)
             bleoid = user['bleoid']
             
             # Create tokens with proper timestamp handling
@@ -122,8 +143,8 @@ class CustomTokenObtainPairView(APIView):
                 'exp': int((now + timedelta(days=REFRESH_TOKEN_EXPIRE)).timestamp())
             }
             
-            access_token = jwt.encode(access_payload, JWT_SECRET, algorithm='HS256')
-            refresh_token = jwt.encode(refresh_payload, JWT_SECRET, algorithm='HS256')
+            access_token = JWTKeyRing.encode(access_payload)
+            refresh_token = JWTKeyRing.encode(refresh_payload)
             
             # Log token creation
             Logger.debug_user_action(
@@ -139,6 +160,13 @@ class CustomTokenObtainPairView(APIView):
                 {"$set": {"last_login": datetime.now()}}
             )
             
+            # Rehash with the current hasher; skipped if the password changed meanwhile
+            if upgraded_password:
+                db.update_one(
+                    {"_id": user["_id"], "password": user["password"]},
+                    {"$set": {"password": upgraded_password}}
+                )
+            
             # Log authentication success
             Logger.debug_user_action(
                 bleoid,
@@ -160,6 +188,14 @@ class CustomTokenObtainPairView(APIView):
                 message="Authentication successful"
             ).to_response()
             
+        except HashingBusyError as e:
+            Logger.debug_error(
+                f"Authentication rejected: {str(e)}",
+                503,
+                None,
+                ErrorSourceType.SERVER.value
+            )
+            return PasswordHashing.busy_response(e)
         except Exception as e:
             # Log server error
             Logger.debug_error(
@@ -232,7 +268,7 @@ class TokenRefreshView(APIView):
             
             # Verify token
             try:
-                payload = jwt.decode(refresh_token, JWT_SECRET, algorithms=['HS256'])
+                payload = JWTKeyRing.decode(refresh_token)
                 
                 bleoid = payload.get('bleoid')
                 email = payload.get('email')
@@ -248,7 +284,9 @@ class TokenRefreshView(APIView):
                 
                 # Check if token is blacklisted
                 db_blacklist = MongoDB.get_instance().get_collection('TokenBlacklist')
-                if db_blacklist.find_one({"token": refresh_token}):
+                is_blacklisted = db_blacklist.find_one({"token": refresh_token}) is not None
+                record_blacklist_check('token_refresh', is_blacklisted)
+                if is_blacklisted:
                     # Log blacklisted token
                     Logger.debug_error(
                         f"Token refresh failed: Token is blacklisted for {masked_email}",
@@ -298,7 +336,7 @@ class TokenRefreshView(APIView):
                 'exp': int((now + timedelta(minutes=ACCESS_TOKEN_EXPIRE)).timestamp())
             }
             
-            new_access_token = jwt.encode(access_payload, JWT_SECRET, algorithm='HS256')
+            new_access_token = JWTKeyRing.encode(access_payload)
             
             # Log success
             Logger.debug_user_action(
@@ -2,9 +2,9 @@ from rest_framework.views import APIView
 from rest_framework import status
 from utils.mongodb_utils import MongoDB
 from models.response.BLEOResponse import BLEOResponse
-from datetime import datetime
+from datetime import datetime, timezone
 import jwt
-from auth.jwt_auth import JWT_SECRET
+from utils.jwt_keys import JWTKeyRing
 from utils.logger import Logger
 from models.enums.LogType import LogType
 from models.enums.ErrorSourceType import ErrorSourceType
@@ -40,9 +40,9 @@ class LogoutView(APIView):
             
             try:
                 # Verify and get expiration from token
-                payload = jwt.decode(refresh_token, JWT_SECRET, algorithms=['HS256'])
+                payload = JWTKeyRing.decode(refresh_token)
                 exp_timestamp = payload['exp']
-                exp_date = datetime.fromtimestamp(exp_timestamp)
+                exp_date = datetime.fromtimestamp(exp_timestamp, timezone.utc)
                 
                 # Get bleoid for logging
                 bleoid = payload.get('bleoid')
@@ -100,7 +100,7 @@ class LogoutView(APIView):
             # Store the blacklisted token with expiry time
             db.insert_one({
                 "token": refresh_token,
-                "created_at": datetime.now(),
+                "created_at": datetime.now(timezone.utc),
                 "expires_at": exp_date
             })
             
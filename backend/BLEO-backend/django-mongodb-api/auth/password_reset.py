@@ -6,6 +6,7 @@ from utils.logger import Logger
 from models.enums.LogType import LogType
 from models.enums.ErrorSourceType import ErrorSourceType
 from utils.privacy_utils import PrivacyUtils
+from utils.jwt_keys import JWTKeyRing
 from services.EmailService import EmailService
 from models.PasswordResets import PasswordResets
 from api.serializers import (
@@ -14,11 +15,10 @@ from api.serializers import (
     PasswordResetResponseSerializer,
     PasswordResetTokenValidationSerializer  # Add this import
 )
-from django.contrib.auth.hashers import make_password
+from services.PasswordHashing import PasswordHashing, HashingBusyError
 from datetime import datetime, timedelta, timezone
 import jwt
 import uuid
-import os
 from utils.validation_patterns import ValidationRules
 
 class PasswordResetRequestView(APIView):
@@ -81,26 +81,24 @@ class PasswordResetRequestView(APIView):
             bleoid = user.get('bleoid')
             
             # Generate JWT token (same as email verification)
+            jti = str(uuid.uuid4())
             payload = {
                 'bleoid': bleoid,
                 'email': email,
                 'type': 'password_reset',
-                'jti': str(uuid.uuid4()),
+                'jti': jti,
                 'iat': datetime.now(timezone.utc).timestamp(),
                 'exp': (datetime.now(timezone.utc) + timedelta(hours=ValidationRules.JWT_EXPIRATION['password_reset'])).timestamp()
             }
             
-            reset_token = jwt.encode(
-                payload, 
-                os.getenv('JWT_SECRET'), 
-                algorithm='HS256'
-            )
+            reset_token = JWTKeyRing.encode(payload)
             
-            # Create PasswordResets model instance
+            # Create PasswordResets model instance; only the jti is stored, the signed token
+            # itself proves the rest
             password_reset = PasswordResets(
                 bleoid=bleoid,
                 email=email,
-                token=reset_token,
+                jti=jti,
                 created_at=datetime.now(timezone.utc),
                 expires_at=datetime.now(timezone.utc) + timedelta(hours=ValidationRules.JWT_EXPIRATION['password_reset']),
                 used=False,
@@ -116,7 +114,7 @@ class PasswordResetRequestView(APIView):
             # Insert new reset record using the model
             db_password_resets.insert_one(password_reset.to_dict())
             
-            # Send reset email using EmailService
+            # Queue the reset email; the EmailOutbox worker delivers it
             try:
                 email_sent = EmailService.send_password_reset_email(
                     email=email,
@@ -129,7 +127,7 @@ class PasswordResetRequestView(APIView):
                     
             except Exception as e:
                 Logger.debug_error(
-                    f"Failed to send password reset email to {masked_email}: {str(e)}",
+                    f"Failed to queue password reset email to {masked_email}: {str(e)}",
                     500,
                     bleoid,
                     ErrorSourceType.SERVER.value
@@ -149,7 +147,7 @@ class PasswordResetRequestView(APIView):
             
             # Log success
             Logger.debug_system_action(
-                f"Password reset email sent successfully to {masked_email}",
+                f"Password reset email queued for {masked_email}",
                 LogType.INFO.value,
                 200
             )
@@ -206,18 +204,17 @@ class PasswordResetConfirmView(APIView):
             
             # Decode and validate JWT token (same as email verification)
             try:
-                payload = jwt.decode(
-                    token, 
-                    os.getenv('JWT_SECRET'), 
-                    algorithms=['HS256']
-                )
+                payload = JWTKeyRing.decode(token)
                 
                 bleoid = payload.get('bleoid')
                 email = payload.get('email')
                 token_type = payload.get('type')
+                jti = payload.get('jti')
                 
                 if token_type != 'password_reset':
                     raise jwt.InvalidTokenError("Invalid token type")
+                if not jti:
+                    raise jwt.InvalidTokenError("Token has no jti")
                     
             except jwt.ExpiredSignatureError:
                 Logger.debug_error(
@@ -245,9 +242,9 @@ class PasswordResetConfirmView(APIView):
             
             masked_email = PrivacyUtils.mask_email(email)
             
-            # Get reset record and create model instance
+            # Get reset record and create model instance (signature already checked above)
             db_password_resets = MongoDB.get_instance().get_collection('PasswordResets')
-            reset_record_data = db_password_resets.find_one({'email': email, 'token': token})
+            reset_record_data = db_password_resets.find_one({'jti': jti})
             
             if not reset_record_data:
                 Logger.debug_error(
@@ -297,7 +294,7 @@ class PasswordResetConfirmView(APIView):
                 {"bleoid": bleoid, "email": email},
                 {
                     "$set": {
-                        "password": make_password(new_password),
+                        "password": PasswordHashing.make(new_password),
                         "password_reset_at": reset_time,
                         "updated_at": reset_time
                     }
@@ -321,7 +318,7 @@ class PasswordResetConfirmView(APIView):
             
             # Update the database record
             db_password_resets.update_one(
-                {"email": email, "token": token},
+                {"jti": jti},
                 {"$set": reset_record.to_dict()}
             )
             
@@ -362,6 +359,14 @@ class PasswordResetConfirmView(APIView):
                     data=response_data
                 ).to_response(status.HTTP_200_OK)
                 
+        except HashingBusyError as e:
+            Logger.debug_error(
+                f"Password reset rejected: {str(e)}",
+                503,
+                None,
+                ErrorSourceType.SERVER.value
+            )
+            return PasswordHashing.busy_response(e)
         except Exception as e:
             Logger.debug_error(
                 f"Password reset confirmation failed with error: {str(e)}",
@@ -380,8 +385,6 @@ class PasswordResetConfirmView(APIView):
             # Get token from query parameters
             token = request.query_params.get('token')
             
-            print(f"here1")
-
             # Use serializer for proper validation
             validate_data = {'token': token} if token else {}
             serializer = PasswordResetTokenValidationSerializer(data=validate_data)
@@ -397,23 +400,17 @@ class PasswordResetConfirmView(APIView):
             
             # Continue with JWT validation...
             try:
-                payload = jwt.decode(
-                    validated_token,
-                    os.getenv('JWT_SECRET'), 
-                    algorithms=['HS256']
-                )
+                payload = JWTKeyRing.decode(validated_token)
                 
                 token_type = payload.get('type')
                 if token_type != 'password_reset':
                     raise jwt.InvalidTokenError("Invalid token type")
-                
-                email = payload.get('email')
-                
-                print(f"here2")
+                if not payload.get('jti'):
+                    raise jwt.InvalidTokenError("Token has no jti")
 
                 # Get reset record and check using model
                 db_password_resets = MongoDB.get_instance().get_collection('PasswordResets')
-                reset_record_data = db_password_resets.find_one({'email': email, 'token': token})
+                reset_record_data = db_password_resets.find_one({'jti': payload['jti']})
                 
                 if not reset_record_data:
                     return BLEOResponse.validation_error(
@@ -428,8 +425,6 @@ class PasswordResetConfirmView(APIView):
                         message="Invalid or expired reset token"
                     ).to_response(status.HTTP_400_BAD_REQUEST)
                 
-                print(f"here3")
-
                 # Prepare structured response data
                 response_data = {
                     "token_valid": True,
@@ -438,8 +433,6 @@ class PasswordResetConfirmView(APIView):
                     "time_remaining_hours": max(0, (self._ensure_timezone_aware(reset_record.expires_at) - datetime.now(timezone.utc)).total_seconds() / 3600)
                 }
 
-                print(f"here4")
-                
                 return BLEOResponse.success(
                     message="Reset token is valid",
                     data=response_data
@@ -1,12 +1,18 @@
+import asyncio
+import datetime
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework import status
 from models.response.BLEOResponse import BLEOResponse
 import jwt
-from auth.jwt_auth import JWT_SECRET
+from utils.jwt_keys import JWTKeyRing
+from utils.jwt_utils import record_blacklist_check
 from utils.mongodb_utils import MongoDB
+from utils.mongodb_async import AsyncMongoDB
 from utils.logger import Logger
 from models.enums.LogType import LogType
 from models.enums.ErrorSourceType import ErrorSourceType
+from api.Views.AsyncAPIView import AsyncAPIView
 
 class TokenValidationView(APIView):
     """API view for validating tokens and checking login status"""
@@ -39,7 +45,7 @@ class TokenValidationView(APIView):
             # Verify token
             try:
                 # Decode token without verifying expiration first
-                payload = jwt.decode(token, JWT_SECRET, algorithms=['HS256'], options={"verify_exp": False})
+                payload = JWTKeyRing.decode(token, options={"verify_exp": False})
                 bleoid = payload.get("bleoid", "unknown")
                 
                 # Log token decode success
@@ -51,7 +57,9 @@ class TokenValidationView(APIView):
                 
                 # Check if token is blacklisted
                 db_blacklist = MongoDB.get_instance().get_collection('TokenBlacklist')
-                if db_blacklist.find_one({"token": token}):
+                is_blacklisted = db_blacklist.find_one({"token": token}) is not None
+                record_blacklist_check('token_validation', is_blacklisted)
+                if is_blacklisted:
                     # Log blacklisted token
                     Logger.debug_error(
                         f"Token validation failed: Token is blacklisted for bleoid: {bleoid}",
@@ -161,4 +169,156 @@ class TokenValidationView(APIView):
             
             return BLEOResponse.server_error(
                 message=f"Failed to validate token: {str(e)}"
-            ).to_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            ).to_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class AsyncTokenValidationView(AsyncAPIView):
+    """Async variant of TokenValidationView for the ASGI deployment"""
+
+    async def post(self, request):
+        """Check if a token is valid and return user information"""
+        try:
+            await Logger.run_async(
+                Logger.debug_system_action,
+                "Token validation request received",
+                LogType.INFO.value,
+                200
+            )
+
+            try:
+                data = self.parse_body(request)
+            except ValueError:
+                data = {}
+            token = data.get('token') if isinstance(data, dict) else None
+
+            if not token:
+                await Logger.run_async(
+                    Logger.debug_error,
+                    "Token validation failed: Token is missing",
+                    400,
+                    None,
+                    ErrorSourceType.SERVER.value
+                )
+
+                return BLEOResponse.validation_error(
+                    message="Token is required"
+                ).to_json_response(status.HTTP_400_BAD_REQUEST)
+
+            try:
+                # Signature is checked before any lookup for the token; off the event
+                # loop, as the key ring may reload from MongoDB
+                payload = await sync_to_async(JWTKeyRing.decode)(token, options={"verify_exp": False})
+            except jwt.InvalidTokenError as e:
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"Token validation failed: Invalid token - {str(e)}",
+                    401,
+                    None,
+                    ErrorSourceType.SERVER.value
+                )
+
+                return BLEOResponse.success(
+                    data={
+                        "is_logged_in": False,
+                        "reason": "invalid",
+                        "details": str(e)
+                    },
+                    message="Invalid token - user is logged out"
+                ).to_json_response()
+
+            bleoid = payload.get("bleoid", "unknown")
+
+            # Blacklist and user lookups are independent: run them concurrently
+            mongo = AsyncMongoDB.get_instance()
+            blacklisted, user = await asyncio.gather(
+                mongo.get_collection('TokenBlacklist').find_one({"token": token}, {"_id": 1}),
+                mongo.get_collection('Users').find_one({"bleoid": bleoid}, {"password": 0})
+            )
+            is_blacklisted = blacklisted is not None
+            record_blacklist_check('token_validation', is_blacklisted)
+
+            if is_blacklisted:
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"Token validation failed: Token is blacklisted for bleoid: {bleoid}",
+                    401,
+                    bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+
+                return BLEOResponse.success(
+                    data={
+                        "is_logged_in": False,
+                        "reason": "blacklisted"
+                    },
+                    message="Token is blacklisted - user is logged out"
+                ).to_json_response()
+
+            current_timestamp = datetime.datetime.now(tz=datetime.timezone.utc).timestamp()
+            if payload["exp"] < current_timestamp:
+                expires_str = datetime.datetime.fromtimestamp(payload["exp"]).isoformat()
+
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"Token validation failed: Token expired at {expires_str} for bleoid: {bleoid}",
+                    401,
+                    bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+
+                return BLEOResponse.success(
+                    data={
+                        "is_logged_in": False,
+                        "reason": "expired",
+                        "expiry": expires_str
+                    },
+                    message="Token has expired - user is logged out"
+                ).to_json_response()
+
+            if not user:
+                await Logger.run_async(
+                    Logger.debug_error,
+                    f"Token validation failed: User not found for bleoid: {bleoid}",
+                    404,
+                    bleoid,
+                    ErrorSourceType.SERVER.value
+                )
+
+                return BLEOResponse.success(
+                    data={
+                        "is_logged_in": False,
+                        "reason": "user_not_found"
+                    },
+                    message="User not found"
+                ).to_json_response()
+
+            user["_id"] = str(user["_id"])
+
+            await Logger.run_async(
+                Logger.debug_user_action,
+                bleoid,
+                "Token validation successful - user is logged in",
+                LogType.SUCCESS.value,
+                200
+            )
+
+            return BLEOResponse.success(
+                data={
+                    "is_logged_in": True,
+                    "user": user,
+                    "token_expiry": datetime.datetime.fromtimestamp(payload["exp"]).isoformat()
+                },
+                message="Token is valid - user is logged in"
+            ).to_json_response()
+
+        except Exception as e:
+            await Logger.run_async(
+                Logger.debug_error,
+                f"Token validation failed with error: {str(e)}",
+                500,
+                None,
+                ErrorSourceType.SERVER.value
+            )
+
+            return BLEOResponse.server_error(
+                message=f"Failed to validate token: {str(e)}"
+            ).to_json_response(status.HTTP_500_INTERNAL_SERVER_ERROR)
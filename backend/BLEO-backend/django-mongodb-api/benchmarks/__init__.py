@@ -0,0 +1 @@
+"""Load-testing and latency benchmark suite for the BLEO REST API"""
@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+from datetime import datetime
+
+
+class BaselineStore:
+    """Stores benchmark results as JSON baselines and compares new runs against them"""
+
+    DEFAULT_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+    COMPARED_METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'mongo_ops_per_request')
+
+    def __init__(self, directory=None):
+        self.directory = directory or self.DEFAULT_DIR
+
+    def path_for(self, name):
+        """Baseline file path for a profile name"""
+        return os.path.join(self.directory, f"{name}.json")
+
+    @staticmethod
+    def current_commit():
+        """Short hash of the checked-out commit, if git is available"""
+        try:
+            return subprocess.check_output(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                stderr=subprocess.DEVNULL,
+                cwd=os.path.dirname(__file__)
+            ).decode().strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def load(self, name):
+        """Load a stored baseline, or None if it does not exist"""
+        path = self.path_for(name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def save(self, name, results, settings):
+        """Write results as the new baseline for a profile"""
+        os.makedirs(self.directory, exist_ok=True)
+        baseline = {
+            'commit': self.current_commit(),
+            'recorded_at': datetime.now().isoformat(),
+            'settings': settings,
+            'results': results,
+        }
+        with open(self.path_for(name), 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        return baseline
+
+    def compare(self, baseline, results, tolerance=0.2):
+        """Return metrics that regressed by more than tolerance (fraction) against the baseline"""
+        regressions = []
+        for label, current in results.items():
+            previous = baseline.get('results', {}).get(label)
+            if not previous:
+                continue
+
+            for metric in self.COMPARED_METRICS:
+                before = previous.get(metric, 0)
+                after = current.get(metric, 0)
+                if before and after > before * (1 + tolerance):
+                    regressions.append({
+                        'label': label,
+                        'metric': metric,
+                        'baseline': before,
+                        'current': after,
+                        'change_pct': round((after - before) / before * 100, 1),
+                    })
+        return regressions
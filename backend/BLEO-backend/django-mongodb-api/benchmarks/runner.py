@@ -0,0 +1,120 @@
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.test import Client
+from utils.mongo_instrumentation import MongoInstrumentation
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class BenchmarkSession:
+    """Per-thread HTTP session that times requests and records samples"""
+
+    def __init__(self, recorder):
+        self.client = Client()
+        self.recorder = recorder
+
+    def request(self, label, method, path, data=None, expected=(200,)):
+        """Issue one request through the Django test client and record it"""
+        handler = getattr(self.client, method)
+
+        with MongoInstrumentation.track() as mongo_stats:
+            started = time.perf_counter()
+            if data is not None:
+                response = handler(path, data=data, content_type='application/json')
+            else:
+                response = handler(path)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.recorder.record(label, elapsed_ms, mongo_stats.commands, response.status_code in expected)
+        return response
+
+
+class SampleRecorder:
+    """Thread-safe collection of latency samples grouped by label"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.enabled = True
+
+    def record(self, label, elapsed_ms, commands, ok):
+        if not self.enabled:
+            return
+        with self._lock:
+            bucket = self.samples.setdefault(label, {'latencies': [], 'commands': 0, 'errors': 0})
+            bucket['latencies'].append(elapsed_ms)
+            bucket['commands'] += commands
+            if not ok:
+                bucket['errors'] += 1
+
+    def summarize(self, wall_seconds):
+        """Aggregate samples into latency percentiles and per-request Mongo ops"""
+        summary = {}
+        for label, bucket in self.samples.items():
+            latencies = sorted(bucket['latencies'])
+            count = len(latencies)
+            summary[label] = {
+                'requests': count,
+                'errors': bucket['errors'],
+                'p50_ms': round(percentile(latencies, 50), 2),
+                'p95_ms': round(percentile(latencies, 95), 2),
+                'p99_ms': round(percentile(latencies, 99), 2),
+                'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+                'mean_ms': round(sum(latencies) / count, 2) if count else 0.0,
+                'throughput_rps': round(count / wall_seconds, 2) if wall_seconds else 0.0,
+                'mongo_ops_per_request': round(bucket['commands'] / count, 2) if count else 0.0,
+            }
+        return summary
+
+
+class BenchmarkRunner:
+    """Runs scenarios at a fixed concurrency and reports latency percentiles"""
+
+    def __init__(self, fixture, concurrency=8, iterations=200, warmup=20):
+        self.fixture = fixture
+        self.concurrency = concurrency
+        self.iterations = iterations
+        self.warmup = warmup
+        self._local = threading.local()
+
+    def _session(self, recorder):
+        """One test client per worker thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None or session.recorder is not recorder:
+            session = BenchmarkSession(recorder)
+            self._local.session = session
+        return session
+
+    def run_scenario(self, scenario):
+        """Run warm-up iterations, then the measured iterations; return per-label stats"""
+        recorder = SampleRecorder()
+
+        def execute(iteration):
+            scenario.run(self._session(recorder), self.fixture, iteration)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            if self.warmup:
+                recorder.enabled = False
+                list(executor.map(execute, range(self.warmup)))
+                recorder.enabled = True
+
+            started = time.perf_counter()
+            list(executor.map(execute, range(self.warmup, self.warmup + self.iterations)))
+            wall_seconds = time.perf_counter() - started
+
+        return recorder.summarize(wall_seconds)
+
+    def run(self, scenarios):
+        """Run every scenario in order and merge their results"""
+        results = {}
+        for scenario in scenarios:
+            results.update(self.run_scenario(scenario))
+        return results
@@ -0,0 +1,188 @@
+from datetime import datetime
+from django.urls import reverse
+from utils.mongodb_utils import MongoDB
+from utils.validation_patterns import ValidationRules
+
+
+class Scenario:
+    """Base benchmark scenario driving real URL patterns through a session"""
+
+    name = None
+    description = ""
+
+    def run(self, session, fixture, iteration):
+        """Execute one iteration; every request goes through session.request()"""
+        raise NotImplementedError
+
+    @staticmethod
+    def pick_user(fixture, iteration):
+        """Pick a seeded user in round-robin order"""
+        users = fixture['users']
+        return users[iteration % len(users)]
+
+    @staticmethod
+    def pick_history_date(fixture, iteration):
+        """Pick a seeded history date formatted for URLs"""
+        dates = fixture['dates']
+        date = dates[(iteration * 7) % len(dates)]
+        return date.strftime(ValidationRules.STANDARD_DATE_FORMAT)
+
+
+class LoginScenario(Scenario):
+    """POST auth/login/ with valid credentials"""
+
+    name = "login"
+    description = "Password login returning an access/refresh token pair"
+
+    def run(self, session, fixture, iteration):
+        user = self.pick_user(fixture, iteration)
+        session.request(
+            "login",
+            "post",
+            reverse('token_obtain_pair'),
+            data={'email': user['email'], 'password': fixture['password']},
+            expected=(200,)
+        )
+
+
+class LoginBurstScenario(Scenario):
+    """Logins interleaved with cheap reads, to see whether hashing starves the reads"""
+
+    name = "login_burst"
+    description = "Half POST auth/login/, half GET connections/ on the same workers"
+
+    def run(self, session, fixture, iteration):
+        user = self.pick_user(fixture, iteration)
+        if iteration % 2:
+            session.request(
+                "login_burst_read",
+                "get",
+                f"{reverse('connection_list')}?bleoid={user['bleoid']}",
+                expected=(200,)
+            )
+        else:
+            session.request(
+                "login_burst_login",
+                "post",
+                reverse('token_obtain_pair'),
+                data={'email': user['email'], 'password': fixture['password']},
+                expected=(200,)
+            )
+
+
+class MessageDayCreateScenario(Scenario):
+    """POST messagesdays/<bleoid>/ for today's date"""
+
+    name = "message_day_create"
+    description = "Create today's MessagesDays document for a linked user"
+
+    def run(self, session, fixture, iteration):
+        user = self.pick_user(fixture, iteration)
+
+        # The view always writes today's date; clear it first (untimed) so the create never conflicts
+        now = datetime.now()
+        MongoDB.get_instance().get_collection('MessagesDays').delete_many({
+            'from_bleoid': user['bleoid'],
+            'date': datetime(now.year, now.month, now.day)
+        })
+
+        session.request(
+            "message_day_create",
+            "post",
+            reverse('message-day-create-with-id', kwargs={'bleoid': user['bleoid']}),
+            data={'mood': "Happy", 'energy_level': "High", 'pleasantness': "pleasant"},
+            expected=(201,)
+        )
+
+
+class MessageCrudScenario(Scenario):
+    """Create, list, update and delete one message on a seeded day"""
+
+    name = "message_crud"
+    description = "POST, GET, PUT and DELETE on messagesdays/<bleoid>/<date>/messages/"
+
+    def run(self, session, fixture, iteration):
+        user = self.pick_user(fixture, iteration)
+        date = self.pick_history_date(fixture, iteration)
+        list_url = reverse('message-operations', kwargs={'bleoid': user['bleoid'], 'date': date})
+
+        response = session.request(
+            "message_create",
+            "post",
+            list_url,
+            data={'title': "Bench", 'text': "Benchmark message", 'type': "Notes"},
+            expected=(201,)
+        )
+        session.request("message_list", "get", list_url, expected=(200,))
+
+        message_id = self._created_message_id(response)
+        if message_id is None:
+            return
+
+        detail_url = reverse(
+            'message-detail',
+            kwargs={'bleoid': user['bleoid'], 'date': date, 'message_id': message_id}
+        )
+        session.request(
+            "message_update",
+            "put",
+            detail_url,
+            data={'title': "Bench updated", 'text': "Benchmark message updated", 'type': "Notes"},
+            expected=(200,)
+        )
+        session.request("message_delete", "delete", detail_url, expected=(200,))
+
+    @staticmethod
+    def _created_message_id(response):
+        """Extract the id of the message appended by the POST"""
+        try:
+            messages = response.json()['data']['messages']
+            return max(message['id'] for message in messages)
+        except (ValueError, KeyError, TypeError):
+            return None
+
+
+class ConnectionListScenario(Scenario):
+    """GET connections/?bleoid=<bleoid>"""
+
+    name = "connection_list"
+    description = "List a user's connections with partner details"
+
+    def run(self, session, fixture, iteration):
+        user = self.pick_user(fixture, iteration)
+        session.request(
+            "connection_list",
+            "get",
+            f"{reverse('connection_list')}?bleoid={user['bleoid']}",
+            expected=(200,)
+        )
+
+
+class AdminLogsScenario(Scenario):
+    """GET logs/admin/ with and without filters"""
+
+    name = "admin_logs"
+    description = "Admin log listing, unfiltered and filtered by bleoid"
+
+    def run(self, session, fixture, iteration):
+        url = reverse('admin-logs')
+        if iteration % 2:
+            user = self.pick_user(fixture, iteration)
+            url = f"{url}?limit=50&bleoid={user['bleoid']}"
+        else:
+            url = f"{url}?limit=50"
+
+        session.request("admin_logs", "get", url, expected=(200,))
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        LoginScenario,
+        LoginBurstScenario,
+        MessageDayCreateScenario,
+        MessageCrudScenario,
+        ConnectionListScenario,
+        AdminLogsScenario,
+    )
+}
@@ -0,0 +1,145 @@
+import random
+import string
+from datetime import datetime, timedelta
+from django.contrib.auth.hashers import make_password
+from utils.mongodb_utils import MongoDB
+from models.User import User
+from models.Link import Link
+from models.MessagesDays import MessagesDays
+from models.enums.ConnectionStatusType import ConnectionStatusType
+from models.enums.MessageType import MessageType
+from models.enums.MoodType import MoodType
+from models.enums.EnergyLevelType import EnergyLevelType
+from models.enums.PleasantnessType import PleasantnessType
+
+
+class BenchmarkSeeder:
+    """Seeds users, accepted couples and MessagesDays history for benchmark runs"""
+
+    PASSWORD = "BenchPassword123!"
+    EMAIL_DOMAIN = "bench.bleo.test"
+    BATCH_SIZE = 1000
+
+    def __init__(self, users=100, years=1, messages_per_day=2, seed=42):
+        # Users are paired into couples, so keep an even number
+        self.user_count = max(2, users + (users % 2))
+        self.years = years
+        self.messages_per_day = messages_per_day
+        self.random = random.Random(seed)
+        self.mongo = MongoDB.get_instance()
+
+    def reset(self):
+        """Remove every document created by a previous seed run"""
+        for collection_key in ('Users', 'Links', 'MessagesDays', 'DebugLogs'):
+            self.mongo.get_collection(collection_key).delete_many({})
+
+    def seed(self):
+        """Create the dataset and return the fixture description used by scenarios"""
+        users = self._seed_users()
+        couples = self._seed_couples(users)
+        days = self._seed_message_days(couples)
+
+        return {
+            'password': self.PASSWORD,
+            'users': users,
+            'couples': couples,
+            'dates': days,
+        }
+
+    def _generate_bleoids(self):
+        """Generate unique deterministic BLEOIDs"""
+        chars = string.ascii_uppercase + string.digits
+        bleoids = set()
+        while len(bleoids) < self.user_count:
+            bleoids.add(''.join(self.random.choice(chars) for _ in range(6)))
+        return sorted(bleoids)
+
+    def _seed_users(self):
+        """Insert benchmark users sharing a single pre-computed password hash"""
+        # Hashing once keeps seeding fast; login still pays the full hash cost
+        hashed_password = make_password(self.PASSWORD)
+        users = []
+        documents = []
+
+        for index, bleoid in enumerate(self._generate_bleoids()):
+            email = f"bench_user_{index}@{self.EMAIL_DOMAIN}"
+            user = User(
+                bleoid=bleoid,
+                email=email,
+                password=hashed_password,
+                userName=f"BenchUser{index}",
+                email_verified=True
+            )
+            documents.append(user.to_dict())
+            users.append({'bleoid': bleoid, 'email': email})
+
+        self._insert_batched('Users', documents)
+        return users
+
+    def _seed_couples(self, users):
+        """Link consecutive users as accepted couples"""
+        couples = []
+        documents = []
+
+        for index in range(0, len(users) - 1, 2):
+            partner1 = users[index]['bleoid']
+            partner2 = users[index + 1]['bleoid']
+            link = Link(
+                bleoidPartner1=partner1,
+                bleoidPartner2=partner2,
+                status=ConnectionStatusType.ACCEPTED.value
+            )
+            documents.append(link.to_dict())
+            couples.append((partner1, partner2))
+
+        self._insert_batched('Links', documents)
+        return couples
+
+    def _seed_message_days(self, couples):
+        """Write one MessagesDays document per partner per day of history"""
+        today = datetime.now()
+        today = datetime(today.year, today.month, today.day)
+        dates = [today - timedelta(days=offset) for offset in range(1, int(365 * self.years) + 1)]
+
+        message_types = [message_type.value for message_type in MessageType]
+        moods = [mood.value for mood in MoodType]
+        energy_levels = [level.value for level in EnergyLevelType]
+        pleasantness_levels = [level.value for level in PleasantnessType]
+
+        documents = []
+        for partner1, partner2 in couples:
+            for from_bleoid, to_bleoid in ((partner1, partner2), (partner2, partner1)):
+                for date in dates:
+                    messages = [
+                        {
+                            'id': message_id,
+                            'title': f"Message {message_id}",
+                            'text': "Benchmark message body " * 4,
+                            'type': self.random.choice(message_types),
+                            'created_at': date
+                        }
+                        for message_id in range(1, self.messages_per_day + 1)
+                    ]
+                    message_day = MessagesDays(
+                        from_bleoid=from_bleoid,
+                        to_bleoid=to_bleoid,
+                        date=date,
+                        messages=messages,
+                        mood=self.random.choice(moods),
+                        energy_level=self.random.choice(energy_levels),
+                        pleasantness=self.random.choice(pleasantness_levels)
+                    )
+                    documents.append(message_day.to_dict())
+
+                    if len(documents) >= self.BATCH_SIZE:
+                        self._insert_batched('MessagesDays', documents)
+                        documents = []
+
+        self._insert_batched('MessagesDays', documents)
+        return dates
+
+    def _insert_batched(self, collection_key, documents):
+        """Insert documents in fixed-size batches"""
+        collection = self.mongo.get_collection(collection_key)
+        for start in range(0, len(documents), self.BATCH_SIZE):
+            collection.insert_many(documents[start:start + self.BATCH_SIZE], ordered=False)
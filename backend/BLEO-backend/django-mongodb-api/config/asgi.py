@@ -1,19 +1,31 @@
+"""
+ASGI config for the BLEO API.
+
+Serve with an ASGI server, e.g.:
+    uvicorn config.asgi:application --workers 2
+
+The hot endpoints (message-day read/create, message CRUD, token validation)
+are routed to their async views, which use pymongo's asyncio client, so one
+worker serves many concurrent I/O-bound requests. WebSocket connections are
+routed to api.routing (couple events).
+"""
 import os
-import django
-from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
 from django.core.asgi import get_asgi_application
-from django.urls import path
-from api import urls as api_urls
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
-django.setup()
+os.environ.setdefault('ASYNC_VIEWS', 'true')
+
+# Load the Django apps before importing consumers
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.security.websocket import AllowedHostsOriginValidator
+from api.routing import websocket_urlpatterns
 
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
-    "websocket": AuthMiddlewareStack(
-        URLRouter(
-            api_urls.websocket_urlpatterns
-        )
+    "http": django_asgi_app,
+    # Authentication happens in the consumer (JWT), not through sessions
+    "websocket": AllowedHostsOriginValidator(
+        URLRouter(websocket_urlpatterns)
     ),
-})
\ No newline at end of file
+})
@@ -27,6 +27,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'middleware.metrics_middleware.MetricsMiddleware',
+    'middleware.compression_middleware.CompressionMiddleware',
+    'middleware.mongo_instrumentation.MongoInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -37,6 +40,29 @@ MIDDLEWARE = [
     'middleware.token_validation.TokenBlacklistMiddleware',
 ]
 
+# Response compression (brotli needs the brotli package, gzip is always available).
+# Auth responses carry tokens and stay uncompressed (BREACH).
+COMPRESSION_MIN_BYTES = env.int('COMPRESSION_MIN_BYTES', 1024)
+COMPRESSION_BROTLI_QUALITY = env.int('COMPRESSION_BROTLI_QUALITY', 5)
+COMPRESSION_EXCLUDE_PATHS = env.list('COMPRESSION_EXCLUDE_PATHS', ['/api/auth/'])
+
+# Per-request MongoDB instrumentation (Server-Timing header and sampled summary logs)
+MONGO_SERVER_TIMING = env.bool('MONGO_SERVER_TIMING', True)
+MONGO_SUMMARY_LOG_SAMPLE_RATE = env.float('MONGO_SUMMARY_LOG_SAMPLE_RATE', 0.0)
+# Also count command/reply bytes; re-encodes every document to BSON, so leave it off outside debugging
+MONGO_COMMAND_BYTES = env.bool('MONGO_COMMAND_BYTES', False)
+
+# Metrics scrape endpoint (api/metrics/); set PROMETHEUS_MULTIPROC_DIR when running several workers
+METRICS_AUTH_TOKEN = env.str('METRICS_AUTH_TOKEN', '')
+
+# Client log ingestion (api/logs/): batch size limits and per-client entries per minute (0 disables)
+LOG_BATCH_MAX_ENTRIES = env.int('LOG_BATCH_MAX_ENTRIES', 100)
+LOG_BATCH_MAX_BYTES = env.int('LOG_BATCH_MAX_BYTES', 256 * 1024)
+LOG_CLIENT_ENTRIES_PER_MINUTE = env.int('LOG_CLIENT_ENTRIES_PER_MINUTE', 600)
+
+# DebugLogs retention seeded into the log_retention_days AppParameter on first startup (0 keeps logs forever)
+LOG_RETENTION_DAYS = env.int('LOG_RETENTION_DAYS', 0)
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -56,6 +82,95 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Route the hot endpoints to their async views (config.asgi turns this on)
+ASYNC_VIEWS = env.bool('ASYNC_VIEWS', False)
+
+# MessagesDays delta sync: changes newer than the settle window are re-sent on the
+# next sync, and clients whose watermark is older than the tombstone retention resync
+MESSAGE_SYNC_SETTLE_SECONDS = env.int('MESSAGE_SYNC_SETTLE_SECONDS', 5)
+MESSAGE_SYNC_TOMBSTONE_RETENTION_DAYS = env.int('MESSAGE_SYNC_TOMBSTONE_RETENTION_DAYS', 90)
+
+# Profile pictures (see utils/profile_pictures.py): uploads larger than these are rejected
+PROFILE_PIC_MAX_BYTES = env.int('PROFILE_PIC_MAX_BYTES', 5 * 1024 * 1024)
+PROFILE_PIC_MAX_PIXELS = env.int('PROFILE_PIC_MAX_PIXELS', 40_000_000)
+
+# Token records (utils/token_sweeper.py). TokenBlacklist entries expire with their
+# refresh token. Used/verified PasswordResets and EmailVerifications are kept for
+# TOKEN_AUDIT_RETENTION_DAYS after expiry (TTL index); unused expired ones are
+# removed by the sweeper in chunks of TOKEN_SWEEP_CHUNK_SIZE.
+TOKEN_AUDIT_RETENTION_DAYS = env.int('TOKEN_AUDIT_RETENTION_DAYS', 30)
+TOKEN_SWEEP_CHUNK_SIZE = env.int('TOKEN_SWEEP_CHUNK_SIZE', 500)
+
+# Account deletion (services/AccountDeletion.py). On a replica set, accounts up to
+# ACCOUNT_DELETION_TRANSACTION_MAX_DOCS are deleted in one transaction; otherwise a
+# resumable job deletes in chunks. The DELETE request runs at most
+# ACCOUNT_DELETION_INLINE_CHUNKS chunks, and the rest is finished in the background.
+ACCOUNT_DELETION_TRANSACTION_MAX_DOCS = env.int('ACCOUNT_DELETION_TRANSACTION_MAX_DOCS', 5000)
+ACCOUNT_DELETION_CHUNK_SIZE = env.int('ACCOUNT_DELETION_CHUNK_SIZE', 1000)
+ACCOUNT_DELETION_INLINE_CHUNKS = env.int('ACCOUNT_DELETION_INLINE_CHUNKS', 20)
+ACCOUNT_DELETION_LEASE_SECONDS = env.int('ACCOUNT_DELETION_LEASE_SECONDS', 300)
+
+# Password hashing (services/PasswordHashing.py). Hashes run in PASSWORD_HASH_WORKERS
+# processes (0 = in the request thread). Past PASSWORD_HASH_MAX_PENDING queued
+# hashes, a request waits PASSWORD_HASH_WAIT_SECONDS for a slot and then gets a 503.
+PASSWORD_HASH_WORKERS = env.int('PASSWORD_HASH_WORKERS', 2)
+PASSWORD_HASH_MAX_PENDING = env.int('PASSWORD_HASH_MAX_PENDING', 16)
+PASSWORD_HASH_WAIT_SECONDS = env.float('PASSWORD_HASH_WAIT_SECONDS', 2.0)
+
+# Login throttling (utils/login_throttle.py). Failed logins are counted over a sliding
+# LOGIN_THROTTLE_WINDOW_SECONDS per client IP and per email; past the limits, logins get a
+# 429 before any lookup. LOGIN_THROTTLE_STORE: 'local' (per process), 'mongo' (shared) or 'off'.
+LOGIN_THROTTLE_STORE = env.str('LOGIN_THROTTLE_STORE', 'local')
+LOGIN_THROTTLE_WINDOW_SECONDS = env.int('LOGIN_THROTTLE_WINDOW_SECONDS', 900)
+LOGIN_THROTTLE_MAX_PER_IP = env.int('LOGIN_THROTTLE_MAX_PER_IP', 50)
+LOGIN_THROTTLE_MAX_PER_EMAIL = env.int('LOGIN_THROTTLE_MAX_PER_EMAIL', 10)
+
+# JWT signing keys (utils/jwt_keys.py). Tokens carry the kid of the key that signed
+# them. Every process keeps the current key and JWT_KEY_RING_SIZE previous ones from
+# the JWTKeys collection, re-read every JWT_KEY_RELOAD_SECONDS. JWT_SECRET seeds an
+# empty collection and verifies tokens issued without a kid.
+JWT_SECRET = env.str('JWT_SECRET', '')
+JWT_KEY_RING_SIZE = env.int('JWT_KEY_RING_SIZE', 2)
+JWT_KEY_RELOAD_SECONDS = env.int('JWT_KEY_RELOAD_SECONDS', 30)
+
+# SMTP (services/EmailService.py). Sessions are pooled by services/SMTPPool.py:
+# up to SMTP_POOL_SIZE logged-in sessions are kept, NOOP-checked after
+# SMTP_POOL_CHECK_SECONDS idle and closed after SMTP_POOL_MAX_IDLE_SECONDS.
+SMTP_SERVER = env.str('SMTP_SERVER', 'smtp.gmail.com')
+SMTP_PORT = env.int('SMTP_PORT', 587)
+SMTP_USERNAME = env.str('SMTP_USERNAME', '')
+SMTP_PASSWORD = env.str('SMTP_PASSWORD', '')
+SMTP_USE_TLS = env.bool('SMTP_USE_TLS', True)
+SMTP_TIMEOUT_SECONDS = env.int('SMTP_TIMEOUT_SECONDS', 30)
+FROM_EMAIL = env.str('FROM_EMAIL', '')
+SMTP_POOL_SIZE = env.int('SMTP_POOL_SIZE', 4)
+SMTP_POOL_CHECK_SECONDS = env.int('SMTP_POOL_CHECK_SECONDS', 10)
+SMTP_POOL_MAX_IDLE_SECONDS = env.int('SMTP_POOL_MAX_IDLE_SECONDS', 60)
+
+# Email outbox (services/EmailOutbox.py). EMAIL_OUTBOX_WORKER picks who delivers:
+# 'thread' (a thread of each web process), 'celery' (tasks.email_tasks) or 'off'
+# (run `manage.py deliver_emails`). Failed sends retry with exponential backoff.
+EMAIL_OUTBOX_WORKER = env.str('EMAIL_OUTBOX_WORKER', 'thread')
+EMAIL_OUTBOX_BATCH_SIZE = env.int('EMAIL_OUTBOX_BATCH_SIZE', 50)
+EMAIL_OUTBOX_MAX_ATTEMPTS = env.int('EMAIL_OUTBOX_MAX_ATTEMPTS', 6)
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = env.int('EMAIL_OUTBOX_RETRY_BASE_SECONDS', 30)
+EMAIL_OUTBOX_LEASE_SECONDS = env.int('EMAIL_OUTBOX_LEASE_SECONDS', 120)
+EMAIL_OUTBOX_POLL_SECONDS = env.int('EMAIL_OUTBOX_POLL_SECONDS', 15)
+EMAIL_OUTBOX_RETENTION_DAYS = env.int('EMAIL_OUTBOX_RETENTION_DAYS', 7)
+
+# Couple WebSocket events. The in-memory layer only reaches sockets of the same
+# process; set CHANNEL_REDIS_URL (needs channels_redis) when running several workers.
+CHANNEL_REDIS_URL = env.str('CHANNEL_REDIS_URL', '')
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {'hosts': [CHANNEL_REDIS_URL]},
+    } if CHANNEL_REDIS_URL else {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    }
+}
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -138,4 +253,16 @@ CELERY_BEAT_SCHEDULE = {
          'task': 'tasks.jwt_rotation_tasks.check_jwt_rotation',
          'schedule': 86400.0,  # Run daily
      },
+     'deliver-email-outbox': {
+         'task': 'tasks.email_tasks.deliver_outbox',
+         'schedule': 60.0,  # Picks up retries; new emails trigger the task directly
+     },
+     'sweep-expired-tokens': {
+         'task': 'tasks.token_tasks.sweep_expired_tokens',
+         'schedule': 3600.0,  # Run hourly
+     },
+     'resume-account-deletions': {
+         'task': 'tasks.account_tasks.resume_account_deletions',
+         'schedule': 300.0,  # Finishes deletions cut short by a crash or the inline budget
+     },
  }
\ No newline at end of file
@@ -51,7 +51,7 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.SUCCESS(f"✅ {result['message']}"))
                 self.stdout.write(f"🔢 Rotation count: {result['rotation_count']}")
                 self.stdout.write(f"📅 Next rotation: {result['next_rotation']}")
-                self.stdout.write(f"🔒 Secret strength: {result['secret_strength']['strength']}")
+                self.stdout.write(f"🔑 Signing key id: {result['kid']}")
             else:
                 self.stdout.write(self.style.SUCCESS(f"ℹ️  {result['message']}"))
         else:
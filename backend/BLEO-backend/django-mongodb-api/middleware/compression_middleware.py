@@ -0,0 +1,130 @@
+import zlib
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+from utils.metrics import Metrics
+
+try:
+    import brotli
+except ImportError:  # Optional: without the brotli package only gzip is offered
+    brotli = None
+
+COMPRESSED_RESPONSES = Metrics.counter(
+    'bleo_http_compressed_responses_total',
+    'Responses compressed by content encoding',
+    labels=('encoding',)
+)
+COMPRESSION_SAVED_BYTES = Metrics.counter(
+    'bleo_http_compression_saved_bytes_total',
+    'Body bytes saved by compression (buffered responses only)',
+    labels=('encoding',)
+)
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip compression for text and JSON responses.
+
+    Buffered responses below COMPRESSION_MIN_BYTES are sent as is, since
+    compressing them costs more CPU than it saves on the wire. Streaming responses
+    (log exports) are gzipped as one stream, flushed after every chunk. Paths in COMPRESSION_EXCLUDE_PATHS
+    return secrets such as tokens and are never compressed (BREACH).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._compress(request, await self.get_response(request))
+
+    @staticmethod
+    def negotiate(accept_encoding, streaming=False):
+        """Best of br/gzip allowed by an Accept-Encoding header, or None"""
+        accepted = {}
+        for part in accept_encoding.split(','):
+            coding, _, params = part.partition(';')
+            coding = coding.strip().lower()
+            if not coding:
+                continue
+            quality = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[coding] = quality
+
+        # Server preference breaks ties: brotli compresses JSON noticeably better
+        candidates = ['br', 'gzip'] if brotli is not None and not streaming else ['gzip']
+        wildcard = accepted.get('*', 0.0)
+        scored = [(accepted.get(coding, wildcard), -rank, coding) for rank, coding in enumerate(candidates)]
+        quality, _, coding = max(scored)
+        return coding if quality > 0 else None
+
+    def _compressible(self, request, response):
+        if response.has_header('Content-Encoding') or response.status_code == 304:
+            return False
+        if any(request.path.startswith(prefix) for prefix in settings.COMPRESSION_EXCLUDE_PATHS):
+            return False
+        content_type = response.get('Content-Type', '').lower()
+        if not content_type.startswith(self.COMPRESSIBLE_TYPES):
+            return False
+        return response.streaming or len(response.content) >= settings.COMPRESSION_MIN_BYTES
+
+    def _compress(self, request, response):
+        if not self._compressible(request, response):
+            return response
+
+        # Caches must key on Accept-Encoding even when this client gets identity
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), response.streaming)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                original = response.streaming_content
+
+                async def gzip_chunks():
+                    # One gzip member for the whole body, like compress_sequence for sync streams
+                    compressor = zlib.compressobj(wbits=31)
+                    async for chunk in original:
+                        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                    yield compressor.flush()
+
+                response.streaming_content = gzip_chunks()
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            original_length = len(response.content)
+            if encoding == 'br':
+                compressed = brotli.compress(response.content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+            else:
+                compressed = compress_string(response.content)
+            if len(compressed) >= original_length:
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+            COMPRESSION_SAVED_BYTES.inc(original_length - len(compressed), encoding=encoding)
+
+        # The compressed body is another byte sequence, so the validator becomes weak
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        response['Content-Encoding'] = encoding
+        COMPRESSED_RESPONSES.inc(encoding=encoding)
+        return response
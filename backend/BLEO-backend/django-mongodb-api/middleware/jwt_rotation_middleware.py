@@ -26,13 +26,9 @@ class JWTRotationMiddleware:
         """Background rotation check"""
         try:
             if self.rotation_manager.needs_rotation():
-                Logger.log_system_event(
+                Logger.system_action(
                     "JWT secret rotation is due - consider running rotation command",
                     LogType.WARNING.value
                 )
         except Exception as e:
-            Logger.log_error(
-                "JWT_ROTATION_MIDDLEWARE",
-                f"Rotation check failed: {str(e)}",
-                LogType.ERROR.value
-            )
\ No newline at end of file
+            Logger.server_error(f"JWT rotation check failed: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,49 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from utils.metrics import Metrics
+
+REQUESTS = Metrics.counter(
+    'bleo_http_requests_total',
+    'HTTP requests by view, method and status class',
+    labels=('view', 'method', 'status')
+)
+REQUEST_LATENCY = Metrics.histogram(
+    'bleo_http_request_duration_seconds',
+    'HTTP request latency by view and method',
+    labels=('view', 'method')
+)
+
+class MetricsMiddleware:
+    """Middleware recording per-view request counts and latency histograms"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def _record(request, response, elapsed):
+        # Route names keep label cardinality bounded (no raw paths with ids)
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+
+        REQUESTS.inc(view=view, method=request.method, status=f"{response.status_code // 100}xx")
+        REQUEST_LATENCY.observe(elapsed, view=view, method=request.method)
@@ -0,0 +1,63 @@
+import random
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from utils.mongo_instrumentation import MongoInstrumentation
+from utils.logger import Logger
+from models.enums.LogType import LogType
+
+class MongoInstrumentationMiddleware:
+    """Middleware attributing MongoDB commands to each request"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'MONGO_SERVER_TIMING', True)
+        self.log_sample_rate = getattr(settings, 'MONGO_SUMMARY_LOG_SAMPLE_RATE', 0.0)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with MongoInstrumentation.track() as stats:
+            response = self.get_response(request)
+
+        self._add_server_timing(response, stats)
+
+        # Logged outside the tracked scope so the summary does not count itself
+        if self._sampled():
+            Logger.debug_system_action(*self._summary(request, response, stats))
+
+        return response
+
+    async def __acall__(self, request):
+        # The scope lives in a contextvar, so it follows the request across awaits
+        with MongoInstrumentation.track() as stats:
+            response = await self.get_response(request)
+
+        self._add_server_timing(response, stats)
+
+        if self._sampled():
+            await Logger.run_async(Logger.debug_system_action, *self._summary(request, response, stats))
+
+        return response
+
+    def _add_server_timing(self, response, stats):
+        if self.server_timing:
+            existing = response.get('Server-Timing')
+            timing = stats.server_timing()
+            response['Server-Timing'] = f"{existing}, {timing}" if existing else timing
+
+    def _sampled(self):
+        return self.log_sample_rate and random.random() < self.log_sample_rate
+
+    @staticmethod
+    def _summary(request, response, stats):
+        return (
+            f"{request.method} {request.path} -> {response.status_code}: {stats.summary()}",
+            LogType.DATABASE.value,
+            200
+        )
@@ -1,30 +1,64 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework import exceptions
 from django.utils.functional import SimpleLazyObject
 from utils.mongodb_utils import MongoDB
+from utils.mongodb_async import AsyncMongoDB
+from utils.jwt_utils import record_blacklist_check
 
 class TokenBlacklistMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
         self.jwt_auth = JWTAuthentication()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _bearer_token(request):
+        header = request.headers.get('Authorization')
+        if header and header.startswith('Bearer '):
+            return header.split(' ')[1]
+        return None
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
         # Only check on authenticated endpoints
         if 'Authorization' in request.headers:
             try:
                 # Extract token
-                header = request.headers.get('Authorization')
-                if header.startswith('Bearer '):
-                    token = header.split(' ')[1]
-                    
+                token = self._bearer_token(request)
+                if token:
                     # Check if token is blacklisted
                     db = MongoDB.get_instance().get_collection('TokenBlacklist')
-                    if db.find_one({"token": token}):
+                    is_blacklisted = db.find_one({"token": token}) is not None
+                    record_blacklist_check('middleware', is_blacklisted)
+                    if is_blacklisted:
                         raise exceptions.AuthenticationFailed('Token is blacklisted')
             except Exception:
-                # If any error occurs during token validation, 
+                # If any error occurs during token validation,
                 # we'll let the view handle authentication
                 pass
-                
+
         response = self.get_response(request)
-        return response
\ No newline at end of file
+        return response
+
+    async def __acall__(self, request):
+        if 'Authorization' in request.headers:
+            try:
+                token = self._bearer_token(request)
+                if token:
+                    db = AsyncMongoDB.get_instance().get_collection('TokenBlacklist')
+                    is_blacklisted = await db.find_one({"token": token}, {"_id": 1}) is not None
+                    record_blacklist_check('middleware', is_blacklisted)
+                    if is_blacklisted:
+                        raise exceptions.AuthenticationFailed('Token is blacklisted')
+            except Exception:
+                # As in the sync path, the view handles authentication
+                pass
+
+        return await self.get_response(request)
@@ -40,4 +40,6 @@ class AppParameters:
     
     # Common parameter names - constants for consistency
     PARAM_DEBUG_LEVEL = "debug_level"
-    PARAM_APP_VERSION = "app_version"
\ No newline at end of file
+    PARAM_APP_VERSION = "app_version"
+    PARAM_LOG_SAMPLING = "log_sampling"
+    PARAM_LOG_RETENTION_DAYS = "log_retention_days"
\ No newline at end of file
@@ -17,7 +17,8 @@ class DebugLogs:
         date: datetime = None,
         bleoid: Optional[str] = None,
         user_type: str = UserType.SYSTEM.value,
-        error_source: Optional[str] = None
+        error_source: Optional[str] = None,
+        repeat_count: int = 1
     ):
         # Validate and set required fields
         if id is None:
@@ -30,6 +31,7 @@ class DebugLogs:
         self.code = code
         self.user_type = user_type
         self.error_source = error_source
+        self.repeat_count = repeat_count
         self.bleoid = self._validate_and_normalize_bleoid(bleoid) if bleoid is not None else None
     
     @staticmethod
@@ -72,7 +74,8 @@ class DebugLogs:
             "code": self.code,
             "bleoid": self.bleoid,
             "user_type": self.user_type,
-            "error_source": self.error_source
+            "error_source": self.error_source,
+            "repeat_count": self.repeat_count
         }
     
     @classmethod
@@ -92,7 +95,8 @@ class DebugLogs:
             code=data.get('code', 200),
             bleoid=data.get('bleoid'),  # Will be validated in __init__ if not None
             user_type=data.get('user_type', UserType.SYSTEM.value),
-            error_source=data.get('error_source')
+            error_source=data.get('error_source'),
+            repeat_count=data.get('repeat_count', 1)
         )
     
     @classmethod
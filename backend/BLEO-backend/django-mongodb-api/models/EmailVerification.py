@@ -9,24 +9,26 @@ class EmailVerification:
     def __init__(self, 
                  bleoid: str,
                  email: str, 
-                 token: str,
+                 token: Optional[str] = None,
                  created_at: Optional[datetime] = None,
                  expires_at: Optional[datetime] = None,
                  verified: bool = False,
                  attempts: int = 0,
-                 verified_at: Optional[datetime] = None):
+                 verified_at: Optional[datetime] = None,
+                 jti: Optional[str] = None):
         """
         Initialize EmailVerification
         
         Args:
             bleoid (str): User's BLEO ID
             email (str): User's email address
-            token (str): JWT verification token
+            token (str, optional): JWT verification token (records written before v1.4.0)
             created_at (datetime, optional): When token was created
             expires_at (datetime, optional): When token expires
             verified (bool): Whether email has been verified
             attempts (int): Number of verification attempts
             verified_at (datetime, optional): When verification was completed
+            jti (str, optional): ID (jti claim) of the verification token, the record's key
         """
         # Add BLEOID validation and normalization
         self.bleoid = self._validate_and_normalize_bleoid(bleoid)
@@ -37,6 +39,7 @@ class EmailVerification:
         self.verified = verified
         self.attempts = attempts
         self.verified_at = verified_at
+        self.jti = jti
     
     @staticmethod
     def _validate_and_normalize_bleoid(bleoid: str) -> str:
@@ -55,16 +58,21 @@ class EmailVerification:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert EmailVerification to dictionary for MongoDB storage"""
-        return {
+        data = {
             'bleoid': self.bleoid,
             'email': self.email,
-            'token': self.token,
             'created_at': self.created_at,
             'expires_at': self.expires_at,
             'verified': self.verified,
             'attempts': self.attempts,
             'verified_at': self.verified_at
         }
+        # Records are keyed by jti; the signed token is only kept by legacy records
+        if self.jti:
+            data['jti'] = self.jti
+        if self.token:
+            data['token'] = self.token
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'EmailVerification':
@@ -72,19 +80,21 @@ class EmailVerification:
         bleoid = data.get('bleoid')
         email = data.get('email')
         token = data.get('token')
+        jti = data.get('jti')
         
         # Validate required fields
         if not bleoid:
             raise ValueError("bleoid is required")
         if not email:
             raise ValueError("email is required")
-        if not token:
-            raise ValueError("token is required")
+        if not token and not jti:
+            raise ValueError("token or jti is required")
             
         return cls(
             bleoid=bleoid,
             email=email,
             token=token,
+            jti=jti,
             created_at=data.get('created_at'),
             expires_at=data.get('expires_at'),
             verified=data.get('verified', False),
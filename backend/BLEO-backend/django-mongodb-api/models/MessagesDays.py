@@ -1,5 +1,5 @@
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from models.MessageInfos import MessageInfos
 from models.enums.MoodType import MoodType
 from models.enums.MoodQuadrantType import MoodQuadrantType
@@ -17,7 +17,9 @@ class MessagesDays:
         messages: List[Dict[str, Any]] = None,
         mood: str = None,
         energy_level: str = None,
-        pleasantness: str = None
+        pleasantness: str = None,
+        version: int = 1,
+        updated_at: datetime = None
     ):
         self.from_bleoid = self._validate_and_normalize_bleoid(from_bleoid, "from_bleoid")
         self.to_bleoid = self._validate_and_normalize_bleoid(to_bleoid, "to_bleoid")
@@ -31,6 +33,20 @@ class MessagesDays:
         self.mood = mood
         self._energy_level = energy_level
         self._pleasantness = pleasantness
+        self.version = version or 1
+        self.updated_at = updated_at or datetime.now(timezone.utc)
+    
+    @staticmethod
+    def touch(update: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the version bump and updated_at stamp to a MessagesDays update document.
+        
+        Every write to a message day goes through this so ETags stay in step
+        with the stored document.
+        """
+        touched = dict(update)
+        touched["$set"] = {**update.get("$set", {}), "updated_at": datetime.now(timezone.utc)}
+        touched["$inc"] = {**update.get("$inc", {}), "version": 1}
+        return touched
     
     @staticmethod
     def _validate_and_normalize_bleoid(value: str, field_name: str) -> str:
@@ -107,7 +123,9 @@ class MessagesDays:
             "messages": [msg.to_dict() for msg in self.messages],
             "mood": self.mood,
             "energy_level": self._energy_level,
-            "pleasantness": self._pleasantness
+            "pleasantness": self._pleasantness,
+            "version": self.version,
+            "updated_at": self.updated_at
         }
     
     @classmethod
@@ -128,5 +146,7 @@ class MessagesDays:
             messages=data.get("messages", []),
             mood=data.get("mood"),
             energy_level=data.get("energy_level"),
-            pleasantness=data.get("pleasantness")
+            pleasantness=data.get("pleasantness"),
+            version=data.get("version"),
+            updated_at=data.get("updated_at")
         )
\ No newline at end of file
@@ -5,19 +5,20 @@ import base64
 class PasswordResets:
     """Model for password reset tokens"""
     
-    def __init__(self, bleoid=None, email=None, token=None, created_at=None, expires_at=None, used=False, attempts=0, used_at=None):
+    def __init__(self, bleoid=None, email=None, token=None, created_at=None, expires_at=None, used=False, attempts=0, used_at=None, jti=None):
         """
         Initialize PasswordResets model
         
         Args:
             bleoid (str): User's BLEO identifier
             email (str): User's email address
-            token (str): JWT reset token
+            token (str): JWT reset token (records written before v1.4.0; new ones only keep jti)
             created_at (datetime): When the reset token was created
             expires_at (datetime): When the reset token expires
             used (bool): Whether the token has been used
             attempts (int): Number of reset attempts
             used_at (datetime): When the token was used
+            jti (str): ID (jti claim) of the reset token, the record's key
         """
         self.bleoid = bleoid
         self.email = email
@@ -27,19 +28,25 @@ class PasswordResets:
         self.used = used
         self.attempts = attempts
         self.used_at = used_at
+        self.jti = jti
     
     def to_dict(self):
         """Convert PasswordResets to dictionary for MongoDB storage"""
         data = {
             'bleoid': self.bleoid,
             'email': self.email,
-            'token': self.token,
             'created_at': self.created_at,
             'expires_at': self.expires_at,
             'used': self.used,
             'attempts': self.attempts
         }
         
+        # Records are keyed by jti; the signed token is only kept by legacy records
+        if self.jti:
+            data['jti'] = self.jti
+        if self.token:
+            data['token'] = self.token
+        
         # Only include used_at if it exists
         if self.used_at:
             data['used_at'] = self.used_at
@@ -57,7 +64,8 @@ class PasswordResets:
             expires_at=data.get('expires_at'),
             used=data.get('used', False),
             attempts=data.get('attempts', 0),
-            used_at=data.get('used_at')
+            used_at=data.get('used_at'),
+            jti=data.get('jti')
         )
     
     def is_expired(self):
@@ -94,4 +102,5 @@ class PasswordResets:
     
     def __repr__(self):
         """Detailed representation of PasswordResets"""
-        return f"PasswordResets(bleoid='{self.bleoid}', email='{self.email}', token='{self.token[:20]}...', created_at='{self.created_at}', expires_at='{self.expires_at}', used={self.used}, attempts={self.attempts})"
\ No newline at end of file
+        key = f"token='{self.token[:20]}...'" if self.token else f"jti='{self.jti}'"
+        return f"PasswordResets(bleoid='{self.bleoid}', email='{self.email}', {key}, created_at='{self.created_at}', expires_at='{self.expires_at}', used={self.used}, attempts={self.attempts})"
\ No newline at end of file
@@ -1,9 +1,8 @@
 from bson.binary import Binary
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from datetime import datetime
-import random
-import string
 import re
+from utils.bleoid_allocator import BleoidAllocator
 
 class User:
     """User schema"""
@@ -13,7 +12,7 @@ class User:
         email: str,
         password: str,
         userName: str = "NewUser",
-        profilePic: Optional[Binary] = None,
+        profilePic: Optional[Union[str, Binary]] = None,  # ProfilePictures reference (Binary before v1.3.0)
         email_verified: bool = False,
         last_login: Optional[datetime] = None,
         created_at: Optional[datetime] = None,
@@ -45,12 +44,8 @@ class User:
     
     @staticmethod
     def generate_bleoid() -> str:
-        """Generate a random bleoid with format XXXXXX that matches schema"""
-        chars = string.ascii_uppercase + string.digits
-        bleoid = ''.join(random.choice(chars) for _ in range(6))
-        # Ensure it matches the pattern (it should, but double-check)
-        User._validate_bleoid(bleoid)
-        return bleoid
+        """Generate a random bleoid with format XXXXXX; uniqueness comes from BleoidAllocator.insert"""
+        return BleoidAllocator.generate()
     
     def to_dict(self) -> Dict[str, Any]:
         return {
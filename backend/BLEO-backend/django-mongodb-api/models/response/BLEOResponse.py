@@ -1,6 +1,8 @@
 from typing import Any, Dict, Optional, TypeVar, Generic
+from django.http import JsonResponse
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
 
 T = TypeVar('T')
 
@@ -58,6 +60,16 @@ class BLEOResponse(Generic[T]):
         
         # Now convert to Response with the updated status
         return Response(self.to_dict(), status=status_code)
+
+    def to_json_response(self, status_code: int = None) -> JsonResponse:
+        """Convert to a plain Django JsonResponse (async views, outside DRF rendering)."""
+        if status_code is None:
+            status_code = status.HTTP_400_BAD_REQUEST if self.error_type else status.HTTP_200_OK
+        
+        self.status_code = status_code
+        
+        # DRF's encoder renders dates the same way as to_response
+        return JsonResponse(self.to_dict(), status=status_code, encoder=JSONEncoder)
     
     @classmethod
     def success(cls, data: T = None, message: str = "Operation successful") -> 'BLEOResponse[T]':
@@ -107,4 +119,9 @@ class BLEOResponse(Generic[T]):
     @classmethod
     def unauthorized(cls, message: str = "Unauthorized access") -> 'BLEOResponse[None]':
         """Create an unauthorized error response."""
-        return cls.error("UnauthorizedError", message)
\ No newline at end of file
+        return cls.error("UnauthorizedError", message)
+    
+    @classmethod
+    def busy(cls, message: str = "Server busy, retry shortly") -> 'BLEOResponse[None]':
+        """Create a response for work shed under load (send with 503 and Retry-After)."""
+        return cls.error("BusyError", message)
\ No newline at end of file
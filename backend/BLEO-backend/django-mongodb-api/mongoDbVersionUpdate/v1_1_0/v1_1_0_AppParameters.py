@@ -0,0 +1,72 @@
+from django.conf import settings
+from models.AppParameters import AppParameters
+from utils.mongodb_utils import MongoDB
+from utils.logger import Logger
+from models.enums.LogType import LogType
+
+# Default DebugLogs sampling: every entry is kept, rate limits and aggregation are off.
+# Operators lower the rates or set the limits through the AppParameters API.
+DEFAULT_LOG_SAMPLING = {
+    'rates': {
+        LogType.INFO.value: 1.0,
+        LogType.SUCCESS.value: 1.0,
+        LogType.DATABASE.value: 1.0,
+        LogType.API.value: 1.0,
+        LogType.AUTH.value: 1.0,
+        LogType.WARNING.value: 1.0
+    },
+    'per_bleoid_per_minute': 0,
+    'per_template_per_minute': 0,
+    'burst': 30,
+    'aggregate_window_seconds': 0
+}
+
+def update_app_parameters():
+    """Create parameters introduced in v1.1.0 without overwriting existing values"""
+    try:
+        db = MongoDB.get_instance().get_collection('AppParameters')
+        
+        NEW_PARAMS = [
+            {
+                'param_name': AppParameters.PARAM_LOG_SAMPLING,
+                'param_value': DEFAULT_LOG_SAMPLING
+            },
+            {
+                'param_name': AppParameters.PARAM_LOG_RETENTION_DAYS,
+                # Seeded from LOG_RETENTION_DAYS (0 by default) so existing logs are not purged
+                'param_value': settings.LOG_RETENTION_DAYS
+            }
+        ]
+        
+        created_count = 0
+        
+        for param in NEW_PARAMS:
+            if db.find_one({"param_name": param['param_name']}):
+                continue
+            
+            # Get next available ID
+            highest_id = db.find_one(sort=[("id", -1)])
+            next_id = highest_id["id"] + 1 if highest_id and "id" in highest_id else 0
+            
+            db.insert_one({"id": next_id, **param})
+            created_count += 1
+            Logger.system_action(
+                f"[v1.1.0] Created parameter: {param['param_name']}",
+                LogType.INFO.value,
+                201
+            )
+        
+        return {
+            "success": True,
+            "created": created_count,
+            "updated": 0,
+            "message": f"App parameters initialized in v1.1.0: {created_count} created"
+        }
+        
+    except Exception as e:
+        Logger.server_error(f"[v1.1.0] Failed to initialize app parameters: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Failed to initialize app parameters in v1.1.0"
+        }
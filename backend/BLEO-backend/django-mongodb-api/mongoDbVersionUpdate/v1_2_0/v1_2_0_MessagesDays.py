@@ -0,0 +1,38 @@
+from utils.mongodb_utils import MongoDB
+from utils.logger import Logger
+from models.enums.LogType import LogType
+
+def backfill_message_days():
+    """Give message days written before v1.2.0 an updated_at so the delta sync feed includes them.
+
+    The day's own date stands in for the unknown last write. Only days missing
+    updated_at are touched, so this is safe to run on every startup.
+    """
+    try:
+        db = MongoDB.get_instance().get_collection('MessagesDays')
+
+        result = db.update_many(
+            {"updated_at": {"$exists": False}},
+            [{"$set": {"updated_at": "$date"}}]
+        )
+
+        if result.modified_count:
+            Logger.system_action(
+                f"[v1.2.0] Backfilled updated_at on {result.modified_count} message day(s)",
+                LogType.INFO.value,
+                200
+            )
+
+        return {
+            "success": True,
+            "updated": result.modified_count,
+            "message": f"Message days backfilled in v1.2.0: {result.modified_count} updated"
+        }
+
+    except Exception as e:
+        Logger.server_error(f"[v1.2.0] Failed to backfill message days: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Failed to backfill message days in v1.2.0"
+        }
@@ -0,0 +1,46 @@
+from utils.mongodb_utils import MongoDB
+from utils.profile_pictures import ProfilePictures
+from utils.logger import Logger
+from models.enums.LogType import LogType
+
+def move_profile_pictures():
+    """Move profile pictures stored inline in Users documents into ProfilePictures.
+
+    Each inline picture is re-encoded into its variants and replaced by the
+    reference. Pictures that cannot be decoded are dropped. Only documents still
+    holding binary data are touched, so this is safe to run on every startup.
+    """
+    try:
+        db = MongoDB.get_instance().get_collection('Users')
+        moved = 0
+        dropped = 0
+
+        for user in db.find({"profilePic": {"$type": "binData"}}, {"bleoid": 1, "profilePic": 1}):
+            try:
+                reference = ProfilePictures.store(user['bleoid'], bytes(user['profilePic']))
+                moved += 1
+            except ValueError:
+                reference = None
+                dropped += 1
+            db.update_one({"_id": user['_id']}, {"$set": {"profilePic": reference}})
+
+        if moved or dropped:
+            Logger.system_action(
+                f"[v1.3.0] Moved {moved} profile picture(s) to ProfilePictures, dropped {dropped} unreadable",
+                LogType.INFO.value,
+                200
+            )
+
+        return {
+            "success": True,
+            "updated": moved,
+            "message": f"Profile pictures moved in v1.3.0: {moved} moved, {dropped} dropped"
+        }
+
+    except Exception as e:
+        Logger.server_error(f"[v1.3.0] Failed to move profile pictures: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Failed to move profile pictures in v1.3.0"
+        }
@@ -0,0 +1,52 @@
+import jwt
+from utils.mongodb_utils import MongoDB
+from utils.logger import Logger
+from models.enums.LogType import LogType
+
+def key_token_records_by_jti():
+    """Replace the full JWT stored in PasswordResets/EmailVerifications records by its jti.
+
+    The jti is read without verifying the signature: the token was issued by
+    this server and only its ID is kept. Records whose token cannot be read
+    are deleted (the user requests a new email). Only records still holding a
+    token are touched, so this is safe to run on every startup.
+    """
+    try:
+        rekeyed = 0
+        dropped = 0
+
+        for key in ('PasswordResets', 'EmailVerifications'):
+            db = MongoDB.get_instance().get_collection(key)
+            for record in db.find({"token": {"$exists": True}}, {"token": 1}):
+                try:
+                    jti = jwt.decode(record['token'], options={"verify_signature": False}).get('jti')
+                except jwt.InvalidTokenError:
+                    jti = None
+
+                if jti:
+                    db.update_one({"_id": record['_id']}, {"$set": {"jti": jti}, "$unset": {"token": ""}})
+                    rekeyed += 1
+                else:
+                    db.delete_one({"_id": record['_id']})
+                    dropped += 1
+
+        if rekeyed or dropped:
+            Logger.system_action(
+                f"[v1.4.0] Rekeyed {rekeyed} token record(s) by jti, dropped {dropped} unreadable",
+                LogType.INFO.value,
+                200
+            )
+
+        return {
+            "success": True,
+            "updated": rekeyed,
+            "message": f"Token records rekeyed in v1.4.0: {rekeyed} rekeyed, {dropped} dropped"
+        }
+
+    except Exception as e:
+        Logger.server_error(f"[v1.4.0] Failed to rekey token records: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Failed to rekey token records in v1.4.0"
+        }
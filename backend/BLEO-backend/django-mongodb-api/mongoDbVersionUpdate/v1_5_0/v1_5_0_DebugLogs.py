@@ -0,0 +1,63 @@
+from pymongo.errors import OperationFailure
+from utils.mongodb_utils import MongoDB
+from utils.logger import Logger
+from models.enums.LogType import LogType
+
+def renumber_duplicate_log_ids():
+    """Give DebugLogs sharing an id (or without one) fresh ids, then build the unique id index.
+
+    Before the index, concurrent writers could allocate the same max(id) + 1.
+    The oldest log of each id keeps it, the others get ids after the current
+    maximum. Once the index exists nothing is scanned, so this is safe to run
+    on every startup.
+    """
+    try:
+        mongo = MongoDB.get_instance()
+        try:
+            mongo.setup_log_id_index()
+            return {
+                "success": True,
+                "updated": 0,
+                "message": "DebugLogs ids already unique in v1.5.0"
+            }
+        except OperationFailure:
+            pass
+
+        db = mongo.get_collection('DebugLogs')
+        highest = db.find_one({"id": {"$type": "number"}}, sort=[("id", -1)])
+        next_id = highest["id"] + 1 if highest else 1
+
+        renumbered = 0
+        duplicates = db.aggregate([
+            {"$group": {"_id": "$id", "logs": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"$or": [{"count": {"$gt": 1}}, {"_id": None}]}}
+        ], allowDiskUse=True)
+        for group in duplicates:
+            logs = sorted(group['logs'])
+            # Logs without an id have nothing to keep
+            for log_id in (logs if group['_id'] is None else logs[1:]):
+                db.update_one({"_id": log_id}, {"$set": {"id": next_id}})
+                next_id += 1
+                renumbered += 1
+
+        mongo.setup_log_id_index()
+
+        Logger.system_action(
+            f"[v1.5.0] Renumbered {renumbered} duplicate DebugLogs id(s) and built the unique id index",
+            LogType.DATABASE.value,
+            200
+        )
+
+        return {
+            "success": True,
+            "updated": renumbered,
+            "message": f"DebugLogs ids made unique in v1.5.0: {renumbered} renumbered"
+        }
+
+    except Exception as e:
+        Logger.server_error(f"[v1.5.0] Failed to renumber duplicate DebugLogs ids: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Failed to renumber duplicate DebugLogs ids in v1.5.0"
+        }
@@ -0,0 +1,231 @@
+from datetime import datetime, timedelta, timezone
+from django.conf import settings
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from utils.mongodb_utils import MongoDB
+from utils.message_sync import MessageSync
+from utils.logger import Logger
+from utils.metrics import Metrics
+from models.enums.LogType import LogType
+
+ACCOUNT_DELETIONS = Metrics.counter(
+    'bleo_account_deletions_total',
+    'User account deletions by mode (transaction, job) and outcome (done, pending)',
+    labels=('mode', 'result')
+)
+
+class AccountDeletion:
+    """Deletes a user and everything they own.
+
+    Owned data: the Users document, the Links the user is part of (either
+    side: the schema has no partnerless link), MessagesDays written by or to them (with sync
+    tombstones so the partner's devices drop those days), profile pictures,
+    reset/verification records, queued emails and DebugLogs.
+
+    On a replica set, accounts up to ACCOUNT_DELETION_TRANSACTION_MAX_DOCS
+    are deleted in one transaction. Otherwise the deletion is an
+    AccountDeletions job: the Users document goes first (the account is gone
+    at once), then every step deletes in chunks of ACCOUNT_DELETION_CHUNK_SIZE
+    and records its progress. Each step is idempotent, so a job cut short by
+    a crash or by the max_chunks budget is simply run again (see resume).
+    Finished jobs are removed.
+    """
+
+    RUNNING = 'running'
+
+    # Step names in execution order; the Users document always goes first
+    STEPS = ('user', 'links', 'message_days', 'profile_pictures', 'password_resets',
+             'email_verifications', 'email_outbox', 'debug_logs')
+
+    # Steps that delete every document matching one query: step -> (collection key, query builder)
+    BULK_STEPS = {
+        'profile_pictures': ('ProfilePictures', lambda job: {"bleoid": job['bleoid']}),
+        'password_resets': ('PasswordResets', lambda job: {"bleoid": job['bleoid']}),
+        'email_verifications': ('EmailVerifications', lambda job: {"bleoid": job['bleoid']}),
+        'email_outbox': ('EmailOutbox', lambda job: {"to_email": job['email']}),
+        'debug_logs': ('DebugLogs', lambda job: {"bleoid": job['bleoid']}),
+    }
+
+    _transactions_supported = None
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc)
+
+    @classmethod
+    def supports_transactions(cls):
+        """True when the server is a replica set member or mongos (checked once)"""
+        if cls._transactions_supported is None:
+            try:
+                hello = MongoDB.get_client().admin.command('hello')
+                cls._transactions_supported = bool(hello.get('setName')) or hello.get('msg') == 'isdbgrid'
+            except Exception:
+                cls._transactions_supported = False
+        return cls._transactions_supported
+
+    @staticmethod
+    def delete_user(bleoid, max_chunks=None):
+        """Delete bleoid's account.
+
+        Returns None when neither the user nor an unfinished job exists,
+        otherwise a dict with the mode, whether everything is deleted, and
+        the deleted counts per step. With max_chunks, a job stops after that
+        many chunks and is left for resume().
+        """
+        mongo = MongoDB.get_instance()
+        user = mongo.get_collection('Users').find_one({"bleoid": bleoid}, {"bleoid": 1, "email": 1})
+        if user is None:
+            job = mongo.get_collection('AccountDeletions').find_one({"bleoid": bleoid, "status": AccountDeletion.RUNNING})
+            return AccountDeletion._run_job(job, max_chunks) if job else None
+
+        if AccountDeletion.supports_transactions() and \
+                AccountDeletion._size(bleoid) <= settings.ACCOUNT_DELETION_TRANSACTION_MAX_DOCS:
+            return AccountDeletion._run_transaction(user)
+        return AccountDeletion._run_job(AccountDeletion._start_job(user), max_chunks)
+
+    @staticmethod
+    def resume(max_chunks=None):
+        """Finish the jobs left running (crashed or over budget); returns the number finished"""
+        db = MongoDB.get_instance().get_collection('AccountDeletions')
+        stale = AccountDeletion._now() - timedelta(seconds=settings.ACCOUNT_DELETION_LEASE_SECONDS)
+        finished = 0
+        while True:
+            # Lease the job so two workers don't run it side by side
+            job = db.find_one_and_update(
+                {"status": AccountDeletion.RUNNING, "updated_at": {"$lt": stale}},
+                {"$set": {"updated_at": AccountDeletion._now()}},
+                return_document=ReturnDocument.AFTER
+            )
+            if job is None:
+                return finished
+            if AccountDeletion._run_job(job, max_chunks)['complete']:
+                finished += 1
+
+    @staticmethod
+    def _size(bleoid):
+        """Documents the deletion would touch, bar the small per-user collections"""
+        mongo = MongoDB.get_instance()
+        return (mongo.get_collection('MessagesDays').count_documents(MessageSync.scope(bleoid)) +
+                mongo.get_collection('DebugLogs').count_documents({"bleoid": bleoid}))
+
+    @staticmethod
+    def _run_transaction(user):
+        """Every step as one bulk operation inside a single transaction"""
+        job = {"bleoid": user['bleoid'], "email": user.get('email')}
+        counts = {}
+
+        def steps(session):
+            counts.clear()
+            for step in AccountDeletion.STEPS:
+                counts[step] = AccountDeletion._run_step(step, job, None, session)
+
+        with MongoDB.get_client().start_session() as session:
+            session.with_transaction(steps)
+
+        ACCOUNT_DELETIONS.inc(mode='transaction', result='done')
+        AccountDeletion._log(job, counts, 'transaction')
+        return {"mode": "transaction", "complete": True, "deleted": counts}
+
+    @staticmethod
+    def _start_job(user):
+        """Create the job of user, or pick up the one already running"""
+        db = MongoDB.get_instance().get_collection('AccountDeletions')
+        now = AccountDeletion._now()
+        try:
+            db.insert_one({
+                "bleoid": user['bleoid'],
+                "email": user.get('email'),
+                "status": AccountDeletion.RUNNING,
+                "completed_steps": [],
+                "deleted": {},
+                "created_at": now,
+                "updated_at": now
+            })
+        except DuplicateKeyError:
+            pass
+        return db.find_one({"bleoid": user['bleoid']})
+
+    @staticmethod
+    def _run_job(job, max_chunks):
+        """Run the remaining steps of job, in chunks, until done or out of budget"""
+        db = MongoDB.get_instance().get_collection('AccountDeletions')
+        deleted = dict(job.get('deleted') or {})
+        budget = [max_chunks]
+
+        for step in AccountDeletion.STEPS:
+            if step in job.get('completed_steps', []):
+                continue
+            count, complete = AccountDeletion._run_step_chunked(step, job, budget)
+            deleted[step] = deleted.get(step, 0) + count
+            update = {"$set": {"deleted": deleted, "updated_at": AccountDeletion._now()}}
+            if complete:
+                update["$addToSet"] = {"completed_steps": step}
+            db.update_one({"_id": job['_id']}, update)
+            if not complete:
+                ACCOUNT_DELETIONS.inc(mode='job', result='pending')
+                return {"mode": "job", "complete": False, "deleted": deleted}
+
+        db.delete_one({"_id": job['_id']})
+        ACCOUNT_DELETIONS.inc(mode='job', result='done')
+        AccountDeletion._log(job, deleted, 'job')
+        return {"mode": "job", "complete": True, "deleted": deleted}
+
+    @staticmethod
+    def _run_step_chunked(step, job, budget):
+        """Run step chunk by chunk while budget[0] (chunks left, None = unlimited) allows.
+
+        Returns (deleted, complete).
+        """
+        chunk_size = settings.ACCOUNT_DELETION_CHUNK_SIZE
+        deleted = 0
+        while budget[0] is None or budget[0] > 0:
+            count = AccountDeletion._run_step(step, job, chunk_size)
+            deleted += count
+            if budget[0] is not None:
+                budget[0] -= 1
+            if count < chunk_size:
+                return deleted, True
+        return deleted, False
+
+    @staticmethod
+    def _run_step(step, job, limit=None, session=None):
+        """Run one step: everything when limit is None, else at most limit documents. Returns the count."""
+        mongo = MongoDB.get_instance()
+        bleoid = job['bleoid']
+
+        if step == 'user':
+            return mongo.get_collection('Users').delete_one({"bleoid": bleoid}, session=session).deleted_count
+
+        if step == 'links':
+            return mongo.get_collection('Links').delete_many(
+                {"$or": [{"bleoidPartner1": bleoid}, {"bleoidPartner2": bleoid}]}, session=session
+            ).deleted_count
+
+        if step == 'message_days':
+            db_days = mongo.get_collection('MessagesDays')
+            cursor = db_days.find(MessageSync.scope(bleoid), {'_id': 1, **MessageSync.DAY_KEY_PROJECTION}, session=session)
+            days = list(cursor.limit(limit) if limit else cursor)
+            if not days:
+                return 0
+            # Tombstones first: a crash in between only repeats them, which clients tolerate
+            tombstones = [tombstone for day in days for tombstone in MessageSync.tombstones(day)]
+            mongo.get_collection('MessagesDaysTombstones').insert_many(tombstones, session=session)
+            return db_days.delete_many({"_id": {"$in": [day['_id'] for day in days]}}, session=session).deleted_count
+
+        collection_key, query = AccountDeletion.BULK_STEPS[step]
+        collection = mongo.get_collection(collection_key)
+        if limit is None:
+            return collection.delete_many(query(job), session=session).deleted_count
+        ids = [doc['_id'] for doc in collection.find(query(job), {'_id': 1}).limit(limit)]
+        if not ids:
+            return 0
+        return collection.delete_many({"_id": {"$in": ids}}).deleted_count
+
+    @staticmethod
+    def _log(job, counts, mode):
+        Logger.debug_system_action(
+            f"Account {job['bleoid']} deleted ({mode}): " +
+            ", ".join(f"{step} {count}" for step, count in counts.items() if count),
+            LogType.SUCCESS.value,
+            200
+        )
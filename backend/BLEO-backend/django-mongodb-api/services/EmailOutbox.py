@@ -0,0 +1,243 @@
+import random
+import smtplib
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from django.conf import settings
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from services.EmailService import EmailService
+from utils.mongodb_utils import MongoDB
+from utils.logger import Logger
+from utils.metrics import Metrics
+from utils.privacy_utils import PrivacyUtils
+from models.enums.LogType import LogType
+from models.enums.ErrorSourceType import ErrorSourceType
+
+OUTBOX_DELIVERIES = Metrics.counter(
+    'bleo_email_outbox_deliveries_total',
+    'EmailOutbox delivery attempts by outcome',
+    labels=('result',)
+)
+
+class EmailOutbox:
+    """Persistent queue between the HTTP endpoints and SMTP.
+
+    Endpoints only insert a row (enqueue) and return. A worker claims due rows
+    with an atomic lease, sends a whole batch over one SMTP session and retries
+    failures with exponential backoff. The worker is a daemon thread of the web
+    process (EMAIL_OUTBOX_WORKER=thread), the deliver_outbox Celery task
+    (celery), or the deliver_emails management command (off).
+
+    Rows carry a unique idempotency_key: enqueueing the same key twice queues
+    one email. A crashed worker's lease expires and the rows are claimed again,
+    so delivery is at least once. Every claim counts as an attempt, so a row
+    that keeps crashing its worker fails after EMAIL_OUTBOX_MAX_ATTEMPTS, and
+    outcomes are only recorded while the worker still holds its lease. Bodies are cleared once a row is sent or
+    failed: reset and verification links stay valid for hours.
+    """
+
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    # Longest wait between two attempts
+    MAX_BACKOFF_SECONDS = 3600
+
+    # Set on rows that are done: their bodies are no longer needed
+    CLEARED_BODIES = {"html_content": None, "text_content": None}
+
+    _wakeup = threading.Event()
+    _worker = None
+    _worker_lock = threading.Lock()
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc)
+
+    @staticmethod
+    def enqueue(to_email, subject, html_content, text_content=None, idempotency_key=None):
+        """Queue an email; returns False when idempotency_key was already queued"""
+        now = EmailOutbox._now()
+        try:
+            MongoDB.get_instance().get_collection('EmailOutbox').insert_one({
+                "idempotency_key": idempotency_key or uuid.uuid4().hex,
+                "to_email": to_email,
+                "subject": subject,
+                "html_content": html_content,
+                "text_content": text_content,
+                "status": EmailOutbox.PENDING,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "locked_until": None,
+                "last_error": None,
+                "created_at": now,
+                "sent_at": None
+            })
+        except DuplicateKeyError:
+            return False
+
+        EmailOutbox.notify()
+        return True
+
+    @staticmethod
+    def notify():
+        """Get the configured worker to deliver new rows now rather than at its next poll"""
+        mode = settings.EMAIL_OUTBOX_WORKER
+        if mode == 'thread':
+            EmailOutbox.start_worker()
+            EmailOutbox._wakeup.set()
+        elif mode == 'celery':
+            from tasks.email_tasks import deliver_outbox
+            deliver_outbox.delay()
+
+    @staticmethod
+    def claim(limit):
+        """Lease up to limit due rows to this worker, counting an attempt for each"""
+        db = MongoDB.get_instance().get_collection('EmailOutbox')
+        now = EmailOutbox._now()
+        lease = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+        max_attempts = settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+
+        # Rows whose every attempt ended with the worker dying are not tried again
+        abandoned = db.update_many(
+            {"status": EmailOutbox.SENDING, "locked_until": {"$lt": now}, "attempts": {"$gte": max_attempts}},
+            {"$set": {"status": EmailOutbox.FAILED, "locked_until": None,
+                      "last_error": f"Lease expired on all {max_attempts} attempts", **EmailOutbox.CLEARED_BODIES}}
+        ).modified_count
+        if abandoned:
+            OUTBOX_DELIVERIES.inc(abandoned, result='failed')
+            Logger.debug_error(
+                f"{abandoned} email(s) failed: their lease expired on every attempt",
+                500,
+                None,
+                ErrorSourceType.SERVER.value
+            )
+
+        claimed = []
+        while len(claimed) < limit:
+            row = db.find_one_and_update(
+                {"$or": [
+                    {"status": EmailOutbox.PENDING, "next_attempt_at": {"$lte": now}},
+                    # Rows of a worker that died mid-batch
+                    {"status": EmailOutbox.SENDING, "locked_until": {"$lt": now}, "attempts": {"$lt": max_attempts}}
+                ]},
+                {"$set": {"status": EmailOutbox.SENDING, "locked_until": lease}, "$inc": {"attempts": 1}},
+                sort=[("next_attempt_at", 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if row is None:
+                break
+            claimed.append(row)
+        return claimed
+
+    @staticmethod
+    def deliver_pending(max_batches=None):
+        """Deliver due rows batch by batch until none is left; returns counts per outcome"""
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            rows = EmailOutbox.claim(settings.EMAIL_OUTBOX_BATCH_SIZE)
+            if not rows:
+                break
+            for outcome, count in EmailOutbox._deliver_batch(rows).items():
+                totals[outcome] += count
+            batches += 1
+
+        if any(totals.values()):
+            Logger.debug_system_action(
+                f"Email outbox delivered {totals['sent']}, retrying {totals['retried']}, failed {totals['failed']}",
+                LogType.INFO.value,
+                200
+            )
+        return totals
+
+    @staticmethod
+    def _deliver_batch(rows):
+        """Send rows over one pooled SMTP session and record each outcome"""
+        counts = {'sent': 0, 'retried': 0, 'failed': 0}
+        errors = EmailService.send_many([
+            (row['to_email'], row['subject'], row['html_content'], row.get('text_content'))
+            for row in rows
+        ])
+        for row, error in zip(rows, errors):
+            if error is None:
+                EmailOutbox._mark_sent(row)
+                counts['sent'] += 1
+            else:
+                # A refused recipient will be refused again: no point retrying
+                permanent = isinstance(error, smtplib.SMTPRecipientsRefused)
+                counts[EmailOutbox._retry(row, str(error), permanent)] += 1
+        return counts
+
+    @staticmethod
+    def _leased(row):
+        """Filter matching row only while this worker's lease on it holds"""
+        return {"_id": row['_id'], "locked_until": row['locked_until']}
+
+    @staticmethod
+    def _mark_sent(row):
+        MongoDB.get_instance().get_collection('EmailOutbox').update_one(
+            EmailOutbox._leased(row),
+            {"$set": {"status": EmailOutbox.SENT, "sent_at": EmailOutbox._now(), "locked_until": None, "last_error": None,
+                      **EmailOutbox.CLEARED_BODIES}}
+        )
+        OUTBOX_DELIVERIES.inc(result='sent')
+
+    @staticmethod
+    def backoff(attempts):
+        """Seconds to wait after the given number of failed attempts (with jitter)"""
+        delay = min(settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), EmailOutbox.MAX_BACKOFF_SECONDS)
+        return delay * random.uniform(0.8, 1.2)
+
+    @staticmethod
+    def _retry(row, error, permanent=False):
+        """Schedule the next attempt of row, or give up after EMAIL_OUTBOX_MAX_ATTEMPTS"""
+        # claim() already counted this attempt
+        attempts = row['attempts']
+        update = {"last_error": error, "locked_until": None}
+        if permanent or attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            update["status"] = EmailOutbox.FAILED
+            update.update(EmailOutbox.CLEARED_BODIES)
+            outcome = 'failed'
+            Logger.debug_error(
+                f"Email to {PrivacyUtils.mask_email(row['to_email'])} failed after {attempts} attempts: {error}",
+                500,
+                None,
+                ErrorSourceType.SERVER.value
+            )
+        else:
+            update["status"] = EmailOutbox.PENDING
+            update["next_attempt_at"] = EmailOutbox._now() + timedelta(seconds=EmailOutbox.backoff(attempts))
+            outcome = 'retried'
+
+        MongoDB.get_instance().get_collection('EmailOutbox').update_one(EmailOutbox._leased(row), {"$set": update})
+        OUTBOX_DELIVERIES.inc(result=outcome)
+        return outcome
+
+    @classmethod
+    def start_worker(cls):
+        """Start this process's delivery thread once"""
+        if cls._worker is not None and cls._worker.is_alive():
+            return
+        with cls._worker_lock:
+            if cls._worker is None or not cls._worker.is_alive():
+                cls._worker = threading.Thread(target=cls._run_worker, name='email-outbox', daemon=True)
+                cls._worker.start()
+
+    @classmethod
+    def _run_worker(cls):
+        while True:
+            # Polling also picks up retries and rows queued by other processes
+            cls._wakeup.wait(settings.EMAIL_OUTBOX_POLL_SECONDS)
+            cls._wakeup.clear()
+            try:
+                cls.deliver_pending()
+            except Exception as e:
+                Logger.debug_error(
+                    f"Email outbox worker error: {str(e)}",
+                    500,
+                    None,
+                    ErrorSourceType.SERVER.value
+                )
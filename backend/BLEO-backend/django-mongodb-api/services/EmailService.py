@@ -1,65 +1,175 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from html import escape
+from string import Template
+from textwrap import dedent
 from django.conf import settings
+from services.SMTPPool import SMTPPool
 from utils.logger import Logger
 from models.enums.LogType import LogType
-import os
+import hashlib
+
+class EmailTemplate:
+    """Email subject and bodies parsed once at import; render() only substitutes"""
+
+    def __init__(self, subject, html_content, text_content):
+        self.subject = subject
+        self.html = Template(dedent(html_content).strip())
+        self.text = Template(dedent(text_content).strip())
+
+    def render(self, **values):
+        """(subject, html, text) with values HTML-escaped in the HTML part"""
+        html_values = {key: escape(str(value)) for key, value in values.items()}
+        return self.subject, self.html.substitute(html_values), self.text.substitute(values)
+
+VERIFICATION_TEMPLATE = EmailTemplate(
+    "Verify Your BLEO Account",
+    """
+    <h2>Welcome to BLEO, $user_name!</h2>
+    <p>Please verify your email address to activate your account.</p>
+    <p><a href="$url" style="background: #4A90E2; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Verify Email</a></p>
+    <p>This link expires in 1 hours.</p>
+    """,
+    """
+    Welcome to BLEO, $user_name!
+
+    Please verify your email address: $url
+
+    This link expires in 1 hours.
+    """
+)
+
+PASSWORD_RESET_TEMPLATE = EmailTemplate(
+    "Reset Your BLEO Password",
+    """
+    <h2>Password Reset Request</h2>
+    <p>Hello $user_name,</p>
+    <p>You requested to reset your password for your BLEO account.</p>
+    <p><a href="$url" style="background: #E74C3C; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Reset Password</a></p>
+    <p>This link expires in 1 hours.</p>
+    <p>If you didn't request this reset, you can safely ignore this email.</p>
+    """,
+    """
+    Password Reset Request
+
+    Hello $user_name,
+
+    You requested to reset your password for your BLEO account.
+
+    Reset your password: $url
+
+    This link expires in 1 hours.
+
+    If you didn't request this reset, you can safely ignore this email.
+    """
+)
 
 class EmailService:
-    """Email service for sending verification emails"""
+    """Email service for sending verification emails.
+
+    The send_*_email helpers only write the message to the EmailOutbox; the
+    outbox worker delivers it with send_many over a pooled SMTP session.
+    """
     
     @staticmethod
-    def send_email(to_email, subject, html_content, text_content=None):
-        """Send email using SMTP"""
+    def connect():
+        """Open an SMTP session ready to send, or None when SMTP is not configured"""
+        if settings.SMTP_USE_TLS and (not settings.SMTP_USERNAME or not settings.SMTP_PASSWORD):
+            Logger.debug_error(
+                "Email sending failed: SMTP credentials not configured",
+                500,
+                None,
+                "SERVER"
+            )
+            return None
+        
+        server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
         try:
-            # Email configuration from environment variables
-            smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
-            smtp_port = int(os.getenv('SMTP_PORT', '587'))
-            smtp_username = os.getenv('SMTP_USERNAME')
-            smtp_password = os.getenv('SMTP_PASSWORD')
-            from_email = os.getenv('FROM_EMAIL', smtp_username)
-            
-            if not smtp_username or not smtp_password:
-                Logger.debug_error(
-                    "Email sending failed: SMTP credentials not configured",
-                    500,
-                    None,
-                    "SERVER"
-                )
-                return False
-            
-            # Create message
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = from_email
-            message['To'] = to_email
-            
-            # Add text and HTML content
-            if text_content:
-                text_part = MIMEText(text_content, 'plain')
-                message.attach(text_part)
-            
-            html_part = MIMEText(html_content, 'html')
-            message.attach(html_part)
-            
-            # Send email
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
+            if settings.SMTP_USE_TLS:
                 server.starttls()
-                server.login(smtp_username, smtp_password)
-                server.send_message(message)
-            
-            Logger.debug_system_action(
-                f"Email sent successfully to: {to_email[:3]}***@{to_email.split('@')[1]}",
-                LogType.SUCCESS.value,
-                200
+            # Local debugging servers speak plain SMTP without authentication
+            if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
+                server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    @staticmethod
+    def build_message(to_email, subject, html_content, text_content=None):
+        """MIME message with optional text and HTML parts"""
+        message = MIMEMultipart('alternative')
+        message['Subject'] = subject
+        message['From'] = settings.FROM_EMAIL or settings.SMTP_USERNAME
+        message['To'] = to_email
+        
+        # Add text and HTML content
+        if text_content:
+            message.attach(MIMEText(text_content, 'plain'))
+        message.attach(MIMEText(html_content, 'html'))
+        return message
+    
+    @staticmethod
+    def send_many(messages):
+        """Send (to_email, subject, html_content, text_content) tuples over one pooled session.
+
+        Returns one entry per message: None when it was sent, else the exception.
+        A dropped session is reopened once and the interrupted message resent.
+        """
+        errors = [None] * len(messages)
+        index = 0
+        reconnected = False
+        while index < len(messages):
+            try:
+                with SMTPPool.session() as server:
+                    while index < len(messages):
+                        try:
+                            server.send_message(EmailService.build_message(*messages[index]))
+                        except Exception as e:
+                            if SMTPPool.is_broken(e):
+                                raise
+                            errors[index] = e
+                        index += 1
+            except Exception as e:
+                if SMTPPool.is_broken(e) and not reconnected:
+                    reconnected = True
+                    continue
+                for failed in range(index, len(messages)):
+                    errors[failed] = e
+                break
+        return errors
+    
+    @staticmethod
+    def send_email(to_email, subject, html_content, text_content=None):
+        """Send email using SMTP right away"""
+        error = EmailService.send_many([(to_email, subject, html_content, text_content)])[0]
+        if error is not None:
+            Logger.debug_error(
+                f"Email sending failed: {str(error)}",
+                500,
+                None,
+                "SERVER"
             )
-            
+            return False
+        
+        Logger.debug_system_action(
+            f"Email sent successfully to: {to_email[:3]}***@{to_email.split('@')[1]}",
+            LogType.SUCCESS.value,
+            200
+        )
+        return True
+    
+    @staticmethod
+    def queue_email(to_email, subject, html_content, text_content=None, idempotency_key=None):
+        """Write the email to the outbox for background delivery"""
+        from services.EmailOutbox import EmailOutbox
+        try:
+            EmailOutbox.enqueue(to_email, subject, html_content, text_content, idempotency_key)
             return True
-            
         except Exception as e:
             Logger.debug_error(
-                f"Email sending failed: {str(e)}",
+                f"Email queueing failed: {str(e)}",
                 500,
                 None,
                 "SERVER"
@@ -67,59 +177,32 @@ class EmailService:
             return False
     
     @staticmethod
-    def send_verification_email(user_email, username, verification_token):
-        """Send email verification email"""
+    def send_verification_email(email, verification_token, user_name):
+        """Queue the email verification email"""
         base_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
-        verification_url = f"{base_url}/verify-email?token={verification_token}"
-        
-        subject = "Verify Your BLEO Account"
-        
-        html_content = f"""
-        <h2>Welcome to BLEO, {username}!</h2>
-        <p>Please verify your email address to activate your account.</p>
-        <p><a href="{verification_url}" style="background: #4A90E2; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Verify Email</a></p>
-        <p>This link expires in 1 hours.</p>
-        """
-        
-        text_content = f"""
-        Welcome to BLEO, {username}!
-        
-        Please verify your email address: {verification_url}
-        
-        This link expires in 1 hours.
-        """
-        
-        return EmailService.send_email(user_email, subject, html_content, text_content)
+        subject, html_content, text_content = VERIFICATION_TEMPLATE.render(
+            user_name=user_name,
+            url=f"{base_url}/verify-email?token={verification_token}"
+        )
+        return EmailService.queue_email(
+            email, subject, html_content, text_content,
+            idempotency_key=EmailService.token_key('verification', verification_token)
+        )
     
     @staticmethod
     def send_password_reset_email(email, reset_token, user_name):
-        """Send password reset email"""
+        """Queue the password reset email"""
         base_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
-        reset_url = f"{base_url}/reset-password?token={reset_token}"
-        
-        subject = "Reset Your BLEO Password"
-        
-        html_content = f"""
-        <h2>Password Reset Request</h2>
-        <p>Hello {user_name},</p>
-        <p>You requested to reset your password for your BLEO account.</p>
-        <p><a href="{reset_url}" style="background: #E74C3C; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Reset Password</a></p>
-        <p>This link expires in 1 hours.</p>
-        <p>If you didn't request this reset, you can safely ignore this email.</p>
-        """
-        
-        text_content = f"""
-        Password Reset Request
+        subject, html_content, text_content = PASSWORD_RESET_TEMPLATE.render(
+            user_name=user_name,
+            url=f"{base_url}/reset-password?token={reset_token}"
+        )
+        return EmailService.queue_email(
+            email, subject, html_content, text_content,
+            idempotency_key=EmailService.token_key('password_reset', reset_token)
+        )
     
-        Hello {user_name},
-        
-        You requested to reset your password for your BLEO account.
-        
-        Reset your password: {reset_url}
-        
-        This link expires in 1 hours.
-        
-        If you didn't request this reset, you can safely ignore this email.
-        """
-        
-        return EmailService.send_email(email, subject, html_content, text_content)
\ No newline at end of file
+    @staticmethod
+    def token_key(kind, token):
+        """Idempotency key of the email carrying token: one email per issued token"""
+        return f"{kind}:{hashlib.sha256(token.encode()).hexdigest()[:32]}"
@@ -0,0 +1,134 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from utils.metrics import Metrics
+
+PASSWORD_HASHES = Metrics.counter(
+    'bleo_password_hashes_total',
+    'Password hash operations (make, verify) by outcome: done (pool), inline, or rejected when the queue is full',
+    labels=('op', 'result')
+)
+PASSWORD_HASH_SECONDS = Metrics.histogram(
+    'bleo_password_hash_seconds',
+    'Time a request waited for a password hash, queueing included',
+    labels=('op',)
+)
+
+class HashingBusyError(Exception):
+    """Raised when PASSWORD_HASH_MAX_PENDING hashes are already queued"""
+
+def _make(password):
+    return make_password(password)
+
+def _verify(password, encoded):
+    # check_password calls the setter only for a correct password whose hasher is outdated
+    upgraded = []
+    valid = check_password(password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+    return valid, (upgraded[0] if upgraded else None)
+
+class PasswordHashing:
+    """Password hashing off the request threads.
+
+    PBKDF2 is slow on purpose, and run inline a login burst holds every
+    worker thread, so cheap reads queue behind it. Hashes instead run in a
+    process pool of PASSWORD_HASH_WORKERS processes (0 runs them inline). At
+    most PASSWORD_HASH_MAX_PENDING hashes are queued or running per process;
+    a request that can't get a slot within PASSWORD_HASH_WAIT_SECONDS gets
+    HashingBusyError (a 503) rather than piling up.
+
+    verify() also returns a new hash when the stored one was made by an
+    outdated hasher or iteration count, for the caller to save.
+    """
+
+    # Retry-After sent with the 503 of a rejected hash
+    RETRY_AFTER_SECONDS = 1
+
+    _executor = None
+    _executor_config = None
+    _slots = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def config():
+        return settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING
+
+    @staticmethod
+    def make(password):
+        """Hash password with the preferred hasher"""
+        return PasswordHashing._run('make', _make, password)
+
+    @staticmethod
+    def verify(password, encoded):
+        """Check password against encoded: (valid, upgraded hash or None)"""
+        if not encoded:
+            return False, None
+        return PasswordHashing._run('verify', _verify, password, encoded)
+
+    @staticmethod
+    def busy_response(error):
+        """503 for a HashingBusyError"""
+        from rest_framework import status
+        from models.response.BLEOResponse import BLEOResponse
+
+        response = BLEOResponse.busy(str(error)).to_response(status.HTTP_503_SERVICE_UNAVAILABLE)
+        response['Retry-After'] = str(PasswordHashing.RETRY_AFTER_SECONDS)
+        return response
+
+    @classmethod
+    def _run(cls, op, fn, *args):
+        started = time.perf_counter()
+        try:
+            if settings.PASSWORD_HASH_WORKERS <= 0:
+                PASSWORD_HASHES.inc(op=op, result='inline')
+                return fn(*args)
+            return cls._submit(op, fn, *args)
+        finally:
+            PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started, op=op)
+
+    @classmethod
+    def _submit(cls, op, fn, *args):
+        executor, slots = cls._pool()
+        if not slots.acquire(timeout=settings.PASSWORD_HASH_WAIT_SECONDS):
+            PASSWORD_HASHES.inc(op=op, result='rejected')
+            raise HashingBusyError("Too many password operations in progress")
+        try:
+            result = executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A worker died (OOM kill...): start a fresh pool for the next request
+            cls.shutdown()
+            raise
+        finally:
+            slots.release()
+        PASSWORD_HASHES.inc(op=op, result='done')
+        return result
+
+    @classmethod
+    def _pool(cls):
+        """This process's executor and queue slots, rebuilt when their settings changed"""
+        config = cls.config()
+        with cls._lock:
+            if cls._executor is None or cls._executor_config != config:
+                if cls._executor is not None:
+                    cls._executor.shutdown(wait=False)
+                workers, max_pending = config
+                # spawn: forking a process that holds Mongo clients and threads is unsafe
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                cls._executor_config = config
+                cls._slots = threading.BoundedSemaphore(max(max_pending, workers))
+            return cls._executor, cls._slots
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the worker processes; the next hash starts a new pool"""
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False)
+            cls._executor = None
+            cls._executor_config = None
@@ -0,0 +1,124 @@
+import smtplib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from django.conf import settings
+from utils.metrics import Metrics
+
+SMTP_SESSIONS = Metrics.counter(
+    'bleo_smtp_sessions_total',
+    'SMTP session checkouts: opened (new handshake), reused from the pool, discarded (stale or broken)',
+    labels=('result',)
+)
+
+class SMTPPool:
+    """Process-wide pool of logged-in SMTP sessions.
+
+    Opening a session costs a TCP connect, STARTTLS and AUTH; a pooled session
+    skips all three. Sessions idle longer than SMTP_POOL_CHECK_SECONDS are
+    probed with NOOP before reuse, and sessions idle longer than
+    SMTP_POOL_MAX_IDLE_SECONDS are closed (servers drop them anyway). A session
+    that fails mid-use is discarded instead of being returned.
+    """
+
+    _idle = deque()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def config():
+        """Settings a session was opened with; sessions of another configuration are not reused"""
+        return (
+            settings.SMTP_SERVER,
+            settings.SMTP_PORT,
+            settings.SMTP_USERNAME,
+            settings.SMTP_USE_TLS
+        )
+
+    @classmethod
+    def checkout(cls):
+        """A healthy session: pooled when possible, otherwise newly opened (None if SMTP is not configured)"""
+        from services.EmailService import EmailService
+
+        config = cls.config()
+        now = time.monotonic()
+        while True:
+            with cls._lock:
+                if not cls._idle:
+                    break
+                server, server_config, last_used = cls._idle.pop()
+
+            idle = now - last_used
+            if server_config != config or idle > settings.SMTP_POOL_MAX_IDLE_SECONDS:
+                cls._close(server)
+                SMTP_SESSIONS.inc(result='discarded')
+                continue
+            if idle > settings.SMTP_POOL_CHECK_SECONDS:
+                try:
+                    healthy = server.noop()[0] == 250
+                except Exception:
+                    healthy = False
+                if not healthy:
+                    cls._close(server)
+                    SMTP_SESSIONS.inc(result='discarded')
+                    continue
+
+            SMTP_SESSIONS.inc(result='reused')
+            return server
+
+        server = EmailService.connect()
+        if server is not None:
+            SMTP_SESSIONS.inc(result='opened')
+        return server
+
+    @classmethod
+    def checkin(cls, server):
+        """Return a working session to the pool (closed when the pool is full)"""
+        with cls._lock:
+            if len(cls._idle) < settings.SMTP_POOL_SIZE:
+                cls._idle.append((server, cls.config(), time.monotonic()))
+                return
+        cls._close(server)
+
+    @classmethod
+    @contextmanager
+    def session(cls):
+        """Borrow a session for the duration of the block; raises SMTPException when SMTP is not configured"""
+        server = cls.checkout()
+        if server is None:
+            raise smtplib.SMTPException("SMTP not configured")
+        try:
+            yield server
+        except Exception as e:
+            if cls.is_broken(e):
+                cls._close(server)
+                SMTP_SESSIONS.inc(result='discarded')
+            else:
+                # Message-level errors (refused recipient...) leave the session usable
+                cls.checkin(server)
+            raise
+        else:
+            cls.checkin(server)
+
+    @staticmethod
+    def is_broken(error):
+        """True when error means the connection is gone (SMTPException subclasses OSError, so exclude it)"""
+        return isinstance(error, smtplib.SMTPServerDisconnected) or (
+            isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+        )
+
+    @classmethod
+    def clear(cls):
+        """Close every pooled session"""
+        with cls._lock:
+            sessions = list(cls._idle)
+            cls._idle.clear()
+        for server, _, _ in sessions:
+            cls._close(server)
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
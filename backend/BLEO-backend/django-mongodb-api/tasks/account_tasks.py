@@ -0,0 +1,18 @@
+from celery import shared_task
+from services.AccountDeletion import AccountDeletion
+from utils.logger import Logger
+from models.enums.ErrorSourceType import ErrorSourceType
+
+@shared_task(ignore_result=True)
+def resume_account_deletions():
+    """Celery task finishing AccountDeletions jobs left running (run by beat)"""
+    try:
+        return AccountDeletion.resume()
+    except Exception as e:
+        Logger.debug_error(
+            f"Celery account deletion task failed: {str(e)}",
+            500,
+            None,
+            ErrorSourceType.SERVER.value
+        )
+        return 0
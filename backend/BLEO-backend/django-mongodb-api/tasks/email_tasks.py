@@ -0,0 +1,18 @@
+from celery import shared_task
+from services.EmailOutbox import EmailOutbox
+from utils.logger import Logger
+from models.enums.ErrorSourceType import ErrorSourceType
+
+@shared_task(ignore_result=True)
+def deliver_outbox():
+    """Celery task delivering the due EmailOutbox rows (queued on enqueue and by beat for retries)"""
+    try:
+        return EmailOutbox.deliver_pending()
+    except Exception as e:
+        Logger.debug_error(
+            f"Celery email outbox task failed: {str(e)}",
+            500,
+            None,
+            ErrorSourceType.SERVER.value
+        )
+        return {'sent': 0, 'retried': 0, 'failed': 0}
@@ -11,19 +11,15 @@ def check_jwt_rotation():
         result = manager.schedule_rotation_check()
         
         if result['success'] and result['rotated']:
-            Logger.log_system_event(
-                f"Automated JWT secret rotation completed via Celery task",
+            Logger.system_action(
+                "Automated JWT secret rotation completed via Celery task",
                 LogType.INFO.value
             )
         
         return result
     except Exception as e:
         error_msg = f"Celery JWT rotation task failed: {str(e)}"
-        Logger.log_error(
-            "JWT_ROTATION_TASK",
-            error_msg,
-            LogType.ERROR.value
-        )
+        Logger.server_error(error_msg)
         return {
             'success': False,
             'message': error_msg
@@ -0,0 +1,18 @@
+from celery import shared_task
+from utils.token_sweeper import TokenSweeper
+from utils.logger import Logger
+from models.enums.ErrorSourceType import ErrorSourceType
+
+@shared_task(ignore_result=True)
+def sweep_expired_tokens():
+    """Celery task deleting unused expired PasswordResets and EmailVerifications (run by beat)"""
+    try:
+        return TokenSweeper.sweep()
+    except Exception as e:
+        Logger.debug_error(
+            f"Celery token sweep task failed: {str(e)}",
+            500,
+            None,
+            ErrorSourceType.SERVER.value
+        )
+        return {}
@@ -1,4 +1,20 @@
+import functools
 from django.test import TestCase
+from utils.mongo_instrumentation import mongo_command_budget
+from utils.mongodb_async import AsyncMongoDB
+from utils.login_throttle import LoginThrottle
+
+
+def closes_async_client(test):
+    """Close the async MongoDB client bound to an async test's event loop once the test is done"""
+    @functools.wraps(test)
+    async def wrapper(self):
+        try:
+            await test(self)
+        finally:
+            await AsyncMongoDB.close()
+    return wrapper
+
 
 class BLEOBaseTest(TestCase):
     """Base test class with enhanced logging for all BLEO tests"""
@@ -7,6 +23,8 @@ class BLEOBaseTest(TestCase):
         # This runs before each test
         self.test_name = self._testMethodName
         print(f"\n📋 Running test: {self.test_name}")
+        # Failed logins of earlier tests must not throttle this one
+        LoginThrottle.clear()
     
     def tearDown(self):
         # This runs after each test
@@ -31,6 +49,10 @@ class BLEOBaseTest(TestCase):
         # If we got here, the test passed
         print(f"✅ PASSED: {test_doc.strip()}")
 
+    def assertMaxMongoCommands(self, max_commands, exclude_logging=True):
+        """Context manager failing when the block issues more than max_commands MongoDB commands"""
+        return mongo_command_budget(max_commands, exclude_logging)
+
 
 class ColoredOutput:
     """Simple colored output for Windows and Unix systems"""
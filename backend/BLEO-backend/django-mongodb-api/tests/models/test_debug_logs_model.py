@@ -105,6 +105,17 @@ class TestDebugLogs(BLEOBaseTest):
         self.assertEqual(result["bleoid"], "USER45")
         self.assertEqual(result["user_type"], UserType.USER.value)
         self.assertEqual(result["error_source"], ErrorSourceType.SERVER.value)
+        self.assertEqual(result["repeat_count"], 1)
+    
+    def test_repeat_count_round_trip(self):
+        """Test repeat_count survives to_dict/from_dict and defaults to 1"""
+        log = DebugLogs(message="Repeated", type=LogType.INFO.value, code=200, repeat_count=5)
+        
+        restored = DebugLogs.from_dict({**log.to_dict(), "id": 1})
+        self.assertEqual(restored.repeat_count, 5)
+        
+        legacy = DebugLogs.from_dict({"id": 2, "date": datetime.now(), "message": "Old", "type": LogType.INFO.value, "code": 200})
+        self.assertEqual(legacy.repeat_count, 1)
     
     def test_from_dict(self):
         """Test creation from dictionary"""
@@ -352,6 +352,24 @@ class MessagesDaysModelTest(BLEOBaseTest):
             print(f"    ✓ Correctly rejected self-reference: '{from_bleoid}' == '{to_bleoid}' after normalization")
         
         print("  🔹 Self-reference validation works correctly with normalization")
+    
+    def test_version_and_touch(self):
+        """Test new days start at version 1 and touch() bumps version and updated_at"""
+        message_day = MessagesDays(
+            from_bleoid="ABC123",
+            to_bleoid="DEF456",
+            date=datetime(2023, 5, 15)
+        )
+        message_day_dict = message_day.to_dict()
+        self.assertEqual(message_day_dict["version"], 1)
+        self.assertIsInstance(message_day_dict["updated_at"], datetime)
+        
+        update = MessagesDays.touch({"$set": {"messages": []}})
+        self.assertEqual(update["$set"]["messages"], [])
+        self.assertIn("updated_at", update["$set"])
+        self.assertEqual(update["$inc"], {"version": 1})
+        
+        print("  🔹 Version starts at 1 and touch() adds the version bump and updated_at")
 
 
 # This will run if this file is executed directly
@@ -114,6 +114,32 @@ class AppParametersSerializerTest(BLEOBaseTest):
         self.assertEqual(serializer.validated_data['param_value']['options'], ['a', 'b', 'c'])
         print(f"  🔹 Complex JSON parameter value validated successfully")
     
+    def test_log_sampling_rates_validated(self):
+        """Test log_sampling accepts rates between 0 and 1 and rejects others"""
+        valid = AppParametersSerializer(data={
+            'param_name': AppParameters.PARAM_LOG_SAMPLING,
+            'param_value': {'rates': {'info': 0.25, 'auth': 1}, 'aggregate_window_seconds': 60}
+        })
+        self.assertTrue(valid.is_valid(), f"Serializer errors: {valid.errors}")
+
+        invalid = AppParametersSerializer(data={
+            'param_name': AppParameters.PARAM_LOG_SAMPLING,
+            'param_value': {'rates': {'info': 1.5}}
+        })
+        self.assertFalse(invalid.is_valid())
+        self.assertIn('param_value', invalid.errors)
+        print(f"  🔹 log_sampling rates validated")
+
+    def test_log_retention_days_validated(self):
+        """Test log_retention_days accepts whole days and rejects negative or fractional values"""
+        for value, expected in ((30, True), (0, True), (-1, False), (1.5, False), ('30', False)):
+            serializer = AppParametersSerializer(data={
+                'param_name': AppParameters.PARAM_LOG_RETENTION_DAYS,
+                'param_value': value
+            })
+            self.assertEqual(serializer.is_valid(), expected, f"Unexpected result for {value!r}")
+        print(f"  🔹 log_retention_days values validated")
+
     def test_id_field_read_only(self):
         """Test that id field is read-only"""
         data = {
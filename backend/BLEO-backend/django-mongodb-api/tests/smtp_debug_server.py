@@ -0,0 +1,88 @@
+import socket
+import socketserver
+import threading
+from email import message_from_bytes
+
+class SMTPDebugServer:
+    """Minimal local SMTP server for tests: plain SMTP, no TLS or AUTH.
+
+    Accepted messages are parsed into `messages`; `sessions` counts the
+    connections opened, so tests can check that batches share one session.
+    Recipients listed in `refuse` are rejected with 550; drop_sessions()
+    closes every open connection, like a server timing out idle clients.
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = 0
+        self.refuse = set()
+        self._connections = set()
+        self._lock = threading.Lock()
+        debug_server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(f"{line}\r\n".encode())
+
+            def handle(self):
+                with debug_server._lock:
+                    debug_server.sessions += 1
+                    debug_server._connections.add(self.connection)
+                try:
+                    self.converse()
+                except OSError:
+                    pass
+                finally:
+                    with debug_server._lock:
+                        debug_server._connections.discard(self.connection)
+
+            def converse(self):
+                self.reply("220 localhost BLEO test SMTP")
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode().strip().upper()
+                    if command.startswith(("EHLO", "HELO")):
+                        self.reply("250 localhost")
+                    elif command.startswith("RCPT TO:"):
+                        address = line.decode().strip()[8:].strip("<> ")
+                        self.reply("550 Mailbox unavailable" if address in debug_server.refuse else "250 OK")
+                    elif command == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        data = b""
+                        while True:
+                            chunk = self.rfile.readline()
+                            if chunk in (b".\r\n", b".\n", b""):
+                                break
+                            data += chunk[1:] if chunk.startswith(b"..") else chunk
+                        with debug_server._lock:
+                            debug_server.messages.append(message_from_bytes(data))
+                        self.reply("250 OK")
+                    elif command == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        # MAIL FROM, RSET, NOOP
+                        self.reply("250 OK")
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def drop_sessions(self):
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
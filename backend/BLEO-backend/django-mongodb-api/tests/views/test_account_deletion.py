@@ -0,0 +1,209 @@
+from tests.base_test import BLEOBaseTest, run_test_with_output
+from rest_framework.test import APIClient
+from api.Views.User.UserView import UserDetailView
+from services.AccountDeletion import AccountDeletion
+from utils.mongodb_utils import MongoDB
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from django.urls import path
+from unittest.mock import patch
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import time
+import random
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('users/<str:bleoid>/', UserDetailView.as_view(), name='user-detail'),
+]
+
+class FakeTransactionClient:
+    """Client whose sessions run the transaction callback directly (no replica set under test)"""
+
+    @contextmanager
+    def start_session(self):
+        class Session:
+            def with_transaction(self, callback):
+                return callback(None)
+        yield Session()
+
+@override_settings(ROOT_URLCONF=__name__, ACCOUNT_DELETION_CHUNK_SIZE=2, ACCOUNT_DELETION_INLINE_CHUNKS=100,
+                   ACCOUNT_DELETION_LEASE_SECONDS=300)
+class AccountDeletionTest(BLEOBaseTest):
+    """Test cases for the user cascade delete"""
+
+    COLLECTION_KEYS = ('Users', 'Links', 'MessagesDays', 'MessagesDaysTombstones', 'PasswordResets',
+                       'EmailVerifications', 'DebugLogs', 'ProfilePictures', 'EmailOutbox', 'AccountDeletions')
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        mongo = MongoDB.get_instance()
+
+        # Use test collections with timestamp to avoid conflicts
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collections = {key: MongoDB.COLLECTIONS[key] for key in cls.COLLECTION_KEYS}
+        for key in cls.COLLECTION_KEYS:
+            MongoDB.COLLECTIONS[key] = f"{key}_{cls.test_suffix}"
+        mongo._setup_collection_indexes(MongoDB.COLLECTIONS['AccountDeletions'])
+        print(f"🔧 Created account deletion test collections with suffix {cls.test_suffix}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            db = MongoDB.get_instance().get_db()
+            for key in cls.COLLECTION_KEYS:
+                db.drop_collection(MongoDB.COLLECTIONS[key])
+            MongoDB.COLLECTIONS.update(cls.original_collections)
+            print(f"🧹 Dropped account deletion test collections with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Seed the user being deleted, their partner and an unrelated user"""
+        super().setUp()
+        self.client = APIClient()
+        self.mongo = MongoDB.get_instance()
+        for key in self.COLLECTION_KEYS:
+            self.mongo.get_collection(key).delete_many({})
+
+        now = datetime.now(timezone.utc)
+        self.mongo.get_collection('Users').insert_many([
+            {'bleoid': bleoid, 'email': f'{bleoid.lower()}@example.com', 'password': make_password('Password123'),
+             'userName': f'User{bleoid}', 'created_at': now}
+            for bleoid in ('ABC123', 'DEF456', 'GHI789')
+        ])
+        self.mongo.get_collection('Links').insert_many([
+            {'bleoidPartner1': 'ABC123', 'bleoidPartner2': 'DEF456', 'status': 'accepted', 'created_at': now, 'updated_at': now},
+            {'bleoidPartner1': 'GHI789', 'bleoidPartner2': 'ABC123', 'status': 'pending', 'created_at': now, 'updated_at': now},
+            {'bleoidPartner1': 'DEF456', 'bleoidPartner2': 'GHI789', 'status': 'pending', 'created_at': now, 'updated_at': now},
+        ])
+        days = []
+        for i in range(3):
+            date = datetime(2025, 1, i + 1)
+            days.append({'from_bleoid': 'ABC123', 'to_bleoid': 'DEF456', 'date': date, 'messages': [], 'updated_at': date})
+            days.append({'from_bleoid': 'DEF456', 'to_bleoid': 'ABC123', 'date': date, 'messages': [], 'updated_at': date})
+        days.append({'from_bleoid': 'GHI789', 'to_bleoid': 'DEF456', 'date': datetime(2025, 1, 1), 'messages': [], 'updated_at': now})
+        self.mongo.get_collection('MessagesDays').insert_many(days)
+
+        for key, extra in (('PasswordResets', {'used': False}), ('EmailVerifications', {'verified': False})):
+            self.mongo.get_collection(key).insert_many([
+                {'bleoid': bleoid, 'email': f'{bleoid.lower()}@example.com', 'jti': f'{key}-{bleoid}',
+                 'created_at': now, 'expires_at': now + timedelta(hours=1), 'attempts': 0, **extra}
+                for bleoid in ('ABC123', 'GHI789')
+            ])
+        self.mongo.get_collection('ProfilePictures').insert_many([
+            {'bleoid': 'ABC123', 'variant': variant, 'reference': 'ref', 'content_type': 'image/png', 'data': b'x', 'updated_at': now}
+            for variant in ('original', 'small', 'thumb')
+        ])
+        self.mongo.get_collection('EmailOutbox').insert_many([
+            {'idempotency_key': f'key-{email}', 'to_email': email, 'subject': 'Hi', 'html_content': '<p>Hi</p>',
+             'status': 'pending', 'attempts': 0, 'next_attempt_at': now, 'created_at': now}
+            for email in ('abc123@example.com', 'ghi789@example.com')
+        ])
+        self.mongo.get_collection('DebugLogs').insert_many([
+            {'id': i, 'date': now, 'message': 'log', 'type': 'INFO', 'code': 200, 'user_type': 'USER',
+             'bleoid': 'ABC123' if i < 5 else 'GHI789'}
+            for i in range(7)
+        ])
+
+    def count(self, key, query=None):
+        return self.mongo.get_collection(key).count_documents(query or {})
+
+    def assert_no_orphans(self):
+        """Nothing of ABC123 is left, and everything of the other users is"""
+        self.assertEqual(self.count('Users', {'bleoid': 'ABC123'}), 0)
+        self.assertEqual(self.count('Links', {'$or': [{'bleoidPartner1': 'ABC123'}, {'bleoidPartner2': 'ABC123'}]}), 0)
+        self.assertEqual(self.count('MessagesDays', {'$or': [{'from_bleoid': 'ABC123'}, {'to_bleoid': 'ABC123'}]}), 0)
+        for key in ('PasswordResets', 'EmailVerifications', 'ProfilePictures', 'DebugLogs'):
+            self.assertEqual(self.count(key, {'bleoid': 'ABC123'}), 0, key)
+        self.assertEqual(self.count('EmailOutbox', {'to_email': 'abc123@example.com'}), 0)
+
+        self.assertEqual(self.count('Users'), 2)
+        self.assertEqual(self.count('Links'), 1)
+        self.assertEqual(self.count('MessagesDays'), 1)
+        self.assertEqual(self.count('PasswordResets'), 1)
+        self.assertEqual(self.count('EmailVerifications'), 1)
+        self.assertEqual(self.count('EmailOutbox'), 1)
+        self.assertEqual(self.count('DebugLogs', {'bleoid': 'GHI789'}), 2)
+
+    def test_delete_cascades_to_every_collection(self):
+        """Test the DELETE endpoint removes everything the user owns, on both sides of the couple"""
+        response = self.client.delete('/users/ABC123/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('6 message day records', response.data['successMessage'])
+
+        self.assert_no_orphans()
+        # The partner's devices learn about the 6 days through tombstones
+        self.assertEqual(self.count('MessagesDaysTombstones', {'to_bleoid': 'DEF456'}), 3)
+        self.assertEqual(self.count('MessagesDaysTombstones', {'from_bleoid': 'DEF456'}), 3)
+        self.assertEqual(self.count('AccountDeletions'), 0)
+        print("  🔹 User, links, days (both directions), tokens, pictures, emails and logs deleted")
+
+    @override_settings(ACCOUNT_DELETION_INLINE_CHUNKS=3)
+    def test_large_account_finishes_in_background(self):
+        """Test a deletion over the inline budget returns 202 and is finished by resume"""
+        response = self.client.delete('/users/ABC123/')
+        self.assertEqual(response.status_code, 202)
+
+        # The account itself is gone at once; the job holds what is left
+        self.assertEqual(self.count('Users', {'bleoid': 'ABC123'}), 0)
+        job = self.mongo.get_collection('AccountDeletions').find_one({'bleoid': 'ABC123'})
+        self.assertIn('user', job['completed_steps'])
+        self.assertNotIn('debug_logs', job['completed_steps'])
+
+        # Fresh jobs are left to the request that owns them
+        self.assertEqual(AccountDeletion.resume(), 0)
+        self.mongo.get_collection('AccountDeletions').update_one(
+            {'_id': job['_id']}, {'$set': {'updated_at': datetime.now(timezone.utc) - timedelta(hours=1)}}
+        )
+        self.assertEqual(AccountDeletion.resume(), 1)
+
+        self.assert_no_orphans()
+        self.assertEqual(self.count('AccountDeletions'), 0)
+        print("  🔹 3 chunks inline, the rest finished by the resume worker")
+
+    @override_settings(ACCOUNT_DELETION_INLINE_CHUNKS=1)
+    def test_repeated_delete_resumes_job(self):
+        """Test deleting again an account whose job is unfinished carries on with the job"""
+        self.assertEqual(self.client.delete('/users/ABC123/').status_code, 202)
+        with override_settings(ACCOUNT_DELETION_INLINE_CHUNKS=100):
+            self.assertEqual(self.client.delete('/users/ABC123/').status_code, 200)
+            self.assertEqual(self.client.delete('/users/ABC123/').status_code, 404)
+
+        self.assert_no_orphans()
+        print("  🔹 Second DELETE finished the job, third one found nothing")
+
+    def test_transaction_mode(self):
+        """Test small accounts on a replica set are deleted in one transaction, without a job"""
+        with patch.object(AccountDeletion, 'supports_transactions', return_value=True), \
+                patch.object(MongoDB, 'get_client', return_value=FakeTransactionClient()):
+            result = AccountDeletion.delete_user('ABC123')
+
+        self.assertEqual(result['mode'], 'transaction')
+        self.assertEqual(result['deleted']['message_days'], 6)
+        self.assertEqual(result['deleted']['links'], 2)
+        self.assert_no_orphans()
+        self.assertEqual(self.count('AccountDeletions'), 0)
+        print("  🔹 Cascade ran as a single transaction")
+
+    @override_settings(ACCOUNT_DELETION_TRANSACTION_MAX_DOCS=3)
+    def test_large_account_skips_transaction(self):
+        """Test accounts over the transaction size limit use a chunked job"""
+        with patch.object(AccountDeletion, 'supports_transactions', return_value=True):
+            result = AccountDeletion.delete_user('ABC123')
+
+        self.assertEqual(result['mode'], 'job')
+        self.assertTrue(result['complete'])
+        self.assert_no_orphans()
+        print("  🔹 11 documents over the limit of 3: deleted by a job")
+
+
+# This will run if this file is executed directly
+if __name__ == '__main__':
+    print("Running AccountDeletionTest...")
+    run_test_with_output(AccountDeletionTest)
@@ -9,6 +9,7 @@ import random
 from django.urls import path
 from django.test import override_settings
 from api.Views.AppParameters.AppParametersView import AppParametersView, AppParameterDetailView
+from mongoDbVersionUpdate.v1_1_0.v1_1_0_AppParameters import update_app_parameters
 
 # Set up URL configuration for testing
 urlpatterns = [
@@ -331,6 +332,64 @@ class AppParametersViewTest(BLEOBaseTest):
         
         print("  🔹 Successfully handled complex JSON parameter values")
 
+    def test_log_retention_sets_ttl_index(self):
+        """Test log_retention_days turns the DebugLogs date index into a TTL index"""
+        original_logs_collection = MongoDB.COLLECTIONS['DebugLogs']
+        MongoDB.COLLECTIONS['DebugLogs'] = f"DebugLogs_{self.test_suffix}"
+        try:
+            logs = MongoDB.get_instance().get_collection('DebugLogs')
+            logs.create_index('date')
+
+            def date_index():
+                return next(index for index in logs.list_indexes() if dict(index['key']) == {'date': 1})
+
+            response = self.client.post('/app-parameters/', {
+                'param_name': AppParameters.PARAM_LOG_RETENTION_DAYS,
+                'param_value': 7
+            }, format='json')
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(date_index().get('expireAfterSeconds'), 7 * 86400)
+
+            # 0 keeps logs forever
+            response = self.client.put(f'/app-parameters/{AppParameters.PARAM_LOG_RETENTION_DAYS}/',
+                                      {'param_value': 0}, format='json')
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(date_index().get('expireAfterSeconds'))
+
+            response = self.client.put(f'/app-parameters/{AppParameters.PARAM_LOG_RETENTION_DAYS}/',
+                                      {'param_value': -3}, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('param_value', response.data['validationErrors'])
+        finally:
+            MongoDB.get_instance().get_db().drop_collection(MongoDB.COLLECTIONS['DebugLogs'])
+            MongoDB.COLLECTIONS['DebugLogs'] = original_logs_collection
+
+        print("  🔹 Log retention applied to the DebugLogs TTL index")
+
+    def test_v1_1_0_seeds_keep_every_log(self):
+        """Test the v1.1.0 parameters neither sample nor expire DebugLogs until configured"""
+        self.db_params.delete_many({'param_name': {'$in': [AppParameters.PARAM_LOG_SAMPLING, AppParameters.PARAM_LOG_RETENTION_DAYS]}})
+        with self.settings(LOG_RETENTION_DAYS=0):
+            self.assertEqual(update_app_parameters()['created'], 2)
+
+        sampling = self.db_params.find_one({'param_name': AppParameters.PARAM_LOG_SAMPLING})['param_value']
+        self.assertEqual(set(sampling['rates'].values()), {1.0})
+        self.assertEqual(sampling['per_bleoid_per_minute'], 0)
+        self.assertEqual(sampling['aggregate_window_seconds'], 0)
+        retention = self.db_params.find_one({'param_name': AppParameters.PARAM_LOG_RETENTION_DAYS})
+        self.assertEqual(retention['param_value'], 0)
+
+        # Existing values are left alone, the setting only seeds an empty collection
+        with self.settings(LOG_RETENTION_DAYS=14):
+            self.assertEqual(update_app_parameters()['created'], 0)
+        self.db_params.delete_many({'param_name': AppParameters.PARAM_LOG_RETENTION_DAYS})
+        with self.settings(LOG_RETENTION_DAYS=14):
+            self.assertEqual(update_app_parameters()['created'], 1)
+        retention = self.db_params.find_one({'param_name': AppParameters.PARAM_LOG_RETENTION_DAYS})
+        self.assertEqual(retention['param_value'], 14)
+
+        print("  🔹 v1.1.0 seeds keep every log, retention comes from LOG_RETENTION_DAYS")
+
 
 # This will run if this file is executed directly
 if __name__ == '__main__':
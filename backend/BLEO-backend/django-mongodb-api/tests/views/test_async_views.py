@@ -0,0 +1,231 @@
+from tests.base_test import BLEOBaseTest, closes_async_client, run_test_with_output
+from api.Views.MessagesDays.MessagesDaysAsyncView import AsyncMessageDayCreateView, AsyncMessageDayDetailView
+from api.Views.MessagesDays.Message.MessageAsyncView import AsyncMessageOperationsView
+from auth.token_validation import AsyncTokenValidationView
+from utils.jwt_keys import JWTKeyRing
+from models.enums.MessageType import MessageType
+from utils.mongodb_utils import MongoDB
+from utils.validation_patterns import ValidationRules
+from django.test import override_settings
+from django.urls import path
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+import asyncio
+import threading
+import time
+import random
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('messagesdays/<str:bleoid>/', AsyncMessageDayCreateView.as_view(), name='message-day-create-with-id'),
+    path('messagesdays/<str:bleoid>/<str:date>/', AsyncMessageDayDetailView.as_view(), name='message-day-detail'),
+    path('messagesdays/<str:bleoid>/<str:date>/messages/', AsyncMessageOperationsView.as_view(), name='message-operations'),
+    path('messagesdays/<str:bleoid>/<str:date>/messages/<int:message_id>/', AsyncMessageOperationsView.as_view(), name='message-detail'),
+    path('auth/validate-token/', AsyncTokenValidationView.as_view(), name='validate_token'),
+]
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewsTest(BLEOBaseTest):
+    """Test cases for the async (ASGI) variants of the hot endpoints"""
+
+    COLLECTION_KEYS = ('Users', 'Links', 'MessagesDays', 'TokenBlacklist')
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        MongoDB.get_instance()
+
+        # Use test collections with timestamp to avoid conflicts
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collections = {key: MongoDB.COLLECTIONS[key] for key in cls.COLLECTION_KEYS}
+        for key in cls.COLLECTION_KEYS:
+            MongoDB.COLLECTIONS[key] = f"{key}_{cls.test_suffix}"
+
+        print(f"🔧 Created async test collections with suffix {cls.test_suffix}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            db = MongoDB.get_instance().get_db()
+            for key in cls.COLLECTION_KEYS:
+                db.drop_collection(MongoDB.COLLECTIONS[key])
+            MongoDB.COLLECTIONS.update(cls.original_collections)
+            print(f"🧹 Dropped async test collections with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        mongo = MongoDB.get_instance()
+        for key in self.COLLECTION_KEYS:
+            mongo.get_collection(key).delete_many({})
+
+        mongo.get_collection('Users').insert_many([
+            {'bleoid': 'ABC123', 'email': 'user1@example.com', 'userName': 'TestUser1', 'password': 'hashed'},
+            {'bleoid': 'DEF456', 'email': 'user2@example.com', 'userName': 'TestUser2', 'password': 'hashed'},
+            {'bleoid': 'GHI789', 'email': 'user3@example.com', 'userName': 'TestUser3', 'password': 'hashed'}
+        ])
+        mongo.get_collection('Links').insert_one({
+            'bleoidPartner1': 'ABC123',
+            'bleoidPartner2': 'DEF456',
+            'status': 'accepted',
+            'created_at': datetime.now()
+        })
+
+        yesterday = datetime.now() - timedelta(days=1)
+        self.yesterday = datetime(yesterday.year, yesterday.month, yesterday.day)
+        self.yesterday_str = self.yesterday.strftime(ValidationRules.STANDARD_DATE_FORMAT)
+        mongo.get_collection('MessagesDays').insert_one({
+            'from_bleoid': 'ABC123',
+            'to_bleoid': 'DEF456',
+            'date': self.yesterday,
+            'messages': [
+                {'id': 1, 'title': 'First', 'text': 'First message', 'type': MessageType.THOUGHTS.value},
+                {'id': 2, 'title': 'Second', 'text': 'Second message', 'type': MessageType.SOUVENIR.value}
+            ],
+            'mood': None,
+            'energy_level': None,
+            'pleasantness': None
+        })
+
+    @closes_async_client
+    async def test_create_message_day_finds_partner_from_link(self):
+        """Test async message-day create resolves the partner from the accepted link"""
+        response = await self.async_client.post(
+            '/messagesdays/ABC123/',
+            {'messages': [{'title': 'Hi', 'text': 'Hello there', 'type': MessageType.THOUGHTS.value}]},
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        data = response.json()['data']
+        self.assertEqual(data['to_bleoid'], 'DEF456')
+        self.assertEqual(data['messages'][0]['id'], 1)
+
+        # A second create on the same day conflicts
+        duplicate = await self.async_client.post('/messagesdays/ABC123/', {}, content_type='application/json')
+        self.assertEqual(duplicate.status_code, 409)
+        print("  🔹 Async create resolved partner DEF456 and rejected the duplicate")
+
+    @closes_async_client
+    async def test_create_message_day_checks_in_sync_order(self):
+        """Test gathered lookups still report errors in the sync view's order"""
+        missing_user = await self.async_client.post(
+            '/messagesdays/ZZZ999/', {'to_bleoid': 'NOPE00'}, content_type='application/json'
+        )
+        self.assertEqual(missing_user.status_code, 404)
+        self.assertIn('ZZZ999', missing_user.json()['errorMessage'])
+
+        not_linked = await self.async_client.post(
+            '/messagesdays/ABC123/', {'to_bleoid': 'GHI789'}, content_type='application/json'
+        )
+        self.assertEqual(not_linked.status_code, 403)
+        print("  🔹 Missing user reported before missing partner; unlinked partner rejected")
+
+    @closes_async_client
+    async def test_get_message_day(self):
+        """Test async message-day read"""
+        response = await self.async_client.get(f'/messagesdays/ABC123/{self.yesterday_str}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']['messages']), 2)
+
+        missing = await self.async_client.get('/messagesdays/ABC123/01-01-2000/')
+        self.assertEqual(missing.status_code, 404)
+        print("  🔹 Async read returned the stored day and 404 for a missing one")
+
+    @closes_async_client
+    async def test_message_crud(self):
+        """Test async message add, update and delete on one day"""
+        base = f'/messagesdays/ABC123/{self.yesterday_str}/messages/'
+
+        added = await self.async_client.post(
+            base, {'title': 'Third', 'text': 'Third message', 'type': MessageType.JOKING.value},
+            content_type='application/json'
+        )
+        self.assertEqual(added.status_code, 201)
+        self.assertEqual([m['id'] for m in added.json()['data']['messages']], [1, 2, 3])
+
+        updated = await self.async_client.put(
+            f'{base}3/', {'title': 'Third (edited)'}, content_type='application/json'
+        )
+        self.assertEqual(updated.status_code, 200)
+        self.assertEqual(updated.json()['data']['title'], 'Third (edited)')
+
+        deleted = await self.async_client.delete(f'{base}1/')
+        self.assertEqual(deleted.status_code, 200)
+        self.assertEqual([m['id'] for m in deleted.json()['data']['messages']], [2, 3])
+
+        listed = await self.async_client.get(base)
+        self.assertEqual(listed.json()['data']['count'], 2)
+        print("  🔹 Async message CRUD added, edited and removed messages")
+
+    @closes_async_client
+    async def test_invalid_bleoid_rejected(self):
+        """Test async message endpoints reject malformed BLEOIDs with 400"""
+        response = await self.async_client.get(f'/messagesdays/bad!/{self.yesterday_str}/messages/')
+        self.assertEqual(response.status_code, 400)
+        print("  🔹 Malformed BLEOID rejected")
+
+    @closes_async_client
+    async def test_validate_token(self):
+        """Test async token validation for valid, blacklisted and invalid tokens"""
+        now = datetime.now(timezone.utc)
+        token = JWTKeyRing.encode(
+            {'bleoid': 'ABC123', 'token_type': 'access', 'exp': int((now + timedelta(minutes=5)).timestamp())}
+        )
+
+        decode = JWTKeyRing.decode
+        decode_threads = []
+
+        def recording_decode(*args, **kwargs):
+            decode_threads.append(threading.current_thread())
+            return decode(*args, **kwargs)
+
+        with patch.object(JWTKeyRing, 'decode', side_effect=recording_decode):
+            valid = await self.async_client.post('/auth/validate-token/', {'token': token}, content_type='application/json')
+        self.assertEqual(valid.status_code, 200)
+        # The key ring may reload from MongoDB: it must not run on the event loop
+        self.assertEqual(len(decode_threads), 1)
+        self.assertIsNot(decode_threads[0], threading.current_thread())
+        self.assertTrue(valid.json()['data']['is_logged_in'])
+        self.assertNotIn('password', valid.json()['data']['user'])
+
+        MongoDB.get_instance().get_collection('TokenBlacklist').insert_one({'token': token})
+        blacklisted = await self.async_client.post('/auth/validate-token/', {'token': token}, content_type='application/json')
+        self.assertEqual(blacklisted.json()['data']['reason'], 'blacklisted')
+
+        invalid = await self.async_client.post('/auth/validate-token/', {'token': 'not-a-jwt'}, content_type='application/json')
+        self.assertEqual(invalid.json()['data']['reason'], 'invalid')
+
+        missing = await self.async_client.post('/auth/validate-token/', {}, content_type='application/json')
+        self.assertEqual(missing.status_code, 400)
+        print("  🔹 Async token validation handled valid, blacklisted, invalid and missing tokens")
+
+    @closes_async_client
+    async def test_methods_without_async_handler_use_sync_view(self):
+        """Test DELETE on the async message-day route is served by the sync view"""
+        response = await self.async_client.delete(f'/messagesdays/ABC123/{self.yesterday_str}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(MongoDB.get_instance().get_collection('MessagesDays').count_documents({}), 0)
+        print("  🔹 DELETE fell back to MessageDayDetailView")
+
+    @closes_async_client
+    async def test_concurrent_requests_share_one_loop(self):
+        """Test many async requests run concurrently on a single event loop"""
+        responses = await asyncio.gather(*[
+            self.async_client.get(f'/messagesdays/ABC123/{self.yesterday_str}/')
+            for _ in range(20)
+        ])
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        print(f"  🔹 {len(responses)} concurrent async reads succeeded")
+
+
+# This will run if this file is executed directly
+if __name__ == '__main__':
+    print("Running AsyncViewsTest...")
+    run_test_with_output(AsyncViewsTest)
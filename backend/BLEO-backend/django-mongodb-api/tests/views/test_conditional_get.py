@@ -0,0 +1,194 @@
+from tests.base_test import BLEOBaseTest, closes_async_client, run_test_with_output
+from api.Views.MessagesDays.MessagesDaysView import MessageDayDetailView
+from api.Views.MessagesDays.MessagesDaysAsyncView import AsyncMessageDayDetailView
+from api.Views.MessagesDays.Message.MessageView import MessageOperationsView
+from api.Views.MessagesDays.Message.MessageAsyncView import AsyncMessageOperationsView
+from models.enums.MessageType import MessageType
+from utils.mongodb_utils import MongoDB
+from utils.validation_patterns import ValidationRules
+from rest_framework.test import APIClient
+from django.test import override_settings
+from django.urls import path
+from datetime import datetime, timedelta
+import time
+import random
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('messagesdays/<str:bleoid>/<str:date>/', MessageDayDetailView.as_view(), name='message-day-detail'),
+    path('messagesdays/<str:bleoid>/<str:date>/messages/', MessageOperationsView.as_view(), name='message-operations'),
+    path('messages/<str:bleoid>/', MessageOperationsView.as_view(), name='messages-all'),
+    path('async/messagesdays/<str:bleoid>/<str:date>/', AsyncMessageDayDetailView.as_view(), name='async-message-day-detail'),
+    path('async/messagesdays/<str:bleoid>/<str:date>/messages/', AsyncMessageOperationsView.as_view(), name='async-message-operations'),
+]
+
+@override_settings(ROOT_URLCONF=__name__)
+class ConditionalGetTest(BLEOBaseTest):
+    """Test cases for ETag / Last-Modified revalidation of message days and messages"""
+
+    COLLECTION_KEYS = ('Users', 'Links', 'MessagesDays')
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        MongoDB.get_instance()
+
+        # Use test collections with timestamp to avoid conflicts
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collections = {key: MongoDB.COLLECTIONS[key] for key in cls.COLLECTION_KEYS}
+        for key in cls.COLLECTION_KEYS:
+            MongoDB.COLLECTIONS[key] = f"{key}_{cls.test_suffix}"
+
+        print(f"🔧 Created conditional GET test collections with suffix {cls.test_suffix}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            db = MongoDB.get_instance().get_db()
+            for key in cls.COLLECTION_KEYS:
+                db.drop_collection(MongoDB.COLLECTIONS[key])
+            MongoDB.COLLECTIONS.update(cls.original_collections)
+            print(f"🧹 Dropped conditional GET test collections with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        self.client = APIClient()
+
+        mongo = MongoDB.get_instance()
+        for key in self.COLLECTION_KEYS:
+            mongo.get_collection(key).delete_many({})
+
+        mongo.get_collection('Users').insert_many([
+            {'bleoid': 'ABC123', 'email': 'user1@example.com', 'userName': 'TestUser1'},
+            {'bleoid': 'DEF456', 'email': 'user2@example.com', 'userName': 'TestUser2'}
+        ])
+
+        today = datetime.now()
+        self.today = datetime(today.year, today.month, today.day)
+        self.yesterday = self.today - timedelta(days=1)
+        self.today_str = self.today.strftime(ValidationRules.STANDARD_DATE_FORMAT)
+        self.yesterday_str = self.yesterday.strftime(ValidationRules.STANDARD_DATE_FORMAT)
+
+        # Legacy documents written before versioning (no version / updated_at)
+        mongo.get_collection('MessagesDays').insert_many([
+            {
+                'from_bleoid': 'ABC123',
+                'to_bleoid': 'DEF456',
+                'date': day,
+                'messages': [{'id': 1, 'title': 'First', 'text': 'First message', 'type': MessageType.THOUGHTS.value}],
+                'mood': None,
+                'energy_level': None,
+                'pleasantness': None
+            }
+            for day in (self.today, self.yesterday)
+        ])
+
+    def add_message(self, date_str):
+        """Add a message through the sync view"""
+        response = self.client.post(
+            f'/messagesdays/ABC123/{date_str}/messages/',
+            {'title': 'More', 'text': 'Another message', 'type': MessageType.JOKING.value},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_day_etag_and_not_modified(self):
+        """Test a day read carries validators and a matching If-None-Match returns 304"""
+        url = f'/messagesdays/ABC123/{self.today_str}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b'')
+        self.assertEqual(cached['ETag'], etag)
+        print(f"  🔹 Day read returned ETag {etag} and a 304 on revalidation")
+
+    def test_write_bumps_version_and_invalidates_etag(self):
+        """Test a message write bumps the day's version, updated_at and ETag"""
+        url = f'/messagesdays/ABC123/{self.today_str}/'
+        etag = self.client.get(url)['ETag']
+
+        self.add_message(self.today_str)
+
+        stored = MongoDB.get_instance().get_collection('MessagesDays').find_one({'date': self.today})
+        self.assertEqual(stored['version'], 1)
+        self.assertIsNotNone(stored['updated_at'])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['data']['version'], 1)
+        self.assertIn('Last-Modified', response)
+
+        # Last-Modified revalidates too
+        cached = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(cached.status_code, 304)
+        print("  🔹 Write bumped version to 1 and changed the ETag; If-Modified-Since returned 304")
+
+    def test_unchanged_put_keeps_version(self):
+        """Test a PUT that changes nothing neither writes nor bumps the version"""
+        url = f'/messagesdays/ABC123/{self.today_str}/'
+        self.client.put(url, {'mood': 'Calm'}, format='json')
+        response = self.client.put(url, {'mood': 'Calm'}, format='json')
+        self.assertEqual(response.data['successMessage'], 'No changes made')
+
+        stored = MongoDB.get_instance().get_collection('MessagesDays').find_one({'date': self.today})
+        self.assertEqual(stored['version'], 1)
+        print("  🔹 Unchanged PUT kept version 1")
+
+    def test_message_reads_revalidate(self):
+        """Test message list and single message reads answer 304 until the day changes"""
+        for url in (f'/messagesdays/ABC123/{self.today_str}/messages/', '/messages/ABC123/'):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        history = '/messages/ABC123/'
+        etag = self.client.get(history)['ETag']
+
+        # Deleting a whole day changes the history ETag
+        MongoDB.get_instance().get_collection('MessagesDays').delete_one({'date': self.yesterday})
+        response = self.client.get(history, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['date_count'], 1)
+        self.assertNotIn('Last-Modified', response)
+        print("  🔹 Message reads returned 304 until a day was deleted")
+
+    def test_missing_day_is_not_revalidated(self):
+        """Test If-None-Match on a missing day still returns 404"""
+        response = self.client.get('/messagesdays/ABC123/01-01-2000/', HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 404)
+        print("  🔹 Missing day returned 404 despite If-None-Match")
+
+    @closes_async_client
+    async def test_async_views_share_validators(self):
+        """Test async reads emit the same ETag as the sync view and answer 304"""
+        sync_etag = (await self.async_client.get(f'/messagesdays/ABC123/{self.today_str}/'))['ETag']
+
+        day = await self.async_client.get(f'/async/messagesdays/ABC123/{self.today_str}/')
+        self.assertEqual(day['ETag'], sync_etag)
+        cached = await self.async_client.get(f'/async/messagesdays/ABC123/{self.today_str}/', headers={'If-None-Match': sync_etag})
+        self.assertEqual(cached.status_code, 304)
+
+        messages_url = f'/async/messagesdays/ABC123/{self.today_str}/messages/'
+        etag = (await self.async_client.get(messages_url))['ETag']
+        await self.async_client.delete(messages_url)
+        stale = await self.async_client.get(messages_url, headers={'If-None-Match': etag})
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.json()['data']['count'], 0)
+        print("  🔹 Async views matched the sync ETag and revalidated after a write")
+
+
+# This will run if this file is executed directly
+if __name__ == '__main__':
+    print("Running ConditionalGetTest...")
+    run_test_with_output(ConditionalGetTest)
@@ -537,6 +537,35 @@ class ConnectionViewTest(BLEOBaseTest):
             self.assertIn('bleoid', connection['other_user'])
         
         print("  🔹 Successfully retrieved all connections for user (1 active, 2 historical)")
+
+    def test_get_connections_query_budget(self):
+        """Test listing connections stays within its MongoDB command budget"""
+        for partner in ('USER02', 'USER03'):
+            self.db_links.insert_one({
+                'bleoidPartner1': 'USER01',
+                'bleoidPartner2': partner,
+                'status': ConnectionStatusType.REJECTED,
+                'created_at': datetime.now(),
+                'updated_at': datetime.now()
+            })
+
+        # One query for the links and one for all partner profiles, whatever the connection count
+        with self.assertMaxMongoCommands(2):
+            response = self.client.get('/connections/', {'bleoid': 'USER01'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['count'], 2)
+        self.assertIn('mongo;dur=', response['Server-Timing'])
+        self.assertNotIn('KB', response['Server-Timing'])
+        for connection in response.data['data']['connections']:
+            self.assertIn('other_user', connection)
+
+        # Byte counts only when asked for, since they re-encode every reply
+        with self.settings(MONGO_COMMAND_BYTES=True):
+            response = self.client.get('/connections/', {'bleoid': 'USER01'})
+        self.assertIn('KB"', response['Server-Timing'])
+
+        print("  🔹 Connection list stayed within its query budget")
     
     def test_get_active_connection_only(self):
         """Test getting only the active connection for a user"""
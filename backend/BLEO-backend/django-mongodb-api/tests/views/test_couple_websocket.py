@@ -0,0 +1,190 @@
+from tests.base_test import BLEOBaseTest, closes_async_client, run_test_with_output
+from api.routing import websocket_urlpatterns
+from api.Views.MessagesDays.Message.MessageView import MessageOperationsView
+from api.Views.MessagesDays.Message.MessageAsyncView import AsyncMessageOperationsView
+from utils.jwt_keys import JWTKeyRing
+from models.enums.MessageType import MessageType
+from utils.mongodb_utils import MongoDB
+from utils.realtime_events import RealtimeEvents
+from utils.validation_patterns import ValidationRules
+from asgiref.sync import sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from rest_framework.test import APIClient
+from django.test import override_settings
+from django.urls import path
+from datetime import datetime, timedelta, timezone
+import time
+import random
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('messagesdays/<str:bleoid>/<str:date>/messages/', MessageOperationsView.as_view(), name='message-operations'),
+    path('async/messagesdays/<str:bleoid>/<str:date>/messages/', AsyncMessageOperationsView.as_view(), name='async-message-operations'),
+]
+
+@override_settings(
+    ROOT_URLCONF=__name__,
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+)
+class CoupleWebSocketTest(BLEOBaseTest):
+    """Test cases for the couple WebSocket and the events published by the write paths"""
+
+    COLLECTION_KEYS = ('Users', 'Links', 'MessagesDays', 'TokenBlacklist')
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        MongoDB.get_instance()
+
+        # Use test collections with timestamp to avoid conflicts
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collections = {key: MongoDB.COLLECTIONS[key] for key in cls.COLLECTION_KEYS}
+        for key in cls.COLLECTION_KEYS:
+            MongoDB.COLLECTIONS[key] = f"{key}_{cls.test_suffix}"
+
+        print(f"🔧 Created websocket test collections with suffix {cls.test_suffix}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            db = MongoDB.get_instance().get_db()
+            for key in cls.COLLECTION_KEYS:
+                db.drop_collection(MongoDB.COLLECTIONS[key])
+            MongoDB.COLLECTIONS.update(cls.original_collections)
+            print(f"🧹 Dropped websocket test collections with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        self.client = APIClient()
+        self.application = URLRouter(websocket_urlpatterns)
+
+        mongo = MongoDB.get_instance()
+        for key in self.COLLECTION_KEYS:
+            mongo.get_collection(key).delete_many({})
+
+        mongo.get_collection('Users').insert_many([
+            {'bleoid': 'ABC123', 'email': 'user1@example.com', 'userName': 'TestUser1'},
+            {'bleoid': 'DEF456', 'email': 'user2@example.com', 'userName': 'TestUser2'},
+            {'bleoid': 'GHI789', 'email': 'user3@example.com', 'userName': 'TestUser3'}
+        ])
+        mongo.get_collection('Links').insert_one({
+            'bleoidPartner1': 'ABC123',
+            'bleoidPartner2': 'DEF456',
+            'status': 'accepted'
+        })
+
+        today = datetime.now()
+        self.today_str = today.strftime(ValidationRules.STANDARD_DATE_FORMAT)
+        mongo.get_collection('MessagesDays').insert_one({
+            'from_bleoid': 'ABC123',
+            'to_bleoid': 'DEF456',
+            'date': datetime(today.year, today.month, today.day),
+            'messages': []
+        })
+
+    def token_for(self, bleoid):
+        """Signed access token for bleoid"""
+        now = datetime.now(timezone.utc)
+        return JWTKeyRing.encode({'bleoid': bleoid, 'exp': int((now + timedelta(minutes=5)).timestamp())})
+
+    async def connect(self, bleoid=None, token=None, subprotocols=None):
+        """Open a couple WebSocket, returning (communicator, connected, close_code_or_subprotocol)"""
+        token = token if token is not None else (self.token_for(bleoid) if bleoid else '')
+        path = 'ws/couple/' if subprotocols else f'ws/couple/?token={token}'
+        communicator = WebsocketCommunicator(self.application, path, subprotocols=subprotocols)
+        connected, subprotocol = await communicator.connect()
+        return communicator, connected, subprotocol
+
+    @closes_async_client
+    async def test_rejects_missing_and_invalid_tokens(self):
+        """Test sockets without a valid token are closed with 4401"""
+        for token in ('', 'not-a-jwt'):
+            communicator, connected, _ = await self.connect(token=token)
+            self.assertTrue(connected)
+            output = await communicator.receive_output()
+            self.assertEqual(output['type'], 'websocket.close')
+            self.assertEqual(output['code'], 4401)
+            await communicator.disconnect()
+        print("  🔹 Missing and invalid tokens closed with 4401")
+
+    @closes_async_client
+    async def test_rejects_blacklisted_token(self):
+        """Test a blacklisted token is closed with 4401"""
+        token = self.token_for('ABC123')
+        await sync_to_async(MongoDB.get_instance().get_collection('TokenBlacklist').insert_one)({'token': token})
+
+        communicator, _, _ = await self.connect(token=token)
+        output = await communicator.receive_output()
+        self.assertEqual(output['code'], 4401)
+        await communicator.disconnect()
+        print("  🔹 Blacklisted token closed with 4401")
+
+    @closes_async_client
+    async def test_rejects_unlinked_user(self):
+        """Test a user without an accepted link is closed with 4403"""
+        communicator, _, _ = await self.connect('GHI789')
+        output = await communicator.receive_output()
+        self.assertEqual(output['code'], 4403)
+        await communicator.disconnect()
+        print("  🔹 Unlinked user closed with 4403")
+
+    @closes_async_client
+    async def test_partner_receives_message_created_from_sync_view(self):
+        """Test a message added through the sync view is pushed to the partner's socket"""
+        partner, connected, _ = await self.connect('DEF456')
+        self.assertTrue(connected)
+
+        response = await sync_to_async(self.client.post)(
+            f'/messagesdays/ABC123/{self.today_str}/messages/',
+            {'title': 'Hello', 'text': 'Pushed message', 'type': MessageType.THOUGHTS.value},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+        event = await partner.receive_json_from(timeout=2)
+        self.assertEqual(event['event'], RealtimeEvents.MESSAGE_CREATED)
+        self.assertEqual(event['from_bleoid'], 'ABC123')
+        self.assertEqual(event['date'], self.today_str)
+        self.assertEqual(event['data']['messages'][0]['title'], 'Hello')
+
+        await partner.disconnect()
+        print("  🔹 Partner received message.created from the sync write path")
+
+    @closes_async_client
+    async def test_both_partners_receive_events_from_async_view(self):
+        """Test both partners' sockets (subprotocol auth) receive events from the async view"""
+        sender, _, subprotocol = await self.connect(subprotocols=['bearer', self.token_for('ABC123')])
+        self.assertEqual(subprotocol, 'bearer')
+        partner, _, _ = await self.connect('DEF456')
+
+        response = await self.async_client.delete(f'/async/messagesdays/ABC123/{self.today_str}/messages/')
+        self.assertEqual(response.status_code, 200)
+
+        for communicator in (sender, partner):
+            event = await communicator.receive_json_from(timeout=2)
+            self.assertEqual(event['event'], RealtimeEvents.MESSAGE_DELETED)
+            await communicator.disconnect()
+        print("  🔹 Both partners received message.deleted from the async write path")
+
+    @closes_async_client
+    async def test_ping_pong(self):
+        """Test the socket answers keepalive pings"""
+        communicator, _, _ = await self.connect('ABC123')
+        await communicator.send_json_to({'type': 'ping'})
+        self.assertEqual(await communicator.receive_json_from(timeout=2), {'type': 'pong'})
+        await communicator.disconnect()
+        print("  🔹 Ping answered with pong")
+
+
+# This will run if this file is executed directly
+if __name__ == '__main__':
+    print("Running CoupleWebSocketTest...")
+    run_test_with_output(CoupleWebSocketTest)
@@ -1,12 +1,15 @@
 from tests.base_test import BLEOBaseTest, run_test_with_output
 from rest_framework.test import APIClient
-from api.Views.DebugLogs.DebugLogViews import LoggingView, AdminLogsView, AdminLogDetailView
+from api.Views.DebugLogs.DebugLogViews import LoggingView, AdminLogsView, AdminLogDetailView, AdminLogAnalyticsView, AdminLogExportView
+import csv
+import gzip
+import io
 from models.enums.LogType import LogType
 from utils.mongodb_utils import MongoDB
 import json
 import time
 import random
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from django.urls import path
 from django.test import override_settings
 from utils.logger import Logger
@@ -14,11 +17,21 @@ from models.enums.UserType import UserType
 from models.enums.ErrorSourceType import ErrorSourceType
 from models.enums.DebugType import DebugType
 from models.AppParameters import AppParameters
+from utils.log_sampler import LogSampler
+from utils.parameter_manager import ParameterManager
+from api.apps import ApiConfig
+from django.apps import apps
+from django.core.management import call_command
+from unittest.mock import patch
+from mongoDbVersionUpdate.v1_5_0.v1_5_0_DebugLogs import renumber_duplicate_log_ids
+from pymongo.errors import DuplicateKeyError
 
 # Set up URL configuration for testing
 urlpatterns = [
     path('logs/', LoggingView.as_view(), name='log-create'),
     path('admin/logs/', AdminLogsView.as_view(), name='admin-logs'),
+    path('admin/logs/analytics/', AdminLogAnalyticsView.as_view(), name='admin-log-analytics'),
+    path('admin/logs/export/', AdminLogExportView.as_view(), name='admin-log-export'),
     path('admin/logs/<str:log_id>/', AdminLogDetailView.as_view(), name='admin-log-detail'),
 ]
 
@@ -99,6 +112,10 @@ class DebugLogViewsTest(BLEOBaseTest):
             }
             self.db_params.insert_one(version_param)
             
+            # Start every test without cached parameters or sampler state
+            ParameterManager.invalidate_cache()
+            LogSampler.reset()
+            
             # Create sample test logs
             now = datetime.now()
             self.test_logs = [
@@ -225,6 +242,74 @@ class DebugLogViewsTest(BLEOBaseTest):
         
         print("  🔹 Properly rejected invalid log data")
     
+    def test_create_log_batch(self):
+        """Test an array of entries is validated in bulk and stored with consecutive ids"""
+        entries = [
+            {'bleoid': 'BATCH1', 'message': f'Batched action {i}', 'type': LogType.INFO.value, 'code': 200}
+            for i in range(5)
+        ]
+        
+        response = self.client.post('/logs/', entries, format='json')
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['accepted'], 5)
+        self.assertEqual([result['status'] for result in response.data['results']], ['created'] * 5)
+        
+        stored = list(self.db_logs.find({'bleoid': 'BATCH1'}).sort('id', 1))
+        self.assertEqual(len(stored), 5)
+        self.assertEqual([log['id'] for log in stored], list(range(stored[0]['id'], stored[0]['id'] + 5)))
+        
+        print("  🔹 Batch of 5 logs stored with one insert")
+    
+    def test_create_log_batch_partial_failure(self):
+        """Test invalid entries are reported per index while valid ones are stored"""
+        entries = [
+            {'message': 'Valid entry', 'type': LogType.INFO.value, 'code': 200},
+            {'message': 'Bad type', 'type': 'not-a-type', 'code': 200},
+            {'message': 'Valid error', 'type': LogType.ERROR.value, 'code': 500}
+        ]
+        
+        response = self.client.post('/logs/', entries, format='json')
+        
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['accepted'], 2)
+        self.assertEqual(response.data['rejected'], 1)
+        results = response.data['results']
+        self.assertEqual(results[1]['status'], 'invalid')
+        self.assertIn('type', results[1]['errors'])
+        self.assertEqual([results[0]['status'], results[2]['status']], ['created', 'created'])
+        self.assertIsNone(self.db_logs.find_one({'message': 'Bad type'}))
+        
+        print("  🔹 Partial batch failure reported with 207")
+    
+    @override_settings(LOG_BATCH_MAX_ENTRIES=3)
+    def test_create_log_batch_too_large(self):
+        """Test batches above the entry limit are rejected with 413"""
+        entries = [{'message': f'Entry {i}', 'type': LogType.INFO.value, 'code': 200} for i in range(4)]
+        
+        response = self.client.post('/logs/', entries, format='json')
+        
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.db_logs.count_documents({'message': {'$regex': '^Entry'}}), 0)
+        
+        print("  🔹 Oversized batch rejected")
+    
+    @override_settings(LOG_CLIENT_ENTRIES_PER_MINUTE=2)
+    def test_create_log_batch_client_quota(self):
+        """Test entries beyond the per-client quota are rejected as rate limited"""
+        LoggingView._client_buckets.clear()
+        entries = [{'message': f'Quota entry {i}', 'type': LogType.INFO.value, 'code': 200} for i in range(3)]
+        
+        try:
+            response = self.client.post('/logs/', entries, format='json')
+        finally:
+            LoggingView._client_buckets.clear()
+        
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['status'] for result in response.data['results']], ['created', 'created', 'rate_limited'])
+        
+        print("  🔹 Per-client quota applied to the batch")
+    
     # ====== AdminLogsView Tests ======
     
     def test_get_all_logs(self):
@@ -315,6 +400,219 @@ class DebugLogViewsTest(BLEOBaseTest):
         
         print("  🔹 Successfully tested pagination")
     
+    def test_cursor_pagination(self):
+        """Test walking all logs with next_cursor returns each log once, newest first"""
+        now = datetime.now().replace(microsecond=0)
+        for i in range(6):
+            self.db_logs.insert_one({
+                'id': 3000 + i,
+                'message': f'Cursor test log {i}',
+                'type': LogType.INFO.value,
+                'user_type': UserType.SYSTEM.value,
+                'code': 200,
+                # Pairs share a date so the id tie-breaker is exercised
+                'date': now + timedelta(minutes=1 + i // 2)
+            })
+        
+        seen = []
+        params = {'limit': '4'}
+        while True:
+            response = self.client.get('/admin/logs/', params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(log['id'] for log in response.data['logs'])
+            if not response.data['has_more']:
+                self.assertIsNone(response.data['next_cursor'])
+                break
+            params = {'limit': '4', 'cursor': response.data['next_cursor']}
+        
+        self.assertEqual(seen, [3005, 3004, 3003, 3002, 3001, 3000, 1003, 1002, 1001])
+        
+        print("  🔹 Cursor pages covered every log exactly once")
+    
+    def test_invalid_cursor(self):
+        """Test a malformed cursor is rejected"""
+        response = self.client.get('/admin/logs/', {'cursor': 'not-a-cursor'})
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Invalid cursor', response.data['error'])
+        
+        print("  🔹 Malformed cursor rejected")
+    
+    def test_total_estimate_and_exact_count(self):
+        """Test filtered totals are capped as estimates unless exact_count is requested"""
+        self.db_logs.insert_many([
+            {'id': 4000 + i, 'message': 'Count test', 'type': LogType.WARNING.value,
+             'user_type': UserType.SYSTEM.value, 'code': 200, 'date': datetime.now()}
+            for i in range(5)
+        ])
+        
+        original_limit = AdminLogsView.COUNT_LIMIT
+        AdminLogsView.COUNT_LIMIT = 3
+        try:
+            response = self.client.get('/admin/logs/', {'type': LogType.WARNING.value})
+            self.assertEqual(response.data['total'], 3)
+            self.assertTrue(response.data['total_is_estimate'])
+            
+            response = self.client.get('/admin/logs/', {'type': LogType.WARNING.value, 'exact_count': 'true'})
+            self.assertEqual(response.data['total'], 5)
+            self.assertFalse(response.data['total_is_estimate'])
+        finally:
+            AdminLogsView.COUNT_LIMIT = original_limit
+        
+        print("  🔹 Capped estimate and opt-in exact count returned")
+    
+    def test_duplicate_ids_renumbered_before_unique_index(self):
+        """Test v1.5.0 renumbers ids duplicated by the old allocator and builds the unique id index"""
+        now = datetime.now()
+        self.db_logs.insert_many([
+            {'id': 1003, 'message': 'Raced log', 'type': LogType.INFO.value, 'date': now},
+            {'id': 1003, 'message': 'Raced log again', 'type': LogType.INFO.value, 'date': now},
+            {'message': 'Log without id', 'type': LogType.INFO.value, 'date': now}
+        ])
+        try:
+            with patch.object(Logger, 'server_error') as server_error:
+                MongoDB.get_instance()._setup_collection_indexes(self.debug_logs_collection_name)
+            server_error.assert_called_once()
+            
+            result = renumber_duplicate_log_ids()
+            self.assertTrue(result['success'])
+            self.assertEqual(result['updated'], 3)
+            
+            ids = [log['id'] for log in self.db_logs.find({}, {'id': 1})]
+            self.assertEqual(len(ids), len(set(ids)))
+            self.assertEqual(self.db_logs.find_one({'message': 'Test system log'})['id'], 1003)
+            with self.assertRaises(DuplicateKeyError):
+                self.db_logs.insert_one({'id': 1001, 'message': 'Duplicate', 'type': LogType.INFO.value, 'date': now})
+            
+            self.assertEqual(renumber_duplicate_log_ids()['updated'], 0)
+        finally:
+            self.db_logs.drop_indexes()
+        
+        print("  🔹 Duplicate log ids renumbered, unique index built")
+    
+    # ====== AdminLogAnalyticsView Tests ======
+    
+    def test_analytics_counts_and_top_users(self):
+        """Test analytics groups logs by type, error code, source and user over the window"""
+        now = datetime.now()
+        self.db_logs.insert_many([
+            {'id': 5000, 'bleoid': 'USER02', 'message': 'Timeout', 'type': LogType.ERROR.value, 'code': 504,
+             'error_source': ErrorSourceType.SERVER.value, 'user_type': UserType.USER.value,
+             'date': now - timedelta(minutes=5), 'repeat_count': 4},
+            {'id': 5001, 'bleoid': 'USER03', 'message': 'Timeout', 'type': LogType.ERROR.value, 'code': 504,
+             'error_source': ErrorSourceType.SERVER.value, 'user_type': UserType.USER.value,
+             'date': now - timedelta(minutes=3)},
+            # Outside the default 24 hour window
+            {'id': 5002, 'bleoid': 'USER02', 'message': 'Old error', 'type': LogType.ERROR.value, 'code': 500,
+             'user_type': UserType.USER.value, 'date': now - timedelta(days=3)}
+        ])
+        
+        response = self.client.get('/admin/logs/analytics/', {'bucket': 'hour', 'top': '2'})
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        # Setup logs from the last day (1002, 1003) + 4 aggregated + 1
+        self.assertEqual(data['total'], 7)
+        self.assertEqual(data['errors_by_code'][0], {'code': 504, 'count': 5})
+        self.assertIn({'code': 500, 'count': 1}, data['errors_by_code'])  # setup log 1002
+        self.assertEqual(data['errors_by_source'][0], {'error_source': ErrorSourceType.SERVER.value, 'count': 5})
+        self.assertEqual(data['top_users'][0], {'bleoid': 'USER02', 'count': 5, 'errors': 5})
+        self.assertEqual(len(data['top_users']), 2)
+        self.assertEqual(sum(row['count'] for row in data['timeline']), 7)
+        
+        print("  🔹 Analytics aggregated counts, error codes and top users")
+    
+    def test_analytics_rejects_invalid_bucket_and_window(self):
+        """Test analytics validates the bucket and caps the window per bucket size"""
+        response = self.client.get('/admin/logs/analytics/', {'bucket': 'week'})
+        self.assertEqual(response.status_code, 400)
+        
+        response = self.client.get('/admin/logs/analytics/', {'bucket': 'minute', 'days': '7'})
+        self.assertEqual(response.status_code, 400)
+        
+        print("  🔹 Invalid bucket and oversized window rejected")
+    
+    def test_analytics_offset_dates(self):
+        """Test analytics accepts start/end dates carrying a UTC offset"""
+        start = (datetime.now(timezone.utc) - timedelta(hours=6)).replace(microsecond=0)
+        naive = self.client.get('/admin/logs/analytics/', {'start_date': start.astimezone().replace(tzinfo=None).isoformat()})
+        
+        response = self.client.get('/admin/logs/analytics/', {'start_date': start.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], naive.data['total'])
+        self.assertIsNone(response.data['window']['start'].tzinfo)
+        
+        response = self.client.get('/admin/logs/analytics/', {
+            'start_date': start.isoformat(), 'end_date': (start + timedelta(hours=7)).isoformat()
+        })
+        self.assertEqual(response.status_code, 200)
+        
+        print("  🔹 Offset-bearing dates compared with the stored local times")
+    
+    # ====== AdminLogExportView Tests ======
+    
+    def test_export_ndjson(self):
+        """Test NDJSON export streams one JSON document per log, newest first"""
+        response = self.client.get('/admin/logs/export/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('attachment; filename="debuglogs-', response['Content-Disposition'])
+        
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        # The export audit log written when the stream starts is the newest entry
+        self.assertEqual([json.loads(line)['id'] for line in lines][1:], [1003, 1002, 1001])
+        
+        print("  🔹 NDJSON export streamed every log")
+    
+    def test_export_csv_gzip_with_filters(self):
+        """Test gzipped CSV export applies the admin filters"""
+        response = self.client.get('/admin/logs/export/', {'output': 'csv', 'gzip': 'true', 'user_type': UserType.USER.value})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        
+        body = gzip.decompress(b''.join(response.streaming_content)).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual([row['id'] for row in rows], ['1002', '1001'])
+        self.assertEqual(rows[0]['error_source'], ErrorSourceType.APPLICATION.value)
+        self.assertEqual(rows[1]['bleoid'], 'USER01')
+        
+        print("  🔹 Gzipped CSV export filtered by type")
+    
+    def test_export_invalid_output(self):
+        """Test an unknown export format is rejected"""
+        response = self.client.get('/admin/logs/export/', {'output': 'xml'})
+        
+        self.assertEqual(response.status_code, 400)
+        
+        print("  🔹 Unknown export format rejected")
+
+    def test_export_command_stdout(self):
+        """Test export_logs to stdout is parseable even when a banner is printed during the export"""
+        get_collection = MongoDB.get_collection
+
+        def connect_with_banner(mongo, name):
+            print("✅ MongoDB connection successful!")
+            return get_collection(mongo, name)
+
+        outputs = {}
+        for compress in (False, True):
+            raw = io.BytesIO()
+            stdout = io.TextIOWrapper(raw, encoding='utf-8')
+            with patch('sys.stdout', stdout), \
+                    patch.object(MongoDB, 'get_collection', autospec=True, side_effect=connect_with_banner):
+                ApiConfig.ready(apps.get_app_config('api'))
+                call_command('export_logs', *(['--gzip'] if compress else []))
+            outputs[compress] = raw.getvalue()
+
+        lines = outputs[False].decode().splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [1003, 1002, 1001])
+        self.assertEqual(gzip.decompress(outputs[True]), outputs[False])
+
+        print("  🔹 export_logs stdout holds only the export")
+
     # ====== AdminLogDetailView Tests ======
     
     def test_get_log_by_id(self):
@@ -379,6 +677,59 @@ class DebugLogViewsTest(BLEOBaseTest):
         print("  🔹 Successfully filtered logs by error_source")
 
 
+    # ====== Log Sampling Tests ======
+    
+    def _set_log_sampling(self, config):
+        """Store a log_sampling parameter and drop cached values"""
+        self.db_params.insert_one({'param_name': AppParameters.PARAM_LOG_SAMPLING, 'param_value': config})
+        ParameterManager.invalidate_cache()
+    
+    def test_sampling_drops_info_but_keeps_errors(self):
+        """Test a zero sampling rate drops info logs while errors are always written"""
+        self._set_log_sampling({'rates': {LogType.INFO.value: 0, LogType.ERROR.value: 0}})
+        
+        response = self.client.post('/logs/', {'message': 'Sampled out', 'type': LogType.INFO.value, 'code': 200}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['sampling'], LogSampler.SAMPLED)
+        self.assertIsNone(self.db_logs.find_one({'message': 'Sampled out'}))
+        
+        response = self.client.post('/logs/', {'message': 'Kept error', 'type': LogType.ERROR.value, 'code': 500}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNotNone(self.db_logs.find_one({'message': 'Kept error'}))
+        
+        print("  🔹 Info log sampled out, error log kept")
+    
+    def test_rate_limit_per_bleoid(self):
+        """Test the per-BLEOID token bucket stops writes once the burst is spent"""
+        self._set_log_sampling({'per_bleoid_per_minute': 1, 'burst': 2})
+        
+        statuses = [
+            self.client.post('/logs/', {'bleoid': 'RATE01', 'message': f'Action {i}', 'type': LogType.INFO.value, 'code': 200}, format='json').status_code
+            for i in range(3)
+        ]
+        
+        self.assertEqual(statuses, [201, 201, 202])
+        self.assertEqual(self.db_logs.count_documents({'bleoid': 'RATE01'}), 2)
+        
+        print("  🔹 Third log for the same BLEOID rate limited")
+    
+    def test_repeated_messages_aggregated(self):
+        """Test identical messages collapse into one entry carrying repeat_count"""
+        self._set_log_sampling({'aggregate_window_seconds': 60})
+        log_data = {'bleoid': 'AGGR01', 'message': 'Same message', 'type': LogType.INFO.value, 'code': 200}
+        
+        statuses = [self.client.post('/logs/', log_data, format='json').status_code for _ in range(4)]
+        self.assertEqual(statuses, [201, 202, 202, 202])
+        
+        Logger.flush_aggregates()
+        
+        logs = list(self.db_logs.find({'message': 'Same message'}))
+        self.assertEqual(len(logs), 2)
+        self.assertEqual(sum(log.get('repeat_count', 1) for log in logs), 4)
+        
+        print("  🔹 Four identical logs stored as two documents totalling repeat_count 4")
+
+
 # This will run if this file is executed directly
 if __name__ == '__main__':
     run_test_with_output(DebugLogViewsTest)
\ No newline at end of file
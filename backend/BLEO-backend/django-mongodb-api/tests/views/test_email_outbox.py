@@ -0,0 +1,250 @@
+from tests.base_test import BLEOBaseTest, run_test_with_output
+from tests.smtp_debug_server import SMTPDebugServer
+from rest_framework.test import APIClient
+from auth.password_reset import PasswordResetRequestView
+from services.EmailOutbox import EmailOutbox
+from services.EmailService import EmailService
+from services.SMTPPool import SMTPPool
+from utils.mongodb_utils import MongoDB
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from django.apps import apps
+from api.apps import ApiConfig
+from unittest.mock import patch
+from django.urls import path
+from datetime import datetime, timedelta, timezone
+import os
+import socket
+import time
+import random
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('auth/password-reset/request/', PasswordResetRequestView.as_view(), name='password-reset-request'),
+]
+
+@override_settings(ROOT_URLCONF=__name__, EMAIL_OUTBOX_WORKER='off', EMAIL_OUTBOX_BATCH_SIZE=10, EMAIL_OUTBOX_MAX_ATTEMPTS=3)
+class EmailOutboxTest(BLEOBaseTest):
+    """Test cases for queued email delivery through a local debugging SMTP server"""
+
+    COLLECTION_KEYS = ('Users', 'PasswordResets', 'EmailOutbox')
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        mongo = MongoDB.get_instance()
+
+        # Use test collections with timestamp to avoid conflicts
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collections = {key: MongoDB.COLLECTIONS[key] for key in cls.COLLECTION_KEYS}
+        for key in cls.COLLECTION_KEYS:
+            MongoDB.COLLECTIONS[key] = f"{key}_{cls.test_suffix}"
+        # The unique idempotency_key index is part of the behaviour under test
+        mongo._setup_collection_indexes(MongoDB.COLLECTIONS['EmailOutbox'])
+
+        cls.smtp = SMTPDebugServer().start()
+        print(f"🔧 Created outbox test collections with suffix {cls.test_suffix}, SMTP on port {cls.smtp.port}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            cls.smtp.stop()
+            db = MongoDB.get_instance().get_db()
+            for key in cls.COLLECTION_KEYS:
+                db.drop_collection(MongoDB.COLLECTIONS[key])
+            MongoDB.COLLECTIONS.update(cls.original_collections)
+            print(f"🧹 Dropped outbox test collections with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        self.client = APIClient()
+        self.outbox = MongoDB.get_instance().get_collection('EmailOutbox')
+        for key in self.COLLECTION_KEYS:
+            MongoDB.get_instance().get_collection(key).delete_many({})
+        self.smtp.messages.clear()
+        self.smtp.sessions = 0
+        self.smtp.refuse.clear()
+
+        self.smtp_settings = override_settings(
+            SMTP_SERVER='127.0.0.1',
+            SMTP_PORT=self.smtp.port,
+            SMTP_USE_TLS=False,
+            SMTP_USERNAME='',
+            SMTP_PASSWORD='',
+            FROM_EMAIL='noreply@bleo.test'
+        )
+        self.smtp_settings.enable()
+        SMTPPool.clear()
+
+    def tearDown(self):
+        """Close pooled sessions and restore the SMTP settings"""
+        SMTPPool.clear()
+        self.smtp_settings.disable()
+        super().tearDown()
+
+    def make_due(self):
+        """Move every scheduled retry to now"""
+        self.outbox.update_many({}, {'$set': {'next_attempt_at': datetime.now(timezone.utc)}})
+
+    def expire_leases(self):
+        """Let every lease run out, as if its worker died"""
+        self.outbox.update_many({'locked_until': {'$ne': None}}, {'$set': {'locked_until': datetime.now(timezone.utc) - timedelta(seconds=1)}})
+
+    def test_endpoint_only_writes_the_outbox(self):
+        """Test the reset endpoint returns once the email is queued, without touching SMTP"""
+        MongoDB.get_instance().get_collection('Users').insert_one({
+            'bleoid': 'ABC123', 'email': 'test@example.com', 'password': make_password('Password123'),
+            'userName': 'TestUser1', 'created_at': datetime.now(timezone.utc)
+        })
+
+        response = self.client.post('/auth/password-reset/request/', {'email': 'test@example.com'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.smtp.sessions, 0)
+
+        row = self.outbox.find_one()
+        self.assertEqual(row['status'], EmailOutbox.PENDING)
+        self.assertTrue(row['idempotency_key'].startswith('password_reset:'))
+
+        self.assertEqual(EmailOutbox.deliver_pending()['sent'], 1)
+        self.assertEqual(self.smtp.messages[0]['Subject'], 'Reset Your BLEO Password')
+        print("  🔹 Endpoint queued the reset email; the worker delivered it")
+
+    def test_batch_shares_one_session(self):
+        """Test a batch of emails is sent over a single SMTP session"""
+        for i in range(5):
+            EmailOutbox.enqueue(f'user{i}@example.com', f'Subject {i}', f'<p>Body {i}</p>', f'Body {i}')
+
+        totals = EmailOutbox.deliver_pending()
+        self.assertEqual(totals, {'sent': 5, 'retried': 0, 'failed': 0})
+        self.assertEqual(self.smtp.sessions, 1)
+        self.assertEqual(sorted(message['To'] for message in self.smtp.messages), [f'user{i}@example.com' for i in range(5)])
+        self.assertEqual(self.outbox.count_documents({'status': EmailOutbox.SENT}), 5)
+        # Sent rows keep no body (reset and verification links)
+        self.assertEqual(self.outbox.count_documents({'html_content': None, 'text_content': None}), 5)
+        print("  🔹 5 emails delivered over 1 SMTP session")
+
+    def test_idempotency_key(self):
+        """Test an idempotency key queues one email however often it is enqueued"""
+        self.assertTrue(EmailOutbox.enqueue('user@example.com', 'Hi', '<p>Hi</p>', idempotency_key='welcome:ABC123'))
+        self.assertFalse(EmailOutbox.enqueue('user@example.com', 'Hi', '<p>Hi</p>', idempotency_key='welcome:ABC123'))
+
+        EmailOutbox.deliver_pending()
+        EmailOutbox.deliver_pending()
+        self.assertEqual(len(self.smtp.messages), 1)
+        print("  🔹 Duplicate enqueue ignored, email delivered once")
+
+    def test_retry_with_backoff_then_fail(self):
+        """Test failed sends are retried later and given up after the max attempts"""
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            closed_port = probe.getsockname()[1]
+
+        EmailOutbox.enqueue('user@example.com', 'Hi', '<p>Hi</p>')
+        with override_settings(SMTP_PORT=closed_port):
+            self.assertEqual(EmailOutbox.deliver_pending()['retried'], 1)
+            row = self.outbox.find_one()
+            self.assertEqual((row['status'], row['attempts']), (EmailOutbox.PENDING, 1))
+            self.assertTrue(row['last_error'])
+            # Not due yet: the backoff keeps it out of the next run
+            self.assertEqual(EmailOutbox.deliver_pending(), {'sent': 0, 'retried': 0, 'failed': 0})
+
+            self.make_due()
+            EmailOutbox.deliver_pending()
+            self.make_due()
+            self.assertEqual(EmailOutbox.deliver_pending()['failed'], 1)
+            row = self.outbox.find_one()
+            self.assertEqual((row['status'], row['html_content']), (EmailOutbox.FAILED, None))
+
+        self.assertLess(EmailOutbox.backoff(1), EmailOutbox.backoff(4))
+        print("  🔹 Unreachable SMTP retried with backoff, then marked failed after 3 attempts")
+
+    def test_refused_recipient_fails_without_retry(self):
+        """Test a refused recipient fails at once while the rest of the batch is delivered"""
+        self.smtp.refuse.add('gone@example.com')
+        EmailOutbox.enqueue('gone@example.com', 'Hi', '<p>Hi</p>')
+        EmailOutbox.enqueue('here@example.com', 'Hi', '<p>Hi</p>')
+
+        totals = EmailOutbox.deliver_pending()
+        self.assertEqual((totals['sent'], totals['failed']), (1, 1))
+        self.assertEqual(self.outbox.find_one({'to_email': 'gone@example.com'})['attempts'], 1)
+        print("  🔹 Refused recipient failed immediately, other email delivered")
+
+    def test_expired_lease_is_reclaimed(self):
+        """Test rows of a crashed worker are delivered once their lease expires"""
+        EmailOutbox.enqueue('user@example.com', 'Hi', '<p>Hi</p>')
+        self.assertEqual(len(EmailOutbox.claim(10)), 1)
+        self.assertEqual(EmailOutbox.claim(10), [])
+
+        self.expire_leases()
+        self.assertEqual(EmailOutbox.deliver_pending()['sent'], 1)
+        # The attempt of the dead worker counts too
+        self.assertEqual(self.outbox.find_one()['attempts'], 2)
+        print("  🔹 Email leased by a dead worker was delivered after the lease expired")
+
+    def test_outcome_needs_the_lease(self):
+        """Test a worker that outlived its lease cannot overwrite the reclaiming worker's result"""
+        EmailOutbox.enqueue('user@example.com', 'Hi', '<p>Hi</p>')
+        [stale] = EmailOutbox.claim(10)
+        self.expire_leases()
+        [current] = EmailOutbox.claim(10)
+
+        EmailOutbox._retry(current, 'Connection reset')
+        EmailOutbox._mark_sent(stale)
+        row = self.outbox.find_one()
+        self.assertEqual((row['status'], row['attempts'], row['last_error']), (EmailOutbox.PENDING, 2, 'Connection reset'))
+        print("  🔹 Late result of an expired lease was ignored")
+
+    def test_row_crashing_every_worker_fails(self):
+        """Test a row whose lease expires on every attempt is failed after the max attempts"""
+        EmailOutbox.enqueue('user@example.com', 'Hi', '<p>Hi</p>')
+        for _ in range(3):
+            self.assertEqual(len(EmailOutbox.claim(10)), 1)
+            self.expire_leases()
+
+        self.assertEqual(EmailOutbox.claim(10), [])
+        row = self.outbox.find_one()
+        self.assertEqual((row['status'], row['attempts'], row['html_content']), (EmailOutbox.FAILED, 3, None))
+        print("  🔹 Row crashing its worker failed after 3 attempts")
+
+    def test_verification_email_queues(self):
+        """Test the verification helper accepts the keywords its view passes"""
+        self.assertTrue(EmailService.send_verification_email(
+            email='new@example.com', verification_token='token-123', user_name='NewUser'
+        ))
+        row = self.outbox.find_one()
+        self.assertTrue(row['idempotency_key'].startswith('verification:'))
+        self.assertIn('token-123', row['html_content'])
+        print("  🔹 Verification email queued")
+
+    @override_settings(EMAIL_OUTBOX_WORKER='thread')
+    def test_worker_started_with_the_server(self):
+        """Test thread mode starts delivering at startup in servers, not in commands or the reloader"""
+        cases = [
+            (['uvicorn', 'config.asgi:application'], {}, True),
+            (['manage.py', 'runserver'], {'RUN_MAIN': 'true'}, True),
+            (['manage.py', 'runserver', '--noreload'], {}, True),
+            (['manage.py', 'runserver'], {}, False),
+            (['manage.py', 'migrate'], {}, False),
+            (['manage.py', 'test'], {}, False),
+        ]
+        for argv, environ, serves in cases:
+            with patch('sys.argv', argv), patch.dict('os.environ', environ), \
+                    patch.object(MongoDB, 'initialize'), patch.object(EmailOutbox, 'notify') as notify:
+                if 'RUN_MAIN' not in environ:
+                    os.environ.pop('RUN_MAIN', None)
+                ApiConfig.ready(apps.get_app_config('api'))
+            self.assertEqual(notify.called, serves, argv)
+        print("  🔹 Outbox worker starts with the server only")
+
+
+# This will run if this file is executed directly
+if __name__ == '__main__':
+    print("Running EmailOutboxTest...")
+    run_test_with_output(EmailOutboxTest)
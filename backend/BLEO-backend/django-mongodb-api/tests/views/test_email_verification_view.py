@@ -115,7 +115,9 @@ class EmailVerificationViewTest(BLEOBaseTest):
         
         self.assertIsNotNone(verification_record, "Verification record should exist")
         
-        token = verification_record['token']
+        # Only the jti is stored: the token comes from the (mocked) email
+        token = mock_send_email.call_args.kwargs['verification_token']
+        self.assertNotIn('token', verification_record)
         
         # Verify email
         verify_data = {
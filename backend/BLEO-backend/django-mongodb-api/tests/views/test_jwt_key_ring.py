@@ -0,0 +1,160 @@
+from tests.base_test import BLEOBaseTest, run_test_with_output
+from rest_framework.test import APIClient
+from auth.jwt_auth import CustomTokenObtainPairView, TokenRefreshView
+from utils.jwt_keys import JWTKeyRing
+from utils.jwt_rotation import JWTSecretRotationManager
+from utils.mongodb_utils import MongoDB
+from django.contrib.auth.hashers import make_password
+from django.urls import path
+from django.test import override_settings
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+import jwt
+import os
+import time
+import random
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('auth/login/', CustomTokenObtainPairView.as_view(), name='token-obtain-pair'),
+    path('auth/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+]
+
+@override_settings(ROOT_URLCONF=__name__, JWT_KEY_RING_SIZE=2, JWT_KEY_RELOAD_SECONDS=30, PASSWORD_HASH_WORKERS=0)
+class JWTKeyRingTest(BLEOBaseTest):
+    """Test cases for kid-tagged JWT signing keys and their rotation"""
+
+    COLLECTION_KEYS = ('Users', 'TokenBlacklist', 'JWTKeys')
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        mongo = MongoDB.get_instance()
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collections = {key: MongoDB.COLLECTIONS[key] for key in cls.COLLECTION_KEYS}
+        for key in cls.COLLECTION_KEYS:
+            MongoDB.COLLECTIONS[key] = f"{key}_{cls.test_suffix}"
+        mongo._setup_collection_indexes(MongoDB.COLLECTIONS['JWTKeys'])
+        print(f"🔧 Created key ring test collections with suffix {cls.test_suffix}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            db = MongoDB.get_instance().get_db()
+            for key in cls.COLLECTION_KEYS:
+                db.drop_collection(MongoDB.COLLECTIONS[key])
+            MongoDB.COLLECTIONS.update(cls.original_collections)
+            # Other tests sign with the keys of the real collection
+            JWTKeyRing.reset()
+            print(f"🧹 Dropped key ring test collections with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        self.client = APIClient()
+        self.db_keys = MongoDB.get_instance().get_collection('JWTKeys')
+        self.db_keys.delete_many({})
+        JWTKeyRing.reset()
+        db_users = MongoDB.get_instance().get_collection('Users')
+        db_users.delete_many({})
+        db_users.insert_one({
+            'bleoid': 'KEY001', 'email': 'keys@example.com', 'password': make_password('Password123'),
+            'userName': 'KeyHolder', 'email_verified': True,
+            'last_login': datetime.now(), 'created_at': datetime.now()
+        })
+
+    def login(self):
+        response = self.client.post('/auth/login/', {'email': 'keys@example.com', 'password': 'Password123'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def refresh(self, refresh_token):
+        return self.client.post('/auth/refresh/', {'refresh': refresh_token}, format='json')
+
+    def test_ring_seeded_from_jwt_secret(self):
+        """Test that an empty store is seeded with JWT_SECRET and tokens carry its kid"""
+        tokens = self.login()
+
+        legacy_kid = JWTKeyRing.kid_for(os.getenv('JWT_SECRET'))
+        self.assertEqual(jwt.get_unverified_header(tokens['access'])['kid'], legacy_kid)
+        keys = list(self.db_keys.find({}))
+        self.assertEqual([(key['kid'], key['generation']) for key in keys], [(legacy_kid, 0)])
+        self.assertNotIn(os.getenv('JWT_SECRET'), legacy_kid)
+        print("  🔹 Ring seeded from JWT_SECRET, tokens tagged with its kid")
+
+    def test_previous_key_verifies_after_rotation(self):
+        """Test that sessions signed before a rotation keep working until they expire"""
+        tokens = self.login()
+        old_kid = jwt.get_unverified_header(tokens['refresh'])['kid']
+
+        result = JWTSecretRotationManager().rotate_secret(force=True)
+        self.assertTrue(result['rotated'])
+        self.assertEqual(result['rotation_count'], 1)
+        self.assertNotEqual(result['kid'], old_kid)
+        self.assertEqual(JWTSecretRotationManager().get_rotation_status()['status'], 'current')
+
+        response = self.refresh(tokens['refresh'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(jwt.get_unverified_header(response.data['data']['access'])['kid'], result['kid'])
+        self.assertEqual(self.db_keys.count_documents({}), 2)
+        print("  🔹 Old refresh token still accepted, new tokens signed with the new key")
+
+    def test_rotation_on_other_node_picked_up(self):
+        """Test that a key added by another process verifies at once and signs after the reload"""
+        JWTKeyRing.current()
+        secret = 'another-node-secret-' + 'x' * 48
+        kid = JWTKeyRing.kid_for(secret)
+        self.db_keys.insert_one({
+            'kid': kid, 'secret': secret, 'generation': 1,
+            'created_at': datetime.now(timezone.utc) + timedelta(seconds=1)
+        })
+        token = jwt.encode({'bleoid': 'KEY001', 'exp': datetime.now(timezone.utc) + timedelta(minutes=5)},
+                           secret, algorithm='HS256', headers={'kid': kid})
+
+        # The unknown kid forces a reload instead of waiting JWT_KEY_RELOAD_SECONDS
+        self.assertEqual(JWTKeyRing.decode(token)['bleoid'], 'KEY001')
+        self.assertEqual(JWTKeyRing.current()[0], kid)
+        print("  🔹 Other node's rotation picked up without a restart")
+
+    @override_settings(JWT_KEY_RING_SIZE=1)
+    def test_keys_past_ring_rejected(self):
+        """Test that tokens signed by a key dropped from the ring are refused"""
+        tokens = self.login()
+        JWTKeyRing.rotate()
+        self.assertEqual(self.refresh(tokens['refresh']).status_code, 200)
+
+        JWTKeyRing.rotate()
+        self.assertEqual(self.db_keys.count_documents({}), 2)
+        self.assertEqual(self.refresh(tokens['refresh']).status_code, 401)
+        print("  🔹 Key past the ring no longer verifies")
+
+    def test_legacy_and_unknown_kids(self):
+        """Test tokens without a kid, and that unknown kids reload the store at most once in a while"""
+        payload = {'bleoid': 'KEY001', 'exp': datetime.now(timezone.utc) + timedelta(minutes=5)}
+        legacy = jwt.encode(payload, os.getenv('JWT_SECRET'), algorithm='HS256')
+        self.assertEqual(JWTKeyRing.decode(legacy)['bleoid'], 'KEY001')
+
+        forged = jwt.encode(payload, 'not-the-secret', algorithm='HS256')
+        with self.assertRaises(jwt.InvalidTokenError):
+            JWTKeyRing.decode(forged)
+
+        unknown = jwt.encode(payload, 'not-the-secret', algorithm='HS256', headers={'kid': 'ffffffffffffffff'})
+        with patch.object(JWTKeyRing, '_load', wraps=JWTKeyRing._load) as load:
+            for _ in range(3):
+                with self.assertRaises(jwt.InvalidTokenError):
+                    JWTKeyRing.decode(unknown)
+        self.assertEqual(load.call_count, 1)
+        print("  🔹 kid-less tokens use JWT_SECRET, unknown kids rejected with one reload")
+
+
+if __name__ == '__main__':
+    print("🚀 Running JWT Key Ring Tests")
+    print("="*60)
+
+    run_test_with_output(JWTKeyRingTest)
@@ -0,0 +1,159 @@
+from tests.base_test import BLEOBaseTest, run_test_with_output
+from rest_framework.test import APIClient
+from auth.jwt_auth import CustomTokenObtainPairView
+from services.PasswordHashing import PasswordHashing
+from utils.login_throttle import LoginThrottle
+from utils.mongodb_utils import MongoDB
+from django.contrib.auth.hashers import make_password
+from django.urls import path
+from django.test import override_settings
+from unittest.mock import patch
+from datetime import datetime
+import time
+import random
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('auth/login/', CustomTokenObtainPairView.as_view(), name='token-obtain-pair'),
+]
+
+@override_settings(ROOT_URLCONF=__name__, LOGIN_THROTTLE_STORE='local', LOGIN_THROTTLE_WINDOW_SECONDS=900,
+                   LOGIN_THROTTLE_MAX_PER_IP=6, LOGIN_THROTTLE_MAX_PER_EMAIL=3, PASSWORD_HASH_WORKERS=0)
+class LoginThrottleTest(BLEOBaseTest):
+    """Test cases for sliding-window login throttling per IP and per email"""
+
+    COLLECTION_KEYS = ('Users', 'LoginThrottle')
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        mongo = MongoDB.get_instance()
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collections = {key: MongoDB.COLLECTIONS[key] for key in cls.COLLECTION_KEYS}
+        for key in cls.COLLECTION_KEYS:
+            MongoDB.COLLECTIONS[key] = f"{key}_{cls.test_suffix}"
+        mongo._setup_collection_indexes(MongoDB.COLLECTIONS['LoginThrottle'])
+        print(f"🔧 Created login throttle test collections with suffix {cls.test_suffix}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            db = MongoDB.get_instance().get_db()
+            for key in cls.COLLECTION_KEYS:
+                db.drop_collection(MongoDB.COLLECTIONS[key])
+            MongoDB.COLLECTIONS.update(cls.original_collections)
+            print(f"🧹 Dropped login throttle test collections with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        self.client = APIClient()
+        self.db_users = MongoDB.get_instance().get_collection('Users')
+        self.db_users.delete_many({})
+        MongoDB.get_instance().get_collection('LoginThrottle').delete_many({})
+        self.db_users.insert_one({
+            'bleoid': 'THR001', 'email': 'throttle@example.com', 'password': make_password('Password123'),
+            'userName': 'Throttled', 'email_verified': True,
+            'last_login': datetime.now(), 'created_at': datetime.now()
+        })
+
+    def login(self, password, email='throttle@example.com'):
+        return self.client.post('/auth/login/', {'email': email, 'password': password}, format='json')
+
+    def test_email_throttled_before_any_lookup(self):
+        """Test that an email past its failure limit is refused without touching Users or hashing"""
+        for _ in range(3):
+            self.assertEqual(self.login('Wrong123').status_code, 401)
+
+        with patch.object(MongoDB, 'get_collection', autospec=True, side_effect=MongoDB.get_collection) as get_collection, \
+                patch.object(PasswordHashing, 'verify') as verify:
+            response = self.login('Password123')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.data['errorType'], 'ThrottledError')
+        self.assertGreater(int(response['Retry-After']), 0)
+        touched = {call.args[1] for call in get_collection.call_args_list}
+        self.assertEqual(touched, set())
+        verify.assert_not_called()
+        print("  🔹 Throttled login refused before any database or hash work")
+
+    def test_success_clears_email_failures(self):
+        """Test that a successful login forgets the email's earlier failures"""
+        for _ in range(2):
+            self.login('Wrong123')
+        self.assertEqual(self.login('Password123').status_code, 200)
+
+        for _ in range(2):
+            self.assertEqual(self.login('Wrong123').status_code, 401)
+        self.assertEqual(self.login('Password123').status_code, 200)
+        print("  🔹 Successful login clears the email's failures")
+
+    def test_ip_throttled_across_emails(self):
+        """Test that one IP trying many emails hits the per-IP limit"""
+        for index in range(6):
+            self.assertEqual(self.login('Wrong123', f"nobody{index}@example.com").status_code, 401)
+
+        response = self.login('Password123')
+        self.assertEqual(response.status_code, 429)
+
+        # Another client address is not affected
+        response = self.client.post('/auth/login/', {'email': 'throttle@example.com', 'password': 'Password123'},
+                                    format='json', REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 200)
+        print("  🔹 Per-IP limit applies across emails")
+
+    def test_sliding_window(self):
+        """Test that the previous window's failures fade out instead of resetting at once"""
+        start = 900 * 1000
+        for _ in range(4):
+            LoginThrottle.record_failure('10.0.0.3', 'slide@example.com', now=start + 800)
+
+        self.assertGreater(LoginThrottle.retry_after('10.0.0.3', 'slide@example.com', now=start + 850), 0)
+        # Just into the next window, most of the previous window still counts (4 * 17/18)
+        wait = LoginThrottle.retry_after('10.0.0.3', 'slide@example.com', now=start + 950)
+        self.assertGreater(wait, 0)
+        # Retry-After lands just past where the count drops under the limit
+        self.assertEqual(LoginThrottle.retry_after('10.0.0.3', 'slide@example.com', now=start + 950 + wait), 0)
+        self.assertGreater(LoginThrottle.retry_after('10.0.0.3', 'slide@example.com', now=start + 950 + wait - 3), 0)
+        # A third of the way in, 4 * 2/3 failures weigh: under the limit of 3
+        self.assertEqual(LoginThrottle.retry_after('10.0.0.3', 'slide@example.com', now=start + 1200), 0)
+        print("  🔹 Previous window's failures fade out")
+
+    def test_non_string_credentials_rejected(self):
+        """Test that a non-string email or password gets a 400 instead of reaching the throttle or the query"""
+        for body in ({'email': 123, 'password': 'Password123'}, {'email': ['throttle@example.com'], 'password': 'x'},
+                     {'email': {'$ne': None}, 'password': 'Password123'}, {'email': 'throttle@example.com', 'password': 1}):
+            response = self.client.post('/auth/login/', body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+
+        self.assertEqual(list(LoginThrottle.subjects('10.0.0.4', 123)), ['ip:10.0.0.4'])
+        print("  🔹 Non-string credentials rejected with 400")
+
+    @override_settings(LOGIN_THROTTLE_STORE='mongo')
+    def test_mongo_store_shared(self):
+        """Test that the Mongo store counts failures in LoginThrottle without storing emails"""
+        for _ in range(3):
+            self.assertEqual(self.login('Wrong123').status_code, 401)
+
+        docs = list(MongoDB.get_instance().get_collection('LoginThrottle').find({}))
+        self.assertEqual(sorted(doc['count'] for doc in docs), [3, 3])
+        self.assertNotIn('throttle@example.com', str(docs))
+        self.assertIn(LoginThrottle.email_key('throttle@example.com'), {doc['key'] for doc in docs})
+
+        # Other processes see the same counters: the local store is empty
+        LoginThrottle._local.clear()
+        self.assertEqual(self.login('Password123').status_code, 429)
+        print("  🔹 Mongo store shares counters between processes")
+
+
+if __name__ == '__main__':
+    print("🚀 Running Login Throttle Tests")
+    print("="*60)
+
+    run_test_with_output(LoginThrottleTest)
@@ -0,0 +1,211 @@
+from tests.base_test import BLEOBaseTest, closes_async_client, run_test_with_output
+from api.Views.MessagesDays.MessagesDaysSyncView import MessageDaySyncView
+from api.Views.MessagesDays.MessagesDaysView import MessageDayCreateView, MessageDayDetailView
+from api.Views.MessagesDays.Message.MessageView import MessageOperationsView
+from api.Views.MessagesDays.Message.MessageAsyncView import AsyncMessageOperationsView
+from models.enums.MessageType import MessageType
+from utils.message_sync import MessageSync
+from utils.mongodb_utils import MongoDB
+from utils.validation_patterns import ValidationRules
+from rest_framework.test import APIClient
+from django.test import override_settings
+from django.urls import path
+from datetime import datetime, timedelta, timezone
+import time
+import random
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('messagesdays/<str:bleoid>/', MessageDayCreateView.as_view(), name='message-day-create-with-id'),
+    path('messagesdays/<str:bleoid>/sync/', MessageDaySyncView.as_view(), name='message-day-sync'),
+    path('messagesdays/<str:bleoid>/<str:date>/', MessageDayDetailView.as_view(), name='message-day-detail'),
+    path('messagesdays/<str:bleoid>/<str:date>/messages/', MessageOperationsView.as_view(), name='message-operations'),
+    path('messagesdays/<str:bleoid>/<str:date>/messages/<int:message_id>/', MessageOperationsView.as_view(), name='message-detail'),
+    path('async/messagesdays/<str:bleoid>/<str:date>/messages/', AsyncMessageOperationsView.as_view(), name='async-message-operations'),
+]
+
+@override_settings(ROOT_URLCONF=__name__, MESSAGE_SYNC_SETTLE_SECONDS=0)
+class MessageDaySyncViewTest(BLEOBaseTest):
+    """Test cases for the MessagesDays delta sync endpoint"""
+
+    COLLECTION_KEYS = ('Users', 'Links', 'MessagesDays', 'MessagesDaysTombstones')
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        MongoDB.get_instance()
+
+        # Use test collections with timestamp to avoid conflicts
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collections = {key: MongoDB.COLLECTIONS[key] for key in cls.COLLECTION_KEYS}
+        for key in cls.COLLECTION_KEYS:
+            MongoDB.COLLECTIONS[key] = f"{key}_{cls.test_suffix}"
+
+        print(f"🔧 Created sync test collections with suffix {cls.test_suffix}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            db = MongoDB.get_instance().get_db()
+            for key in cls.COLLECTION_KEYS:
+                db.drop_collection(MongoDB.COLLECTIONS[key])
+            MongoDB.COLLECTIONS.update(cls.original_collections)
+            print(f"🧹 Dropped sync test collections with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        self.client = APIClient()
+
+        mongo = MongoDB.get_instance()
+        for key in self.COLLECTION_KEYS:
+            mongo.get_collection(key).delete_many({})
+
+        mongo.get_collection('Users').insert_one({'bleoid': 'ABC123', 'email': 'user1@example.com', 'userName': 'TestUser1'})
+
+        # Three days an hour apart: two written by ABC123, one by its partner
+        written = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=3)
+        today = datetime.now()
+        self.days = [datetime(today.year, today.month, today.day) - timedelta(days=offset) for offset in range(3)]
+        self.day_strs = [day.strftime(ValidationRules.STANDARD_DATE_FORMAT) for day in self.days]
+        mongo.get_collection('MessagesDays').insert_many([
+            {
+                'from_bleoid': from_bleoid,
+                'to_bleoid': to_bleoid,
+                'date': day,
+                'messages': [
+                    {'id': 1, 'title': 'First', 'text': 'First message', 'type': MessageType.THOUGHTS.value},
+                    {'id': 2, 'title': 'Second', 'text': 'Second message', 'type': MessageType.NOTES.value}
+                ],
+                'mood': None,
+                'energy_level': None,
+                'pleasantness': None,
+                'version': 1,
+                'updated_at': written + timedelta(hours=index)
+            }
+            for index, (from_bleoid, to_bleoid, day) in enumerate([
+                ('ABC123', 'DEF456', self.days[0]),
+                ('ABC123', 'DEF456', self.days[1]),
+                ('DEF456', 'ABC123', self.days[2])
+            ])
+        ])
+        # Another couple's day is never part of ABC123's feed
+        mongo.get_collection('MessagesDays').insert_one({
+            'from_bleoid': 'GHI789', 'to_bleoid': 'JKL012', 'date': self.days[0], 'messages': [],
+            'version': 1, 'updated_at': written
+        })
+
+    def sync(self, since=None, limit=None):
+        """GET the sync feed of ABC123"""
+        params = {}
+        if since:
+            params['since'] = since
+        if limit:
+            params['limit'] = limit
+        response = self.client.get('/messagesdays/ABC123/sync/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data['data']
+
+    def test_initial_sync_returns_both_partners_days(self):
+        """Test a first sync returns every day written by or to the user, oldest write first"""
+        data = self.sync()
+        self.assertEqual([day['date'] for day in data['days']], self.day_strs)
+        self.assertEqual({day['from_bleoid'] for day in data['days']}, {'ABC123', 'DEF456'})
+        self.assertFalse(data['has_more'])
+        self.assertIsNotNone(data['watermark'])
+        self.assertEqual(data['deleted_days'], [])
+        print(f"  🔹 Initial sync returned {len(data['days'])} days of the couple")
+
+    def test_incremental_sync_returns_only_changes(self):
+        """Test a sync from a watermark returns only days written and deleted since"""
+        watermark = self.sync()['watermark']
+        self.assertEqual(self.sync(watermark)['days'], [])
+
+        self.client.post(
+            f'/messagesdays/ABC123/{self.day_strs[1]}/messages/',
+            {'title': 'New', 'text': 'Fresh message', 'type': MessageType.JOKING.value},
+            format='json'
+        )
+        self.client.delete(f'/messagesdays/ABC123/{self.day_strs[0]}/messages/2/')
+        self.client.delete(f'/messagesdays/ABC123/{self.day_strs[0]}/')
+
+        data = self.sync(watermark)
+        self.assertEqual([day['date'] for day in data['days']], [self.day_strs[1]])
+        self.assertEqual(len(data['days'][0]['messages']), 3)
+        self.assertEqual([tomb['message_id'] for tomb in data['deleted_messages']], [2])
+        self.assertEqual([tomb['date'] for tomb in data['deleted_days']], [self.day_strs[0]])
+
+        # Nothing new after the next watermark
+        caught_up = self.sync(data['watermark'])
+        self.assertEqual(caught_up['days'] + caught_up['deleted_days'] + caught_up['deleted_messages'], [])
+        print("  🔹 Incremental sync returned 1 changed day, 1 deleted message and 1 deleted day")
+
+    def test_pagination(self):
+        """Test limit pages through the feed with has_more and the watermark"""
+        seen = []
+        watermark = None
+        for _ in range(5):
+            data = self.sync(watermark, limit=1)
+            seen += [day['date'] for day in data['days']]
+            watermark = data['watermark']
+            if not data['has_more']:
+                break
+        self.assertEqual(seen, self.day_strs)
+        print("  🔹 Paged through 3 days one at a time")
+
+    def test_bulk_delete_records_tombstones(self):
+        """Test deleting all of a user's days records one tombstone per day"""
+        watermark = self.sync()['watermark']
+        response = self.client.delete('/messagesdays/ABC123/')
+        self.assertEqual(response.data['data']['deleted_count'], 2)
+
+        data = self.sync(watermark)
+        self.assertEqual(sorted(tomb['date'] for tomb in data['deleted_days']), sorted(self.day_strs[:2]))
+        print("  🔹 Bulk deletion surfaced as 2 deleted days")
+
+    @override_settings(MESSAGE_SYNC_SETTLE_SECONDS=60)
+    def test_recent_changes_are_resent(self):
+        """Test the watermark stays before changes inside the settle window"""
+        watermark = self.sync()['watermark']
+        self.client.put(f'/messagesdays/ABC123/{self.day_strs[0]}/', {'mood': 'Calm'}, format='json')
+
+        first = self.sync(watermark)
+        self.assertEqual(len(first['days']), 1)
+        self.assertEqual(first['watermark'], watermark)
+        self.assertEqual(len(self.sync(first['watermark'])['days']), 1)
+        print("  🔹 Change inside the settle window was sent again on the next sync")
+
+    def test_invalid_and_expired_watermarks(self):
+        """Test malformed watermarks are rejected and expired ones ask for a resync"""
+        response = self.client.get('/messagesdays/ABC123/sync/', {'since': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+        old = MessageSync.encode_watermark(datetime(2000, 1, 1), '0' * 24)
+        response = self.client.get('/messagesdays/ABC123/sync/', {'since': old})
+        self.assertEqual(response.status_code, 410)
+
+        response = self.client.get('/messagesdays/bad!/sync/')
+        self.assertEqual(response.status_code, 400)
+        print("  🔹 Malformed watermark returned 400, expired watermark 410")
+
+    @closes_async_client
+    async def test_async_message_delete_records_tombstones(self):
+        """Test the async message view records a tombstone per deleted message"""
+        response = await self.async_client.delete(f'/async/messagesdays/ABC123/{self.day_strs[1]}/messages/')
+        self.assertEqual(response.status_code, 200)
+
+        tombstones = MongoDB.get_instance().get_collection('MessagesDaysTombstones').find({}, {'message_id': 1})
+        self.assertEqual(sorted(tomb['message_id'] for tomb in tombstones), [1, 2])
+        print("  🔹 Async delete-all recorded tombstones for messages 1 and 2")
+
+
+# This will run if this file is executed directly
+if __name__ == '__main__':
+    print("Running MessageDaySyncViewTest...")
+    run_test_with_output(MessageDaySyncViewTest)
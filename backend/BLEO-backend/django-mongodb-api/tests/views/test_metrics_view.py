@@ -0,0 +1,106 @@
+from tests.base_test import BLEOBaseTest, run_test_with_output
+from rest_framework.test import APIClient
+from django.urls import path
+from django.test import override_settings
+from django.http import JsonResponse
+from api.Views.Metrics.MetricsView import MetricsView
+from utils.metrics import Metrics
+from utils.jwt_utils import record_blacklist_check
+
+def ping_view(request):
+    """Trivial view used to generate request metrics"""
+    return JsonResponse({'pong': True})
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('ping/', ping_view, name='metrics-test-ping'),
+]
+
+@override_settings(ROOT_URLCONF=__name__)
+class MetricsViewTest(BLEOBaseTest):
+    """Test cases for the Prometheus metrics endpoint"""
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        self.client = APIClient()
+
+    def _scrape(self, **headers):
+        """Scrape the metrics endpoint and return (response, body)"""
+        response = self.client.get('/metrics/', **headers)
+        return response, response.content.decode()
+
+    def test_scrape_returns_prometheus_text(self):
+        """Test scrape returns text exposition with HELP and TYPE lines"""
+        response, body = self._scrape()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn('# TYPE bleo_http_request_duration_seconds histogram', body)
+        self.assertIn('# TYPE bleo_jwt_verifications_total counter', body)
+
+        print("  🔹 Metrics endpoint returned Prometheus text format")
+
+    def test_request_metrics_recorded_per_view(self):
+        """Test requests are counted and timed under their route name"""
+        for _ in range(3):
+            self.client.get('/ping/')
+
+        response, body = self._scrape()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('bleo_http_requests_total{view="metrics-test-ping",method="GET",status="2xx"}', body)
+        self.assertIn('bleo_http_request_duration_seconds_bucket{view="metrics-test-ping",method="GET",le="+Inf"}', body)
+        self.assertIn('bleo_http_request_duration_seconds_count{view="metrics-test-ping",method="GET"}', body)
+
+        print("  🔹 Per-view request counter and latency histogram recorded")
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram buckets are rendered cumulatively"""
+        histogram = Metrics.histogram('bleo_test_cumulative_seconds', 'Test histogram', buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        _, body = self._scrape()
+
+        self.assertIn('bleo_test_cumulative_seconds_bucket{le="0.1"} 1', body)
+        self.assertIn('bleo_test_cumulative_seconds_bucket{le="1"} 2', body)
+        self.assertIn('bleo_test_cumulative_seconds_bucket{le="+Inf"} 3', body)
+        self.assertIn('bleo_test_cumulative_seconds_count 3', body)
+
+        print("  🔹 Histogram buckets are cumulative")
+
+    def test_blacklist_checks_counted(self):
+        """Test blacklist hits and misses are exposed for the hit-rate metric"""
+        record_blacklist_check('metrics_test', True)
+        record_blacklist_check('metrics_test', False)
+        record_blacklist_check('metrics_test', False)
+
+        _, body = self._scrape()
+
+        self.assertIn('bleo_token_blacklist_checks_total{source="metrics_test",result="hit"} 1', body)
+        self.assertIn('bleo_token_blacklist_checks_total{source="metrics_test",result="miss"} 2', body)
+
+        print("  🔹 Blacklist hits and misses counted")
+
+    @override_settings(METRICS_AUTH_TOKEN='scrape-secret')
+    def test_scrape_requires_token_when_configured(self):
+        """Test scrape is rejected without the configured bearer token"""
+        response, _ = self._scrape()
+        self.assertEqual(response.status_code, 401)
+
+        response, body = self._scrape(HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('# TYPE', body)
+
+        print("  🔹 Metrics token enforced")
+
+
+if __name__ == '__main__':
+    print("🚀 Running Metrics View Tests with Enhanced Summary")
+    print("="*60)
+
+    # Run with enhanced output
+    run_test_with_output(MetricsViewTest)
@@ -0,0 +1,124 @@
+from tests.base_test import BLEOBaseTest, run_test_with_output
+from rest_framework.test import APIClient
+from auth.jwt_auth import CustomTokenObtainPairView
+from services.PasswordHashing import PasswordHashing
+from utils.mongodb_utils import MongoDB
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, identify_hasher
+from django.urls import path
+from django.test import override_settings
+from datetime import datetime
+import time
+import random
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('auth/login/', CustomTokenObtainPairView.as_view(), name='token-obtain-pair'),
+]
+
+@override_settings(ROOT_URLCONF=__name__, PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_PENDING=4,
+                   PASSWORD_HASH_WAIT_SECONDS=2.0)
+class PasswordHashingTest(BLEOBaseTest):
+    """Test cases for password hashing in the process pool and hasher upgrade on login"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_users_collection = MongoDB.COLLECTIONS['Users']
+        MongoDB.COLLECTIONS['Users'] = f"Users_{cls.test_suffix}"
+        print(f"🔧 Created test collection: {MongoDB.COLLECTIONS['Users']}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            MongoDB.get_instance().get_db().drop_collection(MongoDB.COLLECTIONS['Users'])
+            MongoDB.COLLECTIONS['Users'] = cls.original_users_collection
+            PasswordHashing.shutdown()
+            print(f"🧹 Dropped test collection with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        self.client = APIClient()
+        self.db_users = MongoDB.get_instance().get_collection('Users')
+        self.db_users.delete_many({})
+
+    def add_user(self, password_hash):
+        self.db_users.insert_one({
+            'bleoid': 'HASH01', 'email': 'hash@example.com', 'password': password_hash,
+            'userName': 'Hasher', 'email_verified': True,
+            'last_login': datetime.now(), 'created_at': datetime.now()
+        })
+
+    def test_make_and_verify_in_pool(self):
+        """Test hashing and checking a password in the worker processes"""
+        encoded = PasswordHashing.make('Password123')
+
+        self.assertTrue(encoded.startswith('pbkdf2_'))
+        self.assertEqual(PasswordHashing.verify('Password123', encoded), (True, None))
+        self.assertEqual(PasswordHashing.verify('Wrong', encoded), (False, None))
+        self.assertEqual(PasswordHashing.verify('Password123', None), (False, None))
+        print("  🔹 Passwords hashed and checked in the pool")
+
+    @override_settings(PASSWORD_HASH_WORKERS=0)
+    def test_inline_mode(self):
+        """Test that PASSWORD_HASH_WORKERS=0 hashes in the request thread"""
+        encoded = PasswordHashing.make('Password123')
+
+        self.assertTrue(check_password('Password123', encoded))
+        self.assertEqual(PasswordHashing.verify('Password123', encoded), (True, None))
+        print("  🔹 Inline hashing works without workers")
+
+    def test_login_upgrades_outdated_hash(self):
+        """Test that a login rehashes a password stored with too few iterations"""
+        hasher = PBKDF2PasswordHasher()
+        outdated = hasher.encode('Password123', hasher.salt(), iterations=1000)
+        self.add_user(outdated)
+
+        response = self.client.post('/auth/login/', {'email': 'hash@example.com', 'password': 'Password123'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        stored = self.db_users.find_one({'bleoid': 'HASH01'})['password']
+        self.assertNotEqual(stored, outdated)
+        self.assertTrue(check_password('Password123', stored))
+        self.assertEqual(identify_hasher(stored).decode(stored)['iterations'], hasher.iterations)
+
+        # A wrong password changes nothing
+        response = self.client.post('/auth/login/', {'email': 'hash@example.com', 'password': 'Wrong123'}, format='json')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.db_users.find_one({'bleoid': 'HASH01'})['password'], stored)
+        print("  🔹 Outdated hash upgraded on login")
+
+    @override_settings(PASSWORD_HASH_MAX_PENDING=1, PASSWORD_HASH_WAIT_SECONDS=0.05)
+    def test_login_rejected_when_queue_full(self):
+        """Test that a login gets a 503 instead of waiting behind a full queue"""
+        self.add_user(PasswordHashing.make('Password123'))
+
+        _, slots = PasswordHashing._pool()
+        slots.acquire()
+        try:
+            response = self.client.post('/auth/login/', {'email': 'hash@example.com', 'password': 'Password123'}, format='json')
+        finally:
+            slots.release()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.data['errorType'], 'BusyError')
+        self.assertEqual(response['Retry-After'], str(PasswordHashing.RETRY_AFTER_SECONDS))
+
+        # Once a slot frees up, logins go through again
+        response = self.client.post('/auth/login/', {'email': 'hash@example.com', 'password': 'Password123'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        print("  🔹 Full hashing queue answered with 503")
+
+
+if __name__ == '__main__':
+    print("🚀 Running Password Hashing Tests")
+    print("="*60)
+
+    run_test_with_output(PasswordHashingTest)
@@ -2,12 +2,12 @@ from tests.base_test import BLEOBaseTest, run_test_with_output
 from rest_framework.test import APIClient
 from auth.password_reset import PasswordResetRequestView, PasswordResetConfirmView
 from utils.mongodb_utils import MongoDB
+from utils.jwt_keys import JWTKeyRing
 from django.contrib.auth.hashers import make_password
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timezone, timedelta
 from rest_framework import status
 import jwt
-import os
 import time
 import random
 from django.urls import path
@@ -270,12 +270,10 @@ class PasswordResetViewTest(BLEOBaseTest):
 
     # ====== PasswordResetConfirmView Tests ======
     
-    @patch.dict(os.environ, {'JWT_SECRET': 'test-secret-key'})
     @patch('auth.password_reset.Logger')
     def test_password_reset_confirm_success(self, mock_logger):
         """Test successful password reset confirmation"""
         # Create a password reset record first
-        test_secret = 'test-secret-key'
         current_time = datetime.now(timezone.utc)
         payload = {
             'bleoid': 'ABC123',
@@ -286,13 +284,13 @@ class PasswordResetViewTest(BLEOBaseTest):
             'exp': (current_time + timedelta(hours=1)).timestamp()
         }
         
-        valid_token = jwt.encode(payload, test_secret, algorithm='HS256')
+        valid_token = JWTKeyRing.encode(payload)
         
         # Insert reset record with timezone-aware datetime
         reset_record = {
             'bleoid': 'ABC123',
             'email': 'test@example.com',
-            'token': valid_token,
+            'jti': 'test-jti',
             'created_at': current_time,
             'expires_at': current_time + timedelta(hours=1),
             'used': False,
@@ -327,7 +325,7 @@ class PasswordResetViewTest(BLEOBaseTest):
         self.assertIsNotNone(updated_user)
         
         # Verify reset record was marked as used
-        used_reset = self.db_password_resets.find_one({'token': valid_token})
+        used_reset = self.db_password_resets.find_one({'jti': 'test-jti'})
         self.assertTrue(used_reset['used'])
         self.assertIsNotNone(used_reset.get('used_at'))
         
@@ -355,11 +353,9 @@ class PasswordResetViewTest(BLEOBaseTest):
         print(f"  🔹 Status code: {response.status_code}")
         print(f"  🔹 Validation errors returned")
     
-    @patch.dict(os.environ, {'JWT_SECRET': 'test-secret-key'})
     def test_password_reset_confirm_expired_token(self):
         """Test password reset confirm with expired token"""
         # Create expired token
-        test_secret = 'test-secret-key'
         expired_payload = {
             'bleoid': 'ABC123',
             'email': 'test@example.com',
@@ -369,7 +365,7 @@ class PasswordResetViewTest(BLEOBaseTest):
             'exp': (datetime.now(timezone.utc) - timedelta(hours=1)).timestamp()
         }
         
-        expired_token = jwt.encode(expired_payload, test_secret, algorithm='HS256')
+        expired_token = JWTKeyRing.encode(expired_payload)
         
         invalid_data = {
             'token': expired_token,
@@ -388,11 +384,9 @@ class PasswordResetViewTest(BLEOBaseTest):
         print(f"  🔹 Status code: {response.status_code}")
         print(f"  🔹 Expiration message: {response_data.get('errorMessage')}")
     
-    @patch.dict(os.environ, {'JWT_SECRET': 'test-secret-key'})
     def test_password_reset_confirm_token_not_found(self):
         """Test password reset confirm when token not found in database"""
         # Create valid token but don't insert reset record
-        test_secret = 'test-secret-key'
         payload = {
             'bleoid': 'ABC123',
             'email': 'test@example.com',
@@ -402,7 +396,7 @@ class PasswordResetViewTest(BLEOBaseTest):
             'exp': (datetime.now(timezone.utc) + timedelta(hours=1)).timestamp()
         }
         
-        valid_token = jwt.encode(payload, test_secret, algorithm='HS256')
+        valid_token = JWTKeyRing.encode(payload)
         
         confirm_data = {
             'token': valid_token,
@@ -422,11 +416,9 @@ class PasswordResetViewTest(BLEOBaseTest):
         print(f"  🔹 Status code: {response.status_code}")
         print(f"  🔹 Security message: {response_data.get('errorMessage')}")
     
-    @patch.dict(os.environ, {'JWT_SECRET': 'test-secret-key'})
     def test_password_reset_confirm_token_already_used(self):
         """Test password reset confirm when token already used"""
         # Create valid token and mark reset record as used
-        test_secret = 'test-secret-key'
         current_time = datetime.now(timezone.utc)
         payload = {
             'bleoid': 'ABC123',
@@ -437,13 +429,13 @@ class PasswordResetViewTest(BLEOBaseTest):
             'exp': (current_time + timedelta(hours=1)).timestamp()
         }
         
-        valid_token = jwt.encode(payload, test_secret, algorithm='HS256')
+        valid_token = JWTKeyRing.encode(payload)
         
         # Insert used reset record with timezone-aware datetime
         reset_record = {
             'bleoid': 'ABC123',
             'email': 'test@example.com',
-            'token': valid_token,
+            'jti': 'test-jti',
             'created_at': current_time,
             'expires_at': current_time + timedelta(hours=1),
             'used': True,  # Already used
@@ -491,11 +483,9 @@ class PasswordResetViewTest(BLEOBaseTest):
 
     # ====== Token Validation Tests (GET) ======
     
-    @patch.dict(os.environ, {'JWT_SECRET': 'test-secret-key'})
     def test_token_validation_success(self):
         """Test successful token validation via GET"""
         # Create valid token and reset record
-        test_secret = 'test-secret-key'
         current_time = datetime.now(timezone.utc)
         payload = {
             'bleoid': 'ABC123',
@@ -506,13 +496,13 @@ class PasswordResetViewTest(BLEOBaseTest):
             'exp': (current_time + timedelta(hours=1)).timestamp()
         }
         
-        valid_token = jwt.encode(payload, test_secret, algorithm='HS256')
+        valid_token = JWTKeyRing.encode(payload)
         
         # Insert reset record with timezone-aware datetime
         reset_record = {
             'bleoid': 'ABC123',
             'email': 'test@example.com',
-            'token': valid_token,
+            'jti': 'test-jti',
             'created_at': current_time,
             'expires_at': current_time + timedelta(hours=1),
             'used': False,
@@ -573,6 +563,55 @@ class PasswordResetViewTest(BLEOBaseTest):
         print(f"  🔹 Status code: {response.status_code}")
         print(f"  🔹 JWT format validation working")
 
+    def test_forged_token_rejected_without_database(self):
+        """Test a token with a bad signature is rejected before any database access"""
+        current_time = datetime.now(timezone.utc)
+        forged_token = jwt.encode({
+            'bleoid': 'ABC123', 'email': 'test@example.com', 'type': 'password_reset', 'jti': 'test-jti',
+            'iat': current_time.timestamp(), 'exp': (current_time + timedelta(hours=1)).timestamp()
+        }, 'not-the-secret', algorithm='HS256')
+
+        with patch.object(MongoDB, 'get_collection', autospec=True, side_effect=MongoDB.get_collection) as get_collection:
+            response = self.client.put('/auth/password-reset/confirm/', {
+                'token': forged_token, 'password': 'newSecurePassword123'
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        # Only the logger may touch MongoDB
+        touched = {call.args[1] for call in get_collection.call_args_list}
+        self.assertFalse(touched & {'PasswordResets', 'Users'})
+        print("  🔹 Forged token rejected without touching MongoDB")
+
+    def test_records_keyed_by_jti(self):
+        """Test reset records store the token's jti, and v1.4.0 rekeys legacy ones"""
+        from mongoDbVersionUpdate.v1_4_0.v1_4_0_TokenRecords import key_token_records_by_jti
+
+        with patch('services.EmailService.EmailService.send_password_reset_email', return_value=True) as send:
+            response = self.client.post('/auth/password-reset/request/', {'email': 'test@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        token = send.call_args.kwargs['reset_token']
+        record = self.db_password_resets.find_one({'email': 'test@example.com'})
+        self.assertEqual(record['jti'], jwt.decode(token, options={'verify_signature': False})['jti'])
+        self.assertNotIn('token', record)
+
+        current_time = datetime.now(timezone.utc)
+        legacy_token = jwt.encode({'type': 'password_reset', 'jti': 'legacy-jti'}, 'test-secret-key', algorithm='HS256')
+        for token_value in (legacy_token, 'unreadable'):
+            self.db_password_resets.insert_one({
+                'bleoid': 'ABC123', 'email': 'old@example.com', 'token': token_value,
+                'created_at': current_time, 'expires_at': current_time + timedelta(hours=1), 'used': False, 'attempts': 0
+            })
+
+        result = key_token_records_by_jti()
+        self.assertTrue(result['success'])
+        self.assertEqual(result['updated'], 1)
+        legacy = self.db_password_resets.find_one({'jti': 'legacy-jti'})
+        self.assertNotIn('token', legacy)
+        self.assertEqual(self.db_password_resets.count_documents({'email': 'old@example.com'}), 1)
+        print("  🔹 New record keyed by jti, legacy record rekeyed, unreadable one dropped")
+
+
 # This will run if this file is executed directly
 if __name__ == '__main__':
     run_test_with_output(PasswordResetViewTest)
\ No newline at end of file
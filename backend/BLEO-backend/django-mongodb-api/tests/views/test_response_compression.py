@@ -0,0 +1,178 @@
+from tests.base_test import BLEOBaseTest, closes_async_client, run_test_with_output
+from api.Views.MessagesDays.Message.MessageView import MessageOperationsView
+from api.Views.MessagesDays.Message.MessageAsyncView import AsyncMessageOperationsView
+from middleware.compression_middleware import CompressionMiddleware, brotli
+from models.enums.MessageType import MessageType
+from models.enums.EnergyLevelType import EnergyLevelType
+from models.enums.PleasantnessType import PleasantnessType
+from utils.mongodb_utils import MongoDB
+from django.http import JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import path
+from datetime import datetime, timedelta
+from unittest import skipIf
+import gzip
+import json
+import time
+import random
+import zlib
+
+def token_view(request):
+    """Stand-in for an auth endpoint returning a large body"""
+    return JsonResponse({'token': 'x' * 4096})
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('api/messagesdays/<str:bleoid>/messages/', MessageOperationsView.as_view(), name='user-messages'),
+    path('api/async/messagesdays/<str:bleoid>/messages/', AsyncMessageOperationsView.as_view(), name='async-user-messages'),
+    path('api/auth/token/', token_view, name='token'),
+]
+
+@override_settings(ROOT_URLCONF=__name__, COMPRESSION_MIN_BYTES=1024, COMPRESSION_EXCLUDE_PATHS=['/api/auth/'])
+class ResponseCompressionTest(BLEOBaseTest):
+    """Test cases for negotiated response compression and the grouped messages shape"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        MongoDB.get_instance()
+
+        # Use test collections with timestamp to avoid conflicts
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collection = MongoDB.COLLECTIONS['MessagesDays']
+        MongoDB.COLLECTIONS['MessagesDays'] = f"MessagesDays_{cls.test_suffix}"
+
+        # Thirty days of five messages each
+        today = datetime.now()
+        MongoDB.get_instance().get_collection('MessagesDays').insert_many([
+            {
+                'from_bleoid': 'ABC123',
+                'to_bleoid': 'DEF456',
+                'date': datetime(today.year, today.month, today.day) - timedelta(days=offset),
+                'messages': [
+                    {'id': i, 'title': f'Title {i}', 'text': f'Message {i} of day {offset}', 'type': MessageType.THOUGHTS.value,
+                     'created_at': datetime(today.year, today.month, today.day, 12)}
+                    for i in range(1, 6)
+                ],
+                'mood': 'Calm',
+                'energy_level': EnergyLevelType.LOW.value,
+                'pleasantness': PleasantnessType.PLEASANT.value
+            }
+            for offset in range(30)
+        ])
+
+        print(f"🔧 Created compression test collection with suffix {cls.test_suffix}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            MongoDB.get_instance().get_db().drop_collection(MongoDB.COLLECTIONS['MessagesDays'])
+            MongoDB.COLLECTIONS['MessagesDays'] = cls.original_collection
+            print(f"🧹 Dropped compression test collection with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def test_negotiation(self):
+        """Test Accept-Encoding parsing honours q-values and wildcards"""
+        self.assertEqual(CompressionMiddleware.negotiate('gzip'), 'gzip')
+        self.assertEqual(CompressionMiddleware.negotiate('gzip;q=0, identity'), None)
+        self.assertEqual(CompressionMiddleware.negotiate(''), None)
+        self.assertEqual(CompressionMiddleware.negotiate('*'), 'br' if brotli else 'gzip')
+        self.assertEqual(CompressionMiddleware.negotiate('br, gzip', streaming=True), 'gzip')
+        if brotli:
+            self.assertEqual(CompressionMiddleware.negotiate('gzip, deflate, br'), 'br')
+            self.assertEqual(CompressionMiddleware.negotiate('br;q=0.5, gzip'), 'gzip')
+        print("  🔹 Accept-Encoding negotiation honours q-values")
+
+    def test_gzip_large_listing(self):
+        """Test the all-messages listing is gzipped and decodes to the same JSON"""
+        plain = self.client.get('/api/messagesdays/ABC123/messages/')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get('/api/messagesdays/ABC123/messages/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content)), json.loads(plain.content))
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+        # The weakened ETag still revalidates
+        cached = self.client.get('/api/messagesdays/ABC123/messages/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        print(f"  🔹 Listing gzipped from {len(plain.content)} to {len(response.content)} bytes")
+
+    @skipIf(brotli is None, "brotli is not installed")
+    def test_brotli_preferred(self):
+        """Test brotli is chosen when the client accepts it"""
+        response = self.client.get('/api/messagesdays/ABC123/messages/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(brotli.decompress(response.content))['data']['count'], 150)
+        print(f"  🔹 Listing brotli-compressed to {len(response.content)} bytes")
+
+    def test_small_and_excluded_responses_stay_plain(self):
+        """Test bodies under the threshold and auth paths are not compressed"""
+        with self.settings(COMPRESSION_MIN_BYTES=10 ** 7):
+            small = self.client.get('/api/messagesdays/ABC123/messages/', HTTP_ACCEPT_ENCODING='gzip')
+            self.assertNotIn('Content-Encoding', small)
+
+        token = self.client.get('/api/auth/token/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', token)
+        print("  🔹 Small and auth responses were sent uncompressed")
+
+    def test_grouped_shape(self):
+        """Test shape=grouped carries day-level fields once per day"""
+        flat = self.client.get('/api/messagesdays/ABC123/messages/')
+        grouped = self.client.get('/api/messagesdays/ABC123/messages/', {'shape': 'grouped'})
+
+        data = grouped.json()['data']
+        self.assertEqual(data['count'], 150)
+        self.assertEqual(data['date_count'], 30)
+        day = data['days'][0]
+        self.assertEqual(day['mood'], 'Calm')
+        self.assertIsNotNone(day['quadrant'])
+        self.assertEqual(len(day['messages']), 5)
+        # The flat shape repeats the date on every message, the grouped one once per day
+        self.assertIn('date', flat.json()['data']['messages'][0])
+        self.assertNotIn('date', day['messages'][0])
+        print(f"  🔹 Grouped shape: {len(grouped.content)} bytes vs {len(flat.content)} flat")
+
+    @closes_async_client
+    async def test_async_grouped_and_compressed(self):
+        """Test the async listing supports shape=grouped and is compressed under ASGI"""
+        response = await self.async_client.get(
+            '/api/async/messagesdays/ABC123/messages/', {'shape': 'grouped'}, headers={'Accept-Encoding': 'gzip'}
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content))['data']['date_count'], 30)
+        print("  🔹 Async grouped listing was gzipped")
+
+    async def test_async_stream_single_gzip_member(self):
+        """Test an async streaming body is gzipped as one member rather than one per chunk"""
+        lines = [json.dumps({'id': i, 'message': f'Log line {i}'}).encode() + b'\n' for i in range(200)]
+
+        async def stream():
+            for line in lines:
+                yield line
+
+        async def get_response(request):
+            return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+        request = RequestFactory().get('/api/debug-logs/export/', HTTP_ACCEPT_ENCODING='gzip')
+        response = await CompressionMiddleware(get_response)(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        body = b''.join([chunk async for chunk in response.streaming_content])
+
+        decompressor = zlib.decompressobj(wbits=31)
+        self.assertEqual(decompressor.decompress(body), b''.join(lines))
+        self.assertTrue(decompressor.eof)
+        self.assertEqual(decompressor.unused_data, b'')
+        print(f"  🔹 {len(lines)} streamed chunks gzipped into one {len(body)}-byte member")
+
+
+# This will run if this file is executed directly
+if __name__ == '__main__':
+    print("Running ResponseCompressionTest...")
+    run_test_with_output(ResponseCompressionTest)
@@ -0,0 +1,134 @@
+from tests.base_test import BLEOBaseTest, run_test_with_output
+from tests.smtp_debug_server import SMTPDebugServer
+from services.EmailService import EmailService, VERIFICATION_TEMPLATE
+from services.SMTPPool import SMTPPool
+from django.test import override_settings
+import smtplib
+
+@override_settings(SMTP_POOL_SIZE=2, SMTP_POOL_CHECK_SECONDS=3600, SMTP_POOL_MAX_IDLE_SECONDS=3600)
+class SMTPPoolTest(BLEOBaseTest):
+    """Test cases for pooled SMTP sessions and batched sends"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the local SMTP server once before all tests"""
+        super().setUpClass()
+        cls.smtp = SMTPDebugServer().start()
+        print(f"🔧 Started test SMTP server on port {cls.smtp.port}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the SMTP server after all tests"""
+        try:
+            SMTPPool.clear()
+            cls.smtp.stop()
+            print("🧹 Stopped test SMTP server")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Point SMTP at the local server with an empty pool"""
+        super().setUp()
+        self.smtp.messages.clear()
+        self.smtp.sessions = 0
+        self.smtp.refuse.clear()
+        self.smtp_settings = override_settings(
+            SMTP_SERVER='127.0.0.1',
+            SMTP_PORT=self.smtp.port,
+            SMTP_USE_TLS=False,
+            SMTP_USERNAME='',
+            SMTP_PASSWORD='',
+            FROM_EMAIL='noreply@bleo.test'
+        )
+        self.smtp_settings.enable()
+        SMTPPool.clear()
+
+    def tearDown(self):
+        """Close pooled sessions and restore the SMTP settings"""
+        SMTPPool.clear()
+        self.smtp_settings.disable()
+        super().tearDown()
+
+    def messages(self, count, prefix='user'):
+        return [(f'{prefix}{i}@example.com', f'Subject {i}', f'<p>Body {i}</p>', f'Body {i}') for i in range(count)]
+
+    def test_session_reused_across_batches(self):
+        """Test consecutive send_many calls share one logged-in session"""
+        self.assertEqual(EmailService.send_many(self.messages(3)), [None] * 3)
+        self.assertEqual(EmailService.send_many(self.messages(2, 'other')), [None] * 2)
+        self.assertTrue(EmailService.send_email('single@example.com', 'Hi', '<p>Hi</p>'))
+
+        self.assertEqual(len(self.smtp.messages), 6)
+        self.assertEqual(self.smtp.sessions, 1)
+        print("  🔹 3 sends over 1 pooled SMTP session")
+
+    def test_dropped_session_is_replaced(self):
+        """Test a session the server dropped is replaced and the message still sent"""
+        EmailService.send_many(self.messages(1))
+        self.smtp.drop_sessions()
+
+        self.assertEqual(EmailService.send_many(self.messages(2, 'again')), [None, None])
+        self.assertEqual(len(self.smtp.messages), 3)
+        self.assertEqual(self.smtp.sessions, 2)
+        print("  🔹 Dropped session reopened once, no message lost")
+
+    @override_settings(SMTP_POOL_CHECK_SECONDS=0)
+    def test_idle_session_checked_before_reuse(self):
+        """Test an idle session is probed with NOOP and discarded when dead"""
+        server = SMTPPool.checkout()
+        SMTPPool.checkin(server)
+        reused = SMTPPool.checkout()
+        self.assertIs(reused, server)
+        SMTPPool.checkin(reused)
+
+        self.smtp.drop_sessions()
+        fresh = SMTPPool.checkout()
+        self.assertIsNot(fresh, server)
+        self.assertEqual(fresh.noop()[0], 250)
+        SMTPPool.checkin(fresh)
+        print("  🔹 Dead idle session detected by NOOP and replaced")
+
+    def test_config_change_opens_new_session(self):
+        """Test sessions opened with other settings are not reused"""
+        EmailService.send_many(self.messages(1))
+        with override_settings(FROM_EMAIL='other@bleo.test', SMTP_USERNAME='someone', SMTP_PASSWORD=''):
+            EmailService.send_many(self.messages(1))
+        self.assertEqual(self.smtp.sessions, 2)
+        print("  🔹 Changed SMTP settings opened a new session")
+
+    def test_refused_recipient_keeps_session(self):
+        """Test a refused recipient fails alone and the session stays pooled"""
+        self.smtp.refuse.add('user1@example.com')
+        errors = EmailService.send_many(self.messages(3))
+
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], smtplib.SMTPRecipientsRefused)
+        self.assertIsNone(errors[2])
+        EmailService.send_many(self.messages(1, 'later'))
+        self.assertEqual(self.smtp.sessions, 1)
+        print("  🔹 Refused recipient reported per message, session kept")
+
+    @override_settings(SMTP_USE_TLS=True)
+    def test_unconfigured_smtp(self):
+        """Test missing credentials fail every message without connecting"""
+        errors = EmailService.send_many(self.messages(2))
+        self.assertTrue(all(isinstance(error, smtplib.SMTPException) for error in errors))
+        self.assertEqual(self.smtp.sessions, 0)
+        print("  🔹 Unconfigured SMTP reported without a connection attempt")
+
+    def test_template_escapes_html(self):
+        """Test precompiled templates escape values in the HTML part only"""
+        subject, html_content, text_content = VERIFICATION_TEMPLATE.render(user_name='<b>Bob</b>', url='https://x/?a=1&b=2')
+        self.assertEqual(subject, 'Verify Your BLEO Account')
+        self.assertIn('&lt;b&gt;Bob&lt;/b&gt;', html_content)
+        self.assertIn('https://x/?a=1&amp;b=2', html_content)
+        self.assertIn('<b>Bob</b>', text_content)
+        print("  🔹 Template values escaped in HTML, raw in text")
+
+
+# This will run if this file is executed directly
+if __name__ == '__main__':
+    print("Running SMTPPoolTest...")
+    run_test_with_output(SMTPPoolTest)
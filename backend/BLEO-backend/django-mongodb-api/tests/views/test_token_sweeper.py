@@ -0,0 +1,117 @@
+from tests.base_test import BLEOBaseTest, run_test_with_output
+from utils.token_sweeper import TokenSweeper
+from utils.mongodb_utils import MongoDB
+from django.core.management import call_command
+from django.test import override_settings
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+import time
+import random
+
+@override_settings(TOKEN_AUDIT_RETENTION_DAYS=30, TOKEN_SWEEP_CHUNK_SIZE=500)
+class TokenSweeperTest(BLEOBaseTest):
+    """Test cases for token record expiry: TTL indexes and the chunked sweeper"""
+
+    COLLECTION_KEYS = ('PasswordResets', 'EmailVerifications', 'TokenBlacklist')
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        mongo = MongoDB.get_instance()
+
+        # Use test collections with timestamp to avoid conflicts
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collections = {key: MongoDB.COLLECTIONS[key] for key in cls.COLLECTION_KEYS}
+        for key in cls.COLLECTION_KEYS:
+            MongoDB.COLLECTIONS[key] = f"{key}_{cls.test_suffix}"
+            mongo._setup_collection_indexes(MongoDB.COLLECTIONS[key])
+        print(f"🔧 Created token test collections with suffix {cls.test_suffix}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            db = MongoDB.get_instance().get_db()
+            for key in cls.COLLECTION_KEYS:
+                db.drop_collection(MongoDB.COLLECTIONS[key])
+            MongoDB.COLLECTIONS.update(cls.original_collections)
+            print(f"🧹 Dropped token test collections with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        self.resets = MongoDB.get_instance().get_collection('PasswordResets')
+        self.verifications = MongoDB.get_instance().get_collection('EmailVerifications')
+        for key in self.COLLECTION_KEYS:
+            MongoDB.get_instance().get_collection(key).delete_many({})
+        self.now = datetime.now(timezone.utc)
+
+    def add_reset(self, token, expires_in, used=False):
+        self.resets.insert_one({
+            'bleoid': 'ABC123', 'email': 'test@example.com', 'token': token,
+            'created_at': self.now, 'expires_at': self.now + expires_in, 'used': used, 'attempts': 0
+        })
+
+    def add_verification(self, token, expires_in, verified=False):
+        self.verifications.insert_one({
+            'bleoid': 'ABC123', 'email': 'test@example.com', 'token': token,
+            'created_at': self.now, 'expires_at': self.now + expires_in, 'verified': verified, 'attempts': 0
+        })
+
+    def test_ttl_indexes(self):
+        """Test expires_at is a TTL index on the three token collections"""
+        def ttl(key):
+            collection = MongoDB.get_instance().get_collection(key)
+            index = next(index for index in collection.list_indexes() if dict(index['key']) == {'expires_at': 1})
+            return index.get('expireAfterSeconds')
+
+        self.assertEqual(ttl('TokenBlacklist'), 0)
+        self.assertEqual(ttl('PasswordResets'), 30 * 86400)
+        self.assertEqual(ttl('EmailVerifications'), 30 * 86400)
+        print("  🔹 Blacklist expires with its token, reset/verification records after 30 days")
+
+    def test_sweep_removes_only_unused_expired(self):
+        """Test the sweeper keeps used records and tokens that are still valid"""
+        self.add_reset('expired-unused', timedelta(hours=-1))
+        self.add_reset('expired-used', timedelta(hours=-1), used=True)
+        self.add_reset('valid-unused', timedelta(hours=1))
+        self.add_verification('expired-unverified', timedelta(hours=-1))
+        self.add_verification('expired-verified', timedelta(hours=-1), verified=True)
+
+        totals = TokenSweeper.sweep()
+        self.assertEqual(totals, {'PasswordResets': 1, 'EmailVerifications': 1})
+        self.assertEqual(sorted(doc['token'] for doc in self.resets.find()), ['expired-used', 'valid-unused'])
+        self.assertEqual([doc['token'] for doc in self.verifications.find()], ['expired-verified'])
+        print("  🔹 Unused expired records swept, audit and live records kept")
+
+    def test_sweep_in_chunks(self):
+        """Test the sweeper deletes in chunks and can stop after a number of them"""
+        for i in range(5):
+            self.add_reset(f'expired-{i}', timedelta(minutes=-i - 1))
+
+        self.assertEqual(TokenSweeper.sweep(chunk_size=2, max_chunks=1)['PasswordResets'], 2)
+        self.assertEqual(self.resets.count_documents({}), 3)
+        self.assertEqual(TokenSweeper.sweep(chunk_size=2)['PasswordResets'], 3)
+        self.assertEqual(self.resets.count_documents({}), 0)
+        print("  🔹 5 records swept in chunks of 2")
+
+    def test_management_command(self):
+        """Test the sweep_tokens command reports what it deleted"""
+        self.add_verification('expired', timedelta(hours=-2))
+        out = StringIO()
+        call_command('sweep_tokens', '--chunk-size', '10', stdout=out)
+
+        self.assertIn('EmailVerifications: deleted 1', out.getvalue())
+        self.assertEqual(self.verifications.count_documents({}), 0)
+        print("  🔹 sweep_tokens command swept the expired verification")
+
+
+# This will run if this file is executed directly
+if __name__ == '__main__':
+    print("Running TokenSweeperTest...")
+    run_test_with_output(TokenSweeperTest)
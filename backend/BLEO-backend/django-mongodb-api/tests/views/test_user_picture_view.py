@@ -0,0 +1,201 @@
+from tests.base_test import BLEOBaseTest, run_test_with_output
+from rest_framework.test import APIClient
+from api.Views.User.UserView import UserListCreateView, UserDetailView
+from api.Views.User.UserPictureView import UserPictureView
+from mongoDbVersionUpdate.v1_3_0.v1_3_0_Users import move_profile_pictures
+from utils.mongodb_utils import MongoDB
+from bson.binary import Binary
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import path
+from datetime import datetime
+from io import BytesIO
+from PIL import Image
+import base64
+import time
+import random
+
+# Set up URL configuration for testing
+urlpatterns = [
+    path('users/', UserListCreateView.as_view(), name='user-list'),
+    path('users/<str:bleoid>/', UserDetailView.as_view(), name='user-detail'),
+    path('users/<str:bleoid>/picture/', UserPictureView.as_view(), name='user-picture'),
+]
+
+def make_image(width=800, height=600, image_format='JPEG', mode='RGB'):
+    """Encoded test image"""
+    buffer = BytesIO()
+    Image.new(mode, (width, height), (200, 40, 90, 255)[:len(mode)]).save(buffer, image_format)
+    return buffer.getvalue()
+
+@override_settings(ROOT_URLCONF=__name__)
+class UserPictureViewTest(BLEOBaseTest):
+    """Test cases for profile pictures stored in ProfilePictures"""
+
+    COLLECTION_KEYS = ('Users', 'ProfilePictures')
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test environment once before all tests"""
+        super().setUpClass()
+        MongoDB.get_instance()
+
+        # Use test collections with timestamp to avoid conflicts
+        cls.test_suffix = f"test_{int(time.time())}_{random.randint(1000, 9999)}"
+        cls.original_collections = {key: MongoDB.COLLECTIONS[key] for key in cls.COLLECTION_KEYS}
+        for key in cls.COLLECTION_KEYS:
+            MongoDB.COLLECTIONS[key] = f"{key}_{cls.test_suffix}"
+
+        print(f"🔧 Created profile picture test collections with suffix {cls.test_suffix}")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after all tests"""
+        try:
+            db = MongoDB.get_instance().get_db()
+            for key in cls.COLLECTION_KEYS:
+                db.drop_collection(MongoDB.COLLECTIONS[key])
+            MongoDB.COLLECTIONS.update(cls.original_collections)
+            print(f"🧹 Dropped profile picture test collections with suffix {cls.test_suffix}")
+        except Exception as e:
+            print(f"❌ Error during teardown: {str(e)}")
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
+        """Set up the test environment before each test"""
+        super().setUp()
+        self.client = APIClient()
+
+        mongo = MongoDB.get_instance()
+        for key in self.COLLECTION_KEYS:
+            mongo.get_collection(key).delete_many({})
+
+        mongo.get_collection('Users').insert_one({
+            'bleoid': 'ABC123',
+            'email': 'user1@example.com',
+            'password': 'hashed',
+            'userName': 'TestUser1',
+            'profilePic': None,
+            'created_at': datetime.now()
+        })
+
+    def upload(self, raw=None):
+        """PUT a picture for ABC123 as a multipart file"""
+        upload = SimpleUploadedFile('avatar.jpg', raw or make_image(), content_type='image/jpeg')
+        return self.client.put('/users/ABC123/picture/', {'file': upload}, format='multipart')
+
+    def test_upload_stores_variants_and_reference(self):
+        """Test an upload stores every variant and only a reference on the user"""
+        response = self.upload()
+        self.assertEqual(response.status_code, 200, response.data)
+
+        user = MongoDB.get_instance().get_collection('Users').find_one({'bleoid': 'ABC123'})
+        reference = user['profilePic']
+        self.assertIsInstance(reference, str)
+        self.assertEqual(response.data['data']['profilePic'], f'/users/ABC123/picture/?v={reference}')
+        self.assertEqual(response.data['data']['profilePicThumb'], f'/users/ABC123/picture/?v={reference}&size=thumb')
+
+        pictures = MongoDB.get_instance().get_collection('ProfilePictures').find({'bleoid': 'ABC123'})
+        sizes = {}
+        for picture in pictures:
+            self.assertEqual(picture['reference'], reference)
+            sizes[picture['variant']] = Image.open(BytesIO(bytes(picture['data']))).size
+        self.assertEqual(sizes, {'original': (800, 600), 'small': (256, 192), 'thumb': (64, 48)})
+        print(f"  🔹 Stored variants {sizes} under reference {reference}")
+
+    def test_get_serves_variant_with_etag(self):
+        """Test the image endpoint serves the variant, revalidates and caches versioned URLs"""
+        self.upload()
+        reference = MongoDB.get_instance().get_collection('Users').find_one({'bleoid': 'ABC123'})['profilePic']
+
+        response = self.client.get('/users/ABC123/picture/', {'size': 'thumb'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(Image.open(BytesIO(response.content)).size, (64, 48))
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+        cached = self.client.get('/users/ABC123/picture/', {'size': 'thumb'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b'')
+
+        versioned = self.client.get('/users/ABC123/picture/', {'v': reference})
+        self.assertIn('immutable', versioned['Cache-Control'])
+        self.assertNotEqual(versioned['ETag'], response['ETag'])
+        print("  🔹 Thumbnail served, revalidated with 304 and versioned URL cached as immutable")
+
+    def test_transparent_png_stays_png(self):
+        """Test pictures with transparency are stored as PNG"""
+        self.upload(make_image(100, 100, 'PNG', 'RGBA'))
+        response = self.client.get('/users/ABC123/picture/')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        print("  🔹 Transparent picture kept as PNG")
+
+    def test_rejected_uploads(self):
+        """Test invalid pictures, oversized uploads and unknown sizes are rejected"""
+        self.assertEqual(self.upload(b'not an image').status_code, 400)
+
+        with self.settings(PROFILE_PIC_MAX_BYTES=100):
+            self.assertEqual(self.upload().status_code, 400)
+
+        response = self.client.put('/users/ABC123/picture/', {'image': 'not base64!'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.client.get('/users/ABC123/picture/').status_code, 404)
+        self.assertEqual(self.client.get('/users/ABC123/picture/', {'size': 'huge'}).status_code, 400)
+        self.assertEqual(self.client.get('/users/ZZZ999/picture/').status_code, 404)
+        print("  🔹 Invalid, oversized and missing pictures were rejected")
+
+    def test_user_reads_carry_urls_not_bytes(self):
+        """Test user reads expose picture URLs and creation accepts a base64 picture"""
+        response = self.client.post('/users/', {
+            'email': 'new@example.com',
+            'password': 'password123',
+            'userName': 'NewUser',
+            'profilePic': base64.b64encode(make_image(300, 300)).decode()
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        bleoid = response.data['data']['bleoid']
+
+        user = self.client.get(f'/users/{bleoid}/').data['data']
+        self.assertTrue(user['profilePic'].startswith(f'/users/{bleoid}/picture/?v='))
+        self.assertTrue(user['profilePicThumb'].endswith('&size=thumb'))
+        print(f"  🔹 Created user exposes {user['profilePic']}")
+
+    def test_delete_picture(self):
+        """Test deleting the picture removes every variant and the reference"""
+        self.upload()
+        response = self.client.delete('/users/ABC123/picture/')
+        self.assertEqual(response.status_code, 200)
+
+        mongo = MongoDB.get_instance()
+        self.assertEqual(mongo.get_collection('ProfilePictures').count_documents({'bleoid': 'ABC123'}), 0)
+        self.assertIsNone(mongo.get_collection('Users').find_one({'bleoid': 'ABC123'})['profilePic'])
+        print("  🔹 Picture and reference deleted")
+
+    def test_version_update_moves_inline_pictures(self):
+        """Test the v1.3.0 update moves inline pictures out of Users documents"""
+        users = MongoDB.get_instance().get_collection('Users')
+        users.update_one({'bleoid': 'ABC123'}, {'$set': {'profilePic': Binary(make_image(120, 120))}})
+        users.insert_one({
+            'bleoid': 'DEF456', 'email': 'user2@example.com', 'password': 'hashed', 'userName': 'TestUser2',
+            'profilePic': Binary(b'garbage'), 'created_at': datetime.now()
+        })
+
+        result = move_profile_pictures()
+        self.assertTrue(result['success'])
+        self.assertEqual(result['updated'], 1)
+
+        self.assertIsInstance(users.find_one({'bleoid': 'ABC123'})['profilePic'], str)
+        self.assertIsNone(users.find_one({'bleoid': 'DEF456'})['profilePic'])
+        self.assertEqual(self.client.get('/users/ABC123/picture/').status_code, 200)
+
+        # Nothing left to move on the next startup
+        self.assertEqual(move_profile_pictures()['updated'], 0)
+        print("  🔹 v1.3.0 moved 1 inline picture and dropped 1 unreadable one")
+
+
+# This will run if this file is executed directly
+if __name__ == '__main__':
+    print("Running UserPictureViewTest...")
+    run_test_with_output(UserPictureViewTest)
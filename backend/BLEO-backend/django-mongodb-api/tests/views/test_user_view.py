@@ -10,6 +10,9 @@ import random
 from datetime import datetime
 from django.urls import path
 from django.test import override_settings
+from unittest.mock import patch
+from pymongo.errors import DuplicateKeyError
+from utils.bleoid_allocator import BleoidAllocator
 
 # Set up URL configuration for testing
 urlpatterns = [
@@ -131,17 +134,88 @@ class UserViewTest(BLEOBaseTest):
         
         # Check response
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data['data']), 2)
-        self.assertEqual(response.data['data'][0]['bleoid'], 'ABC123')
-        self.assertEqual(response.data['data'][1]['bleoid'], 'DEF456')
+        users = response.data['data']['users']
+        self.assertEqual(len(users), 2)
+        self.assertEqual(users[0]['bleoid'], 'ABC123')
+        self.assertEqual(users[1]['bleoid'], 'DEF456')
+        self.assertFalse(response.data['data']['has_more'])
+        self.assertIsNone(response.data['data']['next_cursor'])
         self.assertEqual(response.data['successMessage'], 'Users retrieved successfully')
         
         # Verify no passwords are returned
-        self.assertNotIn('password', response.data['data'][0])
-        self.assertNotIn('password', response.data['data'][1])
+        self.assertNotIn('password', users[0])
+        self.assertNotIn('password', users[1])
         
         print("  🔹 Successfully retrieved all users")
     
+    def test_get_users_pages_with_cursor(self):
+        """Test paging through users with limit and next_cursor"""
+        response = self.client.get('/users/?limit=1')
+        
+        self.assertEqual(response.status_code, 200)
+        page = response.data['data']
+        self.assertEqual([u['bleoid'] for u in page['users']], ['ABC123'])
+        self.assertTrue(page['has_more'])
+        self.assertIsNotNone(page['next_cursor'])
+        
+        response = self.client.get(f"/users/?limit=1&cursor={page['next_cursor']}")
+        
+        self.assertEqual(response.status_code, 200)
+        page = response.data['data']
+        self.assertEqual([u['bleoid'] for u in page['users']], ['DEF456'])
+        self.assertFalse(page['has_more'])
+        self.assertIsNone(page['next_cursor'])
+        
+        print("  🔹 Paged through users with a keyset cursor")
+    
+    def test_get_users_prefix_search(self):
+        """Test searching users by userName or email prefix"""
+        response = self.client.get('/users/?search=TestUser2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([u['bleoid'] for u in response.data['data']['users']], ['DEF456'])
+        
+        # Email search is case-insensitive since emails are stored lowercase
+        response = self.client.get('/users/?sort=email&search=USER1@')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([u['bleoid'] for u in response.data['data']['users']], ['ABC123'])
+        
+        response = self.client.get('/users/?search=Nobody')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['users'], [])
+        
+        print("  🔹 Searched users by prefix")
+    
+    def test_get_users_lean_projection(self):
+        """Test that the list leaves out pictures and preferences unless asked"""
+        self.db_users.update_one({'bleoid': 'ABC123'}, {'$set': {'profilePic': 'picture-id'}})
+        
+        response = self.client.get('/users/')
+        user = response.data['data']['users'][0]
+        self.assertNotIn('profilePic', user)
+        self.assertNotIn('preferences', user)
+        self.assertEqual(user['userName'], 'TestUser1')
+        
+        response = self.client.get('/users/?picture=true')
+        user = response.data['data']['users'][0]
+        self.assertIn('profilePic', user)
+        
+        print("  🔹 Users list uses the lean projection")
+    
+    def test_get_users_invalid_params(self):
+        """Test that a bad cursor or sort field is rejected"""
+        response = self.client.get('/users/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+        
+        response = self.client.get('/users/?sort=password')
+        self.assertEqual(response.status_code, 400)
+        
+        # A cursor is only valid for the sort it was issued for
+        page = self.client.get('/users/?limit=1').data['data']
+        response = self.client.get(f"/users/?sort=email&cursor={page['next_cursor']}")
+        self.assertEqual(response.status_code, 400)
+        
+        print("  🔹 Invalid list parameters rejected")
+    
     def test_create_user_success(self):
         """Test creating a new user successfully"""
         # Request data
@@ -195,6 +269,39 @@ class UserViewTest(BLEOBaseTest):
         self.assertEqual(user_count, 2)
         print("  🔹 Properly rejected duplicate email")
     
+    def test_create_user_bleoid_collision_retried(self):
+        """Test that a BLEOID taken by another user is replaced by a fresh one"""
+        self.db_users.create_index('bleoid', unique=True)
+        user_data = {'email': 'collide@example.com', 'password': 'Password789', 'userName': 'Collider'}
+        
+        # The first candidate belongs to an existing user
+        with patch('utils.bleoid_allocator.BleoidAllocator.generate', side_effect=['ABC123', 'NEW001']):
+            response = self.client.post('/users/', user_data, format='json')
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['bleoid'], 'NEW001')
+        self.assertEqual(self.db_users.find_one({'bleoid': 'ABC123'})['email'], 'user1@example.com')
+        self.assertEqual(self.db_users.find_one({'bleoid': 'NEW001'})['email'], 'collide@example.com')
+        
+        print("  🔹 BLEOID collision retried on the unique index")
+    
+    def test_bleoid_allocator_raises_other_conflicts(self):
+        """Test that the allocator only retries BLEOID conflicts"""
+        self.db_users.create_index('bleoid', unique=True)
+        self.db_users.create_index('email', unique=True)
+        
+        with patch('utils.bleoid_allocator.BleoidAllocator.generate', side_effect=['NEW002']) as generate:
+            with self.assertRaises(DuplicateKeyError):
+                BleoidAllocator.insert(self.db_users, {'email': 'user1@example.com'})
+        self.assertEqual(generate.call_count, 1)
+        
+        # Keeps the document's own BLEOID when it is free
+        inserted = BleoidAllocator.insert(self.db_users, {'bleoid': 'OWN001', 'email': 'own@example.com'})
+        self.assertEqual(inserted['bleoid'], 'OWN001')
+        self.assertIn('_id', inserted)
+        
+        print("  🔹 Non-BLEOID duplicates are not retried")
+    
     def test_create_user_invalid_data(self):
         """Test error when creating user with invalid data"""
         # Request data (missing email)
@@ -0,0 +1,53 @@
+import secrets
+from pymongo.errors import DuplicateKeyError
+from utils.metrics import Metrics
+from utils.validation_patterns import ValidationPatterns
+
+BLEOID_COLLISIONS = Metrics.counter(
+    'bleo_bleoid_collisions_total',
+    'Random BLEOIDs rejected by the unique Users.bleoid index'
+)
+
+class BleoidAllocator:
+    """Random BLEOIDs, made unique by the Users.bleoid unique index.
+
+    Instead of reading Users until a free id turns up, the document is inserted
+    with a fresh id and the insert is only retried when the index rejects that
+    id. With 36^6 ids a retry stays rare at any realistic user count, and the
+    common case costs the insert alone.
+    """
+
+    MAX_ATTEMPTS = 8
+
+    @staticmethod
+    def generate():
+        """A random BLEOID matching ^[A-Z0-9]{6}$"""
+        return ''.join(secrets.choice(ValidationPatterns.UPPERCASE_ALPHANUMERIC)
+                       for _ in range(ValidationPatterns.BLEOID_LENGTH))
+
+    @staticmethod
+    def insert(collection, document):
+        """Insert document, under its own BLEOID when free, else a new one; returns the stored copy.
+
+        A DuplicateKeyError on any other unique field (email, userName) is
+        raised to the caller, as is running out of attempts.
+        """
+        bleoid = document.get('bleoid') or BleoidAllocator.generate()
+        for attempt in range(BleoidAllocator.MAX_ATTEMPTS):
+            try:
+                inserted = {**document, "bleoid": bleoid}
+                collection.insert_one(inserted)
+                return inserted
+            except DuplicateKeyError as e:
+                if attempt == BleoidAllocator.MAX_ATTEMPTS - 1 or not BleoidAllocator._is_bleoid_conflict(collection, e, bleoid):
+                    raise
+                BLEOID_COLLISIONS.inc()
+                bleoid = BleoidAllocator.generate()
+
+    @staticmethod
+    def _is_bleoid_conflict(collection, error, bleoid):
+        key_pattern = (error.details or {}).get('keyPattern')
+        if key_pattern is not None:
+            return 'bleoid' in key_pattern
+        # Servers that don't report the key: look, only now that an insert failed
+        return collection.find_one({"bleoid": bleoid}, {"_id": 1}) is not None
@@ -0,0 +1,73 @@
+import calendar
+import hashlib
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from utils.metrics import Metrics
+
+CONDITIONAL_REQUESTS = Metrics.counter(
+    'bleo_conditional_get_total',
+    'Conditional MessagesDays reads by outcome (not_modified skips the full read)',
+    labels=('result',)
+)
+
+class ConditionalGet:
+    """ETag / Last-Modified validators for MessagesDays reads.
+
+    Every write bumps the day's version and updated_at (see MessagesDays.touch),
+    so the validators only need _id, version and updated_at. Views answer
+    If-None-Match / If-Modified-Since from a projection-only query and run the
+    full read and serialization only when the client's copy is stale.
+
+    Single days carry ETag and Last-Modified. Lists carry only an ETag: a
+    deleted day changes the list without moving any updated_at forward.
+    """
+
+    # The only fields needed to compute the validators
+    PROJECTION = {"_id": 1, "version": 1, "updated_at": 1}
+
+    @staticmethod
+    def is_conditional(request):
+        """True when the client sent validators from a previous response"""
+        return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+    @staticmethod
+    def validators(days):
+        """(etag, last_modified) for one MessagesDays document (dict) or a list of them"""
+        single = isinstance(days, dict)
+        docs = [days] if single else days
+
+        # Legacy documents without a version count as version 0 until their next write
+        tokens = sorted(f"{doc['_id']}:{doc.get('version', 0)}" for doc in docs)
+        etag = quote_etag(hashlib.sha1(",".join(tokens).encode()).hexdigest()[:32])
+
+        last_modified = None
+        if single and days.get('updated_at'):
+            # Stored as UTC; pymongo hands it back naive
+            last_modified = calendar.timegm(days['updated_at'].utctimetuple())
+
+        return etag, last_modified
+
+    @staticmethod
+    def apply(response, etag, last_modified=None):
+        """Attach the validators to a full response"""
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Per-user data: browsers may keep it but must revalidate before reuse
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    @staticmethod
+    def revalidate(request, days):
+        """304 response when the client's copy of days (PROJECTION documents) is current, else None"""
+        if not days:
+            return None
+
+        etag, last_modified = ConditionalGet.validators(days)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            CONDITIONAL_REQUESTS.inc(result='modified')
+            return None
+
+        CONDITIONAL_REQUESTS.inc(result='not_modified')
+        return ConditionalGet.apply(response, etag, last_modified)
@@ -0,0 +1,184 @@
+import hashlib
+import os
+import threading
+import time
+import jwt
+from datetime import datetime, timezone
+from django.conf import settings
+from pymongo import DESCENDING
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from utils.jwt_utils import JWTSecretGenerator, JWT_VERIFICATIONS, decode_jwt
+from utils.mongodb_utils import MongoDB
+
+
+class JWTKeyRing:
+    """kid-tagged HS256 signing keys shared by every node through JWTKeys.
+
+    Tokens are signed with the newest key and carry its kid in the header.
+    Each process holds the newest JWT_KEY_RING_SIZE + 1 keys in a dict, so a
+    token is verified with the key its kid names in one lookup; the dict is
+    re-read every JWT_KEY_RELOAD_SECONDS, and at once (at most every
+    MIN_FORCED_RELOAD_SECONDS) when a token names a kid not known yet.
+
+    A rotation adds a key and drops the ones past the ring: tokens signed by
+    the previous keys stay valid until they expire, so sessions renew over
+    their normal lifetime instead of all at once. JWT_SECRET seeds an empty
+    collection, and verifies tokens issued before kids while its key is in
+    the ring.
+    """
+
+    ALGORITHM = 'HS256'
+
+    # Floor between reloads triggered by unknown kids (forged tokens can't hammer MongoDB)
+    MIN_FORCED_RELOAD_SECONDS = 5
+
+    _keys = {}
+    _current = None
+    _loaded_at = 0.0
+    _forced_at = 0.0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def kid_for(secret):
+        """Key id of a secret: a fingerprint that reveals nothing about it"""
+        return hashlib.sha256(secret.encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def legacy_secret():
+        """JWT_SECRET, which seeds the ring and signed the tokens without a kid"""
+        return settings.JWT_SECRET or os.getenv('JWT_SECRET')
+
+    @classmethod
+    def encode(cls, payload):
+        """Sign payload with the current key"""
+        kid, secret = cls.current()
+        return jwt.encode(payload, secret, algorithm=cls.ALGORITHM, headers={'kid': kid})
+
+    @classmethod
+    def decode(cls, token, **kwargs):
+        """decode_jwt() with the key named by the token's kid"""
+        try:
+            kid = jwt.get_unverified_header(token).get('kid')
+        except jwt.InvalidTokenError:
+            JWT_VERIFICATIONS.inc(result='invalid')
+            raise
+        if kid is None:
+            kid = cls.kid_for(cls.legacy_secret() or '')
+        secret = cls.secret_for(kid)
+        if secret is None:
+            JWT_VERIFICATIONS.inc(result='invalid')
+            raise jwt.InvalidTokenError("Token signed with an unknown key")
+        return decode_jwt(token, secret, algorithms=[cls.ALGORITHM], **kwargs)
+
+    @classmethod
+    def current(cls):
+        """(kid, secret) of the signing key"""
+        cls._refresh()
+        return cls._current
+
+    @classmethod
+    def secret_for(cls, kid):
+        """Secret of a kid in the ring, or None"""
+        cls._refresh()
+        secret = cls._keys.get(kid)
+        if secret is None and time.monotonic() - cls._forced_at >= cls.MIN_FORCED_RELOAD_SECONDS:
+            # Possibly rotated on another node since the last reload
+            cls._forced_at = time.monotonic()
+            cls._refresh(force=True)
+            secret = cls._keys.get(kid)
+        return secret
+
+    @classmethod
+    def newest(cls):
+        """The current key's document (kid, generation, created_at), secret left out"""
+        return cls._collection().find_one(
+            {}, {"_id": 0, "secret": 0}, sort=[("created_at", DESCENDING)]
+        )
+
+    @classmethod
+    def rotate(cls):
+        """Add a new signing key, drop the keys past the ring; the new key's document"""
+        cls._refresh()
+        db = cls._collection()
+        previous = cls.newest()
+        secret = JWTSecretGenerator.generate_secure_secret()
+        key = {
+            "kid": cls.kid_for(secret),
+            "secret": secret,
+            "generation": previous['generation'] + 1,
+            "created_at": datetime.now(timezone.utc)
+        }
+        db.insert_one(dict(key))
+
+        kept = [doc['_id'] for doc in db.find({}, {"_id": 1}).sort("created_at", DESCENDING).limit(cls.size())]
+        db.delete_many({"_id": {"$nin": kept}})
+
+        cls._refresh(force=True)
+        key.pop('secret')
+        return key
+
+    @staticmethod
+    def size():
+        """Keys kept: the current one and JWT_KEY_RING_SIZE previous ones"""
+        return max(settings.JWT_KEY_RING_SIZE, 0) + 1
+
+    @classmethod
+    def reset(cls):
+        """Forget the loaded keys; the next use reads JWTKeys again"""
+        with cls._lock:
+            cls._keys = {}
+            cls._current = None
+            cls._loaded_at = 0.0
+            cls._forced_at = 0.0
+
+    @classmethod
+    def _refresh(cls, force=False):
+        if not force and cls._fresh():
+            return
+        with cls._lock:
+            if not force and cls._fresh():
+                # Reloaded by another thread while this one waited
+                return
+            try:
+                docs = cls._load()
+            except PyMongoError:
+                if cls._current is None:
+                    raise
+                # Keep verifying with the keys we have until the store is back
+                cls._loaded_at = time.monotonic()
+                return
+            cls._keys = {doc['kid']: doc['secret'] for doc in docs}
+            cls._current = (docs[0]['kid'], docs[0]['secret'])
+            cls._loaded_at = time.monotonic()
+
+    @classmethod
+    def _fresh(cls):
+        return cls._current is not None and time.monotonic() - cls._loaded_at < settings.JWT_KEY_RELOAD_SECONDS
+
+    @classmethod
+    def _load(cls):
+        db = cls._collection()
+        docs = list(db.find({}, {"_id": 0, "kid": 1, "secret": 1})
+                    .sort("created_at", DESCENDING).limit(cls.size()))
+        if docs:
+            return docs
+
+        secret = cls.legacy_secret()
+        if not secret:
+            raise ValueError("JWT_SECRET not found in environment variables. Please run setup_jwt_secret().")
+        try:
+            db.insert_one({
+                "kid": cls.kid_for(secret),
+                "secret": secret,
+                "generation": 0,
+                "created_at": datetime.now(timezone.utc)
+            })
+        except DuplicateKeyError:
+            # Another node seeded it first
+            pass
+        return list(db.find({}, {"_id": 0, "kid": 1, "secret": 1})
+                    .sort("created_at", DESCENDING).limit(cls.size()))
+
+    @staticmethod
+    def _collection():
+        return MongoDB.get_instance().get_collection('JWTKeys')
@@ -1,58 +1,35 @@
 import os
-import json
-from datetime import datetime, timedelta
-from pathlib import Path
-from utils.jwt_utils import JWTSecretGenerator
+from datetime import datetime, timedelta, timezone
+from utils.jwt_keys import JWTKeyRing
 from utils.logger import Logger
 from models.enums.LogType import LogType
 
 class JWTSecretRotationManager:
-    """Manages automatic JWT secret rotation"""
+    """Manages automatic JWT secret rotation through the shared key ring (utils/jwt_keys.py)"""
     
     def __init__(self):
-        self.project_root = Path(__file__).parent.parent
-        self.env_file = self.project_root / '.env'
-        self.rotation_data_file = self.project_root / '.jwt_rotation.json'
         self.rotation_days = int(os.getenv('JWT_SECRET_ROTATION_DAYS', 30))
     
     def get_rotation_data(self):
-        """Get current rotation metadata"""
+        """Get current rotation metadata, from the newest key of the ring"""
         try:
-            if self.rotation_data_file.exists():
-                with open(self.rotation_data_file, 'r') as f:
-                    return json.load(f)
-            else:
-                # Create initial rotation data
-                initial_data = {
-                    'last_rotation': datetime.now().isoformat(),
-                    'next_rotation': (datetime.now() + timedelta(days=self.rotation_days)).isoformat(),
-                    'rotation_count': 0,
-                    'rotation_days': self.rotation_days
-                }
-                self.save_rotation_data(initial_data)
-                return initial_data
+            # Seeds the ring from JWT_SECRET on first use
+            JWTKeyRing.current()
+            key = JWTKeyRing.newest()
+            last_rotation = key['created_at']
+            if last_rotation.tzinfo is None:
+                last_rotation = last_rotation.replace(tzinfo=timezone.utc)
+            return {
+                'last_rotation': last_rotation.isoformat(),
+                'next_rotation': (last_rotation + timedelta(days=self.rotation_days)).isoformat(),
+                'rotation_count': key['generation'],
+                'rotation_days': self.rotation_days,
+                'kid': key['kid']
+            }
         except Exception as e:
-            Logger.log_error(
-                "JWT_ROTATION",
-                f"Failed to read rotation data: {str(e)}",
-                LogType.ERROR.value
-            )
+            Logger.server_error(f"Failed to read JWT rotation data: {str(e)}")
             return None
     
-    def save_rotation_data(self, data):
-        """Save rotation metadata"""
-        try:
-            with open(self.rotation_data_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            return True
-        except Exception as e:
-            Logger.log_error(
-                "JWT_ROTATION",
-                f"Failed to save rotation data: {str(e)}",
-                LogType.ERROR.value
-            )
-            return False
-    
     def needs_rotation(self):
         """Check if JWT secret needs rotation"""
         rotation_data = self.get_rotation_data()
@@ -61,7 +38,7 @@ class JWTSecretRotationManager:
         
         try:
             next_rotation = datetime.fromisoformat(rotation_data['next_rotation'])
-            return datetime.now() >= next_rotation
+            return datetime.now(timezone.utc) >= next_rotation
         except Exception:
             return True
     
@@ -79,7 +56,7 @@ class JWTSecretRotationManager:
             if not force and not self.needs_rotation():
                 rotation_data = self.get_rotation_data()
                 next_rotation = datetime.fromisoformat(rotation_data['next_rotation'])
-                days_left = (next_rotation - datetime.now()).days
+                days_left = (next_rotation - datetime.now(timezone.utc)).days
                 
                 return {
                     'success': True,
@@ -88,38 +65,12 @@ class JWTSecretRotationManager:
                     'next_rotation': rotation_data['next_rotation']
                 }
             
-            # Generate new JWT secret
-            new_secret = JWTSecretGenerator.generate_secure_secret()
+            # Sign with a new key; the previous ones still verify until they leave the ring
+            key = JWTKeyRing.rotate()
+            rotation_data = self.get_rotation_data()
             
-            # Update .env file
-            save_result = JWTSecretGenerator.save_secret_to_env(new_secret)
-            
-            if not save_result['success']:
-                return {
-                    'success': False,
-                    'message': f'Failed to save new secret: {save_result["message"]}'
-                }
-            
-            # Update rotation data
-            rotation_data = self.get_rotation_data() or {}
-            rotation_data.update({
-                'last_rotation': datetime.now().isoformat(),
-                'next_rotation': (datetime.now() + timedelta(days=self.rotation_days)).isoformat(),
-                'rotation_count': rotation_data.get('rotation_count', 0) + 1,
-                'rotation_days': self.rotation_days,
-                'previous_secret_rotated_at': datetime.now().isoformat()
-            })
-            
-            if not self.save_rotation_data(rotation_data):
-                Logger.log_error(
-                    "JWT_ROTATION",
-                    "Secret rotated but failed to save rotation metadata",
-                    LogType.WARNING.value
-                )
-            
-            # Log the rotation
-            Logger.log_system_event(
-                f"JWT secret rotated successfully. Rotation #{rotation_data['rotation_count']}",
+            Logger.system_action(
+                f"JWT signing key rotated. Rotation #{key['generation']}, kid {key['kid']}",
                 LogType.INFO.value
             )
             
@@ -127,18 +78,14 @@ class JWTSecretRotationManager:
                 'success': True,
                 'rotated': True,
                 'message': 'JWT secret rotated successfully',
-                'rotation_count': rotation_data['rotation_count'],
-                'next_rotation': rotation_data['next_rotation'],
-                'secret_strength': JWTSecretGenerator.validate_secret_strength(new_secret)
+                'rotation_count': key['generation'],
+                'next_rotation': rotation_data['next_rotation'] if rotation_data else None,
+                'kid': key['kid']
             }
             
         except Exception as e:
             error_msg = f"JWT secret rotation failed: {str(e)}"
-            Logger.log_error(
-                "JWT_ROTATION",
-                error_msg,
-                LogType.ERROR.value
-            )
+            Logger.server_error(error_msg)
             return {
                 'success': False,
                 'message': error_msg,
@@ -157,7 +104,7 @@ class JWTSecretRotationManager:
         try:
             last_rotation = datetime.fromisoformat(rotation_data['last_rotation'])
             next_rotation = datetime.fromisoformat(rotation_data['next_rotation'])
-            now = datetime.now()
+            now = datetime.now(timezone.utc)
             
             days_since = (now - last_rotation).days
             days_until = (next_rotation - now).days
@@ -195,7 +142,7 @@ class JWTSecretRotationManager:
             if self.needs_rotation():
                 result = self.rotate_secret()
                 if result['success'] and result['rotated']:
-                    Logger.log_system_event(
+                    Logger.system_action(
                         f"Automatic JWT secret rotation completed. Next rotation: {result['next_rotation']}",
                         LogType.INFO.value
                     )
@@ -208,11 +155,7 @@ class JWTSecretRotationManager:
                 }
         except Exception as e:
             error_msg = f"Scheduled rotation check failed: {str(e)}"
-            Logger.log_error(
-                "JWT_ROTATION",
-                error_msg,
-                LogType.ERROR.value
-            )
+            Logger.server_error(error_msg)
             return {
                 'success': False,
                 'message': error_msg
@@ -2,8 +2,21 @@ import secrets
 import os
 import base64
 import hashlib
+import jwt
 from datetime import datetime
 from pathlib import Path
+from utils.metrics import Metrics
+
+JWT_VERIFICATIONS = Metrics.counter(
+    'bleo_jwt_verifications_total',
+    'JWT signature/claims verifications by outcome',
+    labels=('result',)
+)
+TOKEN_BLACKLIST_CHECKS = Metrics.counter(
+    'bleo_token_blacklist_checks_total',
+    'Token blacklist lookups by caller and outcome (hit = token is blacklisted)',
+    labels=('source', 'result')
+)
 
 class JWTSecretGenerator:
     """Utility class for generating and managing JWT secrets"""
@@ -251,6 +264,23 @@ class JWTSecretGenerator:
         }
 
 # Convenience functions
+def decode_jwt(token, secret, **kwargs):
+    """jwt.decode() that also counts the verification outcome in metrics"""
+    try:
+        payload = jwt.decode(token, secret, **kwargs)
+    except jwt.ExpiredSignatureError:
+        JWT_VERIFICATIONS.inc(result='expired')
+        raise
+    except jwt.InvalidTokenError:
+        JWT_VERIFICATIONS.inc(result='invalid')
+        raise
+    JWT_VERIFICATIONS.inc(result='valid')
+    return payload
+
+def record_blacklist_check(source, blacklisted):
+    """Count a token blacklist lookup for the hit-rate metric"""
+    TOKEN_BLACKLIST_CHECKS.inc(source=source, result='hit' if blacklisted else 'miss')
+
 def generate_jwt_secret(length=64):
     """Generate a secure JWT secret (convenience function)"""
     return JWTSecretGenerator.generate_secure_secret(length)
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import zlib
+from utils.log_query import LogQuery
+from utils.mongodb_utils import MongoDB
+
+class LogExporter:
+    """Streams DebugLogs as NDJSON or CSV chunks without holding the result set in memory"""
+
+    FORMATS = {
+        'ndjson': ('application/x-ndjson', 'ndjson'),
+        'csv': ('text/csv', 'csv'),
+    }
+    FIELDS = ('id', 'date', 'type', 'code', 'message', 'bleoid', 'user_type', 'error_source', 'repeat_count')
+    DEFAULT_BATCH_SIZE = 1000
+    # Rows are joined into chunks of roughly this size before being yielded
+    CHUNK_BYTES = 64 * 1024
+
+    def __init__(self, query, export_format='ndjson', batch_size=DEFAULT_BATCH_SIZE, compress=False):
+        if export_format not in self.FORMATS:
+            raise ValueError(f"Invalid format. Must be one of: {', '.join(self.FORMATS)}")
+        self.query = query
+        self.export_format = export_format
+        self.batch_size = batch_size
+        self.compress = compress
+
+    @property
+    def content_type(self):
+        """MIME type of the exported body"""
+        return 'application/gzip' if self.compress else self.FORMATS[self.export_format][0]
+
+    def filename(self, stem):
+        """File name for the export, e.g. debuglogs.ndjson.gz"""
+        extension = self.FORMATS[self.export_format][1]
+        return f"{stem}.{extension}.gz" if self.compress else f"{stem}.{extension}"
+
+    def cursor(self):
+        """DebugLogs cursor fetching batch_size documents per round trip"""
+        db = MongoDB.get_instance().get_collection('DebugLogs')
+        projection = {field: 1 for field in self.FIELDS}
+        projection['_id'] = 0
+        return db.find(self.query, projection).sort(LogQuery.SORT).batch_size(self.batch_size)
+
+    def chunks(self):
+        """Yield encoded chunks, gzipped when compress is set"""
+        rows = self._csv_rows() if self.export_format == 'csv' else self._ndjson_rows()
+        chunks = self._buffered(rows)
+        return self._gzip(chunks) if self.compress else chunks
+
+    def write_to(self, stream):
+        """Write the whole export to a binary stream, returning the bytes written"""
+        written = 0
+        for chunk in self.chunks():
+            stream.write(chunk)
+            written += len(chunk)
+        return written
+
+    def _ndjson_rows(self):
+        for log in self.cursor():
+            yield json.dumps(log, default=_json_default) + '\n'
+
+    def _csv_rows(self):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for log in self.cursor():
+            if log.get('date') is not None:
+                log['date'] = log['date'].isoformat()
+            writer.writerow(log)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    def _buffered(self, rows):
+        """Group small rows into CHUNK_BYTES-sized encoded chunks"""
+        pending, size = [], 0
+        for row in rows:
+            pending.append(row)
+            size += len(row)
+            if size >= self.CHUNK_BYTES:
+                yield ''.join(pending).encode()
+                pending, size = [], 0
+        if pending:
+            yield ''.join(pending).encode()
+
+    @staticmethod
+    def _gzip(chunks):
+        # wbits=31 writes a gzip header and trailer
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+
+def _json_default(value):
+    """Serialize dates as ISO 8601 and anything else as text"""
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
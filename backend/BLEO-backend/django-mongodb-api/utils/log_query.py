@@ -0,0 +1,77 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from utils.validation_patterns import ValidationPatterns
+
+class LogQuery:
+    """DebugLogs filters and (date, id) keyset cursors shared by the admin log endpoints"""
+
+    # Newest first; id breaks ties between logs written in the same millisecond
+    SORT = [('date', -1), ('id', -1)]
+
+    @staticmethod
+    def build(query_params):
+        """Build a DebugLogs filter from request query parameters.
+
+        Raises ValidationError when the bleoid filter is malformed.
+        """
+        query = {}
+
+        for field in ('type', 'error_source', 'user_type'):
+            value = query_params.get(field)
+            if value:
+                query[field] = value
+
+        bleoid = query_params.get('bleoid')
+        if bleoid:
+            query['bleoid'] = ValidationPatterns.validate_url_bleoid(bleoid, "bleoid")
+
+        # Date filters
+        days = query_params.get('days')
+        if days:
+            try:
+                query['date'] = {'$gte': datetime.now() - timedelta(days=int(days))}
+            except ValueError:
+                pass
+
+        for param, operator in (('start_date', '$gte'), ('end_date', '$lte')):
+            value = query_params.get(param)
+            if value:
+                try:
+                    query.setdefault('date', {})[operator] = LogQuery.local_naive(datetime.fromisoformat(value))
+                except ValueError:
+                    pass
+
+        return query
+
+    @staticmethod
+    def local_naive(value):
+        """value as naive local time, the form DebugLogs.date is stored in"""
+        if value.tzinfo is not None:
+            return value.astimezone().replace(tzinfo=None)
+        return value
+
+    @staticmethod
+    def encode_cursor(log):
+        """Opaque cursor pointing just after log in SORT order"""
+        payload = json.dumps({'date': log['date'].isoformat(), 'id': log['id']})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Return (date, id) from a cursor, raising ValueError when it is malformed"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            return datetime.fromisoformat(payload['date']), int(payload['id'])
+        except (KeyError, TypeError, UnicodeDecodeError, json.JSONDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    @staticmethod
+    def after_cursor(query, cursor):
+        """Restrict query to logs strictly after cursor in SORT order"""
+        date, log_id = LogQuery.decode_cursor(cursor)
+        keyset = {'$or': [
+            {'date': {'$lt': date}},
+            {'date': date, 'id': {'$lt': log_id}}
+        ]}
+        return {'$and': [query, keyset]} if query else keyset
@@ -0,0 +1,50 @@
+from models.AppParameters import AppParameters
+from models.enums.LogType import LogType
+from utils.logger import Logger
+from utils.mongodb_utils import MongoDB
+from utils.parameter_manager import ParameterManager
+
+_FROM_PARAMETER = object()
+
+class LogRetention:
+    """Keeps the DebugLogs TTL index in line with the log_retention_days AppParameter"""
+
+    @staticmethod
+    def parse_days(value):
+        """Validate a retention setting: whole days >= 0, where 0 or None keeps logs forever"""
+        if value is None:
+            return None
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError("Log retention must be a whole number of days (0 keeps logs forever)")
+        return value or None
+
+    @staticmethod
+    def retention_days():
+        """Configured retention in days, or None when logs are kept forever"""
+        value = ParameterManager.get_parameter_value(AppParameters.PARAM_LOG_RETENTION_DAYS, None)
+        try:
+            return LogRetention.parse_days(value)
+        except ValueError:
+            Logger.app_error(f"Ignoring invalid {AppParameters.PARAM_LOG_RETENTION_DAYS}: {value}")
+            return None
+
+    @staticmethod
+    def apply(days=_FROM_PARAMETER):
+        """Set the TTL on the DebugLogs date index; MongoDB then drops expired logs itself"""
+        try:
+            if days is _FROM_PARAMETER:
+                days = LogRetention.retention_days()
+            else:
+                days = LogRetention.parse_days(days)
+
+            seconds = days * 86400 if days else None
+            if MongoDB.get_instance().ensure_ttl_index('DebugLogs', 'date', seconds):
+                Logger.system_action(
+                    f"DebugLogs retention set to {f'{days} days' if days else 'unlimited'}",
+                    LogType.DATABASE.value,
+                    200
+                )
+            return days
+        except Exception as e:
+            Logger.server_error(f"Failed to apply DebugLogs retention: {str(e)}")
+            return None
@@ -0,0 +1,257 @@
+import atexit
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from models.AppParameters import AppParameters
+from models.DebugLogs import DebugLogs
+from models.enums.LogType import LogType
+from utils.metrics import Metrics
+
+LOG_DECISIONS = Metrics.counter(
+    'bleo_debug_log_decisions_total',
+    'Logger sampling decisions by log type',
+    labels=('type', 'decision')
+)
+
+# Ids, counters and BLEOIDs vary per call; templates group messages that only differ by them
+_TEMPLATE_PATTERNS = (
+    (re.compile(r'[\w.+-]+@[\w-]+(\.[\w-]+)+'), '<email>'),
+    (re.compile(r'\b[0-9a-f]{24}\b'), '<oid>'),
+    (re.compile(r'\b(?=[A-Z0-9]*\d)[A-Z0-9]{6}\b'), '<bleoid>'),
+    (re.compile(r'\d+'), '#'),
+)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate_per_minute, holding at most burst tokens"""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated_at')
+
+    def __init__(self, rate_per_minute, burst, now):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = now
+
+    def take(self, now, count=1):
+        """Consume up to count whole tokens, returning how many were granted (0 when empty)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        granted = min(count, int(self.tokens))
+        self.tokens -= granted
+        return granted
+
+
+class TokenBuckets:
+    """Token buckets keyed by caller-defined keys, evicting the least recently used"""
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    def get(self, key, rate_per_minute, burst, now):
+        """Fetch the bucket for key, recreating it when its rate or burst changed"""
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.rate != rate_per_minute / 60.0 or bucket.capacity != max(1, burst):
+            bucket = TokenBucket(rate_per_minute, burst, now)
+            self._buckets[key] = bucket
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def clear(self):
+        """Forget every bucket"""
+        self._buckets.clear()
+
+
+class LogSampler:
+    """Decides whether a DebugLogs entry is written, sampled out, rate limited or aggregated
+
+    Configured through the log_sampling AppParameter:
+    - rates: keep probability per LogType value (missing types are kept)
+    - per_bleoid_per_minute / per_template_per_minute: token bucket rates (0 disables)
+    - burst: token bucket capacity
+    - aggregate_window_seconds: identical messages inside the window collapse
+      into one follow-up entry carrying repeat_count (0 disables)
+
+    Errors are always written. Without the parameter every entry is written.
+    """
+
+    WRITTEN = 'written'
+    SAMPLED = 'sampled'
+    RATE_LIMITED = 'rate_limited'
+    AGGREGATED = 'aggregated'
+
+    DEFAULT_CONFIG = {
+        'rates': {},
+        'per_bleoid_per_minute': 0,
+        'per_template_per_minute': 0,
+        'burst': 20,
+        'aggregate_window_seconds': 0,
+    }
+    CONFIG_MAX_AGE_SECONDS = 30
+    MAX_TRACKED_KEYS = 10000
+
+    _lock = threading.Lock()
+    _buckets = TokenBuckets(MAX_TRACKED_KEYS)
+    _aggregates = OrderedDict()
+    _closed = []
+    _local = threading.local()
+
+    @classmethod
+    def get_config(cls):
+        """Current sampling config merged over the defaults"""
+        from utils.parameter_manager import ParameterManager
+
+        raw = ParameterManager.get_cached_parameter_value(
+            AppParameters.PARAM_LOG_SAMPLING, None, max_age=cls.CONFIG_MAX_AGE_SECONDS
+        )
+        config = dict(cls.DEFAULT_CONFIG)
+        if isinstance(raw, dict):
+            config.update({key: value for key, value in raw.items() if key in config})
+        if not isinstance(config['rates'], dict):
+            config['rates'] = {}
+        return config
+
+    @staticmethod
+    def message_template(message):
+        """Normalize a message so entries differing only by ids share a template"""
+        template = message or ''
+        for pattern, replacement in _TEMPLATE_PATTERNS:
+            template = pattern.sub(replacement, template)
+        return template
+
+    @classmethod
+    def last_decision(cls):
+        """Decision taken for the last entry admitted on this thread"""
+        return getattr(cls._local, 'decision', None)
+
+    @classmethod
+    def clear_decision(cls):
+        """Forget this thread's last decision before a new entry is considered"""
+        cls._local.decision = None
+
+    @classmethod
+    def _decide(cls, log_entry, decision):
+        cls._local.decision = decision
+        LOG_DECISIONS.inc(type=log_entry.type, decision=decision)
+        return decision == cls.WRITTEN
+
+    @classmethod
+    def admit(cls, log_entry, now=None):
+        """Return True when log_entry should be written now"""
+        if log_entry.type == LogType.ERROR.value:
+            return cls._decide(log_entry, cls.WRITTEN)
+
+        config = cls.get_config()
+        now = time.monotonic() if now is None else now
+
+        with cls._lock:
+            window = _as_number(config['aggregate_window_seconds'])
+            if window > 0:
+                key = (log_entry.type, log_entry.user_type, log_entry.bleoid,
+                       log_entry.code, log_entry.message)
+                aggregate = cls._aggregates.get(key)
+                if aggregate and now < aggregate['window_end']:
+                    aggregate['count'] += 1
+                    aggregate['last_seen'] = datetime.now()
+                    return cls._decide(log_entry, cls.AGGREGATED)
+                if aggregate and aggregate['count']:
+                    cls._closed.append(cls._aggregates.pop(key))
+                else:
+                    cls._aggregates.pop(key, None)
+                cls._aggregates[key] = {
+                    'entry': log_entry,
+                    'count': 0,
+                    'window_end': now + window,
+                    'last_seen': log_entry.date,
+                }
+
+            rate = _as_number(config['rates'].get(log_entry.type, 1.0), 1.0)
+            if rate < 1.0 and random.random() >= rate:
+                return cls._decide(log_entry, cls.SAMPLED)
+
+            burst = int(_as_number(config['burst'], 1))
+            limits = (
+                ('bleoid', log_entry.bleoid, config['per_bleoid_per_minute']),
+                ('template', cls.message_template(log_entry.message), config['per_template_per_minute']),
+            )
+            for kind, value, per_minute in limits:
+                per_minute = _as_number(per_minute)
+                if value and per_minute > 0:
+                    if not cls._buckets.get((kind, value), per_minute, burst, now).take(now):
+                        return cls._decide(log_entry, cls.RATE_LIMITED)
+
+        return cls._decide(log_entry, cls.WRITTEN)
+
+    @classmethod
+    def due_aggregates(cls, now=None, flush_all=False):
+        """Pop closed aggregation windows and build their repeat_count entries"""
+        now = time.monotonic() if now is None else now
+        with cls._lock:
+            closed, cls._closed = cls._closed, []
+            # Windows share one length, so insertion order is expiry order
+            while cls._aggregates:
+                key, aggregate = next(iter(cls._aggregates.items()))
+                overflow = len(cls._aggregates) > cls.MAX_TRACKED_KEYS
+                if not (flush_all or overflow or aggregate['window_end'] <= now):
+                    break
+                del cls._aggregates[key]
+                if aggregate['count']:
+                    closed.append(aggregate)
+
+        return [
+            DebugLogs(
+                message=aggregate['entry'].message,
+                type=aggregate['entry'].type,
+                code=aggregate['entry'].code,
+                date=aggregate['last_seen'],
+                bleoid=aggregate['entry'].bleoid,
+                user_type=aggregate['entry'].user_type,
+                error_source=aggregate['entry'].error_source,
+                repeat_count=aggregate['count']
+            )
+            for aggregate in closed
+        ]
+
+    @classmethod
+    def pending_aggregates(cls):
+        """Number of suppressed entries waiting for their window to close"""
+        pending = list(cls._aggregates.values()) + list(cls._closed)
+        return sum(aggregate['count'] for aggregate in pending)
+
+    @classmethod
+    def reset(cls):
+        """Forget all buckets and aggregation windows"""
+        with cls._lock:
+            cls._buckets.clear()
+            cls._aggregates.clear()
+            cls._closed = []
+
+
+def _as_number(value, default=0):
+    """Coerce a config value to float, falling back to default"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+Metrics.gauge_callback(
+    'bleo_debug_log_pending_aggregates',
+    'Repeated DebugLogs entries waiting to be written as one aggregate',
+    LogSampler.pending_aggregates
+)
+
+
+def _flush_aggregates_at_exit():
+    from utils.logger import Logger
+    Logger.flush_aggregates()
+
+
+atexit.register(_flush_aggregates_at_exit)
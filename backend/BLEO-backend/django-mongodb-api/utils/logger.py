@@ -4,29 +4,42 @@ from models.enums.LogType import LogType
 from models.enums.UserType import UserType
 from models.enums.ErrorSourceType import ErrorSourceType
 from models.enums.DebugType import DebugType
+import asyncio
 import traceback
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from datetime import datetime
 from models.AppParameters import AppParameters
+from utils.metrics import Metrics
+from utils.log_sampler import LogSampler
+
+LOG_WRITES = Metrics.counter(
+    'bleo_debug_log_writes_total',
+    'DebugLogs writes by log type and outcome',
+    labels=('type', 'result')
+)
+LOG_QUEUE_DEPTH = Metrics.gauge(
+    'bleo_logger_queue_depth',
+    'DebugLogs entries waiting to be written to MongoDB'
+)
 
 class Logger:
     """Utility class for logging actions to MongoDB"""
     
+    # Concurrent writers can race on max(id) + 1
+    ID_ATTEMPTS = 3
+    
     @staticmethod
     def _should_log():
-        """Check if debug logging is enabled in AppParameters"""
-        try:
-            db = MongoDB.get_instance().get_collection('AppParameters')
-            debug_param = db.find_one({"param_name": AppParameters.PARAM_DEBUG_LEVEL})
-            
-            # Default to logging unless explicitly set to NO_DEBUG
-            if not debug_param:
-                return True
-                
-            return debug_param.get('param_value') == DebugType.DEBUG.value
-        except Exception as e:
-            # If there's an error checking debug status, default to logging
-            print(f"Error checking debug status: {str(e)}")
+        """Check if debug logging is enabled in AppParameters (cached for a few seconds)"""
+        from utils.parameter_manager import ParameterManager
+
+        debug_level = ParameterManager.get_cached_parameter_value(AppParameters.PARAM_DEBUG_LEVEL)
+
+        # Default to logging unless explicitly set to NO_DEBUG
+        if debug_level is None:
             return True
+
+        return debug_level == DebugType.DEBUG.value
     
     @staticmethod
     def _get_next_id():
@@ -46,23 +59,123 @@ class Logger:
     
     @staticmethod
     def _save_log(log_entry):
-        """Save a log entry to the database if debug is enabled"""
+        """Save a log entry to the database if debug is enabled and the sampler admits it"""
+        LogSampler.clear_decision()
+
         # Only log if debug is enabled
         if not Logger._should_log():
             return None
-            
+
+        # Write repeated messages whose aggregation window has closed
+        for aggregate in LogSampler.due_aggregates():
+            Logger._write(aggregate)
+
+        if not LogSampler.admit(log_entry):
+            return None
+
+        return Logger._write(log_entry)
+
+    @staticmethod
+    def save_many(log_entries):
+        """Save several entries with one insert_many.
+
+        Returns an (inserted_id, decision) pair per entry: decision is the
+        LogSampler decision, 'failed' when the write failed, or None when
+        debug logging is disabled.
+        """
+        results = [(None, None)] * len(log_entries)
+        if not log_entries or not Logger._should_log():
+            return results
+
+        # Write repeated messages whose aggregation window has closed
+        for aggregate in LogSampler.due_aggregates():
+            Logger._write(aggregate)
+
+        admitted = []
+        for index, log_entry in enumerate(log_entries):
+            if LogSampler.admit(log_entry):
+                admitted.append(index)
+            else:
+                results[index] = (None, LogSampler.last_decision())
+        if not admitted:
+            return results
+
+        LOG_QUEUE_DEPTH.inc(len(admitted))
         try:
-            # Set the ID to max(id) + 1 if it's the placeholder value
-            if log_entry.id == 0:
-                log_entry.id = Logger._get_next_id()
-                
             db = MongoDB.get_instance().get_collection('DebugLogs')
-            result = db.insert_one(log_entry.to_dict())
+            pending = admitted
+
+            for attempt in range(Logger.ID_ATTEMPTS):
+                # One max(id) lookup for the whole batch, ids assigned consecutively
+                first_id = Logger._get_next_id()
+                documents = []
+                for offset, index in enumerate(pending):
+                    log_entries[index].id = first_id + offset
+                    documents.append(log_entries[index].to_dict())
+
+                try:
+                    db.insert_many(documents, ordered=False)
+                    write_errors = []
+                except BulkWriteError as e:
+                    write_errors = e.details.get('writeErrors', [])
+
+                failed = {error['index'] for error in write_errors}
+                for position, index in enumerate(pending):
+                    if position not in failed:
+                        results[index] = (documents[position]['_id'], LogSampler.WRITTEN)
+                        LOG_WRITES.inc(type=log_entries[index].type, result='written')
+
+                # Only id collisions with concurrent writers are retried
+                collisions = {error['index'] for error in write_errors if error.get('code') == 11000}
+                pending = [index for position, index in enumerate(pending) if position in collisions]
+                if not pending:
+                    break
+        except Exception as e:
+            print(f"Error logging batch to database: {str(e)}")
+            print(traceback.format_exc())
+        finally:
+            LOG_QUEUE_DEPTH.dec(len(admitted))
+
+        for index in admitted:
+            if results[index][0] is None:
+                results[index] = (None, 'failed')
+                LOG_WRITES.inc(type=log_entries[index].type, result='failed')
+        return results
+
+    @staticmethod
+    def flush_aggregates():
+        """Write every pending repeat_count entry now, whatever its window"""
+        return [Logger._write(aggregate) for aggregate in LogSampler.due_aggregates(flush_all=True)]
+
+    @staticmethod
+    def _write(log_entry):
+        """Insert a log entry into DebugLogs"""
+        LOG_QUEUE_DEPTH.inc()
+        try:
+            db = MongoDB.get_instance().get_collection('DebugLogs')
+            assign_id = log_entry.id == 0
+            
+            for attempt in range(Logger.ID_ATTEMPTS):
+                # Set the ID to max(id) + 1 if it's the placeholder value
+                if assign_id:
+                    log_entry.id = Logger._get_next_id()
+                try:
+                    result = db.insert_one(log_entry.to_dict())
+                    break
+                except DuplicateKeyError:
+                    # Another writer took the same id (unique index on id)
+                    if not assign_id or attempt == Logger.ID_ATTEMPTS - 1:
+                        raise
+            
+            LOG_WRITES.inc(type=log_entry.type, result='written')
             return result.inserted_id
         except Exception as e:
+            LOG_WRITES.inc(type=log_entry.type, result='failed')
             print(f"Error logging to database: {str(e)}")
             print(traceback.format_exc())
             return None
+        finally:
+            LOG_QUEUE_DEPTH.dec()
     
     @staticmethod
     def user_action(bleoid, message, log_type=LogType.INFO.value, code=200):
@@ -140,4 +253,9 @@ class Logger:
         """Log an error only if debug is enabled"""
         if Logger._should_log():
             return Logger.error(message, code, bleoid, error_source)
-        return None
\ No newline at end of file
+        return None
+
+    @staticmethod
+    async def run_async(log_method, *args):
+        """Run a Logger method in a worker thread so async views never block the event loop on DebugLogs writes"""
+        return await asyncio.to_thread(log_method, *args)
@@ -0,0 +1,198 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from django.conf import settings
+from pymongo.errors import PyMongoError
+from utils.metrics import Metrics
+from utils.mongodb_utils import MongoDB
+
+LOGIN_THROTTLE = Metrics.counter(
+    'bleo_login_throttle_total',
+    'Login throttle outcomes: failures recorded, and attempts rejected per subject kind (ip, email)',
+    labels=('result', 'kind')
+)
+
+
+class LocalThrottleStore:
+    """Per-process window counters, evicting the least recently used subjects"""
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> [window, count in window, count in the window before]
+        self._counters = OrderedDict()
+
+    def counts(self, keys, window):
+        """{key: (count in window, count in window - 1)}"""
+        with self._lock:
+            return {key: self._read(key, window) for key in keys}
+
+    def add(self, keys, window):
+        with self._lock:
+            for key in keys:
+                current, previous = self._read(key, window)
+                self._counters[key] = [window, current + 1, previous]
+                self._counters.move_to_end(key)
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+
+    def reset(self, key):
+        with self._lock:
+            self._counters.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+
+    def _read(self, key, window):
+        entry = self._counters.get(key)
+        if entry is None or entry[0] < window - 1:
+            return 0, 0
+        if entry[0] == window - 1:
+            return 0, entry[1]
+        return entry[1], entry[2]
+
+
+class MongoThrottleStore:
+    """Window counters in the LoginThrottle collection, shared by every node.
+
+    One document per (key, window), counted with $inc and removed by a TTL
+    index once the following window is over.
+    """
+
+    def counts(self, keys, window):
+        db = MongoDB.get_instance().get_collection('LoginThrottle')
+        counts = {key: [0, 0] for key in keys}
+        for doc in db.find({"key": {"$in": list(keys)}, "window": {"$in": [window - 1, window]}},
+                           {"_id": 0, "key": 1, "window": 1, "count": 1}):
+            counts[doc['key']][0 if doc['window'] == window else 1] = doc['count']
+        return {key: tuple(value) for key, value in counts.items()}
+
+    def add(self, keys, window):
+        db = MongoDB.get_instance().get_collection('LoginThrottle')
+        expires_at = datetime.fromtimestamp((window + 2) * settings.LOGIN_THROTTLE_WINDOW_SECONDS, timezone.utc)
+        for key in keys:
+            db.update_one(
+                {"key": key, "window": window},
+                {"$inc": {"count": 1}, "$setOnInsert": {"expires_at": expires_at}},
+                upsert=True
+            )
+
+    def reset(self, key):
+        MongoDB.get_instance().get_collection('LoginThrottle').delete_many({"key": key})
+
+    def clear(self):
+        MongoDB.get_instance().get_collection('LoginThrottle').delete_many({})
+
+
+class LoginThrottle:
+    """Sliding-window limits on failed logins, per client IP and per email.
+
+    Each subject keeps a counter for the current fixed window and the one
+    before; the sliding count weights the previous window by the part of it
+    still inside the last LOGIN_THROTTLE_WINDOW_SECONDS. A login is refused
+    (before any user lookup or password hash) once the IP reached
+    LOGIN_THROTTLE_MAX_PER_IP failures or the email LOGIN_THROTTLE_MAX_PER_EMAIL.
+    A successful login clears its email's failures.
+
+    LOGIN_THROTTLE_STORE picks where counters live: 'local' (each process
+    counts alone, so N processes allow up to N times the limits), 'mongo'
+    (shared by every node, one extra query per login) or 'off'.
+    """
+
+    # Subjects tracked by the local store before the oldest are forgotten
+    MAX_TRACKED_KEYS = 100000
+
+    _local = LocalThrottleStore(MAX_TRACKED_KEYS)
+    _mongo = MongoThrottleStore()
+
+    @classmethod
+    def store(cls):
+        mode = settings.LOGIN_THROTTLE_STORE
+        if mode == 'mongo':
+            return cls._mongo
+        if mode == 'local':
+            return cls._local
+        return None
+
+    @staticmethod
+    def email_key(email):
+        """Store key of an email, hashed so the store never holds addresses"""
+        return "email:" + hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+    @staticmethod
+    def subjects(ip, email):
+        """{store key: (kind, limit)}"""
+        subjects = {f"ip:{ip or 'unknown'}": ('ip', settings.LOGIN_THROTTLE_MAX_PER_IP)}
+        if isinstance(email, str) and email:
+            subjects[LoginThrottle.email_key(email)] = ('email', settings.LOGIN_THROTTLE_MAX_PER_EMAIL)
+        return subjects
+
+    @classmethod
+    def retry_after(cls, ip, email, now=None):
+        """Seconds until a login may be attempted again, or 0 when it may go ahead"""
+        store = cls.store()
+        if store is None:
+            return 0
+        now = time.time() if now is None else now
+        window_seconds = settings.LOGIN_THROTTLE_WINDOW_SECONDS
+        window, elapsed = divmod(now, window_seconds)
+        window = int(window)
+        subjects = cls.subjects(ip, email)
+
+        weight = 1 - elapsed / window_seconds
+        remaining = window_seconds - elapsed
+        try:
+            counts = store.counts(list(subjects), window)
+        except PyMongoError:
+            # An unreachable shared store must not lock everyone out
+            return 0
+
+        wait = None
+        for key, (current, previous) in counts.items():
+            kind, limit = subjects[key]
+            if limit <= 0 or current + previous * weight < limit:
+                continue
+            LOGIN_THROTTLE.inc(result='rejected', kind=kind)
+            if current < limit:
+                # The previous window's share fades until the count is under the limit
+                seconds = min(remaining, (current + previous * weight - limit) / previous * window_seconds)
+            else:
+                # This window's failures become the previous share of the next one, then fade
+                seconds = remaining + (current - limit) / current * window_seconds
+            wait = max(wait or 0, seconds)
+        # Whole seconds, a second past the moment the count drops under the limit (float rounding)
+        return 0 if wait is None else math.ceil(wait) + 1
+
+    @classmethod
+    def record_failure(cls, ip, email, now=None):
+        store = cls.store()
+        if store is None:
+            return
+        now = time.time() if now is None else now
+        subjects = cls.subjects(ip, email)
+        try:
+            store.add(list(subjects), int(now // settings.LOGIN_THROTTLE_WINDOW_SECONDS))
+        except PyMongoError:
+            return
+        for kind, _ in subjects.values():
+            LOGIN_THROTTLE.inc(result='failure', kind=kind)
+
+    @classmethod
+    def record_success(cls, email):
+        store = cls.store()
+        if store is not None and isinstance(email, str) and email:
+            try:
+                store.reset(cls.email_key(email))
+            except PyMongoError:
+                pass
+
+    @classmethod
+    def clear(cls):
+        """Forget every counter of the configured store"""
+        store = cls.store()
+        if store is not None:
+            store.clear()
@@ -0,0 +1,126 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.conf import settings
+from utils.mongodb_utils import MongoDB
+from utils.mongodb_async import AsyncMongoDB
+
+class MessageSync:
+    """MessagesDays change feed: days written and days/messages deleted after a watermark.
+
+    Days are read in (updated_at, _id) order and tombstones in (deleted_at, _id)
+    order, both through indexes scoped to the user, so an incremental sync reads
+    only what changed. The watermark is an opaque (timestamp, _id) keyset cursor;
+    ObjectIds order across both collections, so one cursor serves both streams.
+    """
+
+    DAY_SORT = [('updated_at', 1), ('_id', 1)]
+    TOMBSTONE_SORT = [('deleted_at', 1), ('_id', 1)]
+
+    # Fields of a deleted day that its tombstones carry
+    DAY_KEY_PROJECTION = {'from_bleoid': 1, 'to_bleoid': 1, 'date': 1}
+
+    @staticmethod
+    def utcnow():
+        """Current UTC time, naive like the datetimes pymongo returns"""
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    @staticmethod
+    def scope(bleoid):
+        """Days and tombstones written by or to bleoid (both halves of the couple's history)"""
+        return {'$or': [{'from_bleoid': bleoid}, {'to_bleoid': bleoid}]}
+
+    @staticmethod
+    def encode_watermark(timestamp, object_id):
+        """Opaque watermark pointing just after (timestamp, object_id)"""
+        payload = json.dumps({'ts': timestamp.isoformat(), 'id': str(object_id)})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode_watermark(watermark):
+        """Return (timestamp, ObjectId) from a watermark, raising ValueError when it is malformed"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(watermark.encode()).decode())
+            return datetime.fromisoformat(payload['ts']), ObjectId(payload['id'])
+        except (KeyError, TypeError, UnicodeDecodeError, json.JSONDecodeError, InvalidId, ValueError) as e:
+            raise ValueError(f"Invalid watermark: {watermark}") from e
+
+    @staticmethod
+    def is_expired(timestamp):
+        """True when tombstones older than timestamp may already be purged (client must resync)"""
+        return timestamp < MessageSync.utcnow() - timedelta(days=settings.MESSAGE_SYNC_TOMBSTONE_RETENTION_DAYS)
+
+    @staticmethod
+    def after(query, field, watermark_key):
+        """Restrict query to documents strictly after watermark_key in (field, _id) order"""
+        if watermark_key is None:
+            return query
+        timestamp, object_id = watermark_key
+        keyset = {'$or': [
+            {field: {'$gt': timestamp}},
+            {field: timestamp, '_id': {'$gt': object_id}}
+        ]}
+        return {'$and': [query, keyset]}
+
+    @staticmethod
+    def merge(days, tombstones, limit, watermark):
+        """Interleave days and tombstones by time and cut one page.
+
+        days and tombstones are each fetched with limit + 1 in feed order.
+        Returns (days, tombstones, next_watermark, has_more).
+
+        When the feed is drained the watermark stops short of the last
+        MESSAGE_SYNC_SETTLE_SECONDS: a write stamped just before a read can
+        commit just after it, so recent changes are sent again next time
+        rather than skipped. Clients apply changes idempotently.
+        """
+        changes = sorted(
+            [(day['updated_at'], day['_id'], 'day', day) for day in days] +
+            [(tombstone['deleted_at'], tombstone['_id'], 'tombstone', tombstone) for tombstone in tombstones],
+            key=lambda change: (change[0], change[1])
+        )
+        has_more = len(changes) > limit
+        page = changes[:limit]
+
+        if has_more:
+            last = page[-1]
+        else:
+            settled_before = MessageSync.utcnow() - timedelta(seconds=settings.MESSAGE_SYNC_SETTLE_SECONDS)
+            settled = [change for change in page if change[0] < settled_before]
+            last = settled[-1] if settled else None
+        next_watermark = MessageSync.encode_watermark(last[0], last[1]) if last else watermark
+
+        return (
+            [change[3] for change in page if change[2] == 'day'],
+            [change[3] for change in page if change[2] == 'tombstone'],
+            next_watermark,
+            has_more
+        )
+
+    @staticmethod
+    def tombstones(message_day, message_ids=None):
+        """Tombstones for a deleted day (message_ids None) or for messages deleted from it"""
+        deleted_at = MessageSync.utcnow()
+        base = {
+            'from_bleoid': message_day['from_bleoid'],
+            'to_bleoid': message_day.get('to_bleoid'),
+            'date': message_day['date'],
+            'deleted_at': deleted_at
+        }
+        if message_ids is None:
+            return [{**base, 'message_id': None}]
+        return [{**base, 'message_id': message_id} for message_id in message_ids]
+
+    @staticmethod
+    def record(tombstones):
+        """Store tombstones from sync views"""
+        if tombstones:
+            MongoDB.get_instance().get_collection('MessagesDaysTombstones').insert_many(tombstones)
+
+    @staticmethod
+    async def arecord(tombstones):
+        """Store tombstones from async views"""
+        if tombstones:
+            await AsyncMongoDB.get_instance().get_collection('MessagesDaysTombstones').insert_many(tombstones)
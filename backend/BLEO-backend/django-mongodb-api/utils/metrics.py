@@ -0,0 +1,413 @@
+import atexit
+import glob
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from pymongo import monitoring
+
+
+class _ShardedValues:
+    """Per-thread value shards: writers only touch their own dict and never take a lock.
+
+    Shards are summed at scrape time; shards of finished threads are folded into
+    a retired shard so short-lived threads do not accumulate.
+    """
+
+    def __init__(self, combine):
+        self._combine = combine
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+        return shard
+
+    def collect(self):
+        """Merged {label_key: value} across every thread"""
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    self._merge_into(self._retired, dict(shard))
+            self._shards = alive
+            merged = {}
+            self._merge_into(merged, self._retired)
+            for _, shard in alive:
+                self._merge_into(merged, dict(shard))
+        return merged
+
+    def _merge_into(self, target, source):
+        for key, value in source.items():
+            target[key] = self._combine(target[key], value) if key in target else self._copy(value)
+
+    @staticmethod
+    def _copy(value):
+        return list(value) if isinstance(value, list) else value
+
+
+def _add(left, right):
+    return left + right
+
+
+def _add_lists(left, right):
+    return [a + b for a, b in zip(left, right)]
+
+
+class _Metric:
+    """Common metric definition"""
+
+    type = None
+    combine = staticmethod(_add)
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = _ShardedValues(self.combine)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def collect(self):
+        return self._values.collect()
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        shard = self._values.shard()
+        shard[key] = shard.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Gauge updated with inc/dec (summed across threads and processes)"""
+
+    type = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        shard = self._values.shard()
+        shard[key] = shard.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Histogram with fixed buckets; each value is [bucket counts..., +Inf count, sum]"""
+
+    type = 'histogram'
+    combine = staticmethod(_add_lists)
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        shard = self._values.shard()
+        entry = shard.get(key)
+        if entry is None:
+            entry = shard[key] = [0] * (len(self.buckets) + 2)
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+
+class CallbackGauge:
+    """Gauge whose value is read from a callback at scrape time"""
+
+    type = 'gauge'
+
+    def __init__(self, name, documentation, callback, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.callback = callback
+
+    def collect(self):
+        try:
+            value = self.callback()
+        except Exception:
+            return {}
+        if isinstance(value, dict):
+            return {tuple(str(part) for part in key): number for key, number in value.items()}
+        return {(): value}
+
+
+class Metrics:
+    """In-process metrics registry with Prometheus text exposition.
+
+    With PROMETHEUS_MULTIPROC_DIR set (e.g. gunicorn workers), every process
+    periodically writes its snapshot there and a scrape merges all of them.
+    """
+
+    _metrics = {}
+    _lock = threading.Lock()
+    _flusher = None
+
+    MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+
+    @classmethod
+    def _register(cls, metric):
+        with cls._lock:
+            existing = cls._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            cls._metrics[metric.name] = metric
+        cls._ensure_flusher()
+        return metric
+
+    @classmethod
+    def counter(cls, name, documentation, labels=()):
+        return cls._register(Counter(name, documentation, labels))
+
+    @classmethod
+    def gauge(cls, name, documentation, labels=()):
+        return cls._register(Gauge(name, documentation, labels))
+
+    @classmethod
+    def histogram(cls, name, documentation, labels=(), buckets=Histogram.DEFAULT_BUCKETS):
+        return cls._register(Histogram(name, documentation, labels, buckets))
+
+    @classmethod
+    def gauge_callback(cls, name, documentation, callback, labels=()):
+        return cls._register(CallbackGauge(name, documentation, callback, labels))
+
+    # ---- collection ----
+
+    @classmethod
+    def snapshot(cls):
+        """Current values of every metric in this process"""
+        with cls._lock:
+            metrics = list(cls._metrics.values())
+
+        snapshot = {}
+        for metric in metrics:
+            snapshot[metric.name] = {
+                'type': metric.type,
+                'help': metric.documentation,
+                'labels': list(metric.label_names),
+                'buckets': list(getattr(metric, 'buckets', ())),
+                'samples': [[list(key), value] for key, value in metric.collect().items()],
+            }
+        return snapshot
+
+    @classmethod
+    def _snapshot_path(cls, pid):
+        return os.path.join(cls.MULTIPROC_DIR, f"bleo_metrics_{pid}.json")
+
+    @classmethod
+    def flush(cls):
+        """Write this process' snapshot to the multiprocess directory"""
+        if not cls.MULTIPROC_DIR:
+            return
+        os.makedirs(cls.MULTIPROC_DIR, exist_ok=True)
+        payload = {'pid': os.getpid(), 'written_at': time.time(), 'metrics': cls.snapshot()}
+        path = cls._snapshot_path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def _ensure_flusher(cls):
+        if not cls.MULTIPROC_DIR or (cls._flusher is not None and cls._flusher.is_alive()):
+            return
+
+        def run():
+            while True:
+                time.sleep(cls.FLUSH_INTERVAL)
+                try:
+                    cls.flush()
+                except Exception as e:
+                    print(f"Error flushing metrics: {str(e)}")
+
+        with cls._lock:
+            if cls._flusher is None or not cls._flusher.is_alive():
+                cls._flusher = threading.Thread(target=run, name='metrics-flusher', daemon=True)
+                cls._flusher.start()
+                atexit.register(cls.flush)
+
+    @classmethod
+    def _after_fork_in_child(cls):
+        """Forked workers start from zero and need their own flusher thread"""
+        cls._lock = threading.Lock()
+        for metric in cls._metrics.values():
+            if isinstance(metric, _Metric):
+                metric._values = _ShardedValues(metric.combine)
+        cls._flusher = None
+        cls._ensure_flusher()
+
+    @staticmethod
+    def _pid_alive(pid):
+        try:
+            os.kill(pid, 0)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    @classmethod
+    def _merged_snapshot(cls):
+        """Merge the snapshots of every process (or return this process' snapshot)"""
+        if not cls.MULTIPROC_DIR:
+            return cls.snapshot()
+
+        cls.flush()
+        merged = {}
+        for path in glob.glob(os.path.join(cls.MULTIPROC_DIR, 'bleo_metrics_*.json')):
+            try:
+                with open(path) as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            alive = cls._pid_alive(payload.get('pid', 0))
+            for name, metric in payload.get('metrics', {}).items():
+                # Gauges describe live state, so drop values from exited workers
+                if metric['type'] == 'gauge' and not alive:
+                    continue
+                target = merged.setdefault(name, dict(metric, samples=[]))
+                target['samples'].extend(metric['samples'])
+
+        for metric in merged.values():
+            combined = {}
+            for key, value in metric['samples']:
+                key = tuple(key)
+                if key in combined:
+                    combined[key] = _add_lists(combined[key], value) if isinstance(value, list) else combined[key] + value
+                else:
+                    combined[key] = value
+            metric['samples'] = [[list(key), value] for key, value in combined.items()]
+        return merged
+
+    # ---- exposition ----
+
+    @staticmethod
+    def _escape(value):
+        return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+    @classmethod
+    def _format_labels(cls, names, values, extra=None):
+        pairs = list(zip(names, values))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{cls._escape(value)}"' for name, value in pairs) + '}'
+
+    @staticmethod
+    def _format_number(value):
+        if value == math.inf:
+            return '+Inf'
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    @classmethod
+    def render(cls):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name, metric in sorted(cls._merged_snapshot().items()):
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            label_names = metric['labels']
+
+            for key, value in sorted(metric['samples']):
+                if metric['type'] == 'histogram':
+                    cumulative = 0
+                    bounds = list(metric['buckets']) + [math.inf]
+                    for bound, count in zip(bounds, value[:-1]):
+                        cumulative += count
+                        labels = cls._format_labels(label_names, key, ('le', cls._format_number(float(bound))))
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    labels = cls._format_labels(label_names, key)
+                    lines.append(f"{name}_sum{labels} {cls._format_number(value[-1])}")
+                    lines.append(f"{name}_count{labels} {cumulative}")
+                else:
+                    lines.append(f"{name}{cls._format_labels(label_names, key)} {cls._format_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=Metrics._after_fork_in_child)
+
+
+class MongoPoolMetricsListener(monitoring.ConnectionPoolListener):
+    """pymongo pool listener feeding connection pool metrics"""
+
+    OPEN_CONNECTIONS = Metrics.gauge(
+        'bleo_mongo_pool_connections', 'Open MongoDB pool connections', labels=('address',)
+    )
+    CHECKED_OUT = Metrics.gauge(
+        'bleo_mongo_pool_checked_out', 'MongoDB connections currently checked out', labels=('address',)
+    )
+    CHECKOUT_FAILURES = Metrics.counter(
+        'bleo_mongo_pool_checkout_failures_total', 'Failed MongoDB connection checkouts', labels=('address', 'reason')
+    )
+    CHECKOUT_DURATION = Metrics.histogram(
+        'bleo_mongo_pool_checkout_seconds', 'Time spent waiting for a pooled MongoDB connection',
+        labels=('address',), buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+    )
+    POOL_CLEARED = Metrics.counter(
+        'bleo_mongo_pool_cleared_total', 'MongoDB pool clears (usually after network errors)', labels=('address',)
+    )
+
+    @staticmethod
+    def _address(event):
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.POOL_CLEARED.inc(address=self._address(event))
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.OPEN_CONNECTIONS.inc(address=self._address(event))
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.OPEN_CONNECTIONS.dec(address=self._address(event))
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.CHECKOUT_FAILURES.inc(address=self._address(event), reason=event.reason)
+
+    def connection_checked_out(self, event):
+        address = self._address(event)
+        self.CHECKED_OUT.inc(address=address)
+        duration = getattr(event, 'duration', None)
+        if duration is not None:
+            self.CHECKOUT_DURATION.observe(duration, address=address)
+
+    def connection_checked_in(self, event):
+        self.CHECKED_OUT.dec(address=self._address(event))
@@ -0,0 +1,158 @@
+import contextvars
+import time
+from contextlib import contextmanager
+import bson
+from django.conf import settings
+from pymongo import monitoring
+
+
+class MongoRequestStats:
+    """MongoDB commands, durations and bytes attributed to one scope (usually one request).
+
+    Bytes are only counted with MONGO_COMMAND_BYTES: pymongo hands the listener
+    decoded documents, so sizing them means encoding every command and reply again.
+    """
+
+    def __init__(self):
+        self.bytes_measured = getattr(settings, 'MONGO_COMMAND_BYTES', False)
+        self.commands = 0
+        self.failed = 0
+        self.duration_ms = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.by_collection = {}
+        self.by_command = {}
+        self.started_at = time.perf_counter()
+
+    def record_started(self, command_name, collection, size):
+        self.commands += 1
+        self.bytes_sent += size
+        self.by_command[command_name] = self.by_command.get(command_name, 0) + 1
+        if collection:
+            self.by_collection[collection] = self.by_collection.get(collection, 0) + 1
+
+    def record_finished(self, duration_ms, size, failed=False):
+        self.duration_ms += duration_ms
+        self.bytes_received += size
+        if failed:
+            self.failed += 1
+
+    def count_excluding(self, collections):
+        """Command count ignoring commands on the given collection names"""
+        excluded = sum(self.by_collection.get(name, 0) for name in collections)
+        return self.commands - excluded
+
+    def server_timing(self):
+        """Value for the Server-Timing response header"""
+        desc = f"{self.commands} commands"
+        if self.bytes_measured:
+            desc += f", {(self.bytes_sent + self.bytes_received) / 1024:.1f} KB"
+        return f'mongo;dur={self.duration_ms:.2f};desc="{desc}"'
+
+    def summary(self):
+        """Short human-readable summary used for sampled logs"""
+        collections = ", ".join(f"{name}={count}" for name, count in sorted(self.by_collection.items()))
+        traffic = f", {self.bytes_sent}B sent / {self.bytes_received}B received" if self.bytes_measured else ""
+        return (
+            f"{self.commands} Mongo commands ({self.failed} failed) in {self.duration_ms:.2f}ms"
+            f"{traffic} [{collections}]"
+        )
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """pymongo listener attributing every command to the active instrumentation scopes"""
+
+    def started(self, event):
+        scopes = MongoInstrumentation._scopes.get()
+        if not scopes:
+            return
+
+        target = event.command.get(event.command_name)
+        if event.command_name == 'getMore':
+            target = event.command.get('collection')
+        collection = target if isinstance(target, str) else None
+        size = MongoInstrumentation._encoded_size(event.command) if any(stats.bytes_measured for stats in scopes) else 0
+
+        for stats in scopes:
+            stats.record_started(event.command_name, collection, size)
+
+    def succeeded(self, event):
+        scopes = MongoInstrumentation._scopes.get()
+        if not scopes:
+            return
+
+        size = MongoInstrumentation._encoded_size(event.reply) if any(stats.bytes_measured for stats in scopes) else 0
+        for stats in scopes:
+            stats.record_finished(event.duration_micros / 1000.0, size)
+
+    def failed(self, event):
+        scopes = MongoInstrumentation._scopes.get()
+        if not scopes:
+            return
+
+        for stats in scopes:
+            stats.record_finished(event.duration_micros / 1000.0, 0, failed=True)
+
+
+class MongoInstrumentation:
+    """Per-request MongoDB command accounting"""
+
+    # Collections written by Logger on almost every request
+    LOGGING_COLLECTION_KEYS = ('DebugLogs', 'AppParameters')
+
+    _scopes = contextvars.ContextVar('mongo_instrumentation_scopes', default=())
+    _listener = None
+
+    @classmethod
+    def get_listener(cls):
+        """Shared listener passed to every MongoClient"""
+        if cls._listener is None:
+            cls._listener = MongoCommandListener()
+        return cls._listener
+
+    @staticmethod
+    def _encoded_size(document):
+        """BSON size of a command or reply"""
+        try:
+            return len(bson.encode(document))
+        except Exception:
+            return 0
+
+    @classmethod
+    @contextmanager
+    def track(cls):
+        """Attribute the commands issued in this block (and this context) to a new stats object"""
+        stats = MongoRequestStats()
+        token = cls._scopes.set(cls._scopes.get() + (stats,))
+        try:
+            yield stats
+        finally:
+            cls._scopes.reset(token)
+
+    @classmethod
+    def logging_collection_names(cls):
+        """Current collection names used by Logger (tests rename collections)"""
+        from utils.mongodb_utils import MongoDB
+        return [MongoDB.COLLECTIONS[key] for key in cls.LOGGING_COLLECTION_KEYS]
+
+
+class MongoCommandBudgetExceeded(AssertionError):
+    """Raised when a block issues more MongoDB commands than its budget"""
+
+
+@contextmanager
+def mongo_command_budget(max_commands, exclude_logging=True):
+    """Fail if the block issues more than max_commands MongoDB commands.
+
+    Logger traffic (DebugLogs/AppParameters) is ignored by default so the budget
+    reflects the view's own queries.
+    """
+    with MongoInstrumentation.track() as stats:
+        yield stats
+
+    excluded = MongoInstrumentation.logging_collection_names() if exclude_logging else []
+    used = stats.count_excluding(excluded)
+    if used > max_commands:
+        raise MongoCommandBudgetExceeded(
+            f"Expected at most {max_commands} MongoDB commands, got {used}: {stats.by_collection}"
+        )
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import weakref
+from pymongo import AsyncMongoClient
+from environs import Env
+from .mongodb_utils import MongoDB
+from .mongo_instrumentation import MongoInstrumentation
+from .metrics import MongoPoolMetricsListener
+
+env = Env()
+env.read_env()
+
+class AsyncMongoDB:
+    """Asyncio MongoDB connection utility for the ASGI views.
+
+    An AsyncMongoClient is bound to the event loop that created it, so one
+    instance is kept per running loop. Collection names come from
+    MongoDB.COLLECTIONS, so both clients always address the same collections.
+    """
+
+    _instances = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def get_instance(cls):
+        """Get or create the instance for the running event loop"""
+        loop = asyncio.get_running_loop()
+        instance = cls._instances.get(loop)
+        if instance is None:
+            instance = AsyncMongoDB()
+            cls._instances[loop] = instance
+        return instance
+
+    @classmethod
+    async def close(cls):
+        """Close the running loop's client, if any"""
+        instance = cls._instances.pop(asyncio.get_running_loop(), None)
+        if instance is not None:
+            await instance._client.close()
+
+    def __init__(self):
+        """Create the client; it connects lazily on the first command"""
+        env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
+        env.read_env(env_path)
+
+        mongo_uri = env.str('MONGO_URI')
+        mongo_password = env.str('MONGO_PASSWORD')
+        db_name = env.str('MONGO_DB_NAME')
+
+        # Insert password into connection string if placeholder exists
+        if '{password}' in mongo_uri:
+            mongo_uri = mongo_uri.replace('{password}', mongo_password)
+
+        self._client = AsyncMongoClient(
+            mongo_uri,
+            event_listeners=[MongoInstrumentation.get_listener(), MongoPoolMetricsListener()]
+        )
+        self._db = self._client[db_name]
+
+    def get_collection(self, collection_key):
+        """Get async MongoDB collection by key"""
+        if collection_key not in MongoDB.COLLECTIONS:
+            raise ValueError(f"Collection key not found: {collection_key}")
+
+        return self._db[MongoDB.COLLECTIONS[collection_key]]
+
+    def get_db(self):
+        """Get async MongoDB database instance"""
+        return self._db
@@ -27,8 +27,8 @@ USER_SCHEMA = {
                 "description": "User's display name (defaults to 'NewUser')"
             },
             "profilePic": {
-                "bsonType": ["binData", "null"],
-                "description": "Profile picture binary data (optional)"
+                "bsonType": ["string", "binData", "null"],
+                "description": "ProfilePictures reference (optional; inline binary data before v1.3.0)"
             },
             "email_verified": {
                 "bsonType": "bool",
@@ -152,6 +152,45 @@ MESSAGE_DAY_SCHEMA = {
                 "bsonType": ["string", "null"],
                 "enum": ["pleasant", "unpleasant", None],
                 "description": "Pleasantness level for the day (pleasant/unpleasant)"
+            },
+            "version": {
+                "bsonType": ["int", "long"],
+                "minimum": 1,
+                "description": "Incremented on every write (ETag source)"
+            },
+            "updated_at": {
+                "bsonType": "date",
+                "description": "UTC time of the last write (Last-Modified source)"
+            }
+        }
+    }
+}
+
+MESSAGE_DAY_TOMBSTONE_SCHEMA = {
+    "$jsonSchema": {
+        "bsonType": "object",
+        "required": ["from_bleoid", "date", "deleted_at"],
+        "properties": {
+            "from_bleoid": {
+                "bsonType": "string",
+                "pattern": "^[A-Z0-9]{6}$",
+                "description": "Author of the deleted day"
+            },
+            "to_bleoid": {
+                "bsonType": ["string", "null"],
+                "description": "Partner of the deleted day"
+            },
+            "date": {
+                "bsonType": "date",
+                "description": "Date of the deleted day"
+            },
+            "message_id": {
+                "bsonType": ["int", "long", "null"],
+                "description": "Deleted message id, null when the whole day was deleted"
+            },
+            "deleted_at": {
+                "bsonType": "date",
+                "description": "UTC deletion time (delta sync order and retention TTL)"
             }
         }
     }
@@ -160,7 +199,7 @@ MESSAGE_DAY_SCHEMA = {
 PASSWORD_RESET_SCHEMA = {
     "$jsonSchema": {
         "bsonType": "object",
-        "required": ["bleoid", "email", "token", "created_at", "expires_at", "used", "attempts"],
+        "required": ["bleoid", "email", "jti", "created_at", "expires_at", "used", "attempts"],
         "properties": {
             "bleoid": {
                 "bsonType": "string",
@@ -173,9 +212,9 @@ PASSWORD_RESET_SCHEMA = {
                 "maxLength": ValidationRules.MAX_LENGTHS['email'],
                 "description": "User's email address for password reset"
             },
-            "token": {
+            "jti": {
                 "bsonType": "string",
-                "description": "JWT reset token"
+                "description": "ID (jti claim) of the signed reset token"
             },
             "created_at": {
                 "bsonType": "date",
@@ -260,6 +299,11 @@ DEBUG_LOGS_SCHEMA = {
                 "bsonType": ["string", "null"],
                 "enum": ["server", "application", None],
                 "description": "Source of the error (server or application)"
+            },
+            "repeat_count": {
+                "bsonType": "int",
+                "minimum": 1,
+                "description": "Identical entries this document stands for (aggregated logging)"
             }
         }
     }
@@ -288,7 +332,7 @@ APP_PARAMETERS_SCHEMA = {
 EMAIL_VERIFICATION_SCHEMA = {
     "$jsonSchema": {
         "bsonType": "object",
-        "required": ["bleoid", "email", "token", "created_at", "expires_at", "verified"],
+        "required": ["bleoid", "email", "jti", "created_at", "expires_at", "verified"],
         "properties": {
             "bleoid": {
                 "bsonType": "string",
@@ -301,9 +345,9 @@ EMAIL_VERIFICATION_SCHEMA = {
                 "maxLength": 254,
                 "description": "User's email address for verification"
             },
-            "token": {
+            "jti": {
                 "bsonType": "string",
-                "description": "JWT verification token"
+                "description": "ID (jti claim) of the signed verification token"
             },
             "created_at": {
                 "bsonType": "date",
@@ -328,4 +372,191 @@ EMAIL_VERIFICATION_SCHEMA = {
             }
         }
     }
-}
\ No newline at end of file
+}
+
+PROFILE_PICTURE_SCHEMA = {
+    "$jsonSchema": {
+        "bsonType": "object",
+        "required": ["bleoid", "variant", "reference", "content_type", "data", "updated_at"],
+        "properties": {
+            "bleoid": {
+                "bsonType": "string",
+                "pattern": ValidationPatterns.BLEOID_PATTERN,
+                "description": "Owner of the picture"
+            },
+            "variant": {
+                "enum": ["original", "small", "thumb"],
+                "description": "Stored size of the picture"
+            },
+            "reference": {
+                "bsonType": "string",
+                "description": "Content hash shared by all variants, also stored in Users.profilePic"
+            },
+            "content_type": {
+                "enum": ["image/jpeg", "image/png"],
+                "description": "MIME type of data"
+            },
+            "data": {
+                "bsonType": "binData",
+                "description": "Encoded image bytes"
+            },
+            "size": {
+                "bsonType": ["int", "long"],
+                "description": "Length of data in bytes"
+            },
+            "updated_at": {
+                "bsonType": "date",
+                "description": "When the picture was uploaded"
+            }
+        }
+    }
+}
+
+EMAIL_OUTBOX_SCHEMA = {
+    "$jsonSchema": {
+        "bsonType": "object",
+        "required": ["idempotency_key", "to_email", "subject", "html_content", "status", "attempts", "next_attempt_at", "created_at"],
+        "properties": {
+            "idempotency_key": {
+                "bsonType": "string",
+                "description": "Unique key: the same email is queued once"
+            },
+            "to_email": {
+                "bsonType": "string",
+                "description": "Recipient address"
+            },
+            "subject": {
+                "bsonType": "string",
+                "description": "Email subject"
+            },
+            "html_content": {
+                "bsonType": ["string", "null"],
+                "description": "HTML body, cleared once sent or failed (it may hold live token links)"
+            },
+            "text_content": {
+                "bsonType": ["string", "null"],
+                "description": "Plain text body (optional), cleared with html_content"
+            },
+            "status": {
+                "enum": ["pending", "sending", "sent", "failed"],
+                "description": "Delivery state"
+            },
+            "attempts": {
+                "bsonType": ["int", "long"],
+                "minimum": 0,
+                "description": "Delivery attempts so far"
+            },
+            "next_attempt_at": {
+                "bsonType": "date",
+                "description": "Earliest time of the next attempt"
+            },
+            "locked_until": {
+                "bsonType": ["date", "null"],
+                "description": "Lease of the worker currently sending the email"
+            },
+            "last_error": {
+                "bsonType": ["string", "null"],
+                "description": "Error of the last failed attempt"
+            },
+            "created_at": {
+                "bsonType": "date",
+                "description": "When the email was queued"
+            },
+            "sent_at": {
+                "bsonType": ["date", "null"],
+                "description": "When the email was delivered (sent rows expire after the retention)"
+            }
+        }
+    }
+}
+
+ACCOUNT_DELETION_SCHEMA = {
+    "$jsonSchema": {
+        "bsonType": "object",
+        "required": ["bleoid", "status", "completed_steps", "created_at", "updated_at"],
+        "properties": {
+            "bleoid": {
+                "bsonType": "string",
+                "pattern": ValidationPatterns.BLEOID_PATTERN,
+                "description": ValidationPatterns.BLEOID_DESCRIPTION
+            },
+            "email": {
+                "bsonType": ["string", "null"],
+                "description": "Email of the deleted user (for its queued emails)"
+            },
+            "status": {
+                "enum": ["running"],
+                "description": "Jobs are removed once finished"
+            },
+            "completed_steps": {
+                "bsonType": "array",
+                "items": {"bsonType": "string"},
+                "description": "Cascade steps already finished"
+            },
+            "deleted": {
+                "bsonType": "object",
+                "description": "Documents deleted so far, per step"
+            },
+            "created_at": {
+                "bsonType": "date",
+                "description": "When the deletion started"
+            },
+            "updated_at": {
+                "bsonType": "date",
+                "description": "Last progress (a worker resumes jobs idle for ACCOUNT_DELETION_LEASE_SECONDS)"
+            }
+        }
+    }
+}
+
+LOGIN_THROTTLE_SCHEMA = {
+    "$jsonSchema": {
+        "bsonType": "object",
+        "required": ["key", "window", "count", "expires_at"],
+        "properties": {
+            "key": {
+                "bsonType": "string",
+                "description": "Throttled subject: ip:<address> or email:<sha256 of the email>"
+            },
+            "window": {
+                "bsonType": ["int", "long"],
+                "description": "Index of the fixed window (epoch seconds // LOGIN_THROTTLE_WINDOW_SECONDS)"
+            },
+            "count": {
+                "bsonType": ["int", "long"],
+                "minimum": 0,
+                "description": "Failed logins recorded in the window"
+            },
+            "expires_at": {
+                "bsonType": "date",
+                "description": "End of the following window, once the count no longer weighs (TTL)"
+            }
+        }
+    }
+}
+
+JWT_KEY_SCHEMA = {
+    "$jsonSchema": {
+        "bsonType": "object",
+        "required": ["kid", "secret", "generation", "created_at"],
+        "properties": {
+            "kid": {
+                "bsonType": "string",
+                "description": "Key id sent in the token header (fingerprint of the secret)"
+            },
+            "secret": {
+                "bsonType": "string",
+                "description": "HS256 signing secret"
+            },
+            "generation": {
+                "bsonType": ["int", "long"],
+                "minimum": 0,
+                "description": "Rotations before this key (0 = seeded from JWT_SECRET)"
+            },
+            "created_at": {
+                "bsonType": "date",
+                "description": "When the key was added; the newest one signs"
+            }
+        }
+    }
+}
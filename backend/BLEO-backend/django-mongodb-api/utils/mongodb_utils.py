@@ -1,17 +1,26 @@
 from models.enums.DebugType import DebugType
 from models.AppParameters import AppParameters
 import os
-from pymongo import MongoClient, ASCENDING
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
 from environs import Env
+from .mongo_instrumentation import MongoInstrumentation
+from .metrics import MongoPoolMetricsListener
 from .mongodb_schemas import (
     USER_SCHEMA, 
     LINK_SCHEMA, 
     MESSAGE_DAY_SCHEMA, 
+    MESSAGE_DAY_TOMBSTONE_SCHEMA,
     PASSWORD_RESET_SCHEMA, 
     TOKEN_BLACKLIST_SCHEMA,
     EMAIL_VERIFICATION_SCHEMA,
     DEBUG_LOGS_SCHEMA,
-    APP_PARAMETERS_SCHEMA
+    APP_PARAMETERS_SCHEMA,
+    PROFILE_PICTURE_SCHEMA,
+    EMAIL_OUTBOX_SCHEMA,
+    ACCOUNT_DELETION_SCHEMA,
+    LOGIN_THROTTLE_SCHEMA,
+    JWT_KEY_SCHEMA
 )
 
 env = Env()
@@ -30,11 +39,17 @@ class MongoDB:
         'Users': 'Users',
         'Links': 'Links', 
         'MessagesDays': 'MessagesDays',
+        'MessagesDaysTombstones': 'MessagesDaysTombstones',
         'PasswordResets': 'PasswordResets',
         'TokenBlacklist': 'TokenBlacklist',
         'EmailVerifications': 'EmailVerifications',
         'DebugLogs': 'DebugLogs',
-        'AppParameters': 'AppParameters'
+        'AppParameters': 'AppParameters',
+        'ProfilePictures': 'ProfilePictures',
+        'EmailOutbox': 'EmailOutbox',
+        'AccountDeletions': 'AccountDeletions',
+        'LoginThrottle': 'LoginThrottle',
+        'JWTKeys': 'JWTKeys'
     }
     
     @classmethod
@@ -78,7 +93,10 @@ class MongoDB:
                 mongo_uri = mongo_uri.replace('{password}', mongo_password)
             
             # Create MongoDB client and connect to database
-            self._client = MongoClient(mongo_uri)
+            self._client = MongoClient(
+                mongo_uri,
+                event_listeners=[MongoInstrumentation.get_listener(), MongoPoolMetricsListener()]
+            )
             self._db = self._client[db_name]
             
             # Test connection
@@ -99,6 +117,10 @@ class MongoDB:
         # Step 2: Handle version updates (including AppParameters)
         self._handle_version_updates()
         
+        # Step 3: Apply the DebugLogs retention setting
+        from utils.log_retention import LogRetention
+        LogRetention.apply()
+        
         print("✅ MongoDB system setup complete!")
     
     def _ensure_collections_exist(self):
@@ -113,6 +135,11 @@ class MongoDB:
             else:
                 print(f"  🔄 Updating schema for existing collection: {collection_name}")
                 self.setup_collection(collection_name, create=False)
+                # Indexes added after a collection was created are synced here
+                try:
+                    self._setup_collection_indexes(collection_name)
+                except Exception as e:
+                    print(f"  ❌ Error syncing indexes for {collection_name}: {str(e)}")
     
     def _handle_version_updates(self):
         """Handle version-based parameter updates"""
@@ -129,7 +156,7 @@ class MongoDB:
                 print(f"  📊 Current database version: {current_version}")
             
             # Run version updates starting from 1.0.0
-            versions_to_run = ["1.0.0"]  # Add future versions here: ["1.0.0", "1.1.0", "1.2.0"]
+            versions_to_run = ["1.0.0", "1.1.0", "1.2.0", "1.3.0", "1.4.0", "1.5.0"]  # Add future versions here
             
             for version in versions_to_run:
                 if self._should_run_version(current_version, version):
@@ -143,6 +170,21 @@ class MongoDB:
         # For now, always run 1.0.0 to ensure base parameters exist
         if target_version == "1.0.0":
             return True
+        # 1.1.0 only creates missing parameters, so it is safe to run every time
+        if target_version == "1.1.0":
+            return True
+        # 1.2.0 only backfills days missing updated_at, so it is safe to run every time
+        if target_version == "1.2.0":
+            return True
+        # 1.3.0 only moves pictures still stored inline, so it is safe to run every time
+        if target_version == "1.3.0":
+            return True
+        # 1.4.0 only rekeys token records still holding the full JWT, so it is safe to run every time
+        if target_version == "1.4.0":
+            return True
+        # 1.5.0 only renumbers duplicate DebugLogs ids, so it is safe to run every time
+        if target_version == "1.5.0":
+            return True
         # Add logic for future versions
         return False
     
@@ -151,8 +193,11 @@ class MongoDB:
         try:
             print(f"  🚀 Running version {version} updates...")
             
-            if version == '1.0.0':
-                from mongoDbVersionUpdate.v1_0_0.v1_0_0_AppParameters import update_app_parameters
+            if version in ('1.0.0', '1.1.0'):
+                if version == '1.0.0':
+                    from mongoDbVersionUpdate.v1_0_0.v1_0_0_AppParameters import update_app_parameters
+                else:
+                    from mongoDbVersionUpdate.v1_1_0.v1_1_0_AppParameters import update_app_parameters
                 result = update_app_parameters()
                 
                 if result["success"]:
@@ -160,6 +205,38 @@ class MongoDB:
                     print(f"    📊 Created: {result['created']}, Updated: {result['updated']}")
                 else:
                     print(f"    ❌ {result['message']}: {result.get('error', 'Unknown error')}")
+            elif version == '1.2.0':
+                from mongoDbVersionUpdate.v1_2_0.v1_2_0_MessagesDays import backfill_message_days
+                result = backfill_message_days()
+                
+                if result["success"]:
+                    print(f"    ✅ {result['message']}")
+                else:
+                    print(f"    ❌ {result['message']}: {result.get('error', 'Unknown error')}")
+            elif version == '1.3.0':
+                from mongoDbVersionUpdate.v1_3_0.v1_3_0_Users import move_profile_pictures
+                result = move_profile_pictures()
+                
+                if result["success"]:
+                    print(f"    ✅ {result['message']}")
+                else:
+                    print(f"    ❌ {result['message']}: {result.get('error', 'Unknown error')}")
+            elif version == '1.4.0':
+                from mongoDbVersionUpdate.v1_4_0.v1_4_0_TokenRecords import key_token_records_by_jti
+                result = key_token_records_by_jti()
+                
+                if result["success"]:
+                    print(f"    ✅ {result['message']}")
+                else:
+                    print(f"    ❌ {result['message']}: {result.get('error', 'Unknown error')}")
+            elif version == '1.5.0':
+                from mongoDbVersionUpdate.v1_5_0.v1_5_0_DebugLogs import renumber_duplicate_log_ids
+                result = renumber_duplicate_log_ids()
+                
+                if result["success"]:
+                    print(f"    ✅ {result['message']}")
+                else:
+                    print(f"    ❌ {result['message']}: {result.get('error', 'Unknown error')}")
             else:
                 print(f"    ⚠️ No update module found for version {version}")
                 
@@ -176,11 +253,17 @@ class MongoDB:
                 self.COLLECTIONS['Users']: USER_SCHEMA,
                 self.COLLECTIONS['Links']: LINK_SCHEMA,
                 self.COLLECTIONS['MessagesDays']: MESSAGE_DAY_SCHEMA,
+                self.COLLECTIONS['MessagesDaysTombstones']: MESSAGE_DAY_TOMBSTONE_SCHEMA,
                 self.COLLECTIONS['PasswordResets']: PASSWORD_RESET_SCHEMA,
                 self.COLLECTIONS['TokenBlacklist']: TOKEN_BLACKLIST_SCHEMA,
                 self.COLLECTIONS['EmailVerifications']: EMAIL_VERIFICATION_SCHEMA,  # Add this line
                 self.COLLECTIONS['DebugLogs']: DEBUG_LOGS_SCHEMA,
-                self.COLLECTIONS['AppParameters']: APP_PARAMETERS_SCHEMA
+                self.COLLECTIONS['AppParameters']: APP_PARAMETERS_SCHEMA,
+                self.COLLECTIONS['ProfilePictures']: PROFILE_PICTURE_SCHEMA,
+                self.COLLECTIONS['EmailOutbox']: EMAIL_OUTBOX_SCHEMA,
+                self.COLLECTIONS['AccountDeletions']: ACCOUNT_DELETION_SCHEMA,
+                self.COLLECTIONS['LoginThrottle']: LOGIN_THROTTLE_SCHEMA,
+                self.COLLECTIONS['JWTKeys']: JWT_KEY_SCHEMA
             }
             
             if collection_name not in schema_mapping:
@@ -237,23 +320,137 @@ class MongoDB:
             self._db[collection_name].create_index([("userName", ASCENDING)], unique=True)
             self._db[collection_name].create_index([("bleoid", ASCENDING)], unique=True)
         elif collection_name == self.COLLECTIONS['PasswordResets']:
-            self._db[collection_name].create_index([("token", ASCENDING)], unique=True)
+            # Records are keyed by the token's jti, see _setup_token_id_index
+            self._setup_token_id_index(collection_name)
             self._db[collection_name].create_index([("email", ASCENDING)])
+            # Account deletion
+            self._db[collection_name].create_index([("bleoid", ASCENDING)])
+            # Used tokens are kept for audit, then expire; see TokenSweeper for unused ones
+            from django.conf import settings
+            self.ensure_ttl_index('PasswordResets', 'expires_at', settings.TOKEN_AUDIT_RETENTION_DAYS * 24 * 3600)
         elif collection_name == self.COLLECTIONS['TokenBlacklist']:
             self._db[collection_name].create_index([("token", ASCENDING)], unique=True)
-            self._db[collection_name].create_index([("expires_at", ASCENDING)])
+            # An expired refresh token is rejected anyway: its blacklist entry can go
+            self.ensure_ttl_index('TokenBlacklist', 'expires_at', 0)
         elif collection_name == self.COLLECTIONS['EmailVerifications']:  # Add this section
             self._db[collection_name].create_index([("email", ASCENDING)])
-            self._db[collection_name].create_index([("token", ASCENDING)], unique=True)
+            self._setup_token_id_index(collection_name)
             self._db[collection_name].create_index([("bleoid", ASCENDING)])
-            self._db[collection_name].create_index([("expires_at", ASCENDING)])
+            from django.conf import settings
+            self.ensure_ttl_index('EmailVerifications', 'expires_at', settings.TOKEN_AUDIT_RETENTION_DAYS * 24 * 3600)
             self._db[collection_name].create_index([("verified", ASCENDING)])
         elif collection_name == self.COLLECTIONS['AppParameters']:
             self._db[collection_name].create_index([("param_name", ASCENDING)], unique=True)
+        elif collection_name == self.COLLECTIONS['ProfilePictures']:
+            self._db[collection_name].create_index([("bleoid", ASCENDING), ("variant", ASCENDING)], unique=True)
+        elif collection_name == self.COLLECTIONS['EmailOutbox']:
+            self._db[collection_name].create_index([("idempotency_key", ASCENDING)], unique=True)
+            # Worker claims: due pending rows and expired leases
+            self._db[collection_name].create_index([("status", ASCENDING), ("next_attempt_at", ASCENDING)])
+            # Account deletion removes the user's queued emails
+            self._db[collection_name].create_index([("to_email", ASCENDING)])
+            # Delivered rows are only kept for troubleshooting
+            from django.conf import settings
+            self.ensure_ttl_index('EmailOutbox', 'sent_at', settings.EMAIL_OUTBOX_RETENTION_DAYS * 24 * 3600)
+        elif collection_name == self.COLLECTIONS['AccountDeletions']:
+            # One running job per user; resume picks up stalled ones
+            self._db[collection_name].create_index([("bleoid", ASCENDING)], unique=True)
+            self._db[collection_name].create_index([("status", ASCENDING), ("updated_at", ASCENDING)])
+        elif collection_name == self.COLLECTIONS['LoginThrottle']:
+            # One counter per subject and window, dropped once it no longer counts
+            self._db[collection_name].create_index([("key", ASCENDING), ("window", ASCENDING)], unique=True)
+            self.ensure_ttl_index('LoginThrottle', 'expires_at', 0)
+        elif collection_name == self.COLLECTIONS['JWTKeys']:
+            # Verification looks keys up by kid; the ring is the newest keys
+            self._db[collection_name].create_index([("kid", ASCENDING)], unique=True)
+            self._db[collection_name].create_index([("created_at", DESCENDING)])
+        elif collection_name == self.COLLECTIONS['MessagesDays']:
+            # Day lookups (detail reads and the ETag projection check)
+            self._db[collection_name].create_index([("from_bleoid", ASCENDING), ("date", ASCENDING)])
+            # Delta sync feed, see MessageSync
+            for field in ("from_bleoid", "to_bleoid"):
+                self._db[collection_name].create_index([(field, ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)])
+        elif collection_name == self.COLLECTIONS['MessagesDaysTombstones']:
+            for field in ("from_bleoid", "to_bleoid"):
+                self._db[collection_name].create_index([(field, ASCENDING), ("deleted_at", ASCENDING), ("_id", ASCENDING)])
+            # Tombstones outlive the oldest watermark a client may still hold, then expire
+            from django.conf import settings
+            self.ensure_ttl_index('MessagesDaysTombstones', 'deleted_at', settings.MESSAGE_SYNC_TOMBSTONE_RETENTION_DAYS * 24 * 3600)
         elif collection_name == self.COLLECTIONS['DebugLogs']:
-            self._db[collection_name].create_index([("date", ASCENDING)])
-            self._db[collection_name].create_index([("bleoid", ASCENDING)])
-            self._db[collection_name].create_index([("type", ASCENDING)])
+            # The date index doubles as the retention TTL index, see LogRetention
+            if not self._find_index(collection_name, "date"):
+                self._db[collection_name].create_index([("date", ASCENDING)])
+            # Admin filters + (date, id) keyset order, see LogQuery
+            self._db[collection_name].create_index([("date", DESCENDING), ("id", DESCENDING)])
+            for field in ("type", "bleoid", "error_source", "user_type"):
+                self._db[collection_name].create_index([(field, ASCENDING), ("date", DESCENDING), ("id", DESCENDING)])
+            try:
+                self.setup_log_id_index()
+            except OperationFailure as e:
+                # Ids duplicated before the index existed; v1.5.0 renumbers them and builds it
+                from utils.logger import Logger
+                Logger.server_error(f"Unique DebugLogs id index not built: {str(e)}")
+    
+    def setup_log_id_index(self):
+        """Unique DebugLogs id index, so Logger retries when concurrent writers pick the same id.
+
+        Raises OperationFailure while the collection still holds duplicate ids.
+        """
+        self._db[self.COLLECTIONS['DebugLogs']].create_index([("id", ASCENDING)], unique=True)
+    
+    def _setup_token_id_index(self, collection_name):
+        """Unique jti index of PasswordResets/EmailVerifications, replacing the one on the full JWT.
+
+        Partial so records written before v1.4.0 (no jti yet) don't collide on null.
+        """
+        token_index = self._find_index(collection_name, "token")
+        if token_index:
+            self._db[collection_name].drop_index(token_index["name"])
+        self._db[collection_name].create_index(
+            [("jti", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"jti": {"$type": "string"}}
+        )
+
+    def _find_index(self, collection_name, field):
+        """Return the ascending single-field index on field, if any"""
+        for index in self._db[collection_name].list_indexes():
+            if dict(index["key"]) == {field: 1}:
+                return index
+        return None
+
+    def ensure_ttl_index(self, collection_key, field, expire_after_seconds):
+        """Make the single-field index on field expire documents after the given seconds.
+
+        None turns the index back into a plain one. Returns True when the index changed.
+        """
+        collection_name = self.COLLECTIONS[collection_key]
+        collection = self._db[collection_name]
+        existing = self._find_index(collection_name, field)
+        current = existing.get("expireAfterSeconds") if existing else None
+        
+        if existing and current == expire_after_seconds:
+            return False
+        
+        if existing and expire_after_seconds is not None:
+            try:
+                # Retune in place so the index never disappears
+                self._db.command({
+                    "collMod": collection_name,
+                    "index": {"keyPattern": {field: 1}, "expireAfterSeconds": int(expire_after_seconds)}
+                })
+                return True
+            except Exception:
+                # Servers before 5.1 cannot turn a plain index into a TTL one
+                pass
+        
+        if existing:
+            collection.drop_index(existing["name"])
+        if expire_after_seconds is None:
+            collection.create_index([(field, ASCENDING)])
+        else:
+            collection.create_index([(field, ASCENDING)], expireAfterSeconds=int(expire_after_seconds))
+        return True
     
     def get_collection(self, collection_key):
         """Get MongoDB collection by key"""
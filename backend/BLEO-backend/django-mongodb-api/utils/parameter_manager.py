@@ -1,10 +1,19 @@
+import threading
+import time
 from models.AppParameters import AppParameters
 from models.enums.DebugType import DebugType
 from utils.logger import Logger
 from models.enums.LogType import LogType
 
+_MISSING = object()
+
 class ParameterManager:
     """Simple parameter management for AppParameters collection"""
+
+    # Hot-path reads (Logger, sampling) are served from memory for this many seconds
+    CACHE_MAX_AGE_SECONDS = 5
+    _cache = {}
+    _cache_lock = threading.Lock()
     
     @staticmethod
     def get_debug_level():
@@ -57,6 +66,47 @@ class ParameterManager:
             Logger.server_error(f"Error getting parameter {param_name}: {str(e)}")
             return default_value
     
+    @staticmethod
+    def get_cached_parameter_value(param_name, default_value=None, max_age=None):
+        """Get a parameter value cached in-process for max_age seconds.
+
+        Used on hot paths such as Logger, so it never logs: failures print
+        and fall back to default_value.
+        """
+        from utils.mongodb_utils import MongoDB
+
+        max_age = ParameterManager.CACHE_MAX_AGE_SECONDS if max_age is None else max_age
+        # Keyed by collection name so renamed test collections never share entries
+        key = (MongoDB.COLLECTIONS['AppParameters'], param_name)
+        now = time.monotonic()
+
+        cached = ParameterManager._cache.get(key)
+        if cached and now - cached[0] < max_age:
+            value = cached[1]
+            return default_value if value is _MISSING else value
+
+        try:
+            db = MongoDB.get_instance().get_collection('AppParameters')
+            param = db.find_one({"param_name": param_name}, {"param_value": 1})
+            value = param.get("param_value", _MISSING) if param else _MISSING
+        except Exception as e:
+            print(f"Error reading parameter {param_name}: {str(e)}")
+            return default_value
+
+        with ParameterManager._cache_lock:
+            ParameterManager._cache[key] = (now, value)
+        return default_value if value is _MISSING else value
+
+    @staticmethod
+    def invalidate_cache(param_name=None):
+        """Drop cached parameter values (all of them, or one parameter)"""
+        with ParameterManager._cache_lock:
+            if param_name is None:
+                ParameterManager._cache.clear()
+            else:
+                for key in [key for key in ParameterManager._cache if key[1] == param_name]:
+                    del ParameterManager._cache[key]
+
     @staticmethod
     def update_parameter_value(param_name, param_value):
         """Update parameter value in database"""
@@ -82,7 +132,8 @@ class ParameterManager:
                     "param_name": param_name,
                     "param_value": param_value
                 })
-                
+
+            ParameterManager.invalidate_cache(param_name)
             Logger.system_action(
                 f"Parameter {param_name} updated to {param_value}",
                 LogType.INFO.value,
@@ -0,0 +1,118 @@
+import hashlib
+from datetime import datetime, timezone
+from io import BytesIO
+from bson.binary import Binary
+from django.conf import settings
+from django.urls import NoReverseMatch, reverse
+from PIL import Image, ImageOps, UnidentifiedImageError
+from utils.mongodb_utils import MongoDB
+
+class ProfilePictures:
+    """Profile pictures kept out of the Users documents.
+
+    An upload is decoded once and re-encoded into fixed-size variants, each stored
+    as its own ProfilePictures document keyed by (bleoid, variant). The Users
+    document only keeps the picture's content hash in profilePic, which doubles as
+    the image ETag and as the cache-busting `v` parameter of the picture URL, so
+    user reads and connection lists never load image bytes.
+    """
+
+    # Longest side in pixels of each stored variant
+    VARIANTS = {'original': 1024, 'small': 256, 'thumb': 64}
+    DEFAULT_VARIANT = 'small'
+
+    ACCEPTED_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+    JPEG_QUALITY = 85
+
+    @staticmethod
+    def render(raw):
+        """Re-encode raw image bytes into every variant: {variant: (data, content_type)}.
+
+        Raises ValueError when raw is too large or not an accepted image.
+        """
+        if len(raw) > settings.PROFILE_PIC_MAX_BYTES:
+            raise ValueError(f"Profile picture exceeds {settings.PROFILE_PIC_MAX_BYTES} bytes")
+
+        try:
+            image = Image.open(BytesIO(raw))
+            if image.format not in ProfilePictures.ACCEPTED_FORMATS:
+                raise ValueError(f"Unsupported image format: {image.format}")
+            # Reject decompression bombs before any pixel is decoded
+            if image.width * image.height > settings.PROFILE_PIC_MAX_PIXELS:
+                raise ValueError("Profile picture dimensions are too large")
+            image = ImageOps.exif_transpose(image)
+        except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+            raise ValueError("Profile picture is not a valid image") from e
+
+        # Re-encoding also drops EXIF metadata such as GPS position
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        image_format, content_type = ('PNG', 'image/png') if has_alpha else ('JPEG', 'image/jpeg')
+
+        variants = {}
+        for variant, size in ProfilePictures.VARIANTS.items():
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.LANCZOS)
+            buffer = BytesIO()
+            resized.save(buffer, image_format, quality=ProfilePictures.JPEG_QUALITY, optimize=True)
+            variants[variant] = (buffer.getvalue(), content_type)
+        return variants
+
+    @staticmethod
+    def store(bleoid, raw):
+        """Store the variants of raw for bleoid and return the reference for Users.profilePic"""
+        variants = ProfilePictures.render(raw)
+        ProfilePictures.save(bleoid, variants)
+        return ProfilePictures.reference(variants)
+
+    @staticmethod
+    def reference(variants):
+        """Content hash of rendered variants, the value kept in Users.profilePic"""
+        return hashlib.sha1(variants['original'][0]).hexdigest()[:16]
+
+    @staticmethod
+    def save(bleoid, variants):
+        """Store already rendered variants for bleoid"""
+        reference = ProfilePictures.reference(variants)
+        now = datetime.now(timezone.utc)
+
+        db = MongoDB.get_instance().get_collection('ProfilePictures')
+        for variant, (data, content_type) in variants.items():
+            db.replace_one(
+                {"bleoid": bleoid, "variant": variant},
+                {
+                    "bleoid": bleoid,
+                    "variant": variant,
+                    "reference": reference,
+                    "content_type": content_type,
+                    "data": Binary(data),
+                    "size": len(data),
+                    "updated_at": now
+                },
+                upsert=True
+            )
+
+    @staticmethod
+    def delete(bleoid):
+        """Remove every variant of bleoid's picture"""
+        return MongoDB.get_instance().get_collection('ProfilePictures').delete_many({"bleoid": bleoid}).deleted_count
+
+    @staticmethod
+    def etag(reference, variant):
+        """Strong ETag of one variant of a picture"""
+        return f'"{reference}-{variant}"'
+
+    @staticmethod
+    def url(bleoid, reference, variant=None):
+        """Versioned URL of a picture variant, or None when the user has no picture"""
+        if not isinstance(reference, str) or not reference:
+            return None
+        try:
+            path = reverse('user-picture', args=[bleoid])
+        except NoReverseMatch:
+            # URL configurations without the picture route (some tests)
+            return None
+        query = f"?v={reference}"
+        if variant and variant != ProfilePictures.DEFAULT_VARIANT:
+            query += f"&size={variant}"
+        return path + query
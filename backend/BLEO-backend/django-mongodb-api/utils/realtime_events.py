@@ -0,0 +1,75 @@
+from datetime import datetime
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from utils.metrics import Metrics
+from utils.validation_patterns import ValidationRules
+
+EVENTS_PUBLISHED = Metrics.counter(
+    'bleo_realtime_events_total',
+    'Couple WebSocket events published by event type and outcome',
+    labels=('event', 'result')
+)
+
+class RealtimeEvents:
+    """Publishes message-day and message changes to the couple's WebSocket group.
+
+    The write paths call publish() after a successful write. Delivery is best
+    effort: a failing channel layer never fails the write, and clients resync
+    over HTTP after a reconnect.
+    """
+
+    # Message handler name on CoupleConsumer (couple.event -> couple_event)
+    MESSAGE_TYPE = 'couple.event'
+
+    MESSAGE_DAY_CREATED = 'message_day.created'
+    MESSAGE_DAY_UPDATED = 'message_day.updated'
+    MESSAGE_DAY_DELETED = 'message_day.deleted'
+    MESSAGE_CREATED = 'message.created'
+    MESSAGE_UPDATED = 'message.updated'
+    MESSAGE_DELETED = 'message.deleted'
+
+    @staticmethod
+    def group_name(bleoid, partner_bleoid):
+        """Channel group shared by both partners (order independent)"""
+        return "couple." + "_".join(sorted((bleoid, partner_bleoid)))
+
+    @staticmethod
+    def build(event, from_bleoid, to_bleoid, date=None, data=None):
+        """Event body sent to the WebSocket clients"""
+        if isinstance(date, datetime):
+            date = date.strftime(ValidationRules.STANDARD_DATE_FORMAT)
+        return {
+            'event': event,
+            'from_bleoid': from_bleoid,
+            'to_bleoid': to_bleoid,
+            'date': date,
+            'data': data
+        }
+
+    @staticmethod
+    def publish(event, from_bleoid, to_bleoid, date=None, data=None):
+        """Publish from sync code (DRF views)"""
+        if not to_bleoid:
+            return False
+        try:
+            message = {'type': RealtimeEvents.MESSAGE_TYPE, 'event': RealtimeEvents.build(event, from_bleoid, to_bleoid, date, data)}
+            async_to_sync(get_channel_layer().group_send)(RealtimeEvents.group_name(from_bleoid, to_bleoid), message)
+        except Exception:
+            EVENTS_PUBLISHED.inc(event=event, result='failed')
+            return False
+        EVENTS_PUBLISHED.inc(event=event, result='published')
+        return True
+
+    @staticmethod
+    async def apublish(event, from_bleoid, to_bleoid, date=None, data=None):
+        """Publish from async views"""
+        if not to_bleoid:
+            return False
+        try:
+            message = {'type': RealtimeEvents.MESSAGE_TYPE, 'event': RealtimeEvents.build(event, from_bleoid, to_bleoid, date, data)}
+            await get_channel_layer().group_send(RealtimeEvents.group_name(from_bleoid, to_bleoid), message)
+        except Exception:
+            EVENTS_PUBLISHED.inc(event=event, result='failed')
+            return False
+        EVENTS_PUBLISHED.inc(event=event, result='published')
+        return True
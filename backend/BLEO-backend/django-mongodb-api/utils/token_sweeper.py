@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from django.conf import settings
+from models.enums.LogType import LogType
+from utils.logger import Logger
+from utils.metrics import Metrics
+from utils.mongodb_utils import MongoDB
+
+TOKENS_SWEPT = Metrics.counter(
+    'bleo_tokens_swept_total',
+    'Expired, never-used token records deleted by TokenSweeper',
+    labels=('collection',)
+)
+
+class TokenSweeper:
+    """Deletes token records that expired without being used.
+
+    TTL indexes on expires_at do the bulk of the cleanup (see
+    MongoDB._setup_collection_indexes): blacklist entries go when their token
+    expires, reset and verification records TOKEN_AUDIT_RETENTION_DAYS later
+    so used ones remain as an audit trail. Unused expired records have no audit
+    value; the sweeper removes them straight away, in chunks so each delete
+    stays short, which keeps these collections and their indexes small.
+    """
+
+    # Collection key -> records to remove once expires_at has passed
+    UNUSED = {
+        'PasswordResets': {"used": False},
+        'EmailVerifications': {"verified": False},
+    }
+
+    @staticmethod
+    def sweep(chunk_size=None, max_chunks=None):
+        """Delete unused expired records; returns the count per collection key"""
+        chunk_size = chunk_size or settings.TOKEN_SWEEP_CHUNK_SIZE
+        now = datetime.now(timezone.utc)
+        totals = {}
+        for key, condition in TokenSweeper.UNUSED.items():
+            totals[key] = TokenSweeper._sweep_collection(
+                key, {**condition, "expires_at": {"$lt": now}}, chunk_size, max_chunks
+            )
+
+        if any(totals.values()):
+            Logger.system_action(
+                "Swept expired tokens: " + ", ".join(f"{key} {count}" for key, count in totals.items()),
+                LogType.DATABASE.value,
+                200
+            )
+        return totals
+
+    @staticmethod
+    def _sweep_collection(key, query, chunk_size, max_chunks):
+        collection = MongoDB.get_instance().get_collection(key)
+        deleted = 0
+        chunks = 0
+        while max_chunks is None or chunks < max_chunks:
+            ids = [doc["_id"] for doc in collection.find(query, {"_id": 1}).limit(chunk_size)]
+            if not ids:
+                break
+            # Re-check the condition: a record used since the find is kept
+            count = collection.delete_many({**query, "_id": {"$in": ids}}).deleted_count
+            deleted += count
+            TOKENS_SWEPT.inc(count, collection=key)
+            chunks += 1
+            if len(ids) < chunk_size:
+                break
+        return deleted
@@ -0,0 +1,65 @@
+import base64
+import json
+
+class UserQuery:
+    """Users list filters, lean projection and keyset cursors for UserListCreateView.
+
+    Every sort field has a unique index (userName, email, bleoid), so the sort
+    value alone is a stable cursor and a page is one index range scan: prefix
+    search narrows the same index the page is read from.
+    """
+
+    SORT_FIELDS = ('userName', 'email', 'bleoid')
+    DEFAULT_SORT = 'userName'
+
+    # List fields; pictures and preferences are left to the user detail endpoint
+    LEAN_PROJECTION = {
+        '_id': 0, 'bleoid': 1, 'email': 1, 'userName': 1, 'bio': 1,
+        'email_verified': 1, 'created_at': 1, 'last_login': 1
+    }
+
+    @staticmethod
+    def sort_field(value):
+        """Validated sort field, raising ValueError for unknown ones"""
+        field = value or UserQuery.DEFAULT_SORT
+        if field not in UserQuery.SORT_FIELDS:
+            raise ValueError(f"Invalid sort field: {field}. Valid fields are: {', '.join(UserQuery.SORT_FIELDS)}")
+        return field
+
+    @staticmethod
+    def projection(with_picture=False):
+        """Lean projection, plus the picture reference when asked for"""
+        if with_picture:
+            return {**UserQuery.LEAN_PROJECTION, 'profilePic': 1}
+        return UserQuery.LEAN_PROJECTION
+
+    @staticmethod
+    def build(field, search=None):
+        """Filter for users whose sort field starts with search (an index range, not a regex)"""
+        if not search:
+            return {}
+        # Emails are stored lowercase
+        prefix = search.lower() if field == 'email' else search
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return {field: {'$gte': prefix, '$lt': upper}}
+
+    @staticmethod
+    def encode_cursor(field, user):
+        """Opaque cursor pointing just after user in field order"""
+        payload = json.dumps({'sort': field, 'after': user[field]})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def after_cursor(query, field, cursor):
+        """Restrict query to users strictly after cursor, raising ValueError when it is malformed"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            after = payload['after']
+            if payload['sort'] != field or not isinstance(after, str):
+                raise ValueError
+        except (KeyError, TypeError, UnicodeDecodeError, json.JSONDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+        bounds = dict(query.get(field, {}))
+        bounds['$gt'] = after
+        return {**query, field: bounds}